@@ -1,6 +1,48 @@
 
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, AsyncGenerator
+from collections import OrderedDict
+from typing import Any, Dict, List, AsyncGenerator, Optional, Sequence
+
+import numpy as np
+
+
+def shared_prefix_length(a: Sequence[int], b: Sequence[int]) -> int:
+    """Number of leading tokens ``a`` and ``b`` have in common."""
+    n = min(len(a), len(b))
+    mismatches = np.flatnonzero(np.asarray(a[:n]) != np.asarray(b[:n]))
+    return int(mismatches[0]) if mismatches.size else n
+
+
+class PrefixStateCache:
+    """
+    Evaluated model state (e.g. past key-values) of a few long prompt prefixes,
+    such as one per version of the HRM planner preamble, keyed by the prefix text.
+    The least recently used prefix is evicted first.
+    """
+
+    def __init__(self, max_entries: int = 4):
+        self.max_entries = max_entries
+        self.hits = self.misses = 0
+        self._states: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, prefix: str) -> Optional[Any]:
+        with self._lock:
+            state = self._states.get(prefix)
+            if state is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._states.move_to_end(prefix)
+            return state
+
+    def put(self, prefix: str, state: Any) -> None:
+        with self._lock:
+            self._states[prefix] = state
+            self._states.move_to_end(prefix)
+            while len(self._states) > self.max_entries:
+                self._states.popitem(last=False)
 
 class BaseLLM(ABC):
     """
@@ -31,3 +73,22 @@ class BaseLLM(ABC):
             A dictionary for each event in the stream (e.g., token, tool_call).
         """
         pass
+
+    @abstractmethod
+    async def get_response(self, prompt: str, tools: List[Dict[str, Any]] = None, prefix: str = None,
+                           json_schema: Dict[str, Any] = None) -> str:
+        """
+        Generates a single, complete response from the LLM.
+
+        Args:
+            prompt: The user's prompt.
+            tools: A list of tools available for the model to use.
+            prefix: Optional leading part of ``prompt`` shared by many requests (e.g. the HRM
+                    planner preamble). Local backends evaluate it once and reuse its state.
+            json_schema: Optional JSON schema the response must match (e.g. the HRM planner's
+                         command). Local backends constrain decoding to it.
+
+        Returns:
+            The model's complete response as a string.
+        """
+        pass
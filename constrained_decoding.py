@@ -0,0 +1,163 @@
+"""
+Constrained JSON decoding for local Hugging Face models.
+
+A JSON schema, in the subset tool ``parameters`` use (objects, arrays, strings,
+numbers, booleans, null, enum/const, anyOf/oneOf), is compiled into a regular
+expression over compact JSON text. JsonSchemaLogitsProcessor masks every next
+token that would leave that language, using the partial matching of the
+``regex`` package, and only allows end-of-sequence once the value is complete,
+so generation stops right after the closing brace. llama.cpp models get the same
+schema through llama.cpp's own grammar support (see LlamaLLM).
+"""
+import json
+import re
+from typing import Any, Dict, List
+
+import numpy as np
+
+try:
+    import regex  # a transformers dependency; the standard re module cannot match partially
+except ImportError:
+    regex = None
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+CONSTRAINED_DECODING_AVAILABLE = regex is not None and torch is not None
+
+# At most one space, and only after ':' and ',': the model cannot pad its output with whitespace.
+_WS = "[ ]?"
+_CHARACTER = r'(?:[^"\\\x00-\x1f]|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})'
+_STRING = f'"{_CHARACTER}*"'
+_INTEGER = r"-?(?:0|[1-9][0-9]*)"
+_TYPES = {
+    "string": _STRING,
+    "integer": _INTEGER,
+    "number": _INTEGER + r"(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?",
+    "boolean": "(?:true|false)",
+    "null": "null",
+}
+_ANY_SCALAR = "(?:" + "|".join(_TYPES.values()) + ")"
+
+
+def _alternatives(patterns: List[str]) -> str:
+    return "(?:" + "|".join(patterns) + ")"
+
+
+def _object_regex(schema: Dict[str, Any]) -> str:
+    # Properties are emitted in schema order; optional ones may be left out, so an
+    # object may start with any property up to (and including) the first required one.
+    required = set(schema.get("required", []))
+    members = [(re.escape(json.dumps(name)) + ":" + _WS + json_schema_regex(value), name in required)
+               for name, value in schema.get("properties", {}).items()]
+    starts = []
+    for first, (member, is_required) in enumerate(members):
+        rest = "".join(f"(?:,{_WS}{other})" + ("" if other_required else "?") for other, other_required in members[first + 1:])
+        starts.append(member + rest)
+        if is_required:
+            break
+    body = _alternatives(starts) + ("" if required else "?") if starts else ""
+    return r"\{" + body + r"\}"
+
+
+def json_schema_regex(schema: Dict[str, Any]) -> str:
+    """Regular expression matching the compact JSON texts that satisfy ``schema``."""
+    if "const" in schema:
+        return re.escape(json.dumps(schema["const"]))
+    if "enum" in schema:
+        return _alternatives([re.escape(json.dumps(value)) for value in schema["enum"]])
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            return _alternatives([json_schema_regex(option) for option in schema[key]])
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        return _alternatives([json_schema_regex(dict(schema, type=single)) for single in kind])
+    if kind == "object" or "properties" in schema:
+        return _object_regex(schema)
+    if kind == "array":
+        item = json_schema_regex(schema.get("items", {}))
+        return r"\[" + f"(?:{item}(?:,{_WS}{item})*)?" + r"\]"
+    if kind == "string" and "maxLength" in schema:
+        return f'"{_CHARACTER}{{0,{int(schema["maxLength"])}}}"'
+    return _TYPES.get(kind, _ANY_SCALAR)
+
+
+_VOCABULARIES: Dict[int, Any] = {}
+
+
+def _vocabulary(tokenizer: Any) -> Any:
+    """
+    The text each token adds when appended to others (decoded after an anchor token,
+    so SentencePiece/byte-level leading spaces survive), the distinct first characters
+    of those texts, and each token's index into them (-1 for empty texts and special
+    tokens). Built once per tokenizer.
+    """
+    if id(tokenizer) not in _VOCABULARIES:
+        anchor = tokenizer.encode("a", add_special_tokens=False)[-1:]
+        anchor_text = tokenizer.decode(anchor)
+        # Special tokens (end-of-sequence among them) are never part of the JSON text.
+        special = set(getattr(tokenizer, "all_special_ids", [])) | {tokenizer.eos_token_id}
+        pieces = ["" if token in special else tokenizer.decode(anchor + [token])[len(anchor_text):]
+                  for token in range(len(tokenizer))]
+        chars = sorted({piece[0] for piece in pieces if piece})
+        index = {char: position for position, char in enumerate(chars)}
+        first_char = np.array([index[piece[0]] if piece else -1 for piece in pieces], dtype=np.int64)
+        _VOCABULARIES[id(tokenizer)] = (pieces, chars, first_char)
+    return _VOCABULARIES[id(tokenizer)]
+
+
+class JsonSchemaLogitsProcessor:
+    """
+    transformers logits processor restricting the generated text (everything after
+    ``prompt_length`` tokens) to JSON matching ``schema``. Only tokens starting with a
+    character the schema allows next are considered, in score order, and the best
+    ``top_k`` valid ones are kept for sampling.
+    """
+
+    def __init__(self, tokenizer: Any, schema: Dict[str, Any], prompt_length: int, top_k: int = 32):
+        if regex is None:
+            raise ImportError("Constrained decoding requires 'regex'. Please install it with 'pip install regex'.")
+        self.tokenizer = tokenizer
+        self.pattern = regex.compile(json_schema_regex(schema))
+        self.prompt_length = prompt_length
+        self.top_k = top_k
+        self.pieces, self.chars, self.first_char = _vocabulary(tokenizer)
+
+    def allowed_tokens(self, text: str, scores: np.ndarray) -> List[int]:
+        """The best-scoring tokens that keep ``text`` a valid prefix; only end-of-sequence once it is complete."""
+        if self.pattern.fullmatch(text):
+            return [self.tokenizer.eos_token_id]
+        # The last slot stays False and catches tokens that decode to nothing.
+        char_allowed = np.zeros(len(self.chars) + 1, dtype=bool)
+        char_allowed[:-1] = [self.pattern.fullmatch(text + char, partial=True) is not None for char in self.chars]
+        candidate_scores = np.where(char_allowed[self.first_char], scores, -np.inf)
+        count = int(np.isfinite(candidate_scores).sum())
+        if not count:
+            return [self.tokenizer.eos_token_id]
+        # Most steps are settled by the best few candidates; sort everything only if they are not.
+        head = min(count, 8 * self.top_k)
+        order = np.argpartition(-candidate_scores, head - 1)[:head]
+        order = order[np.argsort(-candidate_scores[order], kind="stable")]
+        allowed = self._valid(text, order)
+        if len(allowed) < self.top_k and count > head:
+            allowed += self._valid(text, np.argsort(-candidate_scores, kind="stable")[head:count], self.top_k - len(allowed))
+        return allowed
+
+    def _valid(self, text: str, tokens: np.ndarray, limit: int = 0) -> List[int]:
+        valid: List[int] = []
+        for token in tokens.tolist():
+            if self.pattern.fullmatch(text + self.pieces[token], partial=True):
+                valid.append(token)
+                if len(valid) >= (limit or self.top_k):
+                    break
+        return valid
+
+    def __call__(self, input_ids: "torch.LongTensor", scores: "torch.FloatTensor") -> "torch.FloatTensor":
+        mask = torch.full_like(scores, float("-inf"))
+        row_scores = scores.float().cpu().numpy()
+        for row in range(scores.shape[0]):
+            text = self.tokenizer.decode(input_ids[row, self.prompt_length:], skip_special_tokens=True)
+            mask[row, self.allowed_tokens(text, row_scores[row])] = 0
+        return scores + mask
@@ -1,9 +1,11 @@
 import json
 import logging
-from typing import AsyncGenerator, Dict, Any
+import re
+from typing import AsyncGenerator, Dict, Any, Optional
 
 from .llm_loader import get_llm
 from .tool_manager import tool_registry
+from tools.base_tool import CURRENT_USER, is_stream
 
 logger = logging.getLogger(__name__)
 
@@ -14,15 +16,23 @@ COMPUTATIONAL_TOOLS = {
     # We can add more tools like "puzzle_solver", "graph_analyzer" etc. here
 }
 
-def get_hrm_planner_prompt(user_input: str) -> str:
+# Longest direct answer the planner schema allows. It stays below the local backends' generation
+# budget (about 500 tokens) so constrained decoding can always close the JSON: tokenizers spend
+# at most one token per ASCII character.
+PLANNER_ANSWER_MAX_LENGTH = 400
+
+_ANSWER_START = re.compile(r'\s*\{\s*"answer"\s*:\s*"')
+
+def get_hrm_planner_preamble() -> str:
     """
-    Creates the meta-prompt for the Planner LLM, instructing it on how to behave within the HRM architecture.
+    The constant part of the Planner LLM's meta-prompt: instructions, tools and examples.
+    It only changes with the tool descriptions, so LLM backends cache its evaluated state.
     """
     # We only present the computational tools to the planner.
     # General tools will be handled by a different mechanism if needed.
     tool_descriptions = "\n".join(
         f"- {name}: {tool_registry[name].description}"
-        for name in COMPUTATIONAL_TOOLS
+        for name in sorted(COMPUTATIONAL_TOOLS)  # a stable order keeps the preamble cacheable across processes
         if name in tool_registry
     )
 
@@ -35,8 +45,9 @@ You have two options:
 The available computational tools are:
 {tool_descriptions}
 
-When delegating to a tool, you MUST respond ONLY with a JSON object in the following format:
-{{"tool": "tool_name", "input": "the_exact_input_for_the_tool"}}
+You MUST respond ONLY with a JSON object, in one of the following formats:
+{{"tool": "tool_name", "input": {{...the tool's arguments...}}}} to delegate to a tool, or
+{{"answer": "your answer"}} to answer directly.
 
 Do not provide any other text, explanation, or formatting around the JSON.
 
@@ -45,18 +56,67 @@ Do not provide any other text, explanation, or formatting around the JSON.
 ### Example 1: General Question
 User request: Tell me a fun fact about the Roman Empire.
 Your response:
-A fun fact is that the Romans used a communal sponge on a stick, known as a xylospongium, as their version of toilet paper.
+{{"answer": "A fun fact is that the Romans used a communal sponge on a stick, known as a xylospongium, as their version of toilet paper."}}
 
 ### Example 2: Computational Task
-User request: What is the result of 987 divided by 3?
+User request: Save the equation 3x + 7 = 22 as problem eq1.
+Your response:
+{{"tool": "math_problem_solver", "input": {{"operation": "add_problem", "problem_id": "eq1", "statement": "3x + 7 = 22"}}}}
+
+### Example 3: Computational Task
+User request: Solve problem eq1.
 Your response:
-{{"tool": "math_problem_solver", "input": "987 / 3"}}
+{{"tool": "math_problem_solver", "input": {{"operation": "solve_problem", "problem_id": "eq1"}}}}
 
 ---
 
 Now, analyze the following user request and generate your response.
 
-User request: {user_input}
+"""
+
+def get_hrm_planner_schema() -> Dict[str, Any]:
+    """
+    JSON schema of the planner's reply: a call to one of the computational tools, with that
+    tool's own ``parameters`` as its input, or a direct answer. Local backends decode against
+    it, so the reply is always a valid command and ends with its closing brace.
+    """
+    options = [
+        {
+            "type": "object",
+            "properties": {"tool": {"const": name}, "input": tool_registry[name].parameters},
+            "required": ["tool", "input"],
+        }
+        for name in sorted(COMPUTATIONAL_TOOLS)
+        if name in tool_registry
+    ]
+    options.append({"type": "object", "properties": {"answer": {"type": "string", "maxLength": PLANNER_ANSWER_MAX_LENGTH}},
+                    "required": ["answer"]})
+    return {"anyOf": options}
+
+def recover_truncated_answer(response: str) -> Optional[str]:
+    """
+    The text of a direct answer that was cut off before its JSON closed (e.g. at the token budget),
+    or None if ``response`` is not one. A trailing partial escape sequence is dropped.
+    """
+    match = _ANSWER_START.match(response)
+    if match is None:
+        return None
+    text = response[match.end():]
+    # At most a closing quote and an incomplete escape like \u00e need to go.
+    for end in range(len(text), max(len(text) - 7, -1), -1):
+        try:
+            return json.loads(f'"{text[:end]}"', strict=False)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+def get_hrm_planner_prompt(user_input: str, preamble: str = None) -> str:
+    """
+    Creates the meta-prompt for the Planner LLM, instructing it on how to behave within the HRM architecture.
+    """
+    if preamble is None:
+        preamble = get_hrm_planner_preamble()
+    return f"""{preamble}User request: {user_input}
 Your response:
 """
 
@@ -82,12 +142,16 @@ async def process_input(history: list[dict], current_user: str = None) -> AsyncG
         return
 
     # Create the detailed prompt for the planner
-    planner_prompt = get_hrm_planner_prompt(user_input)
+    preamble = get_hrm_planner_preamble()
+    planner_prompt = get_hrm_planner_prompt(user_input, preamble)
 
     # Get the full response from the planner, not streaming.
     # The planner's decision (JSON vs. text) is a single atomic unit.
+    # Passing the preamble as a prefix lets local models reuse its evaluated state, and the
+    # schema constrains their decoding to a well-formed command.
     try:
-        planner_response = await planner_llm.get_response(planner_prompt)
+        planner_response = await planner_llm.get_response(planner_prompt, prefix=preamble,
+                                                          json_schema=get_hrm_planner_schema())
         logger.info(f"HRM Planner response: {planner_response}")
     except Exception as e:
         logger.error(f"An error occurred while getting planner response: {e}", exc_info=True)
@@ -100,6 +164,10 @@ async def process_input(history: list[dict], current_user: str = None) -> AsyncG
         # A simple but effective check for a JSON object
         if planner_response.strip().startswith("{") and planner_response.strip().endswith("}"):
             command_data = json.loads(planner_response)
+            if isinstance(command_data.get("answer"), str):
+                logger.info("HRM Dispatcher: Planner answered directly.")
+                yield {"type": "token", "content": command_data["answer"]}
+                return
             tool_name = command_data.get("tool")
             tool_input = command_data.get("input")
 
@@ -108,9 +176,24 @@ async def process_input(history: list[dict], current_user: str = None) -> AsyncG
                 logger.info(f"HRM Dispatcher: Routing to tool '{tool_name}' with input '{tool_input}'")
                 tool_instance = tool_registry[tool_name]
                 try:
-                    # Execute the computational tool
-                    result = tool_instance.execute(query=tool_input)
-                    yield {"type": "tool_result", "tool_name": tool_name, "content": str(result)}
+                    # Execute the computational tool; its input is an arguments object matching its parameters.
+                    # aexecute keeps the event loop free: sync tools run on an executor thread.
+                    # Tools with per-user state (e.g. loaded datasets) key it by CURRENT_USER.
+                    user_token = CURRENT_USER.set(current_user)
+                    try:
+                        if isinstance(tool_input, dict):
+                            result = await tool_instance.aexecute(**tool_input)
+                        else:
+                            result = await tool_instance.aexecute(query=tool_input)
+                        chunks = tool_instance.aiter_stream(result) if is_stream(result) else None
+                    finally:
+                        CURRENT_USER.reset(user_token)
+                    if chunks is None:
+                        yield {"type": "tool_result", "tool_name": tool_name, "content": str(result)}
+                    else:
+                        # A streamed result reaches the client one chunk at a time, as the tool produces it.
+                        async for chunk in chunks:
+                            yield {"type": "tool_result", "tool_name": tool_name, "content": str(chunk)}
                 except Exception as e:
                     logger.error(f"Error executing computational tool '{tool_name}': {e}", exc_info=True)
                     yield {"type": "error", "content": f"Error running tool {tool_name}."}
@@ -122,6 +205,13 @@ async def process_input(history: list[dict], current_user: str = None) -> AsyncG
         # The response is not a valid JSON command, so treat it as a direct answer.
         pass
 
+    # A direct answer truncated mid-string is not valid JSON; pass on the text it got to.
+    answer = recover_truncated_answer(planner_response)
+    if answer is not None:
+        logger.warning("HRM Dispatcher: Planner answer was truncated.")
+        yield {"type": "token", "content": answer}
+        return
+
     # If it's not a valid tool command, stream the planner's response as a direct answer.
     logger.info("HRM Dispatcher: Treating planner response as a direct answer.")
     yield {"type": "token", "content": planner_response}
@@ -1,7 +1,8 @@
+import inspect
 import re
-from typing import Dict, Any, Callable, Tuple, List
+from typing import Dict, Any, Callable, Tuple, List, Optional
 from .conversation import ConversationManager
-from tools.base_tool import BaseTool
+from tools.base_tool import CURRENT_USER, BaseTool, collect_stream, is_stream, run_sync
 
 class IntentDispatcher:
     """
@@ -340,9 +341,33 @@ class IntentDispatcher:
 
         return args, kwargs
 
-    def dispatch(self, conversation: ConversationManager, intent: str, args_str: str) -> str:
+    def _prepare_call(self, conversation: ConversationManager, intent: str, args_str: str) -> Tuple[List[Any], Dict[str, Any]]:
         """
-        Dispatches the user's request to the appropriate tool.
+        Builds the positional and keyword arguments a tool is called with.
+        """
+        # The conversational_ai tool is special, it takes the whole history
+        if intent == "conversational_ai":
+            return [], {"history": conversation.history}
+
+        args, kwargs = self._parse_args(args_str)
+        
+        # For code generation tool, we need to pass the command as the first argument
+        # This logic might need to be moved into the tool itself for better encapsulation
+        if intent in ["generate_code", "explain_code", "refactor_code", "generate_unit_test"]:
+            kwargs['command'] = intent
+
+        # If there are positional args, and the tool expects a single query string,
+        # then join the positional args to form the query.
+        # This is a heuristic and might need to be improved.
+        if args and not kwargs:
+            return [], {"query": " ".join(args)} # Assuming execute takes a query argument
+        
+        return args, kwargs
+
+    def dispatch(self, conversation: ConversationManager, intent: str, args_str: str,
+                 current_user: Optional[str] = None) -> str:
+        """
+        Dispatches the user's request to the appropriate tool, on behalf of ``current_user``.
         """
         if intent in self.tools:
             tool_instance = self.tools[intent] # tool_instance is now a BaseTool instance
@@ -351,27 +376,48 @@ class IntentDispatcher:
                 return f"Error: Tool '{intent}' is not a valid BaseTool instance."
 
             try:
-                # The conversational_ai tool is special, it takes the whole history
-                if intent == "conversational_ai":
-                    # Assuming conversational_ai tool has an execute method that takes history
-                    return tool_instance.execute(history=conversation.history)
+                args, kwargs = self._prepare_call(conversation, intent, args_str)
+                # Tools with per-user state (e.g. loaded datasets) key it by CURRENT_USER.
+                user_token = CURRENT_USER.set(current_user)
+                try:
+                    result = tool_instance.execute(*args, **kwargs)
+                    # Tools whose execute is a coroutine are run to completion here.
+                    result = run_sync(result) if inspect.isawaitable(result) else result
+                    # A streamed result is collected, one list entry per chunk.
+                    return collect_stream(result) if is_stream(result) else result
+                finally:
+                    CURRENT_USER.reset(user_token)
+            except Exception as e:
+                return f"Error calling tool {intent}: {e}"
+        else:
+            return "I'm sorry, I don't understand that."
+
+    async def adispatch(self, conversation: ConversationManager, intent: str, args_str: str,
+                        current_user: Optional[str] = None) -> str:
+        """
+        Dispatches the user's request to the appropriate tool from async code, on behalf of
+        ``current_user``. Tools with a
+        native aexecute run on the event loop; synchronous ones run on the shared tool executor,
+        so the loop is never blocked and many requests can be in flight at once.
+        """
+        if intent in self.tools:
+            tool_instance = self.tools[intent] # tool_instance is now a BaseTool instance
 
-                args, kwargs = self._parse_args(args_str)
-                
-                # For code generation tool, we need to pass the command as the first argument
-                # This logic might need to be moved into the tool itself for better encapsulation
-                if intent in ["generate_code", "explain_code", "refactor_code", "generate_unit_test"]:
-                    kwargs['command'] = intent
+            if not isinstance(tool_instance, BaseTool):
+                return f"Error: Tool '{intent}' is not a valid BaseTool instance."
 
-                # If there are positional args, and the tool expects a single query string,
-                # then join the positional args to form the query.
-                # This is a heuristic and might need to be improved.
-                if args and not kwargs:
-                     query = " ".join(args)
-                     return tool_instance.execute(query=query) # Assuming execute takes a query argument
-                
-                return tool_instance.execute(*args, **kwargs)
+            try:
+                args, kwargs = self._prepare_call(conversation, intent, args_str)
+                user_token = CURRENT_USER.set(current_user)
+                try:
+                    result = await tool_instance.aexecute(*args, **kwargs)
+                    chunks = tool_instance.aiter_stream(result) if is_stream(result) else None
+                finally:
+                    CURRENT_USER.reset(user_token)
+                if chunks is None:
+                    return result
+                return [chunk async for chunk in chunks]
             except Exception as e:
                 return f"Error calling tool {intent}: {e}"
         else:
-            return "I'm sorry, I don't understand that."
\ No newline at end of file
+            return "I'm sorry, I don't understand that."
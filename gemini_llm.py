@@ -69,7 +69,8 @@ class GeminiLLM(BaseLLM):
             print(f"An error occurred while generating response: {e}")
             yield {"type": "error", "content": "Sorry, I encountered an error while processing your request."}
 
-    async def get_response(self, prompt: str, tools: List[Dict[str, Any]] = None) -> str:
+    async def get_response(self, prompt: str, tools: List[Dict[str, Any]] = None, prefix: str = None,
+                           json_schema: Dict[str, Any] = None) -> str:
         """
         Generates a single, complete response from the Gemini model.
         This is used by the HRM Planner.
@@ -77,12 +78,16 @@ class GeminiLLM(BaseLLM):
         Args:
             prompt: The user's prompt.
             tools: A list of tool definitions (not used by the planner).
+            prefix: Not used; prompt caching for hosted models happens server-side.
+            json_schema: Optional JSON schema of the response; Gemini is asked for JSON output.
 
         Returns:
             The model's complete response as a string.
         """
         try:
             generation_config = GenerationConfig(temperature=0.1) # Lower temperature for more deterministic planning
+            if json_schema is not None and not tools:
+                generation_config = GenerationConfig(temperature=0.1, response_mime_type="application/json")
             
             # The planner decides if a tool should be used. We provide the tool definitions.
             api_tools = [Tool.from_dict(t) for t in tools] if tools else None
@@ -5,6 +5,9 @@ from mic.config import GOOGLE_API_KEY, GOOGLE_CSE_ID
 
 logger = logging.getLogger(__name__)
 
+# Loading the CA bundle dominates the cost of a new client, so the SSL context is built once and shared.
+_SSL_CONTEXT = httpx.create_ssl_context()
+
 async def google_web_search(query: str, num_results: int = 5) -> dict:
     """
     Performs a web search using the Google Custom Search API.
@@ -36,7 +39,7 @@ async def google_web_search(query: str, num_results: int = 5) -> dict:
     }
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(verify=_SSL_CONTEXT) as client:
             response = await client.get(search_url, params=params, timeout=10)
             response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes
             data = response.json()
@@ -1,9 +1,59 @@
+import asyncio
+import copy
 import os
-import torch
 from typing import Any, Dict, List, AsyncGenerator
-from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
 
-from .base_llm import BaseLLM
+try:
+    import torch
+    from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM, DynamicCache, LogitsProcessorList
+except ImportError:  # only needed when the model runs in-process
+    torch = None
+
+from .base_llm import BaseLLM, PrefixStateCache, shared_prefix_length
+from .constrained_decoding import JsonSchemaLogitsProcessor
+from .model_server import remote_model
+
+GENERATION_ARGS = {"max_new_tokens": 500, "temperature": 0.7, "do_sample": True}
+
+
+def _chat_input_ids(tokenizer: Any, text: str) -> "torch.Tensor":
+    if tokenizer.chat_template:
+        return tokenizer.apply_chat_template([{"role": "user", "content": text}], add_generation_prompt=True, return_tensors="pt")
+    return tokenizer(text, return_tensors="pt").input_ids
+
+
+def generate_reply(model: Any, tokenizer: Any, prompt: str, generation: Dict[str, Any], prefix: str = None,
+                   states: PrefixStateCache = None, json_schema: Dict[str, Any] = None) -> str:
+    """
+    Generates a reply to ``prompt`` (a single user message).
+
+    With ``prefix`` (a leading part of ``prompt``) and ``states``, the prefix is not re-encoded:
+    its past key-values are computed once, kept in ``states``, and each request continues from
+    a copy of them, so only the tokens after the prefix are evaluated. With ``json_schema`` the
+    reply is constrained to JSON matching the schema and generation stops once it is complete.
+    """
+    input_ids = _chat_input_ids(tokenizer, prompt).to(model.device)
+    options = dict(generation)
+    if prefix and states is not None and prompt.startswith(prefix):
+        state = states.get(prefix)
+        if state is None:
+            prefix_ids = _chat_input_ids(tokenizer, prefix).to(model.device)
+            with torch.no_grad():
+                cache = model(prefix_ids, past_key_values=DynamicCache(), use_cache=True).past_key_values
+            state = (prefix_ids[0].tolist(), cache)
+            states.put(prefix, state)
+        prefix_tokens, cache = state
+        # The encoded prefix ends with the chat template's end-of-turn tokens, so only the shared
+        # tokens are reused; at least one prompt token is left for generate() to evaluate.
+        reused = min(shared_prefix_length(prefix_tokens, input_ids[0].tolist()), input_ids.shape[1] - 1)
+        options["past_key_values"] = copy.deepcopy(cache)
+        options["past_key_values"].crop(reused)
+    if json_schema is not None:
+        options["logits_processor"] = LogitsProcessorList([JsonSchemaLogitsProcessor(tokenizer, json_schema, input_ids.shape[1])])
+    with torch.no_grad():
+        output = model.generate(input_ids, attention_mask=torch.ones_like(input_ids), pad_token_id=tokenizer.eos_token_id,
+                                **options)
+    return tokenizer.decode(output[0, input_ids.shape[1]:], skip_special_tokens=True)
 
 class HfLLM(BaseLLM):
     """
@@ -23,7 +73,18 @@ class HfLLM(BaseLLM):
                       Pinning to a commit hash is recommended for security and reproducibility.
         """
         super().__init__(api_key, model_name)
-        
+        self.revision = revision
+        self.prefix_states = PrefixStateCache()
+        # With "text_generation" in MODEL_SERVER_FAMILIES generation runs in the shared model
+        # server, which loads the weights once for all workers and batches their prompts.
+        self.remote = remote_model("text_generation")
+        if self.remote is not None:
+            self.model = self.tokenizer = self.pipeline = None
+            print(f"HuggingFaceLLM: Using model '{self.model_name}' through the local model server.")
+            return
+        if torch is None:
+            raise RuntimeError("Hugging Face models require 'torch' and 'transformers' (or the model server).")
+
         try:
             self.device = "cuda" if torch.cuda.is_available() else "cpu"
             print(f"HuggingFaceLLM: Using device: {self.device}")
@@ -84,6 +145,16 @@ class HfLLM(BaseLLM):
             # The standard pipeline(messages, stream=True) is not directly available for all models/versions.
             # A common way to stream with transformers is to generate token by token.
 
+            if self.remote is not None:
+                events = self.remote.stream("generate", prompt=formatted_prompt, model=self.model_name, revision=self.revision,
+                                            generation=dict(GENERATION_ARGS, top_p=0.95))
+                # The blocking socket reads run on a worker thread so the event loop stays free.
+                while True:
+                    token = await asyncio.to_thread(next, events, None)
+                    if token is None:
+                        return
+                    yield {"type": "token", "content": token}
+
             input_ids = self.tokenizer.apply_chat_template(messages, return_tensors="pt").to(self.device)
 
             # Generate with streaming
@@ -123,7 +194,8 @@ class HfLLM(BaseLLM):
             print(f"An error occurred while generating response: {e}")
             yield {"type": "error", "content": "Sorry, I encountered an error while processing your request."}
 
-    async def get_response(self, prompt: str, tools: List[Dict[str, Any]] = None) -> str:
+    async def get_response(self, prompt: str, tools: List[Dict[str, Any]] = None, prefix: str = None,
+                           json_schema: Dict[str, Any] = None) -> str:
         """
         Generates a single, complete response from the local Hugging Face model.
         This is used by the HRM Planner.
@@ -131,25 +203,27 @@ class HfLLM(BaseLLM):
         Args:
             prompt: The user's prompt.
             tools: A list of tool definitions (not used in this basic implementation).
+            prefix: Optional leading part of ``prompt`` whose past key-values are cached and reused.
+            json_schema: Optional JSON schema the response is constrained to.
 
         Returns:
             The model's complete response as a string.
         """
-        if self.pipeline is None:
+        if self.pipeline is None and self.remote is None:
             return "Error: Hugging Face pipeline not initialized."
 
         try:
-            messages = [{"role": "user", "content": prompt}]
-            
-            generation_args = {
-                "max_new_tokens": 500,
-                "return_full_text": False,
-                "temperature": 0.7,
-                "do_sample": True,
-            }
-
-            output = self.pipeline(messages, **generation_args)
-            response = output[0]['generated_text']
+            if self.remote is not None:
+                response = await asyncio.to_thread(self.remote.run_one, "generate", prompt=prompt, model=self.model_name,
+                                                   revision=self.revision, generation=GENERATION_ARGS, prefix=prefix,
+                                                   json_schema=json_schema)
+            elif (prefix and prompt.startswith(prefix)) or json_schema is not None:
+                response = generate_reply(self.model, self.tokenizer, prompt, GENERATION_ARGS, prefix=prefix,
+                                          states=self.prefix_states, json_schema=json_schema)
+            else:
+                messages = [{"role": "user", "content": prompt}]
+                output = self.pipeline(messages, return_full_text=False, **GENERATION_ARGS)
+                response = output[0]['generated_text']
             
             # The HRM prompt includes the original user query, which might be echoed back.
             # We will clean it up here if the model includes it.
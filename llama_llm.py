@@ -1,12 +1,109 @@
+import asyncio
 import os
-from typing import Any, Dict, List, AsyncGenerator
-from llama_cpp import Llama
-from .base_llm import BaseLLM
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, AsyncGenerator, Optional
 import json
 
+import numpy as np
+from llama_cpp import Llama
+from llama_cpp.llama_cache import LlamaDiskCache, LlamaRAMCache
+from llama_cpp.llama_grammar import LlamaGrammar
+from llama_cpp.llama_speculative import LlamaDraftModel, LlamaPromptLookupDecoding
+
+from .base_llm import BaseLLM, PrefixStateCache, shared_prefix_length
+
+# Inference tuning. Thread counts default to llama.cpp's own choice (physical cores for
+# generation, all cores for prompt evaluation); 0 keeps that default.
+LLAMA_N_CTX = int(os.getenv("LLAMA_N_CTX", 4096))
+LLAMA_N_GPU_LAYERS = int(os.getenv("LLAMA_N_GPU_LAYERS", 0))
+LLAMA_N_THREADS = int(os.getenv("LLAMA_N_THREADS", 0))
+LLAMA_N_THREADS_BATCH = int(os.getenv("LLAMA_N_THREADS_BATCH", 0))
+LLAMA_N_BATCH = int(os.getenv("LLAMA_N_BATCH", 512))
+LLAMA_N_UBATCH = int(os.getenv("LLAMA_N_UBATCH", 512))
+LLAMA_USE_MLOCK = os.getenv("LLAMA_USE_MLOCK", "0") == "1"
+LLAMA_FLASH_ATTN = os.getenv("LLAMA_FLASH_ATTN", "0") == "1"
+LLAMA_VERBOSE = os.getenv("LLAMA_VERBOSE", "0") == "1"
+# Prompt cache: "ram", "disk" or "off". It keeps evaluated prompt states so a prompt that
+# starts like an earlier one (e.g. the HRM planner preamble) only evaluates the new tail.
+LLAMA_PROMPT_CACHE = os.getenv("LLAMA_PROMPT_CACHE", "ram")
+LLAMA_PROMPT_CACHE_BYTES = int(os.getenv("LLAMA_PROMPT_CACHE_BYTES", 2 << 30))
+LLAMA_PROMPT_CACHE_DIR = os.getenv("LLAMA_PROMPT_CACHE_DIR", ".cache/llama_prompt_cache")
+# Speculative decoding: a small GGUF draft model with the same vocabulary, or
+# LLAMA_SPECULATIVE=prompt_lookup to draft from n-grams of the prompt (no extra model).
+LLAMA_DRAFT_MODEL_PATH = os.getenv("LLAMA_DRAFT_MODEL_PATH")
+LLAMA_SPECULATIVE = os.getenv("LLAMA_SPECULATIVE", "off")
+LLAMA_DRAFT_TOKENS = int(os.getenv("LLAMA_DRAFT_TOKENS", 8))
+
+GENERATION_ARGS = {
+    "max_tokens": 512,
+    "temperature": 0.7,
+    "top_p": 0.95,
+    "stop": ["<|end|>", "<|user|>"],
+}
+
+_DONE = object()
+
+
+def llama_settings(**overrides: Any) -> Dict[str, Any]:
+    """The Llama() keyword arguments for the configured CPU/GPU tuning, with ``overrides`` applied."""
+    settings = {
+        "n_ctx": LLAMA_N_CTX,
+        "n_gpu_layers": LLAMA_N_GPU_LAYERS,
+        "n_batch": LLAMA_N_BATCH,
+        "n_ubatch": min(LLAMA_N_UBATCH, LLAMA_N_BATCH),
+        "use_mmap": True,
+        "use_mlock": LLAMA_USE_MLOCK,
+        "flash_attn": LLAMA_FLASH_ATTN,
+        "verbose": LLAMA_VERBOSE,
+    }
+    if LLAMA_N_THREADS:
+        settings["n_threads"] = LLAMA_N_THREADS
+    if LLAMA_N_THREADS_BATCH:
+        settings["n_threads_batch"] = LLAMA_N_THREADS_BATCH
+    settings.update(overrides)
+    return settings
+
+
+class GGUFDraftModel(LlamaDraftModel):
+    """
+    Speculative decoding with a small GGUF model that shares the main model's
+    vocabulary: it greedily proposes ``num_pred_tokens`` tokens, which the main
+    model then verifies in a single batched evaluation.
+    """
+
+    def __init__(self, model_path: str, num_pred_tokens: int = LLAMA_DRAFT_TOKENS, **llama_params: Any):
+        self.num_pred_tokens = num_pred_tokens
+        self.llm = Llama(model_path=model_path, **llama_settings(**llama_params))
+
+    def __call__(self, input_ids: np.ndarray, /, **kwargs: Any) -> np.ndarray:
+        draft: List[int] = []
+        # generate() reuses the draft context's longest matching prefix, so each call only evaluates the new tokens.
+        for token in self.llm.generate(input_ids.tolist(), top_k=1, temp=0.0, reset=True):
+            if token == self.llm.token_eos():
+                break
+            draft.append(token)
+            if len(draft) >= self.num_pred_tokens:
+                break
+        return np.array(draft, dtype=np.intc)
+
+
+def _draft_model(n_ctx: int) -> Optional[LlamaDraftModel]:
+    if LLAMA_DRAFT_MODEL_PATH:
+        print(f"LlamaLLM: Speculative decoding with draft model '{os.path.basename(LLAMA_DRAFT_MODEL_PATH)}'.")
+        return GGUFDraftModel(LLAMA_DRAFT_MODEL_PATH, n_ctx=n_ctx)
+    if LLAMA_SPECULATIVE == "prompt_lookup":
+        return LlamaPromptLookupDecoding(num_pred_tokens=LLAMA_DRAFT_TOKENS)
+    return None
+
+
 class LlamaLLM(BaseLLM):
     """
     A class to interact with a local GGUF model using llama-cpp-python.
+
+    All model calls run on one dedicated worker thread: a llama.cpp context is
+    not thread-safe, and generation must not block the event loop.
     """
 
     def __init__(self, model_path: str, **kwargs):
@@ -15,18 +112,16 @@ class LlamaLLM(BaseLLM):
 
         Args:
             model_path: The path to the GGUF model file.
+            **kwargs: Llama() arguments overriding the LLAMA_* environment settings.
         """
         super().__init__(model_name=os.path.basename(model_path))
-        
+
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"Model file not found at {model_path}")
 
-        llama_params = {
-            "n_ctx": 4096,
-            "n_gpu_layers": 0,
-            "verbose": True,
-        }
-        llama_params.update(kwargs)
+        llama_params = llama_settings(**kwargs)
+        if "draft_model" not in llama_params:
+            llama_params["draft_model"] = _draft_model(llama_params["n_ctx"])
 
         try:
             print(f"LlamaLLM: Loading model from '{self.model_name}'. This may take a moment...")
@@ -35,6 +130,73 @@ class LlamaLLM(BaseLLM):
         except Exception as e:
             raise RuntimeError(f"Failed to load GGUF model. Error: {e}")
 
+        if LLAMA_PROMPT_CACHE == "ram":
+            self.llm.set_cache(LlamaRAMCache(capacity_bytes=LLAMA_PROMPT_CACHE_BYTES))
+        elif LLAMA_PROMPT_CACHE == "disk":
+            self.llm.set_cache(LlamaDiskCache(cache_dir=LLAMA_PROMPT_CACHE_DIR, capacity_bytes=LLAMA_PROMPT_CACHE_BYTES))
+        self.prefix_states = PrefixStateCache()
+        self._grammars: Dict[str, LlamaGrammar] = {}
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llama")
+
+    def _chat(self, prompt: str, tools: Optional[List[Dict[str, Any]]], stream: bool,
+              grammar: Optional[LlamaGrammar] = None) -> Any:
+        return self.llm.create_chat_completion(
+            messages=[{"role": "user", "content": prompt}],
+            tools=tools,
+            tool_choice="auto",
+            stream=stream,
+            grammar=grammar,
+            **GENERATION_ARGS
+        )
+
+    def _grammar(self, json_schema: Dict[str, Any]) -> LlamaGrammar:
+        """The llama.cpp grammar for ``json_schema``, compiled once per schema."""
+        key = json.dumps(json_schema, sort_keys=True)
+        if key not in self._grammars:
+            self._grammars[key] = LlamaGrammar.from_json_schema(key, verbose=False)
+        return self._grammars[key]
+
+    def _load_prefix(self, prefix: str) -> None:
+        """
+        Puts the evaluated state of ``prefix`` into the context, evaluating it only the first
+        time, so a prompt that starts with it only evaluates the remaining tokens.
+        """
+        state = self.prefix_states.get(prefix)
+        if state is None:
+            self.llm.create_chat_completion(messages=[{"role": "user", "content": prefix}], max_tokens=1)
+            self.prefix_states.put(prefix, self.llm.save_state())
+        elif shared_prefix_length(self.llm.input_ids, state.input_ids) < len(state.input_ids):
+            self.llm.load_state(state)
+
+    async def _relay(self, make_stream: Callable[[], Iterator[Any]]) -> AsyncGenerator[Any, None]:
+        """Runs a blocking llama.cpp stream on the worker thread and yields its chunks on the event loop."""
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        abandoned = threading.Event()
+
+        def produce() -> None:
+            try:
+                for chunk in make_stream():
+                    if abandoned.is_set():
+                        break  # the consumer went away; free the model for the next request
+                    loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+            except Exception as e:
+                loop.call_soon_threadsafe(chunks.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, _DONE)
+
+        loop.run_in_executor(self._worker, produce)
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is _DONE:
+                    return
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            abandoned.set()
+
     async def stream_response(self, prompt: str, tools: List[Dict[str, Any]] = None) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Generates a response from the local GGUF model and streams the output.
@@ -46,35 +208,8 @@ class LlamaLLM(BaseLLM):
         Yields:
             A dictionary for each event in the stream (e.g., token, tool_call).
         """
-        import time
-        print(f"[{time.time()}] LlamaLLM.stream_response: Entered method.")
-
-        messages = [{"role": "user", "content": prompt}]
-        
-        generation_args = {
-            "max_tokens": 512,
-            "temperature": 0.7,
-            "top_p": 0.95,
-            "stop": ["<|end|>", "<|user|>"],
-        }
-
         try:
-            print(f"[{time.time()}] LlamaLLM.stream_response: Calling create_chat_completion...")
-            stream = self.llm.create_chat_completion(
-                messages=messages,
-                tools=tools,
-                tool_choice="auto",
-                stream=True,
-                **generation_args
-            )
-            print(f"[{time.time()}] LlamaLLM.stream_response: Got stream object. Starting iteration...")
-            
-            first_chunk = True
-            for chunk in stream:
-                if first_chunk:
-                    print(f"[{time.time()}] LlamaLLM.stream_response: Received first chunk from model.")
-                    first_chunk = False
-                
+            async for chunk in self._relay(lambda: self._chat(prompt, tools, stream=True)):
                 delta = chunk.get("choices", [{}])[0].get("delta", {})
                 if "tool_calls" in delta and delta["tool_calls"]:
                     tool_call = delta["tool_calls"][0]
@@ -90,5 +225,79 @@ class LlamaLLM(BaseLLM):
             print(f"An error occurred while generating response: {e}")
             yield {"type": "error", "content": "Sorry, I encountered an error."}
 
-    
+    async def get_response(self, prompt: str, tools: List[Dict[str, Any]] = None, prefix: str = None,
+                           json_schema: Dict[str, Any] = None) -> str:
+        """
+        Generates a single, complete response from the local GGUF model.
+        This is used by the HRM Planner.
+
+        Args:
+            prompt: The user's prompt.
+            tools: A list of tool definitions.
+            prefix: Optional leading part of ``prompt`` whose evaluated state is cached and reused.
+            json_schema: Optional JSON schema; sampling is constrained to it by a llama.cpp grammar,
+                         and generation ends with the closing brace.
+
+        Returns:
+            The model's complete response as a string.
+        """
+        try:
+            def respond() -> Dict[str, Any]:
+                if prefix and prompt.startswith(prefix):
+                    self._load_prefix(prefix)
+                grammar = self._grammar(json_schema) if json_schema is not None else None
+                return self._chat(prompt, tools, stream=False, grammar=grammar)
+
+            completion = await asyncio.get_running_loop().run_in_executor(self._worker, respond)
+            return completion["choices"][0]["message"].get("content") or ""
+        except Exception as e:
+            print(f"An error occurred while generating response: {e}")
+            return "Sorry, I encountered an error while processing your request."
+
+
+def benchmark(llm: LlamaLLM, prompt: str, runs: int = 3, prefix: Optional[str] = None) -> List[Dict[str, float]]:
+    """
+    Prompt-evaluation and generation throughput of ``llm`` on ``prompt``. The first run
+    evaluates the whole prompt; later runs show what the prompt cache (or, with
+    ``prefix``, the cached prefix state) saves.
+    """
+    prompt_tokens = len(llm.llm.tokenize(prompt.encode("utf-8")))
+    results = []
+    for run in range(runs):
+        if run:
+            llm.llm.reset()  # drop the live context so only the prompt cache can help
+        start = time.perf_counter()
+        if prefix:
+            llm._load_prefix(prefix)
+        first_token = None
+        generated = 0
+        for chunk in llm._chat(prompt, None, stream=True):
+            if chunk["choices"][0]["delta"].get("content"):
+                first_token = first_token or time.perf_counter()
+                generated += 1
+        end = time.perf_counter()
+        first_token = first_token or end
+        results.append({
+            "prompt_tokens": prompt_tokens,
+            "time_to_first_token_s": round(first_token - start, 3),
+            "prompt_eval_tokens_per_s": round(prompt_tokens / (first_token - start), 1),
+            "generated_tokens": generated,
+            "generation_tokens_per_s": round((generated - 1) / (end - first_token), 1) if generated > 1 else 0.0,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    from .core import get_hrm_planner_preamble, get_hrm_planner_prompt
 
+    model_path = sys.argv[1] if len(sys.argv) > 1 else os.getenv("LLAMA_MODEL_PATH")
+    if not model_path:
+        sys.exit("Usage: python -m mic.llama_llm <model.gguf>  (or set LLAMA_MODEL_PATH)")
+    llm = LlamaLLM(model_path)
+    preamble = get_hrm_planner_preamble()
+    for run, result in enumerate(benchmark(llm, get_hrm_planner_prompt("What is 12345 times 6789?", preamble))):
+        print(f"run {run} ({'cold' if run == 0 else 'prompt cache'}): {result}")
+    for run, result in enumerate(benchmark(llm, get_hrm_planner_prompt("What is 2 to the power of 20?", preamble), prefix=preamble)):
+        print(f"planner run {run} (preamble state {'evaluated' if run == 0 else 'reused'}): {result}")
@@ -0,0 +1,811 @@
+"""
+Optional local model server.
+
+Heavy models (summarization, vision, Hugging Face text generation) can run in
+one separate process per model family instead of inside every API worker, so
+workers stop competing for the GIL and each load the weights only once between
+them. Each family process listens on a Unix socket, queues requests per task,
+batches them dynamically across all connected workers and answers health
+checks; a supervisor restarts it if it dies or stops answering.
+
+Routing is opt-in: list the families in MODEL_SERVER_FAMILIES (e.g.
+"vision,summarization,text_generation") and the tools send those requests to the
+server through ``remote_model(family)``, starting it on first use unless
+MODEL_SERVER_AUTOSTART=0. Unlisted families keep running in-process. Run the
+servers as their own service with ``python -m mic.model_server``.
+
+Wire format: a 4-byte big-endian length followed by a JSON document. NumPy
+arrays and bytes of at least SHARED_MEMORY_THRESHOLD bytes are not serialized at
+all: the client places them in a shared-memory segment and sends its name, and
+the server maps the segment as an array without copying. Large results travel
+the same way back; the client unlinks those segments as soon as it has mapped
+them, and the server removes any it left behind once the client sends its next
+request or disconnects.
+"""
+import argparse
+import base64
+import importlib
+import json
+import logging
+import mmap
+import os
+import queue
+import resource
+import secrets
+import signal
+import socket
+import socketserver
+import struct
+import subprocess  # nosec B404
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import _posixshmem
+    import fcntl
+except ImportError:  # Windows
+    _posixshmem = fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MODEL_SERVER_AVAILABLE = hasattr(socket, "AF_UNIX") and fcntl is not None
+MODEL_SERVER_FAMILIES = {family.strip() for family in os.getenv("MODEL_SERVER_FAMILIES", "").split(",") if family.strip()}
+MODEL_SERVER_SOCKET_DIR = os.getenv("MODEL_SERVER_SOCKET_DIR", os.path.join(tempfile.gettempdir(), "mic-model-server"))
+MODEL_SERVER_AUTOSTART = os.getenv("MODEL_SERVER_AUTOSTART", "1") == "1"
+MODEL_SERVER_MAX_BATCH = int(os.getenv("MODEL_SERVER_MAX_BATCH", 16))
+MODEL_SERVER_BATCH_WAIT_MS = float(os.getenv("MODEL_SERVER_BATCH_WAIT_MS", 5))
+MODEL_SERVER_MAX_QUEUE = int(os.getenv("MODEL_SERVER_MAX_QUEUE", 512))
+MODEL_SERVER_TIMEOUT = float(os.getenv("MODEL_SERVER_TIMEOUT", 300))
+MODEL_SERVER_START_TIMEOUT = float(os.getenv("MODEL_SERVER_START_TIMEOUT", 30))
+MODEL_SERVER_HEALTH_INTERVAL = float(os.getenv("MODEL_SERVER_HEALTH_INTERVAL", 10))
+# Missed health checks in a row before a family process is killed and restarted.
+MODEL_SERVER_HEALTH_FAILURES = 3
+SHARED_MEMORY_THRESHOLD = 64 * 1024
+_HEADER = struct.Struct(">I")
+
+
+class ModelServerError(RuntimeError):
+    """A request failed inside the model server."""
+
+
+class ModelServerUnavailable(ModelServerError):
+    """The model server could not be reached or started."""
+
+
+class ModelServerBusy(ModelServerError):
+    """The task's request queue is full; retry later."""
+
+
+class ModelTask:
+    """
+    A task served by a family process. ``run_batch`` maps a list of request items
+    (dicts) to one result per item and is called with dynamically formed batches;
+    ``stream``, if given, maps one item to an iterator of events.
+    """
+    __slots__ = ("run_batch", "stream")
+
+    def __init__(self, run_batch: Optional[Callable[[List[Dict[str, Any]]], List[Any]]] = None,
+                 stream: Optional[Callable[[Dict[str, Any]], Iterator[Any]]] = None):
+        self.run_batch = run_batch
+        self.stream = stream
+
+
+# Family name -> "module:factory"; the factory runs once inside the family process
+# and returns {task name: ModelTask}.
+MODEL_FAMILIES: Dict[str, str] = {
+    "diagnostics": "mic.model_server:diagnostic_tasks",
+    "summarization": "mic.model_server:summarization_tasks",
+    "text_generation": "mic.model_server:text_generation_tasks",
+    "vision": "mic.tools.vision_inference_service:model_server_tasks",
+}
+
+
+def register_family(family: str, factory_path: str) -> None:
+    """Adds a model family served from ``factory_path`` ("package.module:function")."""
+    MODEL_FAMILIES[family] = factory_path
+
+
+def socket_path(family: str, socket_dir: str = MODEL_SERVER_SOCKET_DIR) -> str:
+    return os.path.join(socket_dir, f"{family}.sock")
+
+
+# -- framing and payload encoding ----------------------------------------------------
+
+def _send(connection: socket.socket, message: Dict[str, Any]) -> None:
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    connection.sendall(_HEADER.pack(len(body)) + body)
+
+
+def _receive_exactly(connection: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = connection.recv_into(view[received:])
+        if not count:
+            raise ConnectionError("Connection closed by peer.")
+        received += count
+    return bytes(buffer)
+
+
+def _receive(connection: socket.socket) -> Dict[str, Any]:
+    (size,) = _HEADER.unpack(_receive_exactly(connection, _HEADER.size))
+    return json.loads(_receive_exactly(connection, size))
+
+
+class _ResponseSegment:
+    """
+    A shared-memory segment holding a large result on its way to the client. Created directly
+    rather than through SharedMemory, like the mappings of ``_attach``: the client unlinks it,
+    so this process's resource tracker must not claim it.
+    """
+
+    def __init__(self, size: int):
+        self.name = "psm_" + secrets.token_hex(8)
+        descriptor = _posixshmem.shm_open("/" + self.name, os.O_CREAT | os.O_EXCL | os.O_RDWR, mode=0o600)
+        try:
+            os.ftruncate(descriptor, size)
+            self.buf = mmap.mmap(descriptor, size)
+        finally:
+            os.close(descriptor)
+
+    def close(self) -> None:
+        self.buf.close()
+
+    def unlink(self) -> None:
+        _posixshmem.shm_unlink("/" + self.name)
+
+
+def _encode(value: Any, segments: List[Any], new_segment: Optional[Callable[[int], Any]] = None) -> Any:
+    """
+    Makes ``value`` JSON-ready; large arrays/bytes go into new shared-memory segments appended to
+    ``segments``, made by ``new_segment(size)`` (a SharedMemory by default).
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        encoded = _encode(np.frombuffer(value, dtype=np.uint8), segments, new_segment)
+        encoded["bytes"] = True
+        return encoded
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        if array.nbytes >= SHARED_MEMORY_THRESHOLD:
+            segment = new_segment(array.nbytes) if new_segment else SharedMemory(create=True, size=array.nbytes)
+            segments.append(segment)
+            np.ndarray(array.shape, array.dtype, buffer=segment.buf)[...] = array
+            return {"__shm__": segment.name, "dtype": array.dtype.str, "shape": list(array.shape)}
+        return {"__array__": base64.b64encode(array.tobytes()).decode("ascii"), "dtype": array.dtype.str, "shape": list(array.shape)}
+    if isinstance(value, dict):
+        return {key: _encode(item, segments, new_segment) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item, segments, new_segment) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _attach(name: str, size: int) -> mmap.mmap:
+    # Mapped directly rather than through SharedMemory so this process's resource
+    # tracker never claims (and later unlinks) a segment the client owns.
+    descriptor = _posixshmem.shm_open("/" + name, os.O_RDWR, mode=0o600)
+    try:
+        return mmap.mmap(descriptor, size)
+    finally:
+        os.close(descriptor)
+
+
+def _decode(value: Any, segments: List[Any], unlink: bool = False) -> Any:
+    """
+    Inverse of ``_encode``; shared-memory arrays are mapped in place (the mappings are appended to
+    ``segments``). With ``unlink`` the segments were handed over with a response and are unlinked
+    once mapped; the mappings keep their data until they are closed.
+    """
+    if isinstance(value, dict):
+        if "__shm__" in value:
+            dtype, shape = np.dtype(value["dtype"]), tuple(value["shape"])
+            segment = _attach(value["__shm__"], max(1, int(np.prod(shape)) * dtype.itemsize))
+            segments.append(segment)
+            if unlink:
+                try:
+                    _posixshmem.shm_unlink("/" + value["__shm__"])
+                except FileNotFoundError:
+                    pass
+            array = np.ndarray(shape, dtype, buffer=segment)
+            return array.data if value.get("bytes") else array
+        if "__array__" in value:
+            array = np.frombuffer(base64.b64decode(value["__array__"]), dtype=np.dtype(value["dtype"])).reshape(value["shape"])
+            return array.tobytes() if value.get("bytes") else array
+        return {key: _decode(item, segments, unlink) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item, segments, unlink) for item in value]
+    return value
+
+
+def _release(segments: List[Any], unlink: bool = False) -> None:
+    for segment in segments:
+        try:
+            segment.close()
+        except BufferError:
+            pass  # a view is still referenced; the mapping goes away with it
+        if unlink:
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+
+
+# -- server side ---------------------------------------------------------------------
+
+class _TaskQueue:
+    """Bounded request queue of one task, drained in dynamically sized batches by a dedicated thread."""
+
+    def __init__(self, name: str, run_batch: Callable[[List[Any]], List[Any]], max_batch_size: int, max_wait_ms: float, max_queue: int):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = self.items = self.errors = 0
+        self._queue: "queue.Queue[Tuple[Any, Future]]" = queue.Queue(maxsize=max_queue)
+        threading.Thread(target=self._loop, name=f"model-server-{name}", daemon=True).start()
+
+    def submit(self, item: Any) -> Future:
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((item, future))
+        except queue.Full:
+            future.set_exception(ModelServerBusy("Model server queue is full."))
+        return future
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _loop(self) -> None:
+        while True:
+            pending = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    pending.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self.batches += 1
+            self.items += len(pending)
+            try:
+                results = self.run_batch([item for item, _ in pending])
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Model server batch of {len(pending)} failed: {e}")
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(pending, results):
+                future.set_result(result)
+
+
+class _ConnectionHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        # Segments of the results sent on this connection. The client unlinks each one it maps;
+        # by its next request it has read the whole response, so any left (e.g. after an error
+        # part-way through a batch) are removed then, or when it disconnects mid-stream.
+        handed_over: List[_ResponseSegment] = []
+        try:
+            while True:
+                try:
+                    request = _receive(self.request)
+                except (ConnectionError, OSError, struct.error, ValueError):
+                    return
+                _release(handed_over, unlink=True)
+                handed_over.clear()
+                self.server.dispatch(self.request, request, handed_over)
+        finally:
+            _release(handed_over, unlink=True)
+
+
+class ModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """One model family served on a Unix socket; one connection thread per client connection."""
+    daemon_threads = True
+
+    def __init__(self, family: str, path: str, max_batch_size: int = MODEL_SERVER_MAX_BATCH,
+                 max_wait_ms: float = MODEL_SERVER_BATCH_WAIT_MS, max_queue: int = MODEL_SERVER_MAX_QUEUE):
+        if family not in MODEL_FAMILIES:
+            raise ValueError(f"Unknown model family '{family}'.")
+        self.family = family
+        self.max_batch_size, self.max_wait_ms, self.max_queue = max_batch_size, max_wait_ms, max_queue
+        self.started = time.time()
+        self._tasks: Optional[Dict[str, ModelTask]] = None
+        self._queues: Dict[str, _TaskQueue] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            os.remove(path)  # stale socket from a previous run
+        super().__init__(path, _ConnectionHandler)
+        os.chmod(path, 0o600)
+
+    def tasks(self) -> Dict[str, ModelTask]:
+        with self._lock:
+            if self._tasks is None:
+                module_name, function = MODEL_FAMILIES[self.family].split(":")
+                start = time.perf_counter()
+                self._tasks = getattr(importlib.import_module(module_name), function)()
+                logger.info(f"Model family '{self.family}' initialized in {time.perf_counter() - start:.1f}s")
+            return self._tasks
+
+    def _queue(self, task: str) -> _TaskQueue:
+        with self._lock:
+            if task not in self._queues:
+                self._queues[task] = _TaskQueue(task, self._tasks[task].run_batch, self.max_batch_size, self.max_wait_ms, self.max_queue)
+            return self._queues[task]
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok", "family": self.family, "pid": os.getpid(),
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1),
+            "tasks_loaded": self._tasks is not None,
+            "queues": {task: {"queued": queue.depth(), "batches": queue.batches, "items": queue.items, "errors": queue.errors}
+                       for task, queue in self._queues.items()},
+        }
+
+    def dispatch(self, connection: socket.socket, request: Dict[str, Any],
+                 handed_over: Optional[List[_ResponseSegment]] = None) -> None:
+        """Answers one request; shared-memory segments of the results are appended to ``handed_over``."""
+        handed_over = [] if handed_over is None else handed_over
+        operation = request.get("op")
+        if operation == "health":
+            _send(connection, self.health())
+            return
+        segments: List[mmap.mmap] = []
+        try:
+            tasks = self.tasks()
+            task = tasks.get(request.get("task"))
+            if task is None:
+                raise ValueError(f"Unknown task '{request.get('task')}' for model family '{self.family}'.")
+            if operation == "run" and task.run_batch:
+                futures = [self._queue(request["task"]).submit(item) for item in _decode(request.get("items", []), segments)]
+                results = []
+                for future in futures:
+                    try:
+                        results.append({"result": _encode(future.result(), handed_over, _ResponseSegment)})
+                    except ModelServerBusy as e:
+                        results.append({"error": str(e), "busy": True})
+                    except Exception as e:
+                        results.append({"error": f"{type(e).__name__}: {e}"})
+                _send(connection, {"results": results})
+            elif operation == "stream" and task.stream:
+                for event in task.stream(_decode(request.get("item", {}), segments)):
+                    _send(connection, {"event": _encode(event, handed_over, _ResponseSegment)})
+                _send(connection, {"done": True})
+            else:
+                raise ValueError(f"Task '{request.get('task')}' does not support '{operation}'.")
+        except (ConnectionError, BrokenPipeError):
+            raise
+        except Exception as e:
+            logger.error(f"Model server request failed: {e}")
+            _send(connection, {"error": f"{type(e).__name__}: {e}"})
+        finally:
+            _release(segments)
+
+
+def serve(family: str, path: str) -> None:
+    """Entry point of a family process."""
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s [model-server:{family}] %(levelname)s %(message)s")
+    server = ModelServer(family, path)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    logger.info(f"Serving model family '{family}' on {path} (pid {os.getpid()})")
+    try:
+        server.serve_forever(poll_interval=0.5)
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class ModelServerSupervisor:
+    """
+    Starts one process per family and keeps it healthy: a process that exits, or
+    misses MODEL_SERVER_HEALTH_FAILURES health checks in a row, is killed and
+    started again, with exponential backoff when it keeps crashing.
+    """
+
+    def __init__(self, families: List[str], socket_dir: str = MODEL_SERVER_SOCKET_DIR,
+                 health_interval: float = MODEL_SERVER_HEALTH_INTERVAL):
+        unknown = [family for family in families if family not in MODEL_FAMILIES]
+        if unknown:
+            raise ValueError(f"Unknown model families: {', '.join(unknown)}")
+        self.families = list(families)
+        self.socket_dir = socket_dir
+        self.health_interval = health_interval
+        self.restarts = {family: 0 for family in families}
+        self._processes: Dict[str, Any] = {}
+        self._failures = {family: 0 for family in families}
+        self._backoff = {family: 1.0 for family in families}
+        self._started_at: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._context = get_context("spawn")
+
+    def _start(self, family: str) -> None:
+        process = self._context.Process(target=serve, args=(family, socket_path(family, self.socket_dir)),
+                                        name=f"model-server-{family}", daemon=False)
+        process.start()
+        self._processes[family] = process
+        self._started_at[family] = time.monotonic()
+        self._failures[family] = 0
+
+    def _restart(self, family: str, reason: str) -> None:
+        process = self._processes[family]
+        logger.warning(f"Restarting model family '{family}' ({reason}).")
+        if process.is_alive():
+            process.kill()
+        process.join(timeout=5)
+        # Back off when the process dies soon after starting (e.g. a model that cannot load).
+        quick_failure = time.monotonic() - self._started_at[family] < 60
+        self._backoff[family] = min(60.0, self._backoff[family] * 2) if quick_failure else 1.0
+        self._stop.wait(self._backoff[family] if quick_failure else 0)
+        self.restarts[family] += 1
+        if not self._stop.is_set():
+            self._start(family)
+
+    def start(self) -> "ModelServerSupervisor":
+        os.makedirs(self.socket_dir, mode=0o700, exist_ok=True)
+        for family in self.families:
+            self._start(family)
+        threading.Thread(target=self._monitor, name="model-server-supervisor", daemon=True).start()
+        return self
+
+    def check(self) -> None:
+        """One round of health checks (the monitor thread calls this every ``health_interval`` seconds)."""
+        for family in self.families:
+            process = self._processes[family]
+            if not process.is_alive():
+                self._restart(family, f"exited with code {process.exitcode}")
+                continue
+            try:
+                ModelServerClient(family, self.socket_dir, autostart=False).health(timeout=2.0)
+                self._failures[family] = 0
+            except (ModelServerError, OSError):
+                if time.monotonic() - self._started_at[family] < MODEL_SERVER_START_TIMEOUT:
+                    continue  # still starting up
+                self._failures[family] += 1
+                if self._failures[family] >= MODEL_SERVER_HEALTH_FAILURES:
+                    self._restart(family, f"{self._failures[family]} failed health checks")
+
+    def _monitor(self) -> None:
+        while not self._stop.wait(self.health_interval):
+            self.check()
+
+    def wait_until_ready(self, timeout: float = MODEL_SERVER_START_TIMEOUT) -> None:
+        for family in self.families:
+            _wait_for_server(family, self.socket_dir, timeout)
+
+    def status(self) -> Dict[str, Any]:
+        return {family: {"pid": process.pid, "alive": process.is_alive(), "restarts": self.restarts[family]}
+                for family, process in self._processes.items()}
+
+    def stop(self) -> None:
+        self._stop.set()
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes.values():
+            process.join(timeout=10)
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+
+# -- client side ---------------------------------------------------------------------
+
+def _ping(family: str, socket_dir: str, timeout: float = 1.0) -> bool:
+    try:
+        ModelServerClient(family, socket_dir, autostart=False).health(timeout=timeout)
+        return True
+    except (ModelServerError, OSError):
+        return False
+
+
+def _wait_for_server(family: str, socket_dir: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if _ping(family, socket_dir):
+            return
+        time.sleep(0.1)
+    raise ModelServerUnavailable(f"Model server for '{family}' did not become ready within {timeout:.0f}s.")
+
+
+def ensure_server(family: str, socket_dir: str = MODEL_SERVER_SOCKET_DIR, timeout: float = MODEL_SERVER_START_TIMEOUT) -> None:
+    """
+    Makes sure the family's server is up, starting a detached supervisor for it if
+    needed. A lock file makes concurrent API workers start it only once.
+    """
+    if _ping(family, socket_dir):
+        return
+    os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+    with open(socket_path(family, socket_dir) + ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            if _ping(family, socket_dir):
+                return
+            logger.info(f"Starting model server for family '{family}'.")
+            environment = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+            with open(os.path.join(socket_dir, f"{family}.log"), "ab") as log:
+                subprocess.Popen([sys.executable, "-m", "mic.model_server", "--families", family, "--socket-dir", socket_dir],  # nosec B603
+                                 env=environment, stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True)
+            _wait_for_server(family, socket_dir, timeout)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class ModelServerClient:
+    """
+    Thin client for one model family. Each thread keeps its own connection;
+    a broken connection is re-established (restarting the server if autostart is
+    on) and the request retried once.
+    """
+
+    def __init__(self, family: str, socket_dir: str = MODEL_SERVER_SOCKET_DIR, timeout: float = MODEL_SERVER_TIMEOUT,
+                 autostart: bool = MODEL_SERVER_AUTOSTART):
+        if not MODEL_SERVER_AVAILABLE:
+            raise ModelServerUnavailable("The model server needs Unix domain sockets.")
+        self.family = family
+        self.socket_dir = socket_dir
+        self.timeout = timeout
+        self.autostart = autostart
+        self._local = threading.local()
+
+    def _connect(self, timeout: float) -> socket.socket:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                connection.settimeout(timeout)
+                connection.connect(socket_path(self.family, self.socket_dir))
+            except OSError as e:
+                connection.close()
+                raise ModelServerUnavailable(f"Cannot reach the '{self.family}' model server: {e}") from e
+            self._local.connection = connection
+        connection.settimeout(timeout)
+        return connection
+
+    def _drop_connection(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            connection.close()
+
+    def _exchange(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        for attempt in (0, 1):
+            try:
+                connection = self._connect(timeout)
+                _send(connection, message)
+                return _receive(connection)
+            except (ModelServerUnavailable, ConnectionError, OSError) as e:
+                # The cached connection may predate a server restart: reconnect once.
+                self._drop_connection()
+                if attempt:
+                    raise ModelServerUnavailable(f"'{self.family}' model server request failed: {e}") from e
+                if self.autostart:
+                    ensure_server(self.family, self.socket_dir)
+        raise AssertionError("unreachable")
+
+    def health(self, timeout: float = 5.0) -> Dict[str, Any]:
+        return self._exchange({"op": "health"}, timeout)
+
+    def run(self, task: str, items: List[Dict[str, Any]]) -> List[Any]:
+        """Runs ``task`` on several items (batched server-side with everyone else's); raises on the first failed item."""
+        segments: List[SharedMemory] = []
+        try:
+            response = self._exchange({"op": "run", "task": task, "items": _encode(items, segments)}, self.timeout)
+        finally:
+            _release(segments, unlink=True)
+        if "error" in response:
+            raise ModelServerError(response["error"])
+        results = []
+        for entry in response["results"]:
+            if "error" in entry:
+                raise (ModelServerBusy if entry.get("busy") else ModelServerError)(entry["error"])
+            results.append(_decode(entry["result"], [], unlink=True))
+        return results
+
+    def run_one(self, task: str, **item: Any) -> Any:
+        return self.run(task, [item])[0]
+
+    def stream(self, task: str, **item: Any) -> Iterator[Any]:
+        """Yields the events of a streaming task; abandoning the iterator closes the connection."""
+        segments: List[SharedMemory] = []
+        finished = False
+        try:
+            connection = self._connect(self.timeout)
+            _send(connection, {"op": "stream", "task": task, "item": _encode(item, segments)})
+            while True:
+                message = _receive(connection)
+                if "error" in message:
+                    finished = True
+                    raise ModelServerError(message["error"])
+                if message.get("done"):
+                    finished = True
+                    return
+                yield _decode(message["event"], [], unlink=True)
+        except (ConnectionError, OSError) as e:
+            raise ModelServerUnavailable(f"'{self.family}' model server stream failed: {e}") from e
+        finally:
+            _release(segments, unlink=True)
+            if not finished:
+                self._drop_connection()
+
+
+_CLIENTS: Dict[str, ModelServerClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def remote_model(family: str) -> Optional[ModelServerClient]:
+    """The client for ``family`` when MODEL_SERVER_FAMILIES routes it to the model server, else None (run in-process)."""
+    if family not in MODEL_SERVER_FAMILIES or not MODEL_SERVER_AVAILABLE:
+        return None
+    with _CLIENTS_LOCK:
+        if family not in _CLIENTS:
+            _CLIENTS[family] = ModelServerClient(family)
+        return _CLIENTS[family]
+
+
+# -- built-in families -----------------------------------------------------------------
+
+def diagnostic_tasks() -> Dict[str, ModelTask]:
+    """Model-free tasks for health checks, tests and IPC benchmarks."""
+    def checksum(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [{"shape": list(np.shape(item["array"])), "sum": float(np.sum(item["array"], dtype=np.float64)),
+                 "batch_size": len(items), "pid": os.getpid()} for item in items]
+
+    def count(item: Dict[str, Any]) -> Iterator[int]:
+        return iter(range(int(item.get("n", 3))))
+
+    def echo(items: List[Dict[str, Any]]) -> List[Any]:
+        return [item["array"] for item in items]
+
+    def repeat(item: Dict[str, Any]) -> Iterator[Any]:
+        return (item["array"] for _ in range(int(item.get("n", 3))))
+
+    return {"checksum": ModelTask(run_batch=checksum), "count": ModelTask(stream=count),
+            "echo": ModelTask(run_batch=echo, stream=repeat)}
+
+
+def summarization_tasks() -> Dict[str, ModelTask]:
+    from transformers import pipeline
+
+    pipelines: Dict[Tuple[str, int], Any] = {}
+
+    def summarize(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # One pipeline call per distinct (model, device, lengths) in the batch.
+        groups: Dict[Tuple, List[int]] = {}
+        for index, item in enumerate(items):
+            key = (item.get("model", "t5-small"), int(item.get("device", -1)), int(item.get("max_length", 150)), int(item.get("min_length", 30)))
+            groups.setdefault(key, []).append(index)
+        results: List[Any] = [None] * len(items)
+        for (model, device, max_length, min_length), indices in groups.items():
+            if (model, device) not in pipelines:
+                pipelines[(model, device)] = pipeline("summarization", model=model, device=device)
+            outputs = pipelines[(model, device)]([items[i]["text"] for i in indices], max_length=max_length,
+                                                 min_length=min_length, do_sample=False, batch_size=len(indices))
+            for index, output in zip(indices, outputs):
+                results[index] = {"summary_text": output["summary_text"]}
+        return results
+
+    return {"summarize": ModelTask(run_batch=summarize)}
+
+
+def text_generation_tasks() -> Dict[str, ModelTask]:
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer, TextIteratorStreamer, pipeline
+
+    from mic.base_llm import PrefixStateCache
+    from mic.hf_llm import generate_reply
+
+    models: Dict[Tuple[str, Optional[str]], Any] = {}
+    prefix_states: Dict[Tuple[str, Optional[str]], PrefixStateCache] = {}
+    lock = threading.Lock()
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    def load(model_name: str, revision: Optional[str]) -> Any:
+        with lock:
+            if (model_name, revision) not in models:
+                model = AutoModelForCausalLM.from_pretrained(model_name, torch_dtype="auto", trust_remote_code=True,  # nosec B615
+                                                             revision=revision).to(device)
+                tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True, revision=revision)  # nosec B615
+                models[(model_name, revision)] = pipeline("text-generation", model=model, tokenizer=tokenizer)
+                prefix_states[(model_name, revision)] = PrefixStateCache()
+            return models[(model_name, revision)]
+
+    def generate(items: List[Dict[str, Any]]) -> List[str]:
+        groups: Dict[str, List[int]] = {}
+        results: List[Any] = [None] * len(items)
+        for index, item in enumerate(items):
+            if (item.get("prefix") and item["prompt"].startswith(item["prefix"])) or item.get("json_schema") is not None:
+                # Prompts with a shared prefix (the HRM planner preamble) continue from its cached key-values;
+                # schema-constrained ones (the planner's JSON reply) get their own logits processor.
+                model_key = (item.get("model", "distilgpt2"), item.get("revision"))
+                generator = load(*model_key)
+                results[index] = generate_reply(generator.model, generator.tokenizer, item["prompt"], item.get("generation", {}),
+                                                prefix=item.get("prefix"), states=prefix_states[model_key],
+                                                json_schema=item.get("json_schema"))
+                continue
+            key = json.dumps([item.get("model", "distilgpt2"), item.get("revision"), item.get("generation", {})], sort_keys=True)
+            groups.setdefault(key, []).append(index)
+        for key, indices in groups.items():
+            model_name, revision, generation = json.loads(key)
+            generator = load(model_name, revision)
+            conversations = [[{"role": "user", "content": items[i]["prompt"]}] for i in indices]
+            outputs = generator(conversations, return_full_text=False, batch_size=len(indices), **generation)
+            for index, output in zip(indices, outputs):
+                results[index] = output[0]["generated_text"]
+        return results
+
+    def stream(item: Dict[str, Any]) -> Iterator[str]:
+        generator = load(item.get("model", "distilgpt2"), item.get("revision"))
+        tokenizer = generator.tokenizer
+        input_ids = tokenizer.apply_chat_template([{"role": "user", "content": item["prompt"]}], return_tensors="pt").to(device)
+        streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        arguments = dict(input_ids=input_ids, streamer=streamer, pad_token_id=tokenizer.eos_token_id, **item.get("generation", {}))
+        threading.Thread(target=generator.model.generate, kwargs=arguments, daemon=True).start()
+        for text in streamer:
+            if text:
+                yield text
+
+    return {"generate": ModelTask(run_batch=generate, stream=stream)}
+
+
+def benchmark(socket_dir: str) -> None:
+    """IPC cost of a decoded 1333x1000 RGB image: shared memory vs. inline base64, and batched concurrent throughput."""
+    global SHARED_MEMORY_THRESHOLD
+    from concurrent.futures import ThreadPoolExecutor
+
+    supervisor = ModelServerSupervisor(["diagnostics"], socket_dir).start()
+    try:
+        supervisor.wait_until_ready()
+        client = ModelServerClient("diagnostics", socket_dir, autostart=False)
+        image = np.random.default_rng(0).integers(0, 256, (1000, 1333, 3), dtype=np.uint8)
+        for label, threshold in (("shared memory", 64 * 1024), ("inline base64", 1 << 62)):
+            SHARED_MEMORY_THRESHOLD = threshold
+            client.run_one("checksum", array=image)
+            start = time.perf_counter()
+            for _ in range(50):
+                client.run_one("checksum", array=image)
+            print(f"{label:>14}: {(time.perf_counter() - start) / 50 * 1000:7.2f} ms per 4 MB image round trip")
+        SHARED_MEMORY_THRESHOLD = 64 * 1024
+        with ThreadPoolExecutor(16) as pool:
+            start = time.perf_counter()
+            results = list(pool.map(lambda _: client.run_one("checksum", array=image), range(400)))
+            elapsed = time.perf_counter() - start
+        print(f"16 concurrent callers: {400 / elapsed:.0f} images/s, mean server batch {np.mean([r['batch_size'] for r in results]):.1f}")
+        print(f"health: {client.health()}")
+    finally:
+        supervisor.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Runs the local model server: one supervised process per model family.")
+    parser.add_argument("--families", default=",".join(sorted(MODEL_SERVER_FAMILIES)) or "summarization,text_generation,vision",
+                        help="Comma-separated model families to serve.")
+    parser.add_argument("--socket-dir", default=MODEL_SERVER_SOCKET_DIR)
+    parser.add_argument("--benchmark", action="store_true", help="Measure IPC overhead with the diagnostics family and exit.")
+    arguments = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [model-server] %(levelname)s %(message)s")
+    if arguments.benchmark:
+        benchmark(arguments.socket_dir)
+        return
+    supervisor = ModelServerSupervisor([family.strip() for family in arguments.families.split(",") if family.strip()],
+                                       arguments.socket_dir).start()
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    try:
+        stopped.wait()
+    finally:
+        supervisor.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -309,6 +309,43 @@ class Benefit(Base):
 
     employee = relationship("Employee", back_populates="benefits")
 
+from sqlalchemy import DateTime, Index
+
+class CalendarEvent(Base):
+    __tablename__ = 'calendar_events'
+    __table_args__ = (
+        # Range scans for listing/free-busy, and (start, id) keyset pagination.
+        Index('ix_calendar_events_start_end', 'start_datetime', 'end_datetime'),
+        Index('ix_calendar_events_start_id', 'start_datetime', 'event_id'),
+    )
+
+    event_id = Column(String, primary_key=True, index=True)
+    summary = Column(String, nullable=False)
+    description = Column(String)
+    location = Column(String)
+    start_datetime = Column(DateTime, nullable=False)
+    end_datetime = Column(DateTime, nullable=False)
+    attendees = Column(String) # Stored as JSON string
+    created_at = Column(String, nullable=False)
+
+    attendee_entries = relationship("CalendarEventAttendee", back_populates="event", cascade="all, delete-orphan")
+
+class CalendarEventAttendee(Base):
+    __tablename__ = 'calendar_event_attendees'
+    __table_args__ = (
+        # Per-attendee time range lookups for free/busy and conflict detection.
+        Index('ix_calendar_event_attendees_attendee_start', 'attendee', 'start_datetime', 'end_datetime'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_id = Column(String, ForeignKey('calendar_events.event_id'), nullable=False)
+    attendee = Column(String, nullable=False)
+    # Denormalized from the event so the composite index can answer range queries on its own.
+    start_datetime = Column(DateTime, nullable=False)
+    end_datetime = Column(DateTime, nullable=False)
+
+    event = relationship("CalendarEvent", back_populates="attendee_entries")
+
 
 # --- Hugging Face Models ---
 
@@ -19,6 +19,8 @@ from mic.models import User
 from mic.auth import register_user, verify_user, get_user_status, update_user_tier
 from mic.tool_manager import tool_registry, load_tools_dynamically
 from mic.core import process_input
+from mic.dispatcher import IntentDispatcher
+from mic.conversation import ConversationManager
 from mic.config import (
     SUBSCRIPTION_TIERS,
     EXCHANGE_RATE_API_KEY,
@@ -203,11 +205,25 @@ async def sse_formatter(response_stream: AsyncGenerator[Dict[str, Any], None]) -
             error_event = {"type": "error", "content": f"Failed to serialize event: {e}"}
             yield f"data: {json.dumps(error_event)}\n\n"
 
+# Explicit tool commands ("analyze data: ...") skip the planner. The registry is filled at startup,
+# and the dispatcher shares the same dict.
+intent_dispatcher = IntentDispatcher(tool_registry)
+
+async def dispatch_command(history: List[Dict[str, str]], intent: str, args_str: str,
+                           username: str) -> AsyncGenerator[Dict[str, Any], None]:
+    # adispatch keeps the event loop free, so concurrent requests' tools run side by side.
+    result = await intent_dispatcher.adispatch(ConversationManager(history), intent, args_str, current_user=username)
+    yield {"type": "tool_result", "tool_name": intent, "content": str(result)}
+
 @app.post("/api/prompt")
 async def api_prompt(request: PromptRequest, current_user: User = Depends(get_current_user)):
     logger.info(f"API prompt received for user '{current_user.username}' with input: {request.history[-1].get('content', 'N/A')}")
     try:
-        response_stream = process_input(request.history, current_user.username)
+        intent, args_str = intent_dispatcher.detect_intent(request.history[-1].get("content", ""))
+        if intent != "conversational_ai" and intent in tool_registry:
+            response_stream = dispatch_command(request.history, intent, args_str, current_user.username)
+        else:
+            response_stream = process_input(request.history, current_user.username)
         # This part needs careful handling for streaming responses
         async def stream_wrapper():
             try:
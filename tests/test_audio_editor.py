@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+from scipy.signal import resample_poly
+
+# Import the tool modules directly
+import mic.tools.audio_edit_graph as audio_edit_graph
+import mic.tools.audio_editor as audio_editor_tool
+
+class TestAudioEditGraph(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.first = os.path.join(self.root, "first.wav")
+        self.second = os.path.join(self.root, "second.wav")
+        audio_edit_graph.write_test_tone(self.first, 2.0, frame_rate=8000, channels=2, frequency=300.0)
+        audio_edit_graph.write_test_tone(self.second, 1.0, frame_rate=16000, channels=1, frequency=500.0)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _render(self, clip, chunk_frames):
+        return np.concatenate(list(clip.chunks(chunk_frames=chunk_frames)))
+
+    def test_streamed_edits_match_whole_array_edits(self):
+        first = audio_edit_graph.open_audio(self.first)
+        second = audio_edit_graph.open_audio(self.second)
+        edit = (first[250:-250].apply_gain(-6).reverse() + second).fade_in(100)
+        self.assertEqual((edit.frame_rate, edit.channels), (8000, 2))
+
+        a = first.read()[2000:-2000][::-1] * audio_edit_graph.db_to_gain(-6)
+        b = resample_poly(second.read(), 1, 2, axis=0).repeat(2, axis=1)
+        expected = np.concatenate([a, b])
+        silent = audio_edit_graph.db_to_gain(-120.0)
+        expected[:800] *= (silent + (1 - silent) * np.arange(800) / 800)[:, None]
+        # Block size must not change the result, including across resampling and reversal.
+        for chunk_frames in (317, 4096):
+            np.testing.assert_allclose(self._render(edit, chunk_frames), expected, atol=1e-5)
+
+    def test_edit_tool_renders_once_and_can_overwrite_its_source(self):
+        result = json.loads(audio_editor_tool.EditAudioTool().execute(
+            clips=[{"file_path": self.first, "start_ms": 500, "end_ms": 1500, "fade_out_ms": 200},
+                   {"file_path": self.second, "gain_db": -3}],
+            output_path=self.first, channels=1, fade_in_ms=50))
+        self.assertEqual(result["duration_ms"], 2000)
+        info = json.loads(audio_editor_tool.GetAudioInfoTool().execute(file_path=self.first))
+        self.assertEqual((info["duration_ms"], info["channels"], info["frame_rate_hz"]), (2000, 1, 8000))
+        self.assertLess(info["max_amplitude"], 32768)
+
+        graph = json.loads(audio_editor_tool.EditAudioTool().execute(
+            clips=[{"file_path": self.second, "reverse": True}], output_path=self.first, dry_run=True))
+        self.assertEqual(graph["graph"]["node"], "Reverse")
+
+    def test_negative_trim_positions_count_from_the_end(self):
+        tool = audio_editor_tool.EditAudioTool()
+        result = json.loads(tool.execute(clips=[{"file_path": self.first, "start_ms": 100, "end_ms": -100}],
+                                         output_path=os.path.join(self.root, "trimmed.wav")))
+        self.assertEqual(result["duration_ms"], 1800)
+        graph = json.loads(tool.execute(clips=[{"file_path": self.first, "start_ms": -500}],
+                                        output_path=self.second, dry_run=True))
+        self.assertEqual(graph["duration_ms"], 500)
+        with self.assertRaises(ValueError):
+            tool.execute(clips=[{"file_path": self.first, "start_ms": 1500, "end_ms": -1000}],
+                         output_path=os.path.join(self.root, "empty.wav"))
+
+if __name__ == '__main__':
+    unittest.main()
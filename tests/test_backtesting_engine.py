@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+import pandas as pd
+
+# Import the tool module directly
+import mic.tools.backtesting_engine as backtesting_engine
+
+class TestBacktesting(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.frame = backtesting_engine.synthetic_market_frame(20, 300, seed=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_cached_load_is_memory_mapped_and_matches_source(self):
+        path = os.path.join(self.root, "prices.csv")
+        self.frame.to_csv(path, index=False)
+        cache_dir = os.path.join(self.root, "cache")
+        first = backtesting_engine.load_market_data(path, cache_dir=cache_dir, mmap=False)
+        second = backtesting_engine.load_market_data(path, cache_dir=cache_dir)
+        self.assertIsInstance(second.close, np.memmap)
+        np.testing.assert_allclose(first.close, second.close)
+        expected = self.frame.pivot(index="date", columns="symbol", values="close")
+        np.testing.assert_allclose(second.close, expected.to_numpy(), rtol=1e-9)
+        self.assertEqual(second.symbols, list(expected.columns))
+
+    def test_rolling_mean_and_buy_and_hold_returns(self):
+        data = backtesting_engine.MarketData.from_frame(self.frame)
+        expected = pd.DataFrame(data.close).rolling(10).mean().to_numpy()
+        np.testing.assert_allclose(backtesting_engine.rolling_mean(data.close, 10), expected, rtol=1e-9)
+
+        single = data.select([data.symbols[0]])
+        result = backtesting_engine.run_backtest(single, "buy_and_hold", cost_bps=0.0)
+        close = single.close[:, 0]
+        first = np.flatnonzero(~np.isnan(close))[0]
+        self.assertAlmostEqual(result.portfolio_metrics()["total_return"], close[-1] / close[first] - 1.0, places=5)
+
+    def test_optimizers_respect_constraints(self):
+        data = backtesting_engine.MarketData.from_frame(self.frame)
+        returns, symbols = backtesting_engine.complete_return_window(data, 200)
+        mu, cov = backtesting_engine.estimate_moments(returns)
+        weights = backtesting_engine.mean_variance_weights(mu, cov, risk_aversion=3.0, max_weight=0.2)
+        self.assertAlmostEqual(weights.sum(), 1.0, places=8)
+        self.assertLessEqual(weights.max(), 0.2 + 1e-9)
+        self.assertGreaterEqual(weights.min(), 0.0)
+        cvar_weights, var, cvar = backtesting_engine.min_cvar_weights(returns, alpha=0.9, max_weight=0.25)
+        self.assertAlmostEqual(cvar_weights.sum(), 1.0, places=6)
+        self.assertGreaterEqual(cvar, var)
+        equal = np.full(len(symbols), 1.0 / len(symbols))
+        risk = backtesting_engine.portfolio_risk(equal, returns, alpha=0.9)
+        self.assertLessEqual(cvar, risk["daily_cvar_90"] + 1e-9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import sys
+import os
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from mic.base_llm import BaseLLM, PrefixStateCache, shared_prefix_length
+
+class TestSharedPrefixLength(unittest.TestCase):
+    def test_shared_prefix_length(self):
+        self.assertEqual(shared_prefix_length([1, 2, 3, 4], [1, 2, 9, 4]), 2)
+        self.assertEqual(shared_prefix_length([1, 2], [1, 2, 3]), 2)
+        self.assertEqual(shared_prefix_length([5, 2], [1, 2]), 0)
+        self.assertEqual(shared_prefix_length([], [1]), 0)
+
+class TestPrefixStateCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = PrefixStateCache()
+        self.assertIsNone(cache.get("preamble"))
+        cache.put("preamble", "state")
+        self.assertEqual(cache.get("preamble"), "state")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_least_recently_used_prefix_is_evicted(self):
+        cache = PrefixStateCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "b" is now the least recently used
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        cache.put("a", 10)  # replacing an entry does not evict another
+        self.assertEqual((cache.get("a"), cache.get("c")), (10, 3))
+
+class TestBaseLLM(unittest.TestCase):
+    def test_backends_must_implement_get_response(self):
+        class StreamOnly(BaseLLM):
+            async def stream_response(self, prompt, tools=None):
+                yield {"type": "token", "content": prompt}
+        with self.assertRaises(TypeError):
+            StreamOnly()
+
+if __name__ == '__main__':
+    unittest.main()
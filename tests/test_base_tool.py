@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import asyncio
+import threading
+import time
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from mic.tools.base_tool import BaseTool, CURRENT_USER, collect_stream, is_stream
+
+class SleepyTool(BaseTool):
+    description = "Blocks for a while."
+    parameters = {"type": "object", "properties": {"seconds": {"type": "number"}}}
+
+    def execute(self, seconds: float = 0.1, **kwargs):
+        time.sleep(seconds)
+        return threading.current_thread().name
+
+class CounterTool(BaseTool):
+    description = "Increments a shared counter without locking."
+    thread_safe = False
+    parameters = {"type": "object", "properties": {}}
+    count = 0
+
+    def execute(self, **kwargs):
+        value = CounterTool.count
+        time.sleep(0.01)
+        CounterTool.count = value + 1
+        return threading.current_thread().name
+
+class NativeAsyncTool(BaseTool):
+    description = "Awaits for a while."
+    parameters = {"type": "object", "properties": {"seconds": {"type": "number"}}}
+
+    async def aexecute(self, seconds: float = 0.1, **kwargs):
+        await asyncio.sleep(seconds)
+        return "done"
+
+class StreamingTool(BaseTool):
+    description = "Yields chunks as it produces them."
+    parameters = {"type": "object", "properties": {"count": {"type": "integer"}}}
+
+    def execute(self, count: int = 3, **kwargs):
+        for i in range(count):
+            yield f"{i}:{threading.current_thread().name}:{CURRENT_USER.get()}"
+
+class TestBaseToolAsyncContract(unittest.TestCase):
+    def test_sync_tools_run_off_the_event_loop(self):
+        tool = SleepyTool("sleepy")
+        async def run():
+            start = time.perf_counter()
+            names = await asyncio.gather(*(tool.aexecute(seconds=0.2) for _ in range(8)))
+            return names, time.perf_counter() - start
+        names, elapsed = asyncio.run(run())
+        self.assertTrue(all(name.startswith("tool") for name in names))
+        self.assertLess(elapsed, 1.0)  # 1.6 s if they ran one after another
+
+    def test_tools_that_are_not_thread_safe_are_serialized(self):
+        async def run():
+            return await asyncio.gather(*(CounterTool(f"counter{i}").aexecute() for i in range(20)))
+        names = asyncio.run(run())
+        self.assertEqual(CounterTool.count, 20)  # no lost updates
+        self.assertEqual(len(set(names)), 1)
+
+    def test_async_tools_run_natively_and_get_a_blocking_execute(self):
+        tool = NativeAsyncTool("native")
+        async def run():
+            start = time.perf_counter()
+            results = await asyncio.gather(*(tool.aexecute(seconds=0.2) for _ in range(1000)))
+            return results, time.perf_counter() - start
+        results, elapsed = asyncio.run(run())
+        self.assertEqual(results, ["done"] * 1000)
+        self.assertLess(elapsed, 2.0)
+        self.assertEqual(tool.execute(seconds=0), "done")
+        # Also from synchronous code running inside an event loop.
+        async def nested():
+            return tool.execute(seconds=0)
+        self.assertEqual(asyncio.run(nested()), "done")
+
+    def test_streamed_results_are_advanced_on_the_tool_thread(self):
+        tool = StreamingTool("streaming")
+        async def run():
+            token = CURRENT_USER.set("alice")
+            try:
+                stream = await tool.aexecute(count=3)
+                chunks = tool.aiter_stream(stream)
+            finally:
+                CURRENT_USER.reset(token)
+            return [chunk async for chunk in chunks]
+        chunks = asyncio.run(run())
+        self.assertEqual([chunk.split(":")[0] for chunk in chunks], ["0", "1", "2"])
+        self.assertTrue(all(chunk.split(":")[1].startswith("tool") for chunk in chunks))
+        self.assertTrue(all(chunk.endswith(":alice") for chunk in chunks))
+        self.assertTrue(is_stream(tool.execute()))
+        self.assertFalse(is_stream(["a list is a value"]))
+        self.assertEqual(len(collect_stream(tool.execute(count=2))), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import unittest
+import sys
+import os
+import asyncio
+import json
+import shutil
+import tempfile
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+# Import the tool module directly
+import mic.tools.blockchain_integration_tool as blockchain_tool
+
+Block = blockchain_tool.Block
+BlockStore = blockchain_tool.BlockStore
+compute_merkle_root = blockchain_tool.compute_merkle_root
+compute_merkle_proof = blockchain_tool.compute_merkle_proof
+verify_merkle_proof = blockchain_tool.verify_merkle_proof
+GetTransactionProofTool = blockchain_tool.GetTransactionProofTool
+TransactOnBlockchainTool = blockchain_tool.TransactOnBlockchainTool
+MinePendingTransactionsTool = blockchain_tool.MinePendingTransactionsTool
+blockchain_instance = blockchain_tool.blockchain_instance
+
+def make_transactions(count, offset=0):
+    return [{"transaction_id": f"tx_{offset + i}", "amount": i} for i in range(count)]
+
+class TestMerkleProofs(unittest.TestCase):
+    def test_proof_for_every_position(self):
+        block = Block(1, make_transactions(7), "0")
+        for position, tx_hash in enumerate(block.tx_hashes):
+            proof = compute_merkle_proof(block.tx_hashes, position)
+            self.assertTrue(verify_merkle_proof(tx_hash, proof, block.merkle_root))
+
+    def test_proof_rejects_other_root(self):
+        block = Block(1, make_transactions(4), "0")
+        proof = block.merkle_proof(block.tx_hashes[2])
+        self.assertFalse(verify_merkle_proof(block.tx_hashes[2], proof, compute_merkle_root(block.tx_hashes[:2])))
+
+    def test_hash_is_stable_after_construction(self):
+        block = Block(1, make_transactions(3), "0")
+        self.assertEqual(block.hash, block.calculate_hash())
+
+class TestBlockStore(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.store = BlockStore(self.data_dir)
+        previous_hash = "0"
+        for height in range(5):
+            block = Block(height, make_transactions(3, offset=height * 3), previous_hash)
+            self.store.append(block)
+            previous_hash = block.hash
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.data_dir)
+
+    def test_read_by_height(self):
+        self.assertEqual(len(self.store), 5)
+        block = self.store.read_block(3)
+        self.assertEqual(block.index, 3)
+        self.assertEqual(block.hash, block.calculate_hash())
+
+    def test_transaction_index(self):
+        block = self.store.read_block(2)
+        self.assertEqual(self.store.find_transaction(block.tx_hashes[1]), (2, 1))
+        self.assertIsNone(self.store.find_transaction("0" * 64))
+
+    def test_rejects_out_of_order_append(self):
+        with self.assertRaises(ValueError):
+            self.store.append(Block(9, [], "0"))
+
+    def test_parallel_range_validation_detects_tampering(self):
+        result = blockchain_tool._validate_block_range(self.data_dir, 0, 5)
+        self.assertEqual(result["errors"], [])
+        with open(self.store.blocks_path, "r+b") as f:
+            data = f.read().replace(b'"tx_7"', b'"tx_X"')
+            f.seek(0)
+            f.write(data)
+        result = blockchain_tool._validate_block_range(self.data_dir, 0, 5)
+        self.assertTrue(any("Merkle root" in error for error in result["errors"]))
+
+class TestGetTransactionProofTool(unittest.TestCase):
+    def setUp(self):
+        self.tool = GetTransactionProofTool()
+
+    def test_proof_for_mined_transaction(self):
+        for tx in make_transactions(3, offset=100):
+            blockchain_instance.add_transaction(tx)
+        block = blockchain_instance.mine_pending_transactions()
+        result = json.loads(self.tool.execute(transaction_hash=block.tx_hashes[1]))
+        self.assertTrue(result["verified"])
+        self.assertEqual(result["block_index"], block.index)
+
+    def test_persisted_chain_is_usable_from_tool_threads(self):
+        data_dir = tempfile.mkdtemp()
+        try:
+            blockchain_instance.attach_store(data_dir)
+            async def transact_and_mine(worker):
+                # Each call runs on a tool executor thread, as it does under the async dispatcher.
+                for i in range(2):
+                    await TransactOnBlockchainTool().aexecute(transaction_type="transfer", sender=f"w{worker}",
+                                                              receiver="r", amount=i)
+                return json.loads(await MinePendingTransactionsTool().aexecute())
+            async def run():
+                reports = await asyncio.gather(*(transact_and_mine(worker) for worker in range(8)))
+                tx_hashes = [tx_hash for report in reports for tx_hash in report.get("transaction_hashes", [])]
+                proofs = await asyncio.gather(*(self.tool.aexecute(transaction_hash=tx_hash) for tx_hash in tx_hashes))
+                return tx_hashes, [json.loads(proof) for proof in proofs]
+            tx_hashes, proofs = asyncio.run(run())
+            self.assertEqual(len(set(tx_hashes)), 16)
+            self.assertTrue(all(proof["verified"] for proof in proofs))
+            self.assertTrue(blockchain_instance.validate(max_workers=1)["valid"])
+        finally:
+            blockchain_instance.store.close()
+            blockchain_instance.store = None
+            shutil.rmtree(data_dir)
+
+    def test_unknown_transaction(self):
+        result = json.loads(self.tool.execute(transaction_hash="f" * 64))
+        self.assertIn("not found", result["error"])
+
+class TestAttachStore(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        saved = (blockchain_instance.chain, blockchain_instance.store, blockchain_instance.pending_transactions)
+        self.addCleanup(setattr, blockchain_instance, "pending_transactions", saved[2])
+        self.addCleanup(setattr, blockchain_instance, "store", saved[1])
+        self.addCleanup(setattr, blockchain_instance, "chain", saved[0])
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        self.stored = self.mine_in_memory(Block(0, [], "0"), 2)
+        blockchain_instance.attach_store(self.data_dir)
+        self.detach()
+
+    def detach(self):
+        blockchain_instance.store.close()
+        blockchain_instance.store = None
+
+    def mine_in_memory(self, genesis, blocks):
+        blockchain_instance.chain, blockchain_instance.pending_transactions = [genesis], []
+        for i in range(blocks):
+            for tx in make_transactions(2, offset=1000 + 10 * i):
+                blockchain_instance.add_transaction(tx)
+            blockchain_instance.mine_pending_transactions()
+        return list(blockchain_instance.chain)
+
+    def test_blocks_that_extend_the_stored_chain_are_appended(self):
+        blockchain_instance.chain = list(self.stored)
+        blockchain_instance.add_transaction(make_transactions(1, offset=2000)[0])
+        block = blockchain_instance.mine_pending_transactions()
+        blockchain_instance.attach_store(self.data_dir)
+        self.addCleanup(self.detach)
+        self.assertEqual(len(blockchain_instance.store), 4)
+        self.assertEqual(blockchain_instance.last_block.hash, block.hash)
+        self.assertTrue(blockchain_instance.validate(max_workers=1)["valid"])
+
+    def test_a_different_in_memory_chain_is_not_dropped(self):
+        chain = self.mine_in_memory(Block(0, [], "0", timestamp="2000-01-01T00:00:00"), 1)
+        result = json.loads(blockchain_tool.PersistBlockchainTool().execute(data_dir=self.data_dir))
+        self.assertIn("error", result)
+        self.assertIsNone(blockchain_instance.store)
+        self.assertEqual([block.hash for block in blockchain_instance.chain], [block.hash for block in chain])
+        store = BlockStore(self.data_dir)
+        self.addCleanup(store.close)
+        self.assertEqual([store.read_block(i).hash for i in range(len(store))], [block.hash for block in self.stored])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import json
+from unittest import mock
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+# config.py requires these; the values are never used here.
+for name in ("GOOGLE_API_KEY", "GOOGLE_CSE_ID", "JWT_SECRET_KEY"):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("DB_TYPE", "sqlite")
+
+try:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    import mic.tools.calendar_management_tool as calendar_management_tool
+    from mic.models import CalendarEvent, CalendarEventAttendee
+except ImportError:  # mic.models needs transformers
+    calendar_management_tool = None
+
+@unittest.skipIf(calendar_management_tool is None, "the calendar tool's dependencies are not installed")
+class TestCalendarManagementTool(unittest.TestCase):
+    def setUp(self):
+        # Each test gets its own in-memory database.
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        CalendarEvent.metadata.create_all(engine, tables=[CalendarEvent.__table__, CalendarEventAttendee.__table__])
+        session = sessionmaker(bind=engine)
+        def get_db():
+            db = session()
+            try:
+                yield db
+            finally:
+                db.close()
+        patcher = mock.patch.object(calendar_management_tool, "get_db", get_db)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(engine.dispose)
+
+    def create(self, event_id, start, end, attendees=(), summary=None):
+        report = json.loads(calendar_management_tool.CreateCalendarEventTool().execute(
+            event_id=event_id, summary=summary or event_id, start_datetime=start, end_datetime=end, attendees=list(attendees)))
+        self.assertNotIn("error", report)
+
+    def list_all(self, page_size, **filters):
+        tool = calendar_management_tool.ListCalendarEventsTool()
+        ids, cursor, pages = [], None, 0
+        while True:
+            page = json.loads(tool.execute(page_size=page_size, cursor=cursor, **filters))
+            pages += 1
+            ids += [event["event_id"] for event in page.get("events", [])]
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return ids, pages
+
+    def test_cursor_pages_cover_every_event_once_in_start_order(self):
+        self.create("e3", "2024-05-01 09:00", "2024-05-01 10:00")
+        self.create("e1", "2024-05-01 08:00", "2024-05-01 09:00")
+        self.create("e2b", "2024-05-01 08:30", "2024-05-01 09:00")
+        self.create("e2a", "2024-05-01 08:30", "2024-05-01 09:30")  # same start: ordered by id
+        self.create("e4", "2024-05-02 08:00", "2024-05-02 09:00")
+        self.assertEqual(self.list_all(2), (["e1", "e2a", "e2b", "e3", "e4"], 3))
+        self.assertEqual(self.list_all(5), (["e1", "e2a", "e2b", "e3", "e4"], 1))
+        self.assertEqual(self.list_all(1, start_date="2024-05-01", end_date="2024-05-01"), (["e1", "e2a", "e2b", "e3"], 4))
+
+    def test_keyword_filter_with_paging(self):
+        for i in range(5):
+            self.create(f"e{i}", f"2024-05-01 0{i}:00", f"2024-05-01 0{i}:30", summary="standup" if i % 2 else "review")
+        self.assertEqual(self.list_all(1, keyword="stand"), (["e1", "e3"], 2))
+
+    def test_invalid_cursor(self):
+        report = json.loads(calendar_management_tool.ListCalendarEventsTool().execute(cursor="not a cursor"))
+        self.assertEqual(report, {"error": "Invalid cursor."})
+
+    def test_conflicts_are_reported_per_attendee(self):
+        self.create("standup", "2024-05-01 10:00", "2024-05-01 11:00", ["alice@example.com"])
+        self.create("review", "2024-05-01 10:30", "2024-05-01 11:30", ["bob@example.com", "alice@example.com"])
+        tool = calendar_management_tool.DetectSchedulingConflictsTool()
+        attendees = ["alice@example.com", "bob@example.com", "carol@example.com"]
+
+        report = json.loads(tool.execute(attendees=attendees, start_datetime="2024-05-01 10:45", end_datetime="2024-05-01 11:15"))
+        self.assertTrue(report["has_conflicts"])
+        self.assertEqual(sorted(c["event_id"] for c in report["conflicts"]["alice@example.com"]), ["review", "standup"])
+        self.assertEqual([c["event_id"] for c in report["conflicts"]["bob@example.com"]], ["review"])
+        self.assertEqual(report["available_attendees"], ["carol@example.com"])
+
+        # Events are half-open: a meeting starting as another ends does not conflict.
+        report = json.loads(tool.execute(attendees=["alice@example.com"], start_datetime="2024-05-01 11:30", end_datetime="2024-05-01 12:00"))
+        self.assertFalse(report["has_conflicts"])
+
+        # The event being rescheduled does not conflict with itself.
+        report = json.loads(tool.execute(attendees=["bob@example.com"], start_datetime="2024-05-01 11:00", end_datetime="2024-05-01 12:00",
+                                         exclude_event_id="review"))
+        self.assertEqual(report["conflicts"], {})
+
+if __name__ == '__main__':
+    unittest.main()
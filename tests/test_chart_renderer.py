@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+
+# Import the tool module directly
+import mic.tools.chart_renderer as chart_renderer_tool
+
+class TestDownsampling(unittest.TestCase):
+    def test_line_downsampling_keeps_endpoints_and_extremes(self):
+        x = np.arange(1_000_000, dtype=np.float64)
+        y = np.sin(x / 1000.0)
+        y[123_457] = 50.0
+        y[765_431] = -50.0
+        x_kept, y_kept = chart_renderer_tool.downsample_line(x, y, threshold=1000)
+        self.assertEqual(len(x_kept), 1000)
+        self.assertEqual((x_kept[0], x_kept[-1]), (0.0, 999_999.0))
+        self.assertTrue(np.all(np.diff(x_kept) > 0))
+        self.assertEqual((y_kept.max(), y_kept.min()), (50.0, -50.0))
+
+    def test_scatter_thinner_bounds_points_per_cell(self):
+        rng = np.random.default_rng(0)
+        thinner = chart_renderer_tool.ScatterThinner((0.0, 1.0), (0.0, 1.0), grid=(10, 10))
+        for _ in range(3):
+            thinner.add(rng.uniform(size=10_000), rng.uniform(size=10_000))
+        x, y = thinner.points()
+        self.assertEqual(len(x), 100)
+        self.assertEqual(thinner.seen, 30_000)
+        cells = set(zip((x * 10).astype(int), (y * 10).astype(int)))
+        self.assertEqual(len(cells), 100)
+
+@unittest.skipUnless(chart_renderer_tool.MATPLOTLIB_AVAILABLE, "matplotlib is not installed")
+class TestChartRenderer(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.renderer = chart_renderer_tool.ChartRenderer(cache_dir=os.path.join(self.root, "cache"), workers=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_repeated_chart_is_served_from_cache(self):
+        builds = []
+
+        def build():
+            builds.append(1)
+            return {"edges": np.linspace(0, 1, 11), "counts": np.arange(10), "kde": None, "points": 45}
+
+        spec = {"plot_type": "histogram", "title": "Test"}
+        first = self.renderer.render(spec, "data-1", build, os.path.join(self.root, "a.png"))
+        second = self.renderer.render(spec, "data-1", build, os.path.join(self.root, "b.png"))
+        third = self.renderer.render({**spec, "title": "Other"}, "data-1", build)
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertFalse(third["cached"])
+        self.assertEqual(len(builds), 2)
+        self.assertTrue(os.path.exists(os.path.join(self.root, "b.png")))
+        self.assertTrue(third["path"].startswith(self.renderer.cache_dir))
+
+if __name__ == '__main__':
+    unittest.main()
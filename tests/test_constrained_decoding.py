@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import json
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+
+import mic.constrained_decoding as constrained_decoding
+
+try:
+    import regex
+except ImportError:
+    regex = None
+
+SCHEMA = {"anyOf": [
+    {
+        "type": "object",
+        "properties": {
+            "tool": {"const": "math_problem_solver"},
+            "input": {
+                "type": "object",
+                "properties": {
+                    "operation": {"type": "string", "enum": ["add_problem", "solve_problem"]},
+                    "problem_id": {"type": "string"},
+                    "statement": {"type": "string"},
+                },
+                "required": ["operation"],
+            },
+        },
+        "required": ["tool", "input"],
+    },
+    {"type": "object", "properties": {"answer": {"type": "string"}}, "required": ["answer"]},
+]}
+
+VOCAB = list('{}":, abcdefghijklmnopqrstuvwxyz_') + ['{"', '":', '","', '"}', '}}', 'answer', 'tool', 'input',
+                                                   'operation', 'math_problem_solver', '<eos>']
+
+class ToyTokenizer:
+    eos_token_id = len(VOCAB) - 1
+
+    def __len__(self):
+        return len(VOCAB)
+
+    def encode(self, text, add_special_tokens=False):
+        return [VOCAB.index(text)]
+
+    def decode(self, ids, skip_special_tokens=False):
+        return "".join(VOCAB[i] for i in ids if not (skip_special_tokens and i == self.eos_token_id))
+
+@unittest.skipIf(regex is None, "regex is not installed")
+class TestConstrainedDecoding(unittest.TestCase):
+    def test_schema_regex(self):
+        pattern = regex.compile(constrained_decoding.json_schema_regex(SCHEMA))
+        for text in ['{"answer": "hi \\"there\\""}',
+                     '{"tool":"math_problem_solver","input":{"operation":"solve_problem","statement":"3x+7=22"}}',
+                     '{"tool": "math_problem_solver", "input": {"operation": "add_problem", "problem_id": "p1"}}']:
+            self.assertIsNotNone(pattern.fullmatch(text), text)
+        for text in ['{"tool":"math_problem_solver","input":{"statement":"x"}}',  # missing required property
+                     '{"tool":"math_problem_solver","input":{"statement":"x","operation":"add_problem"}}',  # out of schema order
+                     '{"answer": 3}', '{ "answer":"x"}', '{"answer":"x"} ', '{"tool":"other","input":{}}']:
+            self.assertIsNone(pattern.fullmatch(text), text)
+
+    def test_decoding_always_yields_a_valid_command(self):
+        processor = constrained_decoding.JsonSchemaLogitsProcessor(ToyTokenizer(), SCHEMA, prompt_length=0, top_k=4)
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            text = ""
+            for _ in range(2000):
+                allowed = processor.allowed_tokens(text, rng.normal(size=len(VOCAB)))
+                self.assertLessEqual(len(allowed), 4)
+                token = allowed[rng.integers(len(allowed))]
+                if token == ToyTokenizer.eos_token_id:
+                    break
+                text += VOCAB[token]
+            command = json.loads(text)
+            self.assertTrue("answer" in command or command["input"]["operation"] in ("add_problem", "solve_problem"))
+            # End-of-sequence is the only choice once the object is closed.
+            self.assertEqual(processor.allowed_tokens(text, np.zeros(len(VOCAB))), [ToyTokenizer.eos_token_id])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+import json
+import inspect
+import re
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+# config.py requires these; the values are never used here.
+for name in ("GOOGLE_API_KEY", "GOOGLE_CSE_ID", "JWT_SECRET_KEY"):
+    os.environ.setdefault(name, "test")
+
+import mic.core as core
+
+try:
+    import regex
+except ImportError:
+    regex = None
+
+from mic import constrained_decoding
+import mic.tools.math_problem_solver as math_problem_solver
+
+# The tools the preamble's examples call, by the name the planner uses for them.
+EXAMPLE_TOOLS = {"math_problem_solver": math_problem_solver.MathProblemSolverTool}
+
+class TestPlannerPrompt(unittest.TestCase):
+    def test_prompt_starts_with_the_cached_preamble(self):
+        preamble = core.get_hrm_planner_preamble()
+        prompt = core.get_hrm_planner_prompt("Solve 3x + 7 = 22.", preamble)
+        self.assertTrue(prompt.startswith(preamble))
+        self.assertEqual(prompt, core.get_hrm_planner_prompt("Solve 3x + 7 = 22."))
+        self.assertEqual(preamble, core.get_hrm_planner_preamble())  # stable across calls, so cacheable
+
+    def test_example_calls_are_accepted_by_their_tools(self):
+        examples = [json.loads(line) for line in re.findall(r"Your response:\n(.*)", core.get_hrm_planner_preamble())]
+        calls = [example for example in examples if "tool" in example]
+        self.assertTrue(calls)
+        for call in calls:
+            tool = EXAMPLE_TOOLS[call["tool"]]()
+            schema, args = tool.parameters, dict(call["input"])
+            self.assertLessEqual(set(schema.get("required", [])), set(args), call)
+            self.assertLessEqual(set(args), set(schema["properties"]), call)
+            for name, value in args.items():
+                if "enum" in schema["properties"][name]:
+                    self.assertIn(value, schema["properties"][name]["enum"], call)
+            # The schema is shared by every operation; the operation itself must take these arguments.
+            operation = getattr(tool, args.pop("operation"))
+            inspect.signature(operation).bind(**args)
+
+class TestPlannerAnswers(unittest.TestCase):
+    def test_answer_schema_is_bounded(self):
+        answer = core.get_hrm_planner_schema()["anyOf"][-1]["properties"]["answer"]
+        self.assertEqual(answer["maxLength"], core.PLANNER_ANSWER_MAX_LENGTH)
+
+    @unittest.skipIf(regex is None, "regex is not installed")
+    def test_answers_over_the_limit_do_not_match(self):
+        pattern = regex.compile(constrained_decoding.json_schema_regex(core.get_hrm_planner_schema()))
+        limit = core.PLANNER_ANSWER_MAX_LENGTH
+        self.assertIsNotNone(pattern.fullmatch(json.dumps({"answer": "a" * limit})))
+        self.assertIsNone(pattern.fullmatch(json.dumps({"answer": "a" * (limit + 1)})))
+
+    def test_truncated_answers_are_recovered(self):
+        for response, expected in [('{"answer": "The Romans used', "The Romans used"),
+                                   ('{"answer": "line\\nbreak and \\"quotes', 'line\nbreak and "quotes'),
+                                   ('{"answer": "caf\\u00e', "caf"),
+                                   ('{"answer": "back\\', "back"),
+                                   ('{"answer": "closed"', "closed")]:
+            self.assertEqual(core.recover_truncated_answer(response), expected, response)
+        for response in ['{"tool": "math_problem_solver", "input": {', "plain text", '{"answer": 3']:
+            self.assertIsNone(core.recover_truncated_answer(response), response)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+from unittest import mock
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+import pandas as pd
+
+# Import the tool module directly
+import mic.tools.customer_segmentation_tool as segmentation
+from mic.tools.model_registry import ModelRegistry
+
+CENTERS = np.array([[0.0, 0.0], [10.0, 0.0], [0.0, 10.0]])
+
+def customers(rows_per_segment, seed=0):
+    rng = np.random.default_rng(seed)
+    points = np.vstack([center + rng.normal(scale=0.5, size=(rows_per_segment, 2)) for center in CENTERS])
+    return pd.DataFrame(rng.permutation(points), columns=["spend", "visits"])
+
+def in_chunks(df, rows):
+    return lambda: (df.iloc[start:start + rows] for start in range(0, len(df), rows))
+
+def sorted_rows(centroids):
+    return centroids[np.lexsort(centroids.T[::-1])]
+
+@unittest.skipIf(not segmentation.SKLEARN_AVAILABLE, "scikit-learn is not installed")
+class TestCustomerSegmentation(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        patcher = mock.patch.object(segmentation, "model_registry", ModelRegistry(self.root))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.root)
+        self.addCleanup(segmentation.segmentation_models.clear)
+
+    def test_chunked_fits_find_the_same_centroids(self):
+        df = customers(2000)
+        for algorithm in ("minibatch_kmeans", "birch"):
+            fits = [segmentation.fit_segments(in_chunks(df, rows), ["spend", "visits"], 3, algorithm, n_jobs=1)[0]
+                    for rows in (500, 2500, len(df))]
+            for model in fits:
+                self.assertEqual(model.rows_fitted, len(df))
+                np.testing.assert_allclose(sorted_rows(model.centroids_original()), sorted_rows(CENTERS), atol=0.1, err_msg=algorithm)
+                self.assertEqual(sorted(entry["count"] for entry in model.segment_summary.values()), [2000] * 3)
+
+    def test_assigning_with_a_saved_model_matches_predict(self):
+        train, new = customers(200), customers(50, seed=1)
+        result = json.loads(segmentation.SegmentCustomersTool().execute(data=train.to_dict("records"), n_segments=3,
+                                                                        mode="in_memory", model_name="shoppers"))
+        self.assertEqual(result["model"]["name"], "shoppers")
+        # The same full-batch fit the tool makes in memory (no standardization by default there).
+        expected = segmentation.KMeans(n_clusters=3, random_state=42, n_init=10).fit(train.to_numpy()).predict(new.to_numpy())
+        segmentation.segmentation_models.clear()  # load the saved version from the registry
+        assigned = json.loads(segmentation.AssignCustomerSegmentsTool().execute(model_name="shoppers", data=new.to_dict("records")))
+        self.assertEqual(assigned["segments"], expected.tolist())
+
+    def test_unknown_models_are_reported(self):
+        result = json.loads(segmentation.AssignCustomerSegmentsTool().execute(model_name="missing", data=[{"spend": 1.0, "visits": 2.0}]))
+        self.assertIn("not found", result["error"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+import asyncio
+import json
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+# Import the tool module directly
+import mic.tools.data_analysis_tool as data_analysis_tool
+from tools.base_tool import CURRENT_USER
+
+class TestPerUserDatasets(unittest.TestCase):
+    def tearDown(self):
+        for user in ("alice", "bob"):
+            data_analysis_tool.get_data_analysis_manager(user).unload_data("scores")
+
+    def load_as(self, user, rows):
+        token = CURRENT_USER.set(user)
+        try:
+            # aexecute runs the tool on an executor thread; the user must follow the call there.
+            return json.loads(asyncio.run(data_analysis_tool.LoadDataTool("load_data").aexecute(data_source=rows, dataset="scores")))
+        finally:
+            CURRENT_USER.reset(token)
+
+    def test_users_cannot_see_each_others_datasets(self):
+        self.load_as("alice", [{"score": 1}, {"score": 2}])
+        self.load_as("bob", [{"score": 10}, {"score": 20}, {"score": 30}])
+        alice = data_analysis_tool.get_data_analysis_manager("alice").list_datasets()
+        bob = data_analysis_tool.get_data_analysis_manager("bob").list_datasets()
+        self.assertEqual([(d["name"], d["rows"]) for d in alice], [("scores", 2)])
+        self.assertEqual([(d["name"], d["rows"]) for d in bob], [("scores", 3)])
+        self.assertNotIn("scores", [d["name"] for d in data_analysis_tool.get_data_analysis_manager().list_datasets()])
+
+    def test_the_model_cannot_choose_the_session(self):
+        self.load_as("alice", [{"score": 1}])
+        tool = data_analysis_tool.ListDatasetsTool()
+        self.assertNotIn("session_id", json.dumps(tool.parameters))
+        token = CURRENT_USER.set("bob")
+        try:
+            listed = json.loads(tool.execute(session_id="alice"))
+        finally:
+            CURRENT_USER.reset(token)
+        self.assertEqual(listed["datasets"], [])
+
+if __name__ == '__main__':
+    unittest.main()
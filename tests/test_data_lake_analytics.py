@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import pandas as pd
+
+# Import the tool module directly
+import mic.tools.data_lake_analytics as data_lake_tool
+
+DataLakeAnalyticsTool = data_lake_tool.DataLakeAnalyticsTool
+LakeCatalog = data_lake_tool.LakeCatalog
+LakeQueryEngine = data_lake_tool.LakeQueryEngine
+
+class TestLakeQueryEngine(unittest.TestCase):
+    def setUp(self):
+        self.lake = tempfile.mkdtemp()
+        for region, rows in (("East", [(1, "A", 100), (2, "B", 150), (3, "A", None)]),
+                             ("West", [(4, "C", 200), (5, "A", 90)])):
+            os.makedirs(os.path.join(self.lake, "sales", f"region={region}"))
+            pd.DataFrame(rows, columns=["id", "product", "amount"]).to_csv(
+                os.path.join(self.lake, "sales", f"region={region}", "part-0.csv"), index=False)
+        pd.DataFrame({"product": ["A", "B", "C"], "category": ["toys", "books", "toys"]}).to_csv(
+            os.path.join(self.lake, "products.csv"), index=False)
+        self.engine = LakeQueryEngine(LakeCatalog(self.lake))
+
+    def tearDown(self):
+        shutil.rmtree(self.lake)
+
+    def query(self, sql, **kwargs):
+        return pd.concat(list(self.engine.execute(sql, **kwargs)), ignore_index=True)
+
+    def test_partition_pruning_and_projection(self):
+        result = self.query("SELECT id, amount FROM sales WHERE region = 'West' AND amount > 100")
+        self.assertEqual(result.to_dict(orient="records"), [{"id": 4, "amount": 200.0}])
+        self.assertEqual(self.engine.stats["files_pruned"], 1)
+
+    def test_group_by_with_sql_null_semantics(self):
+        result = self.query("SELECT product, COUNT(*) AS n, COUNT(amount) AS priced, SUM(amount) AS total "
+                            "FROM sales GROUP BY product HAVING COUNT(*) > 1 ORDER BY product")
+        self.assertEqual(result.to_dict(orient="records"), [{"product": "A", "n": 3, "priced": 2, "total": 190.0}])
+
+    def test_join_and_order_by_limit(self):
+        result = self.query("SELECT s.id, p.category FROM sales s JOIN products p ON s.product = p.product "
+                            "WHERE p.category = 'toys' ORDER BY s.id DESC LIMIT 2")
+        self.assertEqual(result.to_dict(orient="records"), [{"id": 5, "category": "toys"}, {"id": 4, "category": "toys"}])
+
+    def test_legacy_query_without_from(self):
+        tool = DataLakeAnalyticsTool()
+        records = tool.execute(operation="run_query", data_lake_path=self.lake, file_name="products.csv",
+                               sql_query="SELECT * WHERE category = 'books'", engine="native")
+        self.assertEqual(records, [{"product": "B", "category": "books"}])
+
+    def test_invalid_query_is_reported(self):
+        tool = DataLakeAnalyticsTool()
+        with self.assertRaises(ValueError):
+            tool.execute(operation="run_query", data_lake_path=self.lake, sql_query="SELECT missing FROM products", engine="native")
+
+    @unittest.skipUnless(data_lake_tool.DUCKDB_AVAILABLE, "duckdb is not installed")
+    def test_duckdb_engine_only_runs_selects_over_lake_tables(self):
+        tool = DataLakeAnalyticsTool()
+        records = tool.execute(operation="run_query", data_lake_path=self.lake, engine="duckdb",
+                               sql_query="SELECT product, SUM(amount) AS total FROM sales GROUP BY product ORDER BY product")
+        self.assertEqual([record["product"] for record in records], ["A", "B", "C"])
+        target = os.path.join(self.lake, "copied.csv")
+        for sql in ["SELECT * FROM read_csv_auto('/etc/passwd', header=false)",
+                    f"COPY (SELECT 42) TO '{target}'",
+                    "SELECT * FROM '/etc/passwd'",
+                    f"SELECT 1; COPY (SELECT 42) TO '{target}'"]:
+            with self.assertRaises(ValueError, msg=sql):
+                tool.execute(operation="run_query", data_lake_path=self.lake, engine="duckdb", sql_query=sql)
+        self.assertFalse(os.path.exists(target))
+
+    @unittest.skipUnless(data_lake_tool.DUCKDB_AVAILABLE, "duckdb is not installed")
+    def test_duckdb_engine_rewrites_only_the_table_references(self):
+        tool = DataLakeAnalyticsTool()
+        # 'from' inside a literal is not a FROM clause; the legacy form still gets the file's table.
+        records = tool.execute(operation="run_query", data_lake_path=self.lake, engine="duckdb", file_name="products.csv",
+                               sql_query="SELECT product, 'from the lake' AS source WHERE category = 'books'")
+        self.assertEqual(records, [{"product": "B", "source": "from the lake"}])
+        records = tool.execute(operation="run_query", data_lake_path=self.lake, engine="duckdb",
+                               sql_query="SELECT p.product FROM \"products.csv\" p WHERE p.category = 'where toys' LIMIT 1")
+        self.assertEqual(records, [])
+        for sql in ("SELECT product FROM 'products.csv' ORDER BY product", "SELECT product FROM products ORDER BY product"):
+            records = tool.execute(operation="run_query", data_lake_path=self.lake, engine="duckdb", sql_query=sql)
+            self.assertEqual([record["product"] for record in records], ["A", "B", "C"], sql)
+
+if __name__ == '__main__':
+    unittest.main()
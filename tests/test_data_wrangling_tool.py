@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+# Import the tool module directly
+import mic.tools.data_wrangling_tool as data_wrangling_tool
+
+@unittest.skipUnless(data_wrangling_tool.PYARROW_AVAILABLE and data_wrangling_tool.PANDAS_AVAILABLE, "pyarrow/pandas not installed")
+class TestWranglingPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tool = data_wrangling_tool.DataWranglingTool()
+        self.data = [
+            {"id": 1, "name": "alice", "age": 30, "qty": "2"},
+            {"id": 2, "name": " ", "age": None, "qty": "3"},
+            {"id": 2, "name": "bob", "age": 22, "qty": "4"},
+            {"id": 3, "name": None, "age": 41, "qty": "5"},
+        ]
+        self.steps = [
+            {"operation": "clean_data", "cleaning_rules": [
+                {"type": "fill_missing", "column": "name", "value": "unknown"},
+                {"type": "remove_duplicates", "subset": ["id"]},
+                {"type": "standardize_case", "column": "name", "case": "title"}]},
+            {"operation": "transform_data", "transformations": [
+                {"type": "change_type", "column": "qty", "new_type": "int"},
+                {"type": "create_feature", "new_column": "double", "expression": "record['qty'] * 2"},
+                {"type": "create_feature", "new_column": "band", "expression": "'senior' if record['age'] and record['age'] > 35 else 'junior'"}]},
+            {"operation": "merge_data", "data2": [{"id": 3, "team": "red"}, {"id": 1, "team": "blue"}], "on_key": "id", "how": "left"},
+        ]
+
+    def test_pipeline_matches_chained_operations(self):
+        chained = self.tool._run_steps_eagerly(self.data, self.steps)
+        piped = self.tool.execute(operation="run_pipeline", data=self.data, steps=self.steps)
+        normalize = lambda records: [{k: (None if v != v else v) for k, v in r.items()} for r in records]
+        self.assertEqual(normalize(piped), normalize(chained))
+        self.assertEqual([r["name"] for r in piped], ["Alice", "Unknown", "Unknown"])
+        plan = self.tool.execute(operation="explain_pipeline", data=self.data, steps=self.steps)
+        self.assertEqual([line.split("(")[0].split("[")[0] for line in plan], ["Scan", "Project", "Distinct", "Project", "HashJoin"])
+
+    def test_stream_pipeline_from_csv_in_batches(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "rows.csv")
+            with open(path, "w") as f:
+                f.write("id,amount\n" + "".join(f"{i},{i * 0.5}\n" for i in range(25)))
+            steps = [{"operation": "transform_data", "transformations": [
+                {"type": "create_feature", "new_column": "cents", "expression": "record['amount'] * 100"}]}]
+            batches = list(self.tool.execute(operation="stream_pipeline", data=path, steps=steps, batch_size=10))
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        self.assertEqual(batches[-1][-1], {"id": 24, "amount": 12.0, "cents": 1200.0})
+
+    def test_features_that_do_not_vectorize_are_evaluated_per_record(self):
+        data = [{"name": "alice"}, {"name": "bob"}, {"name": "carol"}]
+        steps = [{"operation": "transform_data", "transformations": [
+            {"type": "create_feature", "new_column": "initial", "expression": "record['name'][0]"},
+            {"type": "create_feature", "new_column": "one", "expression": "1"}]}]
+        rows = self.tool.execute(operation="run_pipeline", data=data, steps=steps)
+        self.assertEqual([row["initial"] for row in rows], ["a", "b", "c"])
+        self.assertEqual([row["one"] for row in rows], [1, 1, 1])
+        self.assertEqual(rows, self.tool._run_steps_eagerly(data, steps))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+import asyncio
+import json
+import tempfile
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tools.base_tool import BaseTool
+import mic.tools.data_analysis_tool as data_analysis_tool
+
+try:
+    from mic.dispatcher import IntentDispatcher
+    from mic.conversation import ConversationManager
+except ImportError:  # the conversation manager needs transformers
+    IntentDispatcher = None
+
+class PagesTool(BaseTool):
+    description = "Streams pages of results."
+    parameters = {"type": "object", "properties": {"pages": {"type": "integer"}}}
+
+    def execute(self, pages: int = 2, **kwargs):
+        return (json.dumps({"page": i}) for i in range(pages))
+
+@unittest.skipIf(IntentDispatcher is None, "the dispatcher's dependencies are not installed")
+class TestIntentDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.dispatcher = IntentDispatcher({"pages": PagesTool("pages")})
+
+    def test_streamed_results_are_collected(self):
+        expected = ['{"page": 0}', '{"page": 1}', '{"page": 2}']
+        self.assertEqual(self.dispatcher.dispatch(ConversationManager(), "pages", "pages=3"), expected)
+        self.assertEqual(asyncio.run(self.dispatcher.adispatch(ConversationManager(), "pages", "pages=3")), expected)
+
+@unittest.skipIf(IntentDispatcher is None, "the dispatcher's dependencies are not installed")
+class TestDispatchedUsers(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dispatcher = IntentDispatcher({"load_data": data_analysis_tool.LoadDataTool("load_data"),
+                                            "list_datasets": data_analysis_tool.ListDatasetsTool()})
+
+    def tearDown(self):
+        for user in ("alice", "bob"):
+            data_analysis_tool.get_data_analysis_manager(user).unload_data("scores")
+        self.tmp.cleanup()
+
+    def csv(self, name, rows):
+        path = os.path.join(self.tmp.name, f"{name}.csv")
+        with open(path, "w") as f:
+            f.write("score\n" + "".join(f"{i}\n" for i in range(rows)))
+        return path
+
+    def listed(self, user):
+        return [(d["name"], d["rows"]) for d in json.loads(self.dispatcher.dispatch(
+            ConversationManager(), "list_datasets", "", current_user=user))["datasets"]]
+
+    def test_each_user_gets_their_own_datasets(self):
+        self.dispatcher.dispatch(ConversationManager(), "load_data",
+                                 f"data_source={self.csv('alice', 2)} dataset=scores", current_user="alice")
+        asyncio.run(self.dispatcher.adispatch(ConversationManager(), "load_data",
+                                              f"data_source={self.csv('bob', 3)} dataset=scores", current_user="bob"))
+        self.assertEqual(self.listed("alice"), [("scores", 2)])
+        self.assertEqual(self.listed("bob"), [("scores", 3)])
+        self.assertEqual(self.listed(None), [])
+
+if __name__ == '__main__':
+    unittest.main()
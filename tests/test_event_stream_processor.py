@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+import asyncio
+import pickle
+import tempfile
+from unittest import mock
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import mic.tools.event_stream_processor as esp
+
+def windows(results):
+    return sorted((w["key"], w["window_start"], w["window_end"], w["result"]) for w in results)
+
+class TestEventStreamProcessor(unittest.TestCase):
+    def setUp(self):
+        self.tool = esp.EventStreamProcessorTool()
+
+    def test_tumbling_windows_from_a_running_event_loop(self):
+        events = [{"timestamp": t, "user": u} for t, u in [(1, "a"), (4, "a"), (6, "a"), (2, "b")]]
+        async def run():
+            return await self.tool.aexecute(events=events, key_field="user", window={"type": "tumbling", "size": 5})
+        result = asyncio.run(run())
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(windows(result["windows"]), [("a", 0, 5, 2), ("a", 5, 10, 1), ("b", 0, 5, 1)])
+        self.assertIsNot(type(self.tool).aexecute, esp.BaseTool.aexecute)  # awaited natively, not on a thread
+        # The blocking entry point gives the same answer, even from synchronous code inside a loop.
+        async def nested():
+            return self.tool.execute(events=events, key_field="user", window={"type": "tumbling", "size": 5})
+        self.assertEqual(windows(asyncio.run(nested())["windows"]), windows(result["windows"]))
+
+    def test_sliding_windows_count_a_record_in_every_window_it_falls_in(self):
+        result = self.tool.execute(events=[{"timestamp": 12, "k": 1, "bytes": 3}], key_field="k",
+                                   window={"type": "sliding", "size": 10, "slide": 5},
+                                   aggregation={"type": "sum", "field": "bytes"})
+        self.assertEqual(windows(result["windows"]), [(1, 5, 15, 3), (1, 10, 20, 3)])
+
+    def test_session_windows_merge_within_the_gap(self):
+        events = [{"timestamp": t, "k": "x"} for t in (0, 3, 20)]
+        result = self.tool.execute(events=events, key_field="k", window={"type": "session", "gap": 5})
+        self.assertEqual(windows(result["windows"]), [("x", 0, 8, 2), ("x", 20, 25, 1)])
+
+    def run_with_lateness(self, max_out_of_orderness):
+        env = esp.StreamEnvironment(batch_size=1)  # a watermark after every event
+        events = [{"timestamp": t, "k": "x"} for t in (0, 10, 1)]
+        sink = (env.from_collection(events, timestamp="timestamp", max_out_of_orderness=max_out_of_orderness)
+                .key_by("k").window(esp.TumblingWindow(5)).aggregate("count").sink())
+        asyncio.run(env.execute())
+        late = next(op for op in env.operators if isinstance(op, esp.WindowAggregateOperator)).late_records
+        return windows(sink.results), late
+
+    def test_watermark_drops_records_for_windows_that_already_fired(self):
+        # The event at t=10 moves the watermark to 8, closing [0, 5); the event at t=1 is then late.
+        self.assertEqual(self.run_with_lateness(2), ([("x", 0, 5, 1), ("x", 10, 15, 1)], 1))
+
+    def test_allowed_out_of_orderness_keeps_late_records(self):
+        self.assertEqual(self.run_with_lateness(10), ([("x", 0, 5, 2), ("x", 10, 15, 1)], 0))
+
+    def test_invalid_window_is_reported(self):
+        result = self.tool.execute(events=[], key_field="k", window={"type": "hopping"})
+        self.assertEqual(result["status"], "error")
+
+class TestCheckpoints(unittest.TestCase):
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        for patcher in (mock.patch.object(esp, "STREAM_CHECKPOINT_DIR", root.name),
+                        mock.patch.dict(os.environ, {"STREAM_CHECKPOINT_KEY": ""})):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.tool = esp.EventStreamProcessorTool()
+        self.events = [{"timestamp": t, "k": "x"} for t in (0, 3, 20)]
+
+    def test_the_model_names_a_job_not_a_path(self):
+        self.assertNotIn("checkpoint_dir", self.tool.parameters["properties"])
+        for job in ("../escape", "/etc", ".key", "a/b"):
+            result = self.tool.execute(events=self.events, key_field="k", window={"type": "tumbling", "size": 5}, checkpoint_job=job)
+            self.assertEqual(result["status"], "error", job)
+        result = self.tool.execute(events=self.events, key_field="k", window={"type": "tumbling", "size": 5}, checkpoint_job="job-1")
+        self.assertEqual(result["status"], "success")
+
+    def test_signed_checkpoints_restore(self):
+        env = esp.StreamEnvironment(checkpoint_dir=esp.checkpoint_dir_for("job"))
+        env._write_checkpoint(3, {})
+        self.assertEqual(esp.StreamEnvironment(checkpoint_dir=esp.checkpoint_dir_for("job"))._restore(), 3)
+
+    def test_unsigned_checkpoints_are_never_unpickled(self):
+        path = os.path.join(esp.checkpoint_dir_for("job"), "checkpoint.pkl")
+        os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as f:
+            f.write(b"\0" * 32 + pickle.dumps({"checkpoint_id": 9, "states": {}}))
+        with mock.patch.object(esp.pickle, "loads", side_effect=AssertionError("unpickled")):
+            result = self.tool.execute(events=self.events, key_field="k", window={"type": "tumbling", "size": 5}, checkpoint_job="job")
+        self.assertEqual(result["status"], "error")
+        self.assertIn("refusing", result["message"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from PIL import Image
+
+# Import the tool module directly
+import mic.tools.image_resizer_optimizer as image_resizer_optimizer_tool
+
+class TestImageBatch(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.root, "in")
+        os.makedirs(os.path.join(self.source_dir, "nested"))
+        for i in range(3):
+            folder = self.source_dir if i < 2 else os.path.join(self.source_dir, "nested")
+            Image.new("RGB", (1200, 800), (i * 60, 10, 10)).save(os.path.join(folder, f"photo{i}.jpg"), quality=90)
+        self.output_dir = os.path.join(self.root, "out")
+        self.tool = image_resizer_optimizer_tool.ImageResizerOptimizerTool()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _batch(self, **kwargs):
+        return json.loads(self.tool.execute(action="batch", inputs=self.source_dir, output_dir=self.output_dir, workers=1,
+                                            sizes=[{"width": 600, "height": 600}, {"width": 100, "height": 100, "fit": "exact", "suffix": "_thumb"}],
+                                            **kwargs))
+
+    def test_batch_writes_every_size_and_keeps_structure(self):
+        report = self._batch()
+        self.assertEqual((report["inputs"], report["processed"], report["outputs_written"]), (3, 3, 6))
+        with Image.open(os.path.join(self.output_dir, "nested", "photo2_600x600.jpg")) as image:
+            self.assertEqual(image.size, (600, 400))
+        with Image.open(os.path.join(self.output_dir, "photo0_thumb.jpg")) as image:
+            self.assertEqual(image.size, (100, 100))
+
+    def test_unchanged_inputs_are_skipped_by_content_hash(self):
+        self._batch()
+        path = os.path.join(self.source_dir, "photo1.jpg")
+        os.utime(path)  # a newer timestamp alone does not trigger re-processing
+        Image.new("RGB", (1200, 800), (0, 200, 0)).save(os.path.join(self.source_dir, "photo0.jpg"))
+        report = self._batch()
+        self.assertEqual((report["processed"], report["skipped"]), (1, 2))
+        self.assertEqual(self._batch(force=True)["processed"], 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import sys
+import os
+import asyncio
+import contextlib
+import importlib
+import tempfile
+import time
+import types
+from unittest import mock
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+# Imported here because load_llama_llm's patch of sys.modules drops modules first imported inside it.
+import mic.base_llm
+
+class FakeLlama:
+    """Stands in for llama_cpp.Llama: records its settings and streams scripted chunks."""
+    script = []          # chunk texts; an Exception instance is raised in its place
+    produced = 0
+
+    def __init__(self, model_path, **kwargs):
+        self.model_path = model_path
+        self.kwargs = kwargs
+
+    def set_cache(self, cache):
+        self.cache = cache
+
+    def create_chat_completion(self, messages, stream=False, **kwargs):
+        if not stream:
+            return {"choices": [{"message": {"content": "done"}}]}
+        return self._stream()
+
+    def _stream(self):
+        for item in FakeLlama.script:
+            if isinstance(item, Exception):
+                raise item
+            FakeLlama.produced += 1
+            time.sleep(0.001)
+            yield {"choices": [{"delta": {"content": item}}]}
+
+class FakeDraftModel:
+    pass
+
+class FakePromptLookupDecoding(FakeDraftModel):
+    def __init__(self, num_pred_tokens):
+        self.num_pred_tokens = num_pred_tokens
+
+def fake_llama_cpp():
+    modules = {name: types.ModuleType(name) for name in
+               ("llama_cpp", "llama_cpp.llama_cache", "llama_cpp.llama_grammar", "llama_cpp.llama_speculative")}
+    modules["llama_cpp"].Llama = FakeLlama
+    modules["llama_cpp.llama_cache"].LlamaRAMCache = modules["llama_cpp.llama_cache"].LlamaDiskCache = mock.Mock
+    modules["llama_cpp.llama_grammar"].LlamaGrammar = mock.Mock()
+    modules["llama_cpp.llama_speculative"].LlamaDraftModel = FakeDraftModel
+    modules["llama_cpp.llama_speculative"].LlamaPromptLookupDecoding = FakePromptLookupDecoding
+    return modules
+
+def load_llama_llm(**env):
+    """Imports mic.llama_llm afresh against the fake llama_cpp, with only ``env`` set among the LLAMA_* variables."""
+    environ = {key: value for key, value in os.environ.items() if not key.startswith("LLAMA_")}
+    environ.update(env)
+    with mock.patch.dict(os.environ, environ, clear=True), mock.patch.dict(sys.modules, fake_llama_cpp()):
+        sys.modules.pop("mic.llama_llm", None)
+        return importlib.import_module("mic.llama_llm")
+
+class TestLlamaSettings(unittest.TestCase):
+    def test_defaults(self):
+        settings = load_llama_llm().llama_settings()
+        self.assertEqual((settings["n_ctx"], settings["n_batch"], settings["n_ubatch"]), (4096, 512, 512))
+        self.assertNotIn("n_threads", settings)  # llama.cpp picks its own thread counts
+        self.assertNotIn("n_threads_batch", settings)
+
+    def test_environment_then_overrides(self):
+        llama_llm = load_llama_llm(LLAMA_N_CTX="2048", LLAMA_N_THREADS="6", LLAMA_N_BATCH="256", LLAMA_N_UBATCH="1024",
+                                   LLAMA_FLASH_ATTN="1")
+        settings = llama_llm.llama_settings()
+        self.assertEqual((settings["n_ctx"], settings["n_threads"], settings["flash_attn"]), (2048, 6, True))
+        self.assertEqual(settings["n_ubatch"], 256)  # a micro-batch never exceeds the batch
+        overridden = llama_llm.llama_settings(n_ctx=1024, n_threads=2)
+        self.assertEqual((overridden["n_ctx"], overridden["n_threads"], overridden["n_batch"]), (1024, 2, 256))
+
+    def test_model_is_loaded_with_the_merged_settings(self):
+        llama_llm = load_llama_llm(LLAMA_N_CTX="2048", LLAMA_SPECULATIVE="prompt_lookup", LLAMA_DRAFT_TOKENS="4")
+        with tempfile.NamedTemporaryFile(suffix=".gguf") as model_file:
+            llm = llama_llm.LlamaLLM(model_file.name, n_gpu_layers=10)
+            self.assertEqual((llm.llm.kwargs["n_ctx"], llm.llm.kwargs["n_gpu_layers"]), (2048, 10))
+            self.assertIsInstance(llm.llm.kwargs["draft_model"], FakePromptLookupDecoding)
+            self.assertEqual(llm.llm.kwargs["draft_model"].num_pred_tokens, 4)
+            # An explicit draft_model, even None, wins over the environment.
+            self.assertIsNone(llama_llm.LlamaLLM(model_file.name, draft_model=None).llm.kwargs["draft_model"])
+
+class TestRelay(unittest.TestCase):
+    def setUp(self):
+        self.model_file = tempfile.NamedTemporaryFile(suffix=".gguf")
+        self.addCleanup(self.model_file.close)
+        self.llm = load_llama_llm().LlamaLLM(self.model_file.name)
+        FakeLlama.produced = 0
+
+    def test_errors_raised_mid_stream_reach_the_consumer(self):
+        FakeLlama.script = ["Hel", "lo", RuntimeError("context overflow")]
+        async def run():
+            received = []
+            with self.assertRaisesRegex(RuntimeError, "context overflow"):
+                async for chunk in self.llm._relay(lambda: self.llm._chat("hi", None, stream=True)):
+                    received.append(chunk["choices"][0]["delta"]["content"])
+            return received, [event async for event in self.llm.stream_response("hi")]
+        received, events = asyncio.run(run())
+        self.assertEqual(received, ["Hel", "lo"])
+        self.assertEqual([event["type"] for event in events], ["token", "token", "error"])
+
+    def test_an_abandoned_stream_stops_generating(self):
+        FakeLlama.script = [str(i) for i in range(1000)]
+        async def run():
+            async with contextlib.aclosing(self.llm._relay(lambda: self.llm._chat("hi", None, stream=True))) as chunks:
+                async for _ in chunks:
+                    break
+            # The worker is free again once the producer notices, long before the script would end.
+            await asyncio.get_running_loop().run_in_executor(self.llm._worker, lambda: None)
+            return await self.llm.get_response("next")
+        self.assertEqual(asyncio.run(run()), "done")
+        self.assertLess(FakeLlama.produced, 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+
+# Import the tool module directly
+import mic.tools.model_registry as model_registry_tool
+
+ModelRegistry = model_registry_tool.ModelRegistry
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.registry = ModelRegistry(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_versions_are_content_addressed(self):
+        first = self.registry.register("model", {"weights": np.arange(10.0)})
+        same = self.registry.register("model", {"weights": np.arange(10.0)})
+        second = self.registry.register("model", {"weights": np.ones(10)})
+        self.assertEqual(first["version"], same["version"])
+        self.assertEqual(second["version"], first["version"] + 1)
+        self.assertEqual(self.registry.resolve("model")["version"], second["version"])
+
+    def test_get_or_train_trains_once_and_memory_maps(self):
+        calls = []
+
+        def train():
+            calls.append(1)
+            return {"weights": np.arange(100.0)}, {"accuracy": 0.9}
+
+        artifact, metadata = self.registry.get_or_train("model", {"seed": 1}, train)
+        fresh = ModelRegistry(self.root)  # A new process would start with an empty cache.
+        reloaded, reloaded_metadata = fresh.get_or_train("model", {"seed": 1}, train)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(metadata["version"], reloaded_metadata["version"])
+        self.assertIsInstance(reloaded["weights"], np.memmap)
+        self.assertFalse(reloaded["weights"].flags.writeable)
+        np.testing.assert_array_equal(artifact["weights"], reloaded["weights"])
+
+    def test_aliases_and_tamper_detection(self):
+        metadata = self.registry.register("model", {"weights": np.zeros(4)})
+        self.registry.set_alias("model", "production", metadata["version"])
+        self.assertEqual(self.registry.resolve("model", "production")["sha256"], metadata["sha256"])
+        with open(os.path.join(self.root, "model", str(metadata["version"]), "artifact.joblib"), "ab") as handle:
+            handle.write(b"tampered")
+        with self.assertRaises(ValueError):
+            ModelRegistry(self.root).load("model", "production")
+
+if __name__ == '__main__':
+    unittest.main()
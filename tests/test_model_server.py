@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+
+import mic.model_server as model_server
+
+class TestModelServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.socket_dir = tempfile.mkdtemp(prefix="ms-")
+        cls.supervisor = model_server.ModelServerSupervisor(["diagnostics"], cls.socket_dir, health_interval=0.2).start()
+        cls.supervisor.wait_until_ready()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.supervisor.stop()
+        shutil.rmtree(cls.socket_dir)
+
+    def setUp(self):
+        self.client = model_server.ModelServerClient("diagnostics", self.socket_dir, autostart=False)
+
+    def test_arrays_cross_the_process_boundary_batched(self):
+        large = np.arange(500_000, dtype=np.float32).reshape(1000, 500)  # shared memory
+        small = np.ones(3, dtype=np.int64)  # inline
+        results = self.client.run("checksum", [{"array": large}, {"array": small}])
+        self.assertEqual(results[0]["shape"], [1000, 500])
+        self.assertEqual(results[0]["sum"], float(large.astype(np.float64).sum()))
+        self.assertEqual(results[1]["sum"], 3.0)
+        self.assertNotEqual(results[0]["pid"], os.getpid())
+        # The client unlinks its segments once the response is in.
+        if os.path.isdir("/dev/shm"):
+            self.assertEqual([name for name in os.listdir("/dev/shm") if name.startswith("psm_")], [])
+
+        # Concurrent callers on separate connections share batches in the server.
+        batch_sizes = []
+        def call():
+            batch_sizes.append(self.client.run_one("checksum", array=large)["batch_size"])
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(batch_sizes), 8)
+        self.assertGreater(max(batch_sizes), 1)
+
+        self.assertEqual(list(self.client.stream("count", n=4)), [0, 1, 2, 3])
+        with self.assertRaises(model_server.ModelServerError):
+            self.client.run_one("missing")
+
+    @unittest.skipUnless(os.path.isdir("/dev/shm"), "no /dev/shm to inspect")
+    def test_large_results_leave_no_shared_memory_behind(self):
+        before = set(os.listdir("/dev/shm"))
+        large = np.arange(200_000, dtype=np.float64)
+        np.testing.assert_array_equal(self.client.run_one("echo", array=large), large)
+        self.assertEqual(set(os.listdir("/dev/shm")), before)
+        self.assertEqual([len(event) for event in self.client.stream("echo", array=large, n=2)], [len(large)] * 2)
+        self.assertEqual(set(os.listdir("/dev/shm")), before)
+        # Abandoning a stream leaves the unread results to the server, which removes them on disconnect.
+        events = self.client.stream("echo", array=large, n=5)
+        np.testing.assert_array_equal(next(events), large)
+        events.close()
+        deadline = time.monotonic() + 5
+        while set(os.listdir("/dev/shm")) != before and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(set(os.listdir("/dev/shm")), before)
+
+    def test_supervisor_restarts_a_dead_server(self):
+        pid = self.client.health()["pid"]
+        os.kill(pid, 9)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                if self.client.health(timeout=1.0)["pid"] != pid:
+                    break
+            except model_server.ModelServerUnavailable:
+                time.sleep(0.1)
+        self.assertNotEqual(self.client.health()["pid"], pid)
+        self.assertGreaterEqual(self.supervisor.restarts["diagnostics"], 1)
+        self.assertEqual(self.client.run_one("checksum", array=np.ones(10))["sum"], 10.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+
+import mic.tools.network_traffic_analyzer as network_traffic_analyzer
+
+def zipf_traffic(num_packets, num_ips, rng):
+    """Packets whose source and destination IPs follow a Zipf law, so a few are heavy hitters."""
+    table = np.zeros(num_packets, dtype=network_traffic_analyzer.TRAFFIC_DTYPE)
+    base = 0x0A000000  # 10.0.0.0
+    table["source_ip"] = base + (rng.zipf(1.3, num_packets) % num_ips)
+    table["destination_ip"] = base + (rng.zipf(1.3, num_packets) % num_ips)
+    table["port"] = rng.choice([80, 443, 53, 22, 8080], num_packets, p=[0.4, 0.3, 0.15, 0.1, 0.05])
+    table["size_bytes"] = rng.integers(64, 1500, num_packets)
+    table["timestamp"] = 1_700_000_000 + np.sort(rng.uniform(0, 60, num_packets))
+    return table
+
+class TestCountMinSketch(unittest.TestCase):
+    def test_estimates_stay_within_the_error_bound(self):
+        rng = np.random.default_rng(0)
+        keys = rng.zipf(1.2, 200_000).astype(np.uint64)
+        sketch = network_traffic_analyzer.CountMinSketch(width=2 ** 10, depth=4)
+        for batch in np.array_split(keys, 4):
+            unique, counts = np.unique(batch, return_counts=True)
+            sketch.add(unique, counts)
+        unique, exact = np.unique(keys, return_counts=True)
+        error = sketch.estimate(unique) - exact
+        self.assertTrue(np.all(error >= 0))  # never an underestimate
+        # With probability 1 - e^-depth per key the error is at most e * N / width.
+        bound = np.e * len(keys) / sketch.width
+        self.assertGreaterEqual(np.mean(error <= bound), 1 - np.exp(-sketch.depth))
+
+class TestHyperLogLog(unittest.TestCase):
+    def test_distinct_counts_within_a_few_standard_errors(self):
+        rng = np.random.default_rng(1)
+        for distinct in (500, 20_000, 300_000):
+            values = rng.choice(np.arange(distinct, dtype=np.uint64) * 7919, size=distinct * 3)
+            sketch = network_traffic_analyzer.HyperLogLog()
+            for batch in np.array_split(values, 5):
+                sketch.add(batch)
+            true_count = len(np.unique(values))
+            # Standard error 1.04 / sqrt(2^14) ~ 0.8%; allow 4 of them.
+            self.assertLess(abs(sketch.count() - true_count) / true_count, 0.033, distinct)
+
+class TestTrafficAggregator(unittest.TestCase):
+    def test_approximate_report_matches_exact_heavy_hitters(self):
+        rng = np.random.default_rng(2)
+        batches = [zipf_traffic(100_000, 50_000, rng) for _ in range(5)]
+        exact, approximate = network_traffic_analyzer.TrafficAggregator(), network_traffic_analyzer.TrafficAggregator(approximate=True)
+        for batch in batches:
+            exact.add_batch(batch)
+            approximate.add_batch(batch)
+        exact_report, approximate_report = exact.report(), approximate.report()
+
+        for field in ("total_packets", "total_bytes", "protocol_distribution_percent", "rates"):
+            self.assertEqual(approximate_report[field], exact_report[field], field)
+        bound = np.e * exact.total_packets / 2 ** 16
+        for field in ("top_source_ips", "top_destination_ips", "top_ports"):
+            self.assertEqual([key for key, _ in approximate_report[field]], [key for key, _ in exact_report[field]], field)
+            for (_, estimate), (_, count) in zip(approximate_report[field], exact_report[field]):
+                self.assertTrue(count <= estimate <= count + bound, field)
+        for field in ("distinct_source_ips", "distinct_destination_ips"):
+            self.assertLess(abs(approximate_report[field] - exact_report[field]) / exact_report[field], 0.033, field)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import sys
+import os
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+# Import the tool module directly
+import mic.tools.rules_engine as rules_engine_tool
+
+RulesEngine = rules_engine_tool.RulesEngine
+RulesEngineTool = rules_engine_tool.RulesEngineTool
+rule_engines = rules_engine_tool.rule_engines
+
+LARGE_ORDER_RULE = {
+    "name": "large_order_new_customer",
+    "salience": 5,
+    "when": [
+        {"type": "order", "as": "o", "conditions": [{"field": "total", "op": ">", "value": 1000}]},
+        {"type": "customer", "as": "c", "conditions": [
+            {"field": "id", "op": "==", "ref": "o.customer_id"},
+            {"field": "tier", "op": "==", "value": "new"}
+        ]}
+    ],
+    "then": [{"emit": {"customer": "$c.id", "total": "$o.total"}}]
+}
+
+class TestRulesEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = RulesEngine()
+        self.engine.add_rule(LARGE_ORDER_RULE)
+
+    def test_join_matches_only_related_facts(self):
+        self.engine.assert_facts([
+            {"type": "customer", "id": "c1", "tier": "new"},
+            {"type": "customer", "id": "c2", "tier": "gold"},
+            {"type": "order", "customer_id": "c1", "total": 1500},
+            {"type": "order", "customer_id": "c2", "total": 5000},
+            {"type": "order", "customer_id": "c1", "total": 10},
+        ])
+        self.assertEqual(self.engine.fire_all(), 1)
+        self.assertEqual(self.engine.results[0]["output"], {"customer": "c1", "total": 1500})
+
+    def test_retract_removes_pending_activation(self):
+        customer_id = self.engine.assert_fact({"type": "customer", "id": "c1", "tier": "new"})
+        self.engine.assert_fact({"type": "order", "customer_id": "c1", "total": 2000})
+        self.assertEqual(len(self.engine.agenda), 1)
+        self.assertTrue(self.engine.retract_fact(customer_id))
+        self.assertEqual(len(self.engine.agenda), 0)
+        self.assertEqual(self.engine.fire_all(), 0)
+
+    def test_rule_added_after_facts_sees_existing_facts(self):
+        self.engine.assert_fact({"type": "order", "customer_id": "c9", "total": 50})
+        self.engine.add_rule({
+            "name": "any_order",
+            "when": [{"type": "order", "as": "o", "conditions": []}],
+            "then": [{"emit": "$o.customer_id"}]
+        })
+        self.engine.fire_all()
+        self.assertEqual(self.engine.results, [{"rule": "any_order", "output": "c9"}])
+
+    def test_salience_orders_agenda(self):
+        self.engine.add_rule({
+            "name": "low_priority",
+            "salience": -1,
+            "when": [{"type": "customer", "as": "c", "conditions": [{"field": "tier", "op": "==", "value": "new"}]}],
+            "then": [{"emit": "low"}]
+        })
+        self.engine.assert_fact({"type": "customer", "id": "c1", "tier": "new"})
+        self.engine.assert_fact({"type": "order", "customer_id": "c1", "total": 2000})
+        self.engine.fire_all()
+        self.assertEqual([r["rule"] for r in self.engine.results], ["large_order_new_customer", "low_priority"])
+
+    def test_identical_patterns_share_alpha_memory(self):
+        self.engine.add_rule(dict(LARGE_ORDER_RULE, name="duplicate"))
+        stats = self.engine.stats()
+        self.assertEqual(stats["alpha_memories"], 2)
+        self.assertEqual(stats["join_nodes"], 2)
+
+    def test_range_conditions(self):
+        engine = RulesEngine()
+        for op, value in ((">", 10), (">=", 10), ("<", 10), ("<=", 10)):
+            engine.add_rule({"name": op, "when": [{"type": "x", "conditions": [{"field": "v", "op": op, "value": value}]}], "then": [{"emit": op}]})
+        engine.assert_fact({"type": "x", "v": 10})
+        engine.fire_all()
+        self.assertEqual(sorted(r["output"] for r in engine.results), ["<=", ">="])
+
+    def test_assert_action_chains_rules(self):
+        self.engine.add_rule({
+            "name": "escalate",
+            "when": [{"type": "alert", "as": "a", "conditions": []}],
+            "then": [{"emit": "$a.customer"}]
+        })
+        self.engine.rules["large_order_new_customer"].actions = [{"assert": {"type": "alert", "customer": "$c.id"}}]
+        self.engine.assert_facts([{"type": "customer", "id": "c1", "tier": "new"}, {"type": "order", "customer_id": "c1", "total": 2000}])
+        self.engine.fire_all()
+        self.assertEqual(self.engine.results, [{"rule": "escalate", "output": "c1"}])
+
+class TestRulesEngineTool(unittest.TestCase):
+    def setUp(self):
+        self.tool = RulesEngineTool()
+        rule_engines.clear()
+
+    def test_full_flow(self):
+        self.assertEqual(self.tool.execute(operation="create_engine", engine_id="fraud")["status"], "success")
+        self.assertEqual(self.tool.execute(operation="add_rules", engine_id="fraud", rules=[LARGE_ORDER_RULE])["status"], "success")
+        result = self.tool.execute(operation="assert_facts", engine_id="fraud", facts=[
+            {"type": "customer", "id": "c1", "tier": "new"},
+            {"type": "order", "customer_id": "c1", "total": 1200}
+        ])
+        self.assertEqual(result["pending_activations"], 1)
+        result = self.tool.execute(operation="fire", engine_id="fraud")
+        self.assertEqual(result["fired"], 1)
+        self.assertEqual(result["results"][0]["output"]["customer"], "c1")
+
+    def test_unknown_engine(self):
+        result = self.tool.execute(operation="fire", engine_id="missing")
+        self.assertEqual(result["status"], "error")
+
+    def test_invalid_rule_reference(self):
+        self.tool.execute(operation="create_engine", engine_id="bad")
+        result = self.tool.execute(operation="add_rules", engine_id="bad", rules=[{
+            "name": "broken",
+            "when": [{"type": "order", "conditions": [{"field": "id", "op": "==", "ref": "x.id"}]}]
+        }])
+        self.assertEqual(result["status"], "error")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import mic.tools.spreadsheet_automation_tool as spreadsheet_automation_tool
+
+class TestSpreadsheetReads(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "book.xlsx")
+        self.tool = spreadsheet_automation_tool.SpreadsheetAutomationTool(data_dir=self.tmp.name)
+        self.tool.write_cell(self.path, "Sheet1", "A1", 1)
+
+    def tearDown(self):
+        self.tool.close_session(self.path)
+        self.tmp.cleanup()
+
+    def test_reading_a_range_does_not_create_cells(self):
+        self.assertEqual(self.tool.read_range(self.path, "Sheet1", "A1:B2"), [[1, None]])
+        self.assertEqual(self.tool.read_sheet(self.path, "Sheet1"), [[1]])
+        self.tool.close_session(self.path)
+        self.assertEqual(self.tool.read_sheet(self.path, "Sheet1"), [[1]])
+
+    def test_open_session_reads_like_the_saved_file(self):
+        self.tool.write_cell(self.path, "Sheet1", "C3", 3)
+        ranges = ["A1:B2", "A1:E5", "B2:B2", "D5:E6"]
+        in_session = [self.tool.read_range(self.path, "Sheet1", r) for r in ranges]
+        self.tool.close_session(self.path)
+        self.assertEqual([self.tool.read_range(self.path, "Sheet1", r) for r in ranges], in_session)
+        self.assertEqual(in_session[3], [])
+
+    def test_max_rows_pages_and_zero_returns_nothing(self):
+        self.tool.write_range(self.path, "Sheet1", "A2", [[2], [3], [4]])
+        self.assertEqual(self.tool.read_sheet(self.path, "Sheet1", start_row=2, max_rows=2), [[2], [3]])
+        self.assertEqual(self.tool.read_sheet(self.path, "Sheet1", max_rows=0), [])
+        self.assertEqual(self.tool.execute("read_sheet", self.path, sheet_name="Sheet1", max_rows=0), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+import warnings
+from unittest import mock
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+import pandas as pd
+
+import mic.tools.time_series_forecasting_tool as time_series_forecasting_tool
+from statsmodels.tsa.arima.model import ARIMA
+
+def simulate(n, ar=(), ma=(), d=0, seed=0):
+    """An ARIMA(len(ar), d, len(ma)) sample path of length n."""
+    rng = np.random.default_rng(seed)
+    e = rng.normal(size=n + 100)
+    x = np.zeros(n + 100)
+    for t in range(n + 100):
+        x[t] = e[t] + sum(a * x[t - i - 1] for i, a in enumerate(ar) if t > i) + sum(m * e[t - i - 1] for i, m in enumerate(ma) if t > i)
+    x = x[100:]
+    for _ in range(d):
+        x = np.cumsum(x)
+    return pd.Series(x + 10)
+
+SERIES = {
+    "ar2": simulate(300, ar=(0.6, -0.3)),
+    "arma11": simulate(300, ar=(0.5,), ma=(0.4,)),
+    "ari1": simulate(300, ar=(0.5,), d=1),
+}
+GRID = (range(3), range(2), range(3))
+
+class TestPrescreen(unittest.TestCase):
+    def test_survivors_are_ranked_and_bounded(self):
+        top, margin = time_series_forecasting_tool.PRESCREEN_TOP, time_series_forecasting_tool.EARLY_STOP_MARGIN
+        for name, series in SERIES.items():
+            ranked = time_series_forecasting_tool.prescreen_orders(series, *GRID)
+            scores = [score for _, score in ranked]
+            self.assertEqual(scores, sorted(scores), name)
+            for d in GRID[1]:
+                of_d = [score for order, score in ranked if order[1] == d]
+                self.assertLessEqual(len(of_d), top, name)
+                self.assertLessEqual(max(of_d) - min(of_d), margin, name)
+
+    def test_true_order_ranks_first(self):
+        self.assertEqual(time_series_forecasting_tool.prescreen_orders(SERIES["ar2"], *GRID)[0][0], (2, 0, 0))
+        self.assertEqual(time_series_forecasting_tool.prescreen_orders(SERIES["ari1"], *GRID)[0][0][1], 1)
+
+    def test_scores_are_on_the_exact_aic_scale(self):
+        for name, series in SERIES.items():
+            order, approximate = time_series_forecasting_tool.prescreen_orders(series, *GRID)[0]
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                exact = ARIMA(series, order=order).fit().aic
+            self.assertLess(abs(approximate - exact), time_series_forecasting_tool.EARLY_STOP_MARGIN / 2, name)
+
+    def test_short_series_leave_every_order_to_the_exact_fits(self):
+        ranked = time_series_forecasting_tool.prescreen_orders(pd.Series(np.arange(10.0)), *GRID)
+        self.assertEqual(len(ranked), 18)
+        self.assertTrue(all(score == float("-inf") for _, score in ranked))
+
+class TestSelectArimaOrder(unittest.TestCase):
+    def test_matches_the_exhaustive_search_with_fewer_fits(self):
+        for name, series in SERIES.items():
+            screened = time_series_forecasting_tool.select_arima_order(series, *GRID)
+            exhaustive = time_series_forecasting_tool.select_arima_order(series, *GRID, top=9, margin=float("inf"))
+            self.assertEqual(exhaustive["fitted"], 18, name)
+            self.assertEqual(screened["order"], exhaustive["order"], name)
+            self.assertAlmostEqual(screened["aic"], exhaustive["aic"], places=6, msg=name)
+            self.assertLess(screened["fitted"], 18, name)
+            self.assertEqual(screened["fitted"] + screened["skipped_early"] + screened["pruned"], screened["candidates"], name)
+
+    def test_parallel_search_agrees_with_the_serial_one(self):
+        serial = time_series_forecasting_tool.select_arima_order(SERIES["arma11"], *GRID)
+        parallel = time_series_forecasting_tool.select_arima_order(SERIES["arma11"], *GRID, max_workers=2)
+        self.assertEqual(parallel["order"], serial["order"])
+        self.assertAlmostEqual(parallel["aic"], serial["aic"], places=6)
+
+class TestFitPool(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(time_series_forecasting_tool, "_fit_pool", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tool = time_series_forecasting_tool.TimeSeriesForecastingTool()
+        self.addCleanup(lambda: time_series_forecasting_tool._fit_pool and time_series_forecasting_tool._fit_pool.shutdown())
+
+    def find_best_order(self, **kwargs):
+        return self.tool.execute("find_best_order", model_name="m", data=SERIES["arma11"].tolist(),
+                                 p_values=GRID[0], d_values=GRID[1], q_values=GRID[2], **kwargs)
+
+    def test_short_series_are_searched_without_a_pool(self):
+        self.assertEqual(self.find_best_order()["best_order"][1], 0)
+        self.assertIsNone(time_series_forecasting_tool._fit_pool)
+
+    def test_searches_and_batches_share_one_pool(self):
+        serial = self.find_best_order(max_workers=1)
+        self.assertEqual(self.find_best_order(max_workers=2)["best_order"], serial["best_order"])
+        pool = time_series_forecasting_tool._fit_pool
+        self.assertIsNotNone(pool)
+        self.find_best_order(max_workers=2)
+        batch = self.tool.execute("forecast_batch", model_name="m", series={name: s.tolist() for name, s in SERIES.items()},
+                                  steps=3, p_values=GRID[0], d_values=GRID[1], q_values=GRID[2], max_workers=2)
+        self.assertIs(time_series_forecasting_tool._fit_pool, pool)
+        self.assertEqual(list(batch["series"]), list(SERIES))
+        self.assertEqual(batch["failed"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
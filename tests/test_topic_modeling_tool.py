@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import copy
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import mic.tools.topic_modeling_tool as topic_modeling_tool
+
+SPORTS = ["the team won the football match", "a late goal decided the match", "the striker scored a goal for the team"]
+COOKING = ["bake the bread in a hot oven", "the recipe needs flour butter and sugar", "knead the dough before you bake"]
+
+class TestTopicModelingTool(unittest.TestCase):
+    def setUp(self):
+        self.tool = topic_modeling_tool.TopicModelingTool()
+        self.options = {"model_name": "test", "num_topics": 2, "n_jobs": 1}
+
+    def tearDown(self):
+        self.tool.execute(operation="delete", model_name="test")
+
+    def test_fit_then_infer(self):
+        fitted = self.tool.execute(documents=SPORTS + COOKING, operation="fit", **self.options)
+        self.assertEqual(fitted["documents_seen"], 6)
+        self.assertEqual(len(fitted["topics"]), 2)
+        inferred = self.tool.execute(documents=["the team scored a goal", "bake the dough"], operation="infer", **self.options)
+        self.assertEqual(len(inferred["documents"]), 2)
+        for document in inferred["documents"]:
+            self.assertAlmostEqual(sum(document["topic_distribution"].values()), 1.0, places=2)
+
+    def test_infer_unknown_model(self):
+        self.assertIn("error", self.tool.execute(documents=SPORTS, operation="infer", model_name="missing"))
+
+    def test_concurrent_updates_lose_nothing(self):
+        self.tool.execute(documents=SPORTS + COOKING, operation="fit", **self.options)
+        lda = topic_modeling_tool.topic_models["test"].lda
+        partial_fit, running, overlaps = lda.partial_fit, [], []
+        def tracked_partial_fit(batch):
+            running.append(batch)
+            overlaps.append(len(running))
+            time.sleep(0.01)
+            try:
+                return partial_fit(batch)
+            finally:
+                running.pop()
+        lda.partial_fit = tracked_partial_fit
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda batch: self.tool.execute(documents=batch, operation="update", **self.options),
+                                    [SPORTS, COOKING] * 8))
+        self.assertTrue(all("error" not in result for result in results))
+        summary = self.tool.execute(operation="get_topics", **self.options)
+        self.assertEqual((summary["documents_seen"], summary["updates"]), (6 + 16 * 3, 17))
+        self.assertEqual(max(overlaps), 1)  # one update at a time per model
+
+    def test_models_pickle_without_their_lock(self):
+        model = topic_modeling_tool.OnlineTopicModel(num_topics=2, n_jobs=1).fit(SPORTS + COOKING)
+        for restored in (pickle.loads(pickle.dumps(model)), copy.deepcopy(model)):
+            self.assertEqual(restored.top_words(3), model.top_words(3))
+            restored.partial_fit(SPORTS)
+            self.assertEqual(restored.documents_seen, 9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+
+# Import the tool module directly
+import mic.tools.transcription_engine as transcription_engine
+
+class _TimestampRecognizer:
+    """Emits one 'word' per second of chunk audio, named after its absolute start second."""
+    def __init__(self):
+        self.chunk_seconds = []
+
+    def transcribe(self, audio, language):
+        self.chunk_seconds.append(len(audio) / transcription_engine.SAMPLE_RATE)
+        return [{"word": "w", "start": float(second), "end": second + 0.5} for second in range(int(len(audio) / transcription_engine.SAMPLE_RATE))]
+
+class TestTranscriptionEngine(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "meeting.wav")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_diarization_finds_speakers_and_turns(self):
+        turns = [(0, 0.5, 6.0), (1, 6.8, 12.0), (0, 12.5, 15.5), (2, 16.2, 24.0), (1, 24.6, 30.0)]
+        transcription_engine.synthetic_speech(self.path, turns, 31.0)
+        # Small analysis windows exercise the parallel, stitched front-end.
+        energy, mfcc = transcription_engine.analyze_audio(transcription_engine.AudioSource(self.path), workers=2, window_seconds=7)
+        whole_energy, whole_mfcc = transcription_engine.analyze_audio(transcription_engine.AudioSource(self.path), workers=1)
+        np.testing.assert_allclose(energy, whole_energy, atol=1e-3)
+        np.testing.assert_allclose(mfcc, whole_mfcc, atol=1e-3)
+
+        result = transcription_engine.TranscriptionEngine(workers=1).diarize(self.path)
+        self.assertEqual(result["num_speakers"], 3)
+        self.assertEqual([turn["speaker"] for turn in result["turns"]], [0, 1, 0, 2, 1])
+        for turn, (_, start, end) in zip(result["turns"], turns):
+            self.assertAlmostEqual(turn["start"] / 100.0, start, delta=0.3)
+            self.assertAlmostEqual(turn["end"] / 100.0, end, delta=0.3)
+
+    def test_long_turn_is_split_with_overlap_and_stitched(self):
+        transcription_engine.synthetic_speech(self.path, [(0, 0.0, 75.0)], 76.0)
+        recognizer = _TimestampRecognizer()
+        result = transcription_engine.TranscriptionEngine(backend=recognizer, workers=2).transcribe(self.path, diarize=False)
+        self.assertEqual(result["chunks"], 3)
+        self.assertTrue(all(seconds <= transcription_engine.MAX_CHUNK_SECONDS + 2 * transcription_engine.CHUNK_OVERLAP_SECONDS
+                            for seconds in recognizer.chunk_seconds))
+        words = result["segments"][0]["words"]
+        starts = [word["start"] for word in words]
+        # Overlapping audio is recognized twice but every moment is kept exactly once.
+        self.assertEqual(starts, sorted(starts))
+        self.assertTrue(all(b - a > 0.5 for a, b in zip(starts, starts[1:])))
+        self.assertGreater(len(words), 70)
+
+if __name__ == '__main__':
+    unittest.main()
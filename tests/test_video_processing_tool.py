@@ -0,0 +1,49 @@
+import unittest
+import sys
+import os
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+
+# Import the tool module directly
+import mic.tools.video_processing_tool as video_processing_tool
+
+def _shot(rng, frames, drift=2):
+    """A smooth random texture panning sideways, like a camera move within one shot."""
+    base = rng.integers(0, 256, size=(9, 16, 3), dtype=np.uint8).repeat(10, axis=0).repeat(10, axis=1)
+    return np.stack([np.roll(base, drift * i, axis=1) for i in range(frames)])
+
+class TestSceneDetector(unittest.TestCase):
+    def test_finds_cuts_across_block_boundaries(self):
+        rng = np.random.default_rng(1)
+        video = np.concatenate([_shot(rng, 70), _shot(rng, 45), _shot(rng, 100)])
+        detector = video_processing_tool.SceneDetector(fps=25.0)
+        # Odd block sizes put the second cut right at the start of a block.
+        for start in range(0, len(video), 23):
+            detector.update(video[start:start + 23])
+        self.assertEqual([cut["frame"] for cut in detector.cuts], [70, 115])
+        scenes = detector.scenes()
+        self.assertEqual([(scene["start_frame"], scene["end_frame"]) for scene in scenes], [(0, 70), (70, 115), (115, 215)])
+        self.assertAlmostEqual(scenes[-1]["end_time_seconds"], 215 / 25.0)
+
+    def test_minimum_scene_length_and_static_video(self):
+        rng = np.random.default_rng(2)
+        detector = video_processing_tool.SceneDetector(fps=25.0, min_scene_seconds=1.0)
+        detector.update(np.concatenate([_shot(rng, 60), _shot(rng, 10), _shot(rng, 60)]))
+        self.assertEqual([cut["frame"] for cut in detector.cuts], [60])
+
+        still = video_processing_tool.SceneDetector(fps=25.0, sensitivity=1.0)
+        still.update(np.repeat(_shot(rng, 1), 120, axis=0))
+        self.assertEqual(still.cuts, [])
+        self.assertEqual(len(still.scenes()), 1)
+
+    def test_missing_video(self):
+        tool = video_processing_tool.VideoSceneDetectorTool()
+        self.assertIn("error", tool.execute(video_path="/nonexistent/video.mp4"))
+        results = tool.execute(video_paths=["/nonexistent/a.mp4", "/nonexistent/b.mp4"], workers=2)
+        self.assertEqual(results["failed"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+import base64
+import threading
+from io import BytesIO
+
+# Add the 'mic' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+# Import the tool module directly
+import mic.tools.vision_inference_service as vision_service_tool
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_submissions_share_batches(self):
+        batches = []
+        release = threading.Event()
+
+        def run_batch(items):
+            release.wait(5)
+            batches.append(list(items))
+            return [item * 10 for item in items]
+
+        batcher = vision_service_tool.MicroBatcher(run_batch, max_batch_size=4, max_wait_ms=50)
+        try:
+            futures = [batcher.submit(i) for i in range(9)]
+            release.set()
+            self.assertEqual([future.result(timeout=5) for future in futures], [i * 10 for i in range(9)])
+        finally:
+            batcher.close()
+        self.assertEqual(sum(len(batch) for batch in batches), 9)
+        self.assertLessEqual(max(len(batch) for batch in batches), 4)
+        self.assertLess(len(batches), 9)
+
+@unittest.skipUnless(vision_service_tool.PIL_AVAILABLE, "Pillow is not installed")
+class TestVisionInferenceService(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.service = vision_service_tool.VisionInferenceService(max_batch_size=8, max_wait_ms=20)
+
+        def factory():
+            def run(batch):
+                self.calls.append(len(batch))
+                return [{"size": decoded.size, "decoded": decoded.image.size, "scale": params.get("scale", 1)} for decoded, params in batch]
+            return run
+
+        self.service.register_task("measure", factory)
+
+    def _image(self, color, size=(2000, 1000)):
+        buffer = BytesIO()
+        vision_service_tool.Image.new("RGB", size, color).save(buffer, format="JPEG")
+        return {"image_base64": base64.b64encode(buffer.getvalue()).decode("ascii")}
+
+    def test_results_are_cached_by_content_and_parameters(self):
+        images = [self._image((i * 40, 0, 0)) for i in range(4)]
+        first = self.service.run_many("measure", images)
+        self.assertEqual([entry["index"] for entry in first], [0, 1, 2, 3])
+        self.assertEqual(first[0]["result"]["size"], (2000, 1000))
+        self.assertLessEqual(max(first[0]["result"]["decoded"]), vision_service_tool.MAX_DECODED_SIDE)
+
+        again = self.service.run("measure", dict(images[2]))
+        self.assertEqual(again, first[2]["result"])
+        self.assertEqual(sum(self.calls), 4)
+        self.service.run("measure", images[2], scale=2)
+        self.assertEqual(sum(self.calls), 5)
+        self.assertEqual(self.service.stats()["decoded_cache"]["hits"], 1)
+
+    def test_stream_reports_errors_per_image(self):
+        entries = list(self.service.stream("measure", [self._image((0, 0, 0)), {"image_path": "/does/not/exist.png"}]))
+        by_index = {entry["index"]: entry for entry in entries}
+        self.assertIn("result", by_index[0])
+        self.assertIn("not found", by_index[1]["error"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,573 @@
+import json
+import logging
+import os
+import subprocess  # nosec B404
+import tempfile
+import time
+import wave
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from tools.transcription_engine import pcm_to_float32
+
+try:
+    from scipy.signal import resample_poly
+    SCIPY_AVAILABLE = True
+except ImportError:
+    resample_poly = None
+    SCIPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+FFPROBE_BINARY = os.getenv("FFPROBE_BINARY", "ffprobe")
+# Frames per PCM buffer while rendering; peak memory is a small multiple of this.
+AUDIO_CHUNK_FRAMES = int(os.getenv("AUDIO_CHUNK_FRAMES", 65536))
+_SILENCE_DB = -120.0
+
+def db_to_gain(db: float) -> float:
+    return float(10 ** (db / 20.0))
+
+def float32_to_pcm(samples: np.ndarray, sample_width: int) -> bytes:
+    """Interleaved float32 in [-1, 1] to little-endian PCM as WAV stores it, with clipping."""
+    scale = float(1 << (8 * sample_width - 1))
+    values = np.clip(np.rint(samples.reshape(-1) * scale), -scale, scale - 1)
+    if sample_width == 1:
+        return (values + 128).astype(np.uint8).tobytes()
+    if sample_width == 2:
+        return values.astype("<i2").tobytes()
+    if sample_width == 3:
+        return values.astype("<i4").view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    return values.astype("<i4").tobytes()
+
+class AudioClip:
+    """
+    A node of a lazy audio edit graph.
+
+    Edits (trim/slicing, gain, fades, concatenation, reversal, speed, resampling and
+    channel changes) only build new nodes; nothing is decoded until ``export`` (or
+    ``max``) streams the graph once, in buffers of ``AUDIO_CHUNK_FRAMES`` float32
+    frames, from the sources straight into the encoder. Every node can render any
+    frame range on demand, so a trim never decodes audio outside its range and peak
+    memory does not depend on the length of the files. Times are in milliseconds as
+    in pydub, whose operators (``clip[a:b]``, ``clip + db``, ``clip + other``) are kept.
+    """
+    __slots__ = ("frame_rate", "channels", "sample_width", "frame_count")
+
+    def __init__(self, frame_rate: int, channels: int, sample_width: int, frame_count: int):
+        self.frame_rate = frame_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.frame_count = max(0, int(frame_count))
+
+    def __len__(self) -> int:
+        return int(round(self.frame_count * 1000.0 / self.frame_rate))
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.frame_count / self.frame_rate
+
+    def _frames(self, ms: float) -> int:
+        return int(round(ms * self.frame_rate / 1000.0))
+
+    def chunks(self, start: int = 0, stop: Optional[int] = None, chunk_frames: int = AUDIO_CHUNK_FRAMES) -> Iterator[np.ndarray]:
+        """Yields (frames, channels) float32 buffers covering frames [start, stop) of this clip."""
+        stop = self.frame_count if stop is None else min(stop, self.frame_count)
+        start = max(0, start)
+        if start < stop:
+            yield from self._chunks(start, stop, chunk_frames)
+
+    def _chunks(self, start: int, stop: int, size: int) -> Iterator[np.ndarray]:
+        raise NotImplementedError
+
+    def read(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Frames [start, stop) as one array; meant for short ranges."""
+        parts = list(self.chunks(start, stop))
+        return np.concatenate(parts) if parts else np.zeros((0, self.channels), dtype=np.float32)
+
+    # --- edits -----------------------------------------------------------------
+
+    def trim(self, start_ms: float = 0, end_ms: Optional[float] = None) -> "AudioClip":
+        start = self._frames(start_ms)
+        stop = self.frame_count if end_ms is None else self._frames(end_ms)
+        return _Slice.of(self, start, stop)
+
+    def __getitem__(self, item: slice) -> "AudioClip":
+        if not isinstance(item, slice) or item.step not in (None, 1):
+            raise TypeError("Audio clips are sliced in milliseconds, e.g. clip[1000:5000].")
+        start, stop = item.start or 0, item.stop
+        # Negative positions count from the end, as with lists and pydub.
+        return self.trim(start + len(self) if start < 0 else start,
+                         stop + len(self) if stop is not None and stop < 0 else stop)
+
+    def apply_gain(self, db: float) -> "AudioClip":
+        return _Gain.of(self, db_to_gain(db))
+
+    def __add__(self, other: Any) -> "AudioClip":
+        if isinstance(other, AudioClip):
+            return concatenate([self, other])
+        return self.apply_gain(float(other))
+
+    def __sub__(self, db: float) -> "AudioClip":
+        return self.apply_gain(-float(db))
+
+    def fade_in(self, duration_ms: float) -> "AudioClip":
+        return _Fade(self, 0, min(self._frames(duration_ms), self.frame_count), rising=True)
+
+    def fade_out(self, duration_ms: float) -> "AudioClip":
+        length = min(self._frames(duration_ms), self.frame_count)
+        return _Fade(self, self.frame_count - length, length, rising=False)
+
+    def reverse(self) -> "AudioClip":
+        return self.child if isinstance(self, _Reverse) else _Reverse(self)
+
+    def with_frame_rate(self, frame_rate: int) -> "AudioClip":
+        """Reinterprets the samples at another rate: speed and pitch change together."""
+        return _Relabel(self, frame_rate=int(frame_rate))
+
+    def set_frame_rate(self, frame_rate: int) -> "AudioClip":
+        """Resamples to another rate, keeping duration and pitch."""
+        frame_rate = int(frame_rate)
+        return self if frame_rate == self.frame_rate else _Resample(self, frame_rate)
+
+    def speedup(self, multiplier: float) -> "AudioClip":
+        """Plays ``multiplier`` times faster (pitch follows), at the original sample rate."""
+        # Rounding the intermediate rate to 100 Hz keeps the resampling ratio (and its filter) small.
+        return self.with_frame_rate(max(100, int(round(self.frame_rate * multiplier / 100.0)) * 100)).set_frame_rate(self.frame_rate)
+
+    def set_channels(self, channels: int) -> "AudioClip":
+        return self if channels == self.channels else _Remix(self, int(channels))
+
+    def set_sample_width(self, sample_width: int) -> "AudioClip":
+        """Output sample width in bytes; samples are float32 inside the graph until export."""
+        return self if sample_width == self.sample_width else _Relabel(self, sample_width=int(sample_width))
+
+    def describe(self) -> Dict[str, Any]:
+        """The graph as nested dictionaries, for logging and explain-style output."""
+        node = {"node": type(self).__name__.lstrip("_"), "frames": self.frame_count, "frame_rate": self.frame_rate, "channels": self.channels}
+        node.update(self._describe())
+        return node
+
+    def _describe(self) -> Dict[str, Any]:
+        return {}
+
+    # --- rendering -------------------------------------------------------------
+
+    @property
+    def max(self) -> int:
+        """Largest absolute sample value in integer units of ``sample_width`` (one streaming pass)."""
+        peak = 0.0
+        for chunk in self.chunks():
+            if chunk.size:
+                peak = max(peak, float(np.abs(chunk).max()))
+        return int(min(round(peak * (1 << (8 * self.sample_width - 1))), (1 << (8 * self.sample_width - 1)) - 1))
+
+    def export(self, out_f: str, format: Optional[str] = None, bitrate: Optional[str] = None,
+               chunk_frames: int = AUDIO_CHUNK_FRAMES) -> Dict[str, Any]:
+        """
+        Renders the graph once into ``out_f``. WAV is written directly; every other
+        format is encoded by an ffmpeg process fed the PCM stream on stdin. The file
+        is written next to the destination and moved into place when complete, so
+        exporting over one of the graph's own sources is safe.
+        """
+        format = (format or os.path.splitext(out_f)[1].lstrip(".") or "wav").lower()
+        start = time.perf_counter()
+        directory = os.path.dirname(os.path.abspath(out_f))
+        descriptor, temporary = tempfile.mkstemp(prefix=".tmp-", suffix=f".{format}", dir=directory)
+        os.close(descriptor)
+        try:
+            if format == "wav":
+                self._write_wav(temporary, chunk_frames)
+            else:
+                self._encode_ffmpeg(temporary, format, bitrate, chunk_frames)
+            os.replace(temporary, out_f)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        elapsed = time.perf_counter() - start
+        return {"output_path": out_f, "format": format, "duration_ms": len(self), "frame_rate": self.frame_rate,
+                "channels": self.channels, "seconds": round(elapsed, 3),
+                "realtime_factor": round(self.duration_seconds / elapsed, 1) if elapsed > 0 else None}
+
+    def _write_wav(self, path: str, chunk_frames: int) -> None:
+        with wave.open(path, "wb") as f:
+            f.setnchannels(self.channels)
+            f.setsampwidth(self.sample_width)
+            f.setframerate(self.frame_rate)
+            f.setnframes(self.frame_count)
+            for chunk in self.chunks(chunk_frames=chunk_frames):
+                f.writeframesraw(float32_to_pcm(chunk, self.sample_width))
+
+    def _encode_ffmpeg(self, path: str, format: str, bitrate: Optional[str], chunk_frames: int) -> None:
+        command = [FFMPEG_BINARY, "-nostdin", "-v", "error", "-y", "-f", "f32le", "-ar", str(self.frame_rate),
+                   "-ac", str(self.channels), "-i", "-"] + (["-b:a", bitrate] if bitrate else []) + ["-f", format, path]
+        with tempfile.TemporaryFile() as errors:
+            try:
+                process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=errors)  # nosec B603
+            except FileNotFoundError:
+                raise RuntimeError(f"'{FFMPEG_BINARY}' was not found; only WAV can be written without FFmpeg.")
+            try:
+                for chunk in self.chunks(chunk_frames=chunk_frames):
+                    process.stdin.write(np.ascontiguousarray(chunk, dtype="<f4").tobytes())
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            finally:
+                if process.wait() != 0:
+                    errors.seek(0)
+                    raise RuntimeError(f"ffmpeg could not encode '{format}': {errors.read().decode(errors='replace').strip()}")
+
+class FileClip(AudioClip):
+    """
+    An audio file. PCM WAV is read with the standard library, seeking straight to
+    the requested frames; other formats (and float WAV) are decoded by ffmpeg
+    from the requested position onward.
+    """
+    __slots__ = ("path", "_pcm")
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Audio file not found at the specified path: '{path}'.")
+        self.path = path
+        try:
+            with wave.open(path, "rb") as f:
+                super().__init__(f.getframerate(), f.getnchannels(), f.getsampwidth(), f.getnframes())
+            self._pcm = True
+        except (wave.Error, EOFError):
+            self._pcm = False
+            super().__init__(**self._probe())
+
+    def _probe(self) -> Dict[str, int]:
+        command = [FFPROBE_BINARY, "-v", "error", "-select_streams", "a:0", "-show_entries",
+                   "stream=sample_rate,channels,bits_per_sample,bits_per_raw_sample,duration:format=duration", "-of", "json", self.path]
+        try:
+            process = subprocess.run(command, capture_output=True, text=True, check=False)  # nosec B603
+        except FileNotFoundError:
+            raise RuntimeError(f"Only PCM WAV can be read without FFmpeg; '{FFPROBE_BINARY}' was not found.")
+        info = json.loads(process.stdout or "{}") if process.returncode == 0 else {}
+        if not info.get("streams"):
+            raise ValueError(f"No audio stream found in '{self.path}': {process.stderr.strip()}")
+        stream = info["streams"][0]
+        duration = stream.get("duration") or info.get("format", {}).get("duration")
+        if duration in (None, "N/A"):
+            raise ValueError(f"Could not determine the duration of '{self.path}'.")
+        bits = max(int(stream.get("bits_per_raw_sample") or 0), int(stream.get("bits_per_sample") or 0))
+        frame_rate = int(stream["sample_rate"])
+        return {"frame_rate": frame_rate, "channels": int(stream["channels"]),
+                "sample_width": min(4, bits // 8) if bits >= 8 else 2, "frame_count": int(round(float(duration) * frame_rate))}
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"path": self.path}
+
+    def _chunks(self, start: int, stop: int, size: int) -> Iterator[np.ndarray]:
+        if self._pcm:
+            with wave.open(self.path, "rb") as f:
+                f.setpos(start)
+                position = start
+                while position < stop:
+                    raw = f.readframes(min(size, stop - position))
+                    if not raw:
+                        break
+                    chunk = pcm_to_float32(raw, self.sample_width).reshape(-1, self.channels)
+                    position += len(chunk)
+                    yield chunk
+            if position < stop:
+                yield np.zeros((stop - position, self.channels), dtype=np.float32)
+            return
+        yield from self._decode(start, stop, size)
+
+    def _decode(self, start: int, stop: int, size: int) -> Iterator[np.ndarray]:
+        command = [FFMPEG_BINARY, "-nostdin", "-v", "error"] + (["-ss", f"{start / self.frame_rate:.6f}"] if start else []) + \
+                  ["-i", self.path, "-vn", "-f", "f32le", "-ac", str(self.channels), "-ar", str(self.frame_rate), "-"]
+        frame_bytes = 4 * self.channels
+        with tempfile.TemporaryFile() as errors:
+            try:
+                process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=errors)  # nosec B603
+            except FileNotFoundError:
+                raise RuntimeError(f"'{FFMPEG_BINARY}' was not found; only PCM WAV can be read without FFmpeg.")
+            position = start
+            try:
+                while position < stop:
+                    raw = process.stdout.read(min(size, stop - position) * frame_bytes)
+                    if len(raw) < frame_bytes:
+                        break
+                    chunk = np.frombuffer(raw[:len(raw) // frame_bytes * frame_bytes], dtype="<f4").reshape(-1, self.channels)
+                    position += len(chunk)
+                    yield chunk
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                process.wait()
+                process.stdout.close()
+            if position == start and process.returncode not in (0, -9):
+                errors.seek(0)
+                raise RuntimeError(f"ffmpeg failed for '{self.path}': {errors.read().decode(errors='replace').strip()}")
+        # Container durations are approximate; pad so positions in the graph stay exact.
+        if position < stop:
+            yield np.zeros((stop - position, self.channels), dtype=np.float32)
+
+class _Slice(AudioClip):
+    __slots__ = ("child", "start")
+
+    def __init__(self, child: AudioClip, start: int, stop: int):
+        start, stop = max(0, min(start, child.frame_count)), max(0, min(stop, child.frame_count))
+        super().__init__(child.frame_rate, child.channels, child.sample_width, max(0, stop - start))
+        self.child = child
+        self.start = start
+
+    @classmethod
+    def of(cls, child: AudioClip, start: int, stop: int) -> AudioClip:
+        # A trim of a trim is one trim of the original clip.
+        if isinstance(child, _Slice):
+            start, stop = max(0, start), max(0, min(stop, child.frame_count))
+            return cls(child.child, child.start + start, child.start + stop)
+        return cls(child, start, stop)
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"start_frame": self.start, "input": self.child.describe()}
+
+    def _chunks(self, start: int, stop: int, size: int) -> Iterator[np.ndarray]:
+        return self.child.chunks(self.start + start, self.start + stop, size)
+
+class _Concat(AudioClip):
+    __slots__ = ("children", "_offsets")
+
+    def __init__(self, children: Sequence[AudioClip]):
+        first = children[0]
+        self.children = [child.set_frame_rate(first.frame_rate).set_channels(first.channels) for child in children]
+        self._offsets = np.cumsum([0] + [child.frame_count for child in self.children])
+        super().__init__(first.frame_rate, first.channels, max(child.sample_width for child in children), int(self._offsets[-1]))
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"inputs": [child.describe() for child in self.children]}
+
+    def _chunks(self, start: int, stop: int, size: int) -> Iterator[np.ndarray]:
+        first = int(np.searchsorted(self._offsets, start, side="right")) - 1
+        for index in range(first, len(self.children)):
+            offset = int(self._offsets[index])
+            if offset >= stop:
+                break
+            yield from self.children[index].chunks(start - offset, stop - offset, size)
+
+def concatenate(clips: Sequence[AudioClip]) -> AudioClip:
+    """Joins clips end to end; clips are converted to the first clip's rate and channel count while streaming."""
+    flat: List[AudioClip] = []
+    for clip in clips:
+        flat.extend(clip.children if isinstance(clip, _Concat) else [clip])
+    if not flat:
+        raise ValueError("Nothing to concatenate.")
+    return flat[0] if len(flat) == 1 else _Concat(flat)
+
+class _Gain(AudioClip):
+    __slots__ = ("child", "factor")
+
+    def __init__(self, child: AudioClip, factor: float):
+        super().__init__(child.frame_rate, child.channels, child.sample_width, child.frame_count)
+        self.child = child
+        self.factor = np.float32(factor)
+
+    @classmethod
+    def of(cls, child: AudioClip, factor: float) -> AudioClip:
+        if isinstance(child, _Gain):
+            return cls(child.child, float(child.factor) * factor)
+        return cls(child, factor)
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"gain_db": round(20 * float(np.log10(max(float(self.factor), 1e-12))), 2), "input": self.child.describe()}
+
+    def _chunks(self, start: int, stop: int, size: int) -> Iterator[np.ndarray]:
+        for chunk in self.child.chunks(start, stop, size):
+            yield chunk * self.factor
+
+class _Fade(AudioClip):
+    """Linear amplitude ramp from silence (-120 dB) to unity, or back, over ``length`` frames from ``offset``."""
+    __slots__ = ("child", "offset", "length", "rising")
+
+    def __init__(self, child: AudioClip, offset: int, length: int, rising: bool):
+        super().__init__(child.frame_rate, child.channels, child.sample_width, child.frame_count)
+        self.child, self.offset, self.length, self.rising = child, offset, max(0, length), rising
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"fade": "in" if self.rising else "out", "offset_frame": self.offset, "length_frames": self.length,
+                "input": self.child.describe()}
+
+    def _chunks(self, start: int, stop: int, size: int) -> Iterator[np.ndarray]:
+        position = start
+        silent = db_to_gain(_SILENCE_DB)
+        for chunk in self.child.chunks(start, stop, size):
+            first, position = position, position + len(chunk)
+            # Chunks entirely at unity gain pass through untouched.
+            if self.rising and first >= self.offset + self.length or not self.rising and position <= self.offset:
+                yield chunk
+                continue
+            progress = np.clip((np.arange(first, position) - self.offset) / max(self.length, 1), 0.0, 1.0)
+            ramp = silent + (1.0 - silent) * (progress if self.rising else 1.0 - progress)
+            yield chunk * ramp.astype(np.float32)[:, None]
+
+class _Reverse(AudioClip):
+    __slots__ = ("child",)
+
+    def __init__(self, child: AudioClip):
+        super().__init__(child.frame_rate, child.channels, child.sample_width, child.frame_count)
+        self.child = child
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"input": self.child.describe()}
+
+    def _chunks(self, start: int, stop: int, size: int) -> Iterator[np.ndarray]:
+        # Walk the child's mirrored range backwards one block at a time.
+        end = self.frame_count - start
+        low = self.frame_count - stop
+        while end > low:
+            begin = max(low, end - size)
+            yield self.child.read(begin, end)[::-1]
+            end = begin
+
+class _Relabel(AudioClip):
+    """Same samples under a different frame rate (speed change) or output sample width."""
+    __slots__ = ("child",)
+
+    def __init__(self, child: AudioClip, frame_rate: Optional[int] = None, sample_width: Optional[int] = None):
+        super().__init__(frame_rate or child.frame_rate, child.channels, sample_width or child.sample_width, child.frame_count)
+        self.child = child
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"input": self.child.describe()}
+
+    def _chunks(self, start: int, stop: int, size: int) -> Iterator[np.ndarray]:
+        return self.child.chunks(start, stop, size)
+
+class _Resample(AudioClip):
+    """
+    Polyphase resampling that streams: every output block is computed from the
+    matching input range plus padding and cropped, so the blocks join exactly as if
+    the whole clip had been resampled at once.
+    """
+    __slots__ = ("child", "up", "down", "padding")
+
+    def __init__(self, child: AudioClip, frame_rate: int):
+        if not SCIPY_AVAILABLE:
+            raise RuntimeError("Resampling requires 'scipy'.")
+        divisor = int(np.gcd(frame_rate, child.frame_rate))
+        self.child, self.up, self.down = child, frame_rate // divisor, child.frame_rate // divisor
+        # resample_poly's filter reaches 10 * max(up, down) upsampled samples each way; pad beyond that in input frames.
+        self.padding = 10 * max(self.up, self.down) // self.up + 16
+        super().__init__(frame_rate, child.channels, child.sample_width, -(-child.frame_count * self.up // self.down))
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"from_frame_rate": self.child.frame_rate, "input": self.child.describe()}
+
+    def _chunks(self, start: int, stop: int, size: int) -> Iterator[np.ndarray]:
+        for block_start in range(start, stop, size):
+            block_stop = min(stop, block_start + size)
+            # First input frame: padded back and aligned to a multiple of 'down' so it maps to a whole output frame.
+            first = max(0, (block_start * self.down // self.up - self.padding) // self.down * self.down)
+            last = min(self.child.frame_count, -(-block_stop * self.down // self.up) + self.padding)
+            resampled = resample_poly(self.child.read(first, last), self.up, self.down, axis=0)
+            offset = first * self.up // self.down
+            yield resampled[block_start - offset:block_stop - offset].astype(np.float32, copy=False)
+
+class _Remix(AudioClip):
+    """Channel conversion: down-mixes by averaging, up-mixes by copying the mono mix to every channel."""
+    __slots__ = ("child",)
+
+    def __init__(self, child: AudioClip, channels: int):
+        super().__init__(child.frame_rate, channels, child.sample_width, child.frame_count)
+        self.child = child
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"from_channels": self.child.channels, "input": self.child.describe()}
+
+    def _chunks(self, start: int, stop: int, size: int) -> Iterator[np.ndarray]:
+        for chunk in self.child.chunks(start, stop, size):
+            mono = chunk.mean(axis=1, keepdims=True) if chunk.shape[1] > 1 else chunk
+            yield mono if self.channels == 1 else np.repeat(mono, self.channels, axis=1)
+
+def open_audio(path: str) -> AudioClip:
+    """Opens a file as the leaf of an edit graph; only the header is read."""
+    return FileClip(path)
+
+def build_timeline(clips: List[Dict[str, Any]]) -> AudioClip:
+    """
+    Builds a graph from a JSON-friendly timeline: each entry has 'file_path' and
+    optional 'start_ms', 'end_ms', 'gain_db', 'fade_in_ms', 'fade_out_ms' and
+    'reverse'; entries are concatenated in order.
+    """
+    if not clips:
+        raise ValueError("The timeline needs at least one clip.")
+    parts = []
+    for entry in clips:
+        clip = open_audio(entry["file_path"])
+        if entry.get("start_ms") is not None or entry.get("end_ms") is not None:
+            # Slicing maps negative positions from the end, as the tool schema documents.
+            clip = clip[entry.get("start_ms") or 0:entry.get("end_ms")]
+            if len(clip) == 0:
+                raise ValueError(f"start_ms={entry.get('start_ms')} and end_ms={entry.get('end_ms')} select nothing "
+                                 f"of '{entry['file_path']}'.")
+        if entry.get("reverse"):
+            clip = clip.reverse()
+        if entry.get("gain_db"):
+            clip = clip.apply_gain(entry["gain_db"])
+        if entry.get("fade_in_ms"):
+            clip = clip.fade_in(entry["fade_in_ms"])
+        if entry.get("fade_out_ms"):
+            clip = clip.fade_out(entry["fade_out_ms"])
+        parts.append(clip)
+    return concatenate(parts)
+
+def write_test_tone(path: str, seconds: float, frame_rate: int = 44100, channels: int = 2, frequency: float = 440.0,
+                    chunk_frames: int = 1 << 20) -> None:
+    """Writes a 16-bit sine WAV in chunks (used by the tests and the benchmark)."""
+    with wave.open(path, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(frame_rate)
+        total = int(seconds * frame_rate)
+        for first in range(0, total, chunk_frames):
+            t = np.arange(first, min(total, first + chunk_frames)) / frame_rate
+            tone = (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+            f.writeframes(float32_to_pcm(np.repeat(tone[:, None], channels, axis=1), 2))
+
+if __name__ == "__main__":
+    import tracemalloc
+
+    def streamed(first: str, second: str, output: str) -> None:
+        graph = concatenate([open_audio(first)[5000:-5000].apply_gain(-3).fade_in(2000),
+                             open_audio(second).reverse().fade_out(3000)]).set_channels(1)
+        graph.export(output)
+
+    def eager(first: str, second: str, output: str) -> None:
+        # What decoding whole files per step costs: every intermediate is a full-length array.
+        decoded = []
+        for path in (first, second):
+            with wave.open(path, "rb") as f:
+                decoded.append(pcm_to_float32(f.readframes(f.getnframes()), 2).reshape(-1, 2))
+        a = decoded[0][220500:-220500] * np.float32(db_to_gain(-3))
+        a[:88200] *= np.linspace(0.0, 1.0, 88200, dtype=np.float32)[:, None]
+        b = decoded[1][::-1].copy()
+        b[-132300:] *= np.linspace(1.0, 0.0, 132300, dtype=np.float32)[:, None]
+        with wave.open(output, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(44100)
+            f.writeframes(float32_to_pcm(np.concatenate([a, b]).mean(axis=1), 2))
+
+    # Trim + gain + fades + reversal + concatenation + down-mix of two 44.1 kHz stereo WAVs.
+    # The eager variant only runs on the short inputs: at an hour it needs several GiB.
+    minutes = float(os.getenv("AUDIO_BENCHMARK_MINUTES", 60))
+    with tempfile.TemporaryDirectory() as root:
+        for length, variants in ((10.0, (streamed, eager)), (minutes, (streamed,))):
+            first, second = os.path.join(root, "first.wav"), os.path.join(root, "second.wav")
+            write_test_tone(first, length * 60, frequency=440.0)
+            write_test_tone(second, length * 60, frequency=660.0)
+            for render in variants:
+                tracemalloc.start()
+                start = time.perf_counter()
+                render(first, second, os.path.join(root, "edited.wav"))
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"{render.__name__:>8}, 2 x {length:.0f} min: {elapsed:.1f}s ({2 * length * 60 / elapsed:.0f}x real time), "
+                      f"peak traced memory {peak / 2 ** 20:.1f} MiB")
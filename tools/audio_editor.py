@@ -1,23 +1,27 @@
 import os
-from pydub import AudioSegment
 import logging
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from tools.base_tool import BaseTool
+from tools.audio_edit_graph import AudioClip, build_timeline, concatenate, open_audio
 
 logger = logging.getLogger(__name__)
 
-def _load_audio(file_path: str) -> AudioSegment:
-    """Helper function to load an audio file and provide detailed error messages."""
+def _load_audio(file_path: str) -> AudioClip:
+    """
+    Helper function to open an audio file and provide detailed error messages.
+    Only the header is read here: edits on the returned clip are lazy and the audio
+    is decoded once, in a streaming pass, when the result is exported.
+    """
     if not os.path.isabs(file_path):
         raise ValueError("The provided file_path must be an absolute path.")
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Audio file not found at the specified path: '{file_path}'.")
     try:
-        return AudioSegment.from_file(file_path)
-    except Exception as e:
-        logger.error(f"Pydub failed to load audio file '{file_path}': {e}")
-        raise ValueError(f"Could not load audio file. Ensure it is a valid audio format (e.g., wav, mp3). This tool also requires FFmpeg to be installed on the system for most formats. Error: {e}")
+        return open_audio(file_path)
+    except (ValueError, RuntimeError) as e:
+        logger.error(f"Failed to open audio file '{file_path}': {e}")
+        raise ValueError(f"Could not load audio file. Ensure it is a valid audio format (e.g., wav, mp3). Formats other than PCM WAV require FFmpeg to be installed on the system. Error: {e}")
 
 class GetAudioInfoTool(BaseTool):
     """Tool to get detailed information about an audio file."""
@@ -103,10 +107,8 @@ class ConcatenateAudioTool(BaseTool):
         if not input_files:
             raise ValueError("The 'input_files' list cannot be empty.")
         
-        combined = AudioSegment.empty()
-        for file in input_files:
-            combined += _load_audio(file)
-        
+        combined = concatenate([_load_audio(file) for file in input_files])
+
         combined.export(output_path, format=output_path.split('.')[-1])
         
         return json.dumps({"message": f"Successfully concatenated {len(input_files)} files.", "output_path": output_path}, indent=2)
@@ -180,7 +182,7 @@ class ApplyAudioEffectTool(BaseTool):
         elif effect_type == "speed_change":
             multiplier = kwargs.get("speed_multiplier")
             if multiplier is None: raise ValueError("'speed_multiplier' is required for 'speed_change'.")
-            processed_audio = audio.set_frame_rate(int(audio.frame_rate * multiplier))
+            processed_audio = audio.speedup(multiplier)
         elif effect_type == "reverse":
             processed_audio = audio.reverse()
         else:
@@ -188,4 +190,72 @@ class ApplyAudioEffectTool(BaseTool):
 
         processed_audio.export(output_path, format=output_path.split('.')[-1])
         
-        return json.dumps({"message": f"Effect '{effect_type}' applied successfully.", "output_path": output_path}, indent=2)
\ No newline at end of file
+        return json.dumps({"message": f"Effect '{effect_type}' applied successfully.", "output_path": output_path}, indent=2)
+
+class EditAudioTool(BaseTool):
+    """Tool to apply a whole chain of edits to one or more audio files in a single pass."""
+    def __init__(self, tool_name="edit_audio"):
+        super().__init__(tool_name)
+
+    @property
+    def description(self) -> str:
+        return ("Builds an edit from a timeline of clips (each trimmed, reversed, gain-adjusted and faded), concatenates them, "
+                "applies overall gain/fades/format settings and renders the result once in a single streaming pass, "
+                "so hour-long files are edited with constant memory.")
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "clips": {
+                    "type": "array",
+                    "description": "The timeline, in order.",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "file_path": {"type": "string", "description": "Absolute path to the input audio file."},
+                            "start_ms": {"type": "integer", "description": "Optional: start of the part to keep."},
+                            "end_ms": {"type": "integer", "description": "Optional: end of the part to keep (negative counts from the end)."},
+                            "gain_db": {"type": "number"},
+                            "fade_in_ms": {"type": "integer"},
+                            "fade_out_ms": {"type": "integer"},
+                            "reverse": {"type": "boolean"}
+                        },
+                        "required": ["file_path"]
+                    }
+                },
+                "output_path": {"type": "string", "description": "Absolute path to save the result; the extension sets the format unless 'output_format' is given."},
+                "output_format": {"type": "string", "description": "Optional: output format (e.g., 'wav', 'mp3', 'flac')."},
+                "gain_db": {"type": "number", "description": "Optional: gain applied to the whole result."},
+                "fade_in_ms": {"type": "integer", "description": "Optional: fade-in of the whole result."},
+                "fade_out_ms": {"type": "integer", "description": "Optional: fade-out of the whole result."},
+                "sample_rate": {"type": "integer", "description": "Optional: output sample rate (resampled while streaming)."},
+                "channels": {"type": "integer", "description": "Optional: output channel count (1 = mono mix-down)."},
+                "bitrate": {"type": "string", "description": "Optional: bitrate for compressed formats, e.g. '192k'."},
+                "dry_run": {"type": "boolean", "description": "Return the edit graph without rendering.", "default": False}
+            },
+            "required": ["clips", "output_path"]
+        }
+
+    def execute(self, clips: List[Dict[str, Any]], output_path: str, output_format: Optional[str] = None, gain_db: float = 0.0,
+                fade_in_ms: int = 0, fade_out_ms: int = 0, sample_rate: Optional[int] = None, channels: Optional[int] = None,
+                bitrate: Optional[str] = None, dry_run: bool = False, **kwargs: Any) -> str:
+        for clip in clips:
+            _load_audio(clip.get("file_path", ""))  # validates paths with the usual messages
+        audio = build_timeline(clips)
+        if channels:
+            audio = audio.set_channels(channels)
+        if sample_rate:
+            audio = audio.set_frame_rate(sample_rate)
+        if gain_db:
+            audio = audio.apply_gain(gain_db)
+        if fade_in_ms:
+            audio = audio.fade_in(fade_in_ms)
+        if fade_out_ms:
+            audio = audio.fade_out(fade_out_ms)
+        if dry_run:
+            return json.dumps({"duration_ms": len(audio), "graph": audio.describe()}, indent=2)
+
+        stats = audio.export(output_path, format=output_format or output_path.split('.')[-1], bitrate=bitrate)
+        return json.dumps({"message": f"Rendered {len(clips)} clips in one pass.", **stats}, indent=2)
@@ -39,6 +39,7 @@ def generate_mock_code_snippet() -> str:
 
 class ExtractTranslatableStringsTool(BaseTool):
     """Extracts potential translatable strings from code content."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="extract_translatable_strings"):
         super().__init__(tool_name=tool_name)
 
@@ -77,6 +78,7 @@ class ExtractTranslatableStringsTool(BaseTool):
 
 class TranslateStringsTool(BaseTool):
     """Translates a list of strings into a target language using Google Translate."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="translate_strings"):
         super().__init__(tool_name=tool_name)
         self.translator = None
@@ -122,6 +124,7 @@ class TranslateStringsTool(BaseTool):
 
 class GenerateLanguageResourceFileTool(BaseTool):
     """Generates a language-specific JSON resource file."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="generate_language_resource_file"):
         super().__init__(tool_name=tool_name)
 
@@ -1,7 +1,74 @@
+import asyncio
+import functools
+import inspect
 import logging
 import configparser
+import contextvars
+import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Dict, Any, List, Optional
+
+# Threads that run synchronous tools for async callers. Kept apart from the event loop's
+# default executor so slow tools cannot starve other to_thread() work, and the other way round.
+TOOL_EXECUTOR_WORKERS = int(os.getenv("TOOL_EXECUTOR_WORKERS", "32"))
+
+# The user a tool call is made for, set by the caller (core.process_input, IntentDispatcher) rather
+# than taken from the model's arguments. Tools with per-user state read it; it follows calls through aexecute.
+CURRENT_USER: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_user", default=None)
+
+_tool_executor: Optional[ThreadPoolExecutor] = None
+_serial_executors: Dict[str, ThreadPoolExecutor] = {}
+_tool_executor_lock = threading.Lock()
+
+
+def tool_executor() -> ThreadPoolExecutor:
+    """The shared thread pool thread-safe synchronous tools run on when called through aexecute()."""
+    global _tool_executor
+    with _tool_executor_lock:
+        if _tool_executor is None:
+            _tool_executor = ThreadPoolExecutor(max_workers=TOOL_EXECUTOR_WORKERS, thread_name_prefix="tool")
+        return _tool_executor
+
+
+def serial_executor(module: str) -> ThreadPoolExecutor:
+    """
+    The single thread the tools of ``module`` run on when they are not thread-safe. Tools in one
+    module commonly share module-level state (singletons, registries, data files), so their calls
+    are serialized together.
+    """
+    with _tool_executor_lock:
+        if module not in _serial_executors:
+            _serial_executors[module] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"tool-{module}")
+        return _serial_executors[module]
+
+
+def run_sync(awaitable: Awaitable[Any]) -> Any:
+    """
+    Runs ``awaitable`` to completion from synchronous code. Called from inside a running
+    event loop (a sync caller of an async tool), it runs on a fresh loop in another thread,
+    since the current one cannot be re-entered, still seeing the caller's context variables.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(awaitable)
+    return tool_executor().submit(contextvars.copy_context().run, asyncio.run, awaitable).result()
+
+
+def is_stream(result: Any) -> bool:
+    """Whether a tool returned a stream of chunks (a generator or async iterator) rather than one value."""
+    return inspect.isgenerator(result) or hasattr(result, "__aiter__")
+
+
+def collect_stream(stream: Any) -> List[Any]:
+    """The chunks of a streamed tool result as a list, for synchronous callers."""
+    if hasattr(stream, "__aiter__"):
+        async def collect() -> List[Any]:
+            return [chunk async for chunk in stream]
+        return run_sync(collect())
+    return list(stream)
 
 class BaseTool(ABC):
     """
@@ -10,8 +77,23 @@ class BaseTool(ABC):
     This class provides common functionality for all tools, including:
     - Loading configuration from a file.
     - Setting up a logger.
+    - Both a blocking (execute) and an async (aexecute) entry point. A tool implements
+      whichever suits it and gets the other adapted: synchronous tools run on an executor
+      thread when awaited, and I/O-bound tools written against aexecute run natively
+      on the caller's event loop, with a blocking execute derived from it.
     """
 
+    # Tools run concurrently on the shared pool. One known not to be safe for that (e.g. it
+    # rewrites a JSON data file without locking) sets this to False, and its module's calls
+    # then run one at a time on a dedicated thread.
+    thread_safe: bool = True
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        # A tool that only implements aexecute() gets its blocking counterpart for free.
+        if cls.aexecute is not BaseTool.aexecute and getattr(cls.execute, "__isabstractmethod__", False):
+            cls.execute = BaseTool._execute_via_aexecute
+
     def __init__(self, tool_name: str, config_file: str = 'tools/config.ini', **kwargs):
         """
         Initializes the BaseTool.
@@ -82,6 +164,47 @@ class BaseTool(ABC):
         """
         Executes the tool's main functionality.
 
-        This method must be implemented by any concrete tool that inherits from BaseTool.
+        This method must be implemented by any concrete tool that inherits from BaseTool,
+        unless it implements aexecute instead.
         """
         pass
+
+    async def aexecute(self, *args: Any, **kwargs: Any) -> Any:
+        """
+        Executes the tool from async code without blocking the event loop.
+
+        I/O-bound tools override this with a native implementation. By default a coroutine
+        execute is awaited directly and a synchronous one runs on the shared tool executor,
+        or on its module's serial executor unless the tool is thread_safe.
+        """
+        if inspect.iscoroutinefunction(self.execute):
+            return await self.execute(*args, **kwargs)
+        # Like asyncio.to_thread, the call sees the caller's context variables.
+        call = functools.partial(contextvars.copy_context().run, self.execute, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor(), call)
+
+    def aiter_stream(self, stream: Any) -> AsyncIterator[Any]:
+        """
+        Iterates a streamed result of this tool from async code. Each step of a generator is
+        the tool's own blocking work, so it runs where aexecute would run the tool, seeing the
+        context variables current when this is called.
+        """
+        if hasattr(stream, "__aiter__"):
+            return stream.__aiter__()
+        context = contextvars.copy_context()
+        done = object()
+
+        async def chunks() -> AsyncIterator[Any]:
+            loop = asyncio.get_running_loop()
+            while True:
+                chunk = await loop.run_in_executor(self._executor(), context.run, next, stream, done)
+                if chunk is done:
+                    return
+                yield chunk
+        return chunks()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        return tool_executor() if self.thread_safe else serial_executor(type(self).__module__)
+
+    def _execute_via_aexecute(self, *args: Any, **kwargs: Any) -> Any:
+        return run_sync(self.aexecute(*args, **kwargs))
@@ -1,7 +1,13 @@
 import logging
 import json
+import os
 import random
 import hashlib
+import sqlite3
+import struct
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Any
 from tools.base_tool import BaseTool
@@ -46,20 +52,215 @@ class SmartContract:
             "deployed_at": self.deployed_at
         }
 
+def _transaction_hash(transaction: Dict[str, Any]) -> str:
+    """Returns the SHA-256 hash of a transaction's canonical JSON encoding."""
+    return hashlib.sha256(json.dumps(transaction, sort_keys=True).encode()).hexdigest()
+
+def _hash_pair(left: str, right: str) -> str:
+    return hashlib.sha256(bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+def compute_merkle_root(tx_hashes: List[str]) -> str:
+    """Computes the Merkle root of a list of transaction hashes (odd levels duplicate the last node)."""
+    if not tx_hashes:
+        return hashlib.sha256(b"").hexdigest()
+    level = list(tx_hashes)
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [_hash_pair(level[i], level[i + 1]) for i in range(0, len(level), 2)]
+    return level[0]
+
+def compute_merkle_proof(tx_hashes: List[str], position: int) -> List[Dict[str, str]]:
+    """Builds an O(log n) inclusion proof for the transaction at `position`."""
+    proof = []
+    level = list(tx_hashes)
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        sibling = position ^ 1
+        proof.append({"hash": level[sibling], "side": "left" if sibling < position else "right"})
+        level = [_hash_pair(level[i], level[i + 1]) for i in range(0, len(level), 2)]
+        position //= 2
+    return proof
+
+def verify_merkle_proof(tx_hash: str, proof: List[Dict[str, str]], merkle_root: str) -> bool:
+    """Checks that `tx_hash` is included under `merkle_root` using the given proof."""
+    current = tx_hash
+    for step in proof:
+        current = _hash_pair(step["hash"], current) if step["side"] == "left" else _hash_pair(current, step["hash"])
+    return current == merkle_root
+
 class Block:
     """Represents a single block in the simulated blockchain."""
-    def __init__(self, index: int, transactions: List[Dict[str, Any]], previous_hash: str):
+    def __init__(self, index: int, transactions: List[Dict[str, Any]], previous_hash: str,
+                 timestamp: str = None, nonce: int = 0):
         self.index = index
         self.transactions = transactions
-        self.timestamp = datetime.now().isoformat()
+        self.timestamp = timestamp or datetime.now().isoformat()
         self.previous_hash = previous_hash
-        self.nonce = 0 # Simplified: no actual proof-of-work
+        self.nonce = nonce # Simplified: no actual proof-of-work
+        self.tx_hashes = [_transaction_hash(tx) for tx in transactions]
+        self.merkle_root = compute_merkle_root(self.tx_hashes)
         self.hash = self.calculate_hash()
 
+    def header(self) -> Dict[str, Any]:
+        """The fields covered by the block hash; transactions are committed to through the Merkle root."""
+        return {
+            "index": self.index,
+            "timestamp": self.timestamp,
+            "previous_hash": self.previous_hash,
+            "nonce": self.nonce,
+            "merkle_root": self.merkle_root
+        }
+
     def calculate_hash(self) -> str:
-        block_string = json.dumps(self.__dict__, sort_keys=True)
+        block_string = json.dumps(self.header(), sort_keys=True)
         return hashlib.sha256(block_string.encode()).hexdigest()
 
+    def merkle_proof(self, tx_hash: str) -> List[Dict[str, str]]:
+        return compute_merkle_proof(self.tx_hashes, self.tx_hashes.index(tx_hash))
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = self.header()
+        data["hash"] = self.hash
+        data["transactions"] = self.transactions
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Block":
+        """Rebuilds a block from its serialized form. The stored hash is kept so it can be verified."""
+        block = cls(data["index"], data["transactions"], data["previous_hash"],
+                    timestamp=data["timestamp"], nonce=data.get("nonce", 0))
+        block.hash = data["hash"]
+        return block
+
+def _check_block(block: Block, stored_merkle_root: str) -> List[str]:
+    errors = []
+    if block.merkle_root != stored_merkle_root:
+        errors.append(f"Block {block.index}: Merkle root does not match its transactions.")
+    if block.calculate_hash() != block.hash:
+        errors.append(f"Block {block.index}: stored hash does not match block header.")
+    return errors
+
+def _validate_block_range(data_dir: str, start: int, end: int) -> Dict[str, Any]:
+    """
+    Validates blocks [start, end) from a block store. Runs in a worker process, so it opens
+    its own read-only handle. Returns the boundary hashes so the parent can stitch ranges together.
+    """
+    store = BlockStore(data_dir, read_only=True)
+    errors = []
+    first_previous_hash = None
+    previous_hash = None
+    try:
+        for height, data in store.iter_raw(start, end):
+            block = Block.from_dict(data)
+            if block.index != height:
+                errors.append(f"Block at height {height} reports index {block.index}.")
+            errors.extend(_check_block(block, data["merkle_root"]))
+            if previous_hash is None:
+                first_previous_hash = block.previous_hash
+            elif block.previous_hash != previous_hash:
+                errors.append(f"Block {height}: previous_hash does not match block {height - 1}.")
+            previous_hash = block.hash
+    finally:
+        store.close()
+    return {"start": start, "end": end, "first_previous_hash": first_previous_hash,
+            "last_hash": previous_hash, "errors": errors}
+
+class BlockStore:
+    """
+    An append-only, on-disk block file with two indexes:
+    - `blocks.idx`: fixed-width (offset, length) records, so block N is found with a single seek.
+    - `txindex.db`: an SQLite table mapping each transaction hash to its block height and position.
+    The file handles and the SQLite connection are shared by every thread that calls the tools,
+    so all access goes through one lock.
+    """
+    _INDEX_RECORD = struct.Struct("<QI")
+
+    def __init__(self, data_dir: str, read_only: bool = False):
+        self.data_dir = data_dir
+        self.read_only = read_only
+        if not read_only:
+            os.makedirs(data_dir, exist_ok=True)
+        self.blocks_path = os.path.join(data_dir, "blocks.dat")
+        self.index_path = os.path.join(data_dir, "blocks.idx")
+        mode = "rb" if read_only else "a+b"
+        self._blocks = open(self.blocks_path, mode)
+        self._index = open(self.index_path, mode)
+        self._tx_db = sqlite3.connect(os.path.join(data_dir, "txindex.db"), check_same_thread=False)
+        self._lock = threading.RLock()
+        if not read_only:
+            self._tx_db.execute(
+                "CREATE TABLE IF NOT EXISTS tx_index (tx_hash TEXT PRIMARY KEY, height INTEGER, position INTEGER)"
+            )
+            self._tx_db.commit()
+
+    def __len__(self) -> int:
+        return os.path.getsize(self.index_path) // self._INDEX_RECORD.size
+
+    def append(self, block: Block):
+        if self.read_only:
+            raise IOError("BlockStore was opened read-only.")
+        if block.index != len(self):
+            raise ValueError(f"Expected block at height {len(self)}, got {block.index}.")
+        record = json.dumps(block.to_dict(), sort_keys=True).encode() + b"\n"
+        with self._lock:
+            self._blocks.seek(0, os.SEEK_END)
+            offset = self._blocks.tell()
+            self._blocks.write(record)
+            self._blocks.flush()
+            self._index.seek(0, os.SEEK_END)
+            self._index.write(self._INDEX_RECORD.pack(offset, len(record)))
+            self._index.flush()
+            self._tx_db.executemany(
+                "INSERT OR REPLACE INTO tx_index (tx_hash, height, position) VALUES (?, ?, ?)",
+                [(tx_hash, block.index, position) for position, tx_hash in enumerate(block.tx_hashes)]
+            )
+            self._tx_db.commit()
+
+    def _locate(self, height: int):
+        if not 0 <= height < len(self):
+            raise IndexError(f"No block at height {height}.")
+        self._index.seek(height * self._INDEX_RECORD.size)
+        return self._INDEX_RECORD.unpack(self._index.read(self._INDEX_RECORD.size))
+
+    def read_raw(self, height: int) -> Dict[str, Any]:
+        with self._lock:
+            offset, length = self._locate(height)
+            self._blocks.seek(offset)
+            data = self._blocks.read(length)
+        return json.loads(data)
+
+    def read_block(self, height: int) -> Block:
+        return Block.from_dict(self.read_raw(height))
+
+    def iter_raw(self, start: int, end: int):
+        """Yields (height, block dict) for a contiguous range with one sequential read."""
+        end = min(end, len(self))
+        if start >= end:
+            return
+        with self._lock:
+            first_offset, _ = self._locate(start)
+            last_offset, last_length = self._locate(end - 1)
+            self._blocks.seek(first_offset)
+            data = self._blocks.read(last_offset + last_length - first_offset)
+        for height, line in enumerate(data.splitlines(), start=start):
+            yield height, json.loads(line)
+
+    def find_transaction(self, tx_hash: str):
+        """Returns (height, position) for a transaction hash, or None if it is not on the chain."""
+        with self._lock:
+            row = self._tx_db.execute(
+                "SELECT height, position FROM tx_index WHERE tx_hash = ?", (tx_hash,)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def close(self):
+        with self._lock:
+            self._blocks.close()
+            self._index.close()
+            self._tx_db.close()
+
 class Blockchain:
     """Manages the simulated blockchain, including blocks, pending transactions, and deployed smart contracts."""
     _instance = None
@@ -70,6 +271,8 @@ class Blockchain:
             cls._instance.chain: List[Block] = []
             cls._instance.pending_transactions: List[Dict[str, Any]] = []
             cls._instance.contracts: Dict[str, SmartContract] = {}
+            cls._instance.store: BlockStore = None
+            cls._instance._lock = threading.RLock()  # tools mine and add transactions from several threads
             cls._instance.create_genesis_block()
         return cls._instance
 
@@ -80,26 +283,108 @@ class Blockchain:
     def last_block(self) -> Block:
         return self.chain[-1]
 
+    @property
+    def length(self) -> int:
+        return self.last_block.index + 1
+
+    def attach_store(self, data_dir: str):
+        """
+        Persists the chain to an append-only block file in `data_dir`. If the directory already
+        holds a chain, it is resumed from disk; blocks mined in memory before that are appended
+        if they extend the stored chain, and a ValueError is raised if they do not. Once attached,
+        only the chain tip is kept in memory.
+        """
+        with self._lock:
+            store = BlockStore(data_dir)
+            # A chain that never mined past its own genesis block has nothing worth keeping.
+            if self.store is None and (len(store) == 0 or len(self.chain) > 1):
+                stored = len(store)
+                if self.chain[0].index > stored or any(store.read_block(block.index).hash != block.hash
+                                                       for block in self.chain if block.index < stored):
+                    store.close()
+                    raise ValueError(f"'{data_dir}' holds a chain that the {len(self.chain)} blocks in memory "
+                                     f"do not extend; not attaching it, as they would be lost.")
+                for block in self.chain:
+                    if block.index >= stored:
+                        store.append(block)
+            if self.store is not None:
+                self.store.close()
+            self.store = store
+            self.chain = [store.read_block(len(store) - 1)]
+
+    def get_block(self, height: int) -> Block:
+        if self.store is not None:
+            return self.store.read_block(height)
+        return self.chain[height]
+
+    def find_transaction(self, tx_hash: str):
+        """Returns (block, position) for a mined transaction, or None."""
+        if self.store is not None:
+            location = self.store.find_transaction(tx_hash)
+            if location is None:
+                return None
+            height, position = location
+            return self.store.read_block(height), position
+        for block in self.chain:
+            if tx_hash in block.tx_hashes:
+                return block, block.tx_hashes.index(tx_hash)
+        return None
+
     def add_transaction(self, transaction: Dict[str, Any]):
-        self.pending_transactions.append(transaction)
+        with self._lock:
+            self.pending_transactions.append(transaction)
 
     def add_contract(self, contract: SmartContract):
-        self.contracts[contract.contract_id] = contract
+        with self._lock:
+            self.contracts[contract.contract_id] = contract
 
     def mine_pending_transactions(self) -> Block:
         # In a real blockchain, this would involve Proof-of-Work or Proof-of-Stake.
         # Here, we just create a new block with pending transactions.
-        new_block = Block(len(self.chain), self.pending_transactions, self.last_block.hash)
-        self.chain.append(new_block)
-        self.pending_transactions = [] # Clear pending transactions
-        return new_block
+        with self._lock:
+            new_block = Block(self.length, self.pending_transactions, self.last_block.hash)
+            if self.store is not None:
+                self.store.append(new_block)
+                self.chain = [new_block]
+            else:
+                self.chain.append(new_block)
+            self.pending_transactions = [] # Clear pending transactions
+            return new_block
+
+    def validate(self, max_workers: int = None, chunk_size: int = 1000) -> Dict[str, Any]:
+        """
+        Validates every block's Merkle root, hash and link to its predecessor. A persisted chain is
+        split into height ranges that are checked in parallel across a process pool.
+        """
+        if self.store is None:
+            errors = []
+            for i, block in enumerate(self.chain):
+                errors.extend(_check_block(block, compute_merkle_root([_transaction_hash(tx) for tx in block.transactions])))
+                if i > 0 and block.previous_hash != self.chain[i - 1].hash:
+                    errors.append(f"Block {block.index}: previous_hash does not match block {block.index - 1}.")
+            return {"valid": not errors, "blocks_checked": len(self.chain), "errors": errors}
+
+        total = len(self.store)
+        ranges = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_validate_block_range, [self.store.data_dir] * len(ranges),
+                                        [r[0] for r in ranges], [r[1] for r in ranges]))
+        errors = []
+        previous_last_hash = None
+        for result in results:
+            errors.extend(result["errors"])
+            if previous_last_hash is not None and result["first_previous_hash"] != previous_last_hash:
+                errors.append(f"Block {result['start']}: previous_hash does not match block {result['start'] - 1}.")
+            previous_last_hash = result["last_hash"]
+        return {"valid": not errors, "blocks_checked": total, "errors": errors}
 
     def to_dict(self) -> Dict[str, Any]:
         return {
-            "chain_length": len(self.chain),
+            "chain_length": self.length,
             "last_block_hash": self.last_block.hash,
             "pending_transactions_count": len(self.pending_transactions),
-            "deployed_contracts_count": len(self.contracts)
+            "deployed_contracts_count": len(self.contracts),
+            "persisted": self.store is not None
         }
 
 blockchain_instance = Blockchain()
@@ -272,6 +557,130 @@ class MinePendingTransactionsTool(BaseTool):
             "message": "Pending transactions mined into a new block.",
             "new_block_id": new_block.index,
             "new_block_hash": new_block.hash,
-            "transactions_in_block": len(new_block.transactions)
+            "merkle_root": new_block.merkle_root,
+            "transactions_in_block": len(new_block.transactions),
+            "transaction_hashes": new_block.tx_hashes
+        }
+        return json.dumps(report, indent=2)
+
+class PersistBlockchainTool(BaseTool):
+    """Attaches an append-only on-disk block store to the simulated blockchain."""
+    def __init__(self, tool_name="persist_blockchain"):
+        super().__init__(tool_name=tool_name)
+
+    @property
+    def description(self) -> str:
+        return "Persists the simulated blockchain to an append-only block file with height and transaction indexes, resuming an existing chain if one is found."
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {"data_dir": {"type": "string", "description": "Directory holding the block file and its indexes.", "default": "blockchain_data"}},
+            "required": []
         }
-        return json.dumps(report, indent=2)
\ No newline at end of file
+
+    def execute(self, data_dir: str = "blockchain_data", **kwargs: Any) -> str:
+        try:
+            blockchain_instance.attach_store(data_dir)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            return json.dumps({"error": f"Could not open block store in '{data_dir}': {e}"})
+        return json.dumps({"message": f"Blockchain persisted to '{data_dir}'.", "status": blockchain_instance.to_dict()}, indent=2)
+
+class ValidateBlockchainTool(BaseTool):
+    """Validates the integrity of the whole simulated blockchain."""
+    def __init__(self, tool_name="validate_blockchain"):
+        super().__init__(tool_name=tool_name)
+
+    @property
+    def description(self) -> str:
+        return "Validates every block's Merkle root, hash and link to the previous block. Persisted chains are validated in parallel."
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {"max_workers": {"type": "integer", "description": "Number of worker processes for persisted chains (defaults to the CPU count)."}},
+            "required": []
+        }
+
+    def execute(self, max_workers: int = None, **kwargs: Any) -> str:
+        start = time.perf_counter()
+        result = blockchain_instance.validate(max_workers=max_workers)
+        result["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+        result["errors"] = result["errors"][:50]
+        return json.dumps(result, indent=2)
+
+class GetTransactionProofTool(BaseTool):
+    """Returns a Merkle inclusion proof for a mined transaction."""
+    def __init__(self, tool_name="get_transaction_proof"):
+        super().__init__(tool_name=tool_name)
+
+    @property
+    def description(self) -> str:
+        return "Looks up a mined transaction by hash and returns its block plus a Merkle inclusion proof that can be verified against the block's Merkle root."
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {"transaction_hash": {"type": "string", "description": "The SHA-256 hash of the transaction, as reported when it was mined."}},
+            "required": ["transaction_hash"]
+        }
+
+    def execute(self, transaction_hash: str, **kwargs: Any) -> str:
+        location = blockchain_instance.find_transaction(transaction_hash)
+        if location is None:
+            return json.dumps({"error": f"Transaction '{transaction_hash}' not found on the chain."})
+        block, position = location
+        proof = compute_merkle_proof(block.tx_hashes, position)
+        report = {
+            "transaction_hash": transaction_hash,
+            "block_index": block.index,
+            "block_hash": block.hash,
+            "merkle_root": block.merkle_root,
+            "position": position,
+            "proof": proof,
+            "verified": verify_merkle_proof(transaction_hash, proof, block.merkle_root)
+        }
+        return json.dumps(report, indent=2)
+
+if __name__ == '__main__':
+    import sys
+    import shutil
+    import tempfile
+
+    # Benchmark: python -m tools.blockchain_integration_tool [total_transactions] [transactions_per_block]
+    total_transactions = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    per_block = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    data_dir = tempfile.mkdtemp(prefix="blockchain_bench_")
+    try:
+        chain = Blockchain()
+        chain.attach_store(data_dir)
+
+        start = time.perf_counter()
+        for i in range(total_transactions):
+            chain.add_transaction({"transaction_id": f"tx_{i}", "type": "transfer", "sender": f"acct_{i % 977}",
+                                   "receiver": f"acct_{(i * 31) % 977}", "amount": i % 100})
+            if len(chain.pending_transactions) == per_block:
+                chain.mine_pending_transactions()
+        if chain.pending_transactions:
+            chain.mine_pending_transactions()
+        print(f"Appended {total_transactions} transactions in {chain.length} blocks: {time.perf_counter() - start:.2f}s")
+
+        for workers in (1, None):
+            start = time.perf_counter()
+            result = chain.validate(max_workers=workers)
+            label = "1 worker" if workers == 1 else f"{os.cpu_count()} workers"
+            print(f"Validation ({label}): valid={result['valid']} in {time.perf_counter() - start:.2f}s")
+
+        tx_hash = chain.last_block.tx_hashes[0]
+        start = time.perf_counter()
+        block, position = chain.find_transaction(tx_hash)
+        proof = block.merkle_proof(tx_hash)
+        ok = verify_merkle_proof(tx_hash, proof, block.merkle_root)
+        print(f"Lookup + inclusion proof ({len(proof)} hashes): verified={ok} in {(time.perf_counter() - start) * 1000:.2f}ms")
+    finally:
+        if blockchain_instance.store is not None:
+            blockchain_instance.store.close()
+        shutil.rmtree(data_dir, ignore_errors=True)
\ No newline at end of file
@@ -1,15 +1,117 @@
 import logging
 import json
+import base64
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Optional
 from tools.base_tool import BaseTool
 from mic.database import get_db
-from mic.models import CalendarEvent
+from mic.models import CalendarEvent, CalendarEventAttendee
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import or_
+from sqlalchemy import and_, or_
 
 logger = logging.getLogger(__name__)
 
+class IntervalTree:
+    """
+    A static centered interval tree over half-open [start, end) intervals.
+    Overlap queries cost O(log n + k) instead of scanning every interval.
+    """
+    def __init__(self, intervals: List[Tuple[datetime, datetime, Any]]):
+        self.center = None
+        self.left = None
+        self.right = None
+        if not intervals:
+            return
+        starts = sorted(interval[0] for interval in intervals)
+        # Centering on a start point guarantees that interval lands in `here`, so every level shrinks.
+        self.center = starts[len(starts) // 2]
+        left, right, here = [], [], []
+        for interval in intervals:
+            if interval[1] <= self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        # Intervals containing the center, sorted both ways so queries can stop early.
+        self.by_start = sorted(here, key=lambda i: i[0])
+        self.by_end = sorted(here, key=lambda i: i[1], reverse=True)
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime, Any]]:
+        """Returns every interval that overlaps [start, end)."""
+        if self.center is None:
+            return []
+        found = []
+        if end <= self.center:
+            for interval in self.by_start:
+                if interval[0] >= end:
+                    break
+                found.append(interval)
+            if self.left:
+                found.extend(self.left.overlapping(start, end))
+        elif start >= self.center:
+            for interval in self.by_end:
+                if interval[1] <= start:
+                    break
+                found.append(interval)
+            if self.right:
+                found.extend(self.right.overlapping(start, end))
+        else:
+            found.extend(self.by_start)
+            if self.left:
+                found.extend(self.left.overlapping(start, end))
+            if self.right:
+                found.extend(self.right.overlapping(start, end))
+        return found
+
+def _merge_intervals(intervals: List[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
+    """Merges overlapping or touching intervals; input must be sorted by start."""
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def _parse_event_datetime(value: str) -> datetime:
+    return datetime.strptime(value, '%Y-%m-%d %H:%M')
+
+def _encode_cursor(event: CalendarEvent) -> str:
+    payload = json.dumps([event.start_datetime.isoformat(), event.event_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    start, event_id = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    return datetime.fromisoformat(start), event_id
+
+def _sync_attendees(event: CalendarEvent, attendees: List[str]):
+    """Rebuilds the per-attendee index rows for an event."""
+    event.attendees = json.dumps(attendees)
+    event.attendee_entries = [
+        CalendarEventAttendee(attendee=attendee, start_datetime=event.start_datetime, end_datetime=event.end_datetime)
+        for attendee in dict.fromkeys(attendees)
+    ]
+
+def _busy_intervals(db, attendees: List[str], window_start: datetime, window_end: datetime) -> List[Tuple[datetime, datetime, Dict[str, str]]]:
+    """
+    Fetches every event overlapping the window for the given attendees with one query
+    served by the (attendee, start_datetime, end_datetime) index.
+    """
+    rows = db.query(
+        CalendarEventAttendee.attendee,
+        CalendarEventAttendee.event_id,
+        CalendarEventAttendee.start_datetime,
+        CalendarEventAttendee.end_datetime
+    ).filter(
+        CalendarEventAttendee.attendee.in_(attendees),
+        CalendarEventAttendee.start_datetime < window_end,
+        CalendarEventAttendee.end_datetime > window_start
+    ).order_by(CalendarEventAttendee.start_datetime).all()
+    return [(row.start_datetime, row.end_datetime, {"attendee": row.attendee, "event_id": row.event_id}) for row in rows]
+
 class CreateCalendarEventTool(BaseTool):
     """Creates a new calendar event in the persistent database."""
     def __init__(self, tool_name="create_calendar_event"):
@@ -37,10 +139,12 @@ class CreateCalendarEventTool(BaseTool):
 
     def execute(self, event_id: str, summary: str, start_datetime: str, end_datetime: str, description: str = "", location: str = "", attendees: List[str] = None, **kwargs: Any) -> str:
         try:
-            start = datetime.strptime(start_datetime, '%Y-%m-%d %H:%M')
-            end = datetime.strptime(end_datetime, '%Y-%m-%d %H:%M')
+            start = _parse_event_datetime(start_datetime)
+            end = _parse_event_datetime(end_datetime)
         except ValueError:
             return json.dumps({"error": "Invalid datetime format. Please use 'YYYY-MM-DD HH:MM'."})
+        if end <= start:
+            return json.dumps({"error": "end_datetime must be after start_datetime."})
 
         if attendees is None:
             attendees = []
@@ -52,11 +156,11 @@ class CreateCalendarEventTool(BaseTool):
                 summary=summary,
                 description=description,
                 location=location,
-                start_datetime=start.isoformat(),
-                end_datetime=end.isoformat(),
-                attendees=json.dumps(attendees),
+                start_datetime=start,
+                end_datetime=end,
                 created_at=datetime.now().isoformat() + "Z"
             )
+            _sync_attendees(new_event, attendees)
             db.add(new_event)
             db.commit()
             db.refresh(new_event)
@@ -73,13 +177,13 @@ class CreateCalendarEventTool(BaseTool):
         return json.dumps(report, indent=2)
 
 class ListCalendarEventsTool(BaseTool):
-    """Lists existing calendar events."""
+    """Lists existing calendar events one page at a time."""
     def __init__(self, tool_name="list_calendar_events"):
         super().__init__(tool_name=tool_name)
 
     @property
     def description(self) -> str:
-        return "Lists all existing calendar events, optionally filtering by a keyword in the summary or a date range."
+        return "Lists existing calendar events in start-time order, optionally filtering by a keyword in the summary or a date range. Results are paginated with a cursor."
 
     @property
     def parameters(self) -> Dict[str, Any]:
@@ -88,38 +192,58 @@ class ListCalendarEventsTool(BaseTool):
             "properties": {
                 "keyword": {"type": "string", "description": "Optional: A keyword to filter events by their summary."},
                 "start_date": {"type": "string", "description": "Optional: Filter events starting on or after this date (YYYY-MM-DD)."},
-                "end_date": {"type": "string", "description": "Optional: Filter events ending on or before this date (YYYY-MM-DD)."}
+                "end_date": {"type": "string", "description": "Optional: Filter events ending on or before this date (YYYY-MM-DD)."},
+                "page_size": {"type": "integer", "description": "Optional: Maximum number of events to return.", "default": 50},
+                "cursor": {"type": "string", "description": "Optional: The 'next_cursor' value from a previous page."}
             },
             "required": []
         }
 
-    def execute(self, keyword: str = None, start_date: str = None, end_date: str = None, **kwargs: Any) -> str:
+    def execute(self, keyword: str = None, start_date: str = None, end_date: str = None, page_size: int = 50, cursor: str = None, **kwargs: Any) -> str:
+        page_size = max(1, min(int(page_size), 500))
         db = next(get_db())
         try:
             query = db.query(CalendarEvent)
-            if keyword:
-                query = query.filter(CalendarEvent.summary.ilike(f"%{keyword}%"))
             if start_date:
-                query = query.filter(CalendarEvent.start_datetime >= datetime.strptime(start_date, '%Y-%m-%d').isoformat())
+                query = query.filter(CalendarEvent.start_datetime >= datetime.strptime(start_date, '%Y-%m-%d'))
             if end_date:
-                query = query.filter(CalendarEvent.end_datetime <= (datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)).isoformat())
-            
-            events = query.order_by(CalendarEvent.start_datetime).all()
+                query = query.filter(CalendarEvent.end_datetime <= datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1))
+            if keyword:
+                # Residual filter: applied to rows already narrowed by the indexed range and cursor.
+                query = query.filter(CalendarEvent.summary.ilike(f"%{keyword}%"))
+            if cursor:
+                try:
+                    cursor_start, cursor_id = _decode_cursor(cursor)
+                except (ValueError, TypeError):
+                    return json.dumps({"error": "Invalid cursor."})
+                # Keyset pagination on (start_datetime, event_id), served by ix_calendar_events_start_id.
+                query = query.filter(or_(
+                    CalendarEvent.start_datetime > cursor_start,
+                    and_(CalendarEvent.start_datetime == cursor_start, CalendarEvent.event_id > cursor_id)
+                ))
+
+            events = query.order_by(CalendarEvent.start_datetime, CalendarEvent.event_id).limit(page_size + 1).all()
             if not events:
                 return json.dumps({"message": "No calendar events found matching the criteria."})
-            
+
+            has_more = len(events) > page_size
+            events = events[:page_size]
             event_list = [{
                 "event_id": e.event_id,
                 "summary": e.summary,
                 "description": e.description,
                 "location": e.location,
-                "start_datetime": e.start_datetime,
-                "end_datetime": e.end_datetime,
-                "attendees": json.loads(e.attendees),
+                "start_datetime": e.start_datetime.isoformat(),
+                "end_datetime": e.end_datetime.isoformat(),
+                "attendees": json.loads(e.attendees) if e.attendees else [],
                 "created_at": e.created_at
             } for e in events]
-            
-            report = {"total_events": len(event_list), "events": event_list}
+
+            report = {
+                "returned_events": len(event_list),
+                "events": event_list,
+                "next_cursor": _encode_cursor(events[-1]) if has_more else None
+            }
         except Exception as e:
             logger.error(f"Error listing calendar events: {e}")
             report = {"error": f"Failed to list calendar events: {e}"}
@@ -171,19 +295,26 @@ class UpdateCalendarEventTool(BaseTool):
                 updates_made = True
             if "start_datetime" in kwargs and kwargs["start_datetime"] is not None:
                 try:
-                    event.start_datetime = datetime.strptime(kwargs["start_datetime"], '%Y-%m-%d %H:%M').isoformat()
+                    event.start_datetime = _parse_event_datetime(kwargs["start_datetime"])
                     updates_made = True
                 except ValueError:
                     return json.dumps({"error": "Invalid datetime format for start_datetime. Please use 'YYYY-MM-DD HH:MM'."})
             if "end_datetime" in kwargs and kwargs["end_datetime"] is not None:
                 try:
-                    event.end_datetime = datetime.strptime(kwargs["end_datetime"], '%Y-%m-%d %H:%M').isoformat()
+                    event.end_datetime = _parse_event_datetime(kwargs["end_datetime"])
                     updates_made = True
                 except ValueError:
                     return json.dumps({"error": "Invalid datetime format for end_datetime. Please use 'YYYY-MM-DD HH:MM'."})
+            if event.end_datetime <= event.start_datetime:
+                return json.dumps({"error": "end_datetime must be after start_datetime."})
             if "attendees" in kwargs and kwargs["attendees"] is not None:
-                event.attendees = json.dumps(kwargs["attendees"])
+                _sync_attendees(event, kwargs["attendees"])
                 updates_made = True
+            elif updates_made:
+                # Keep the denormalized attendee rows in step with the event's times.
+                for entry in event.attendee_entries:
+                    entry.start_datetime = event.start_datetime
+                    entry.end_datetime = event.end_datetime
             
             if updates_made:
                 db.commit()
@@ -241,7 +372,7 @@ class FindAvailableTimeSlotsTool(BaseTool):
 
     @property
     def description(self) -> str:
-        return "Finds available time slots within a specified date range and duration, considering existing events."
+        return "Finds available time slots within a specified date range and duration, considering existing events for everyone or for a list of attendees."
 
     @property
     def parameters(self) -> Dict[str, Any]:
@@ -250,39 +381,36 @@ class FindAvailableTimeSlotsTool(BaseTool):
             "properties": {
                 "start_date": {"type": "string", "description": "The start date for searching available slots (YYYY-MM-DD)."},
                 "end_date": {"type": "string", "description": "The end date for searching available slots (YYYY-MM-DD)."},
-                "duration_minutes": {"type": "integer", "description": "The required duration for the time slot in minutes."}
+                "duration_minutes": {"type": "integer", "description": "The required duration for the time slot in minutes."},
+                "attendees": {"type": "array", "items": {"type": "string"}, "description": "Optional: Only consider events these attendees are invited to."}
             },
             "required": ["start_date", "end_date", "duration_minutes"]
         }
 
-    def execute(self, start_date: str, end_date: str, duration_minutes: int, **kwargs: Any) -> str:
+    def execute(self, start_date: str, end_date: str, duration_minutes: int, attendees: List[str] = None, **kwargs: Any) -> str:
         try:
             search_start = datetime.strptime(start_date, '%Y-%m-%d')
             search_end = datetime.strptime(end_date, '%Y-%m-%d')
         except ValueError:
             return json.dumps({"error": "Invalid date format. Please use 'YYYY-MM-DD'."})
 
+        window_end = search_end + timedelta(days=1)
         db = next(get_db())
         try:
-            # Fetch all events that overlap with the search range
-            # An event overlaps if (event.start < search_end_plus_one_day AND event.end > search_start)
-            all_events_query = db.query(CalendarEvent).filter(
-                or_(
-                    CalendarEvent.start_datetime < (search_end + timedelta(days=1)).isoformat(),
-                    CalendarEvent.end_datetime > search_start.isoformat()
-                )
-            ).order_by(CalendarEvent.start_datetime).all()
-            
-            busy_slots = []
-            for event in all_events_query:
-                busy_slots.append({
-                    "start": datetime.fromisoformat(event.start_datetime),
-                    "end": datetime.fromisoformat(event.end_datetime)
-                })
-            
+            if attendees:
+                busy = _busy_intervals(db, attendees, search_start, window_end)
+            else:
+                # An event overlaps if (event.start < window_end AND event.end > search_start)
+                rows = db.query(CalendarEvent.start_datetime, CalendarEvent.end_datetime, CalendarEvent.event_id).filter(
+                    CalendarEvent.start_datetime < window_end,
+                    CalendarEvent.end_datetime > search_start
+                ).all()
+                busy = [(row.start_datetime, row.end_datetime, row.event_id) for row in rows]
+            busy_tree = IntervalTree(busy)
+
             available_slots = []
             current_day = search_start
-            while current_day <= search_end:
+            while current_day <= search_end and len(available_slots) < 10:
                 # Assume working hours from 9 AM to 5 PM (adjust as needed)
                 day_start_time = current_day.replace(hour=9, minute=0, second=0, microsecond=0)
                 day_end_time = current_day.replace(hour=17, minute=0, second=0, microsecond=0)
@@ -293,29 +421,22 @@ class FindAvailableTimeSlotsTool(BaseTool):
 
                 temp_time = day_start_time
                 while temp_time + timedelta(minutes=duration_minutes) <= day_end_time:
-                    is_available = True
                     potential_slot_end = temp_time + timedelta(minutes=duration_minutes)
-                    
-                    for busy in busy_slots:
-                        # Check for overlap: (start1 < end2 and end1 > start2)
-                        if not (potential_slot_end <= busy["start"] or temp_time >= busy["end"]):
-                            is_available = False
-                            break
-                    
-                    if is_available:
+                    if not busy_tree.overlapping(temp_time, potential_slot_end):
                         available_slots.append({
                             "start": temp_time.strftime('%Y-%m-%d %H:%M'),
                             "end": potential_slot_end.strftime('%Y-%m-%d %H:%M')
                         })
-                    
+                        if len(available_slots) == 10:
+                            break
                     temp_time += timedelta(minutes=30) # Check every 30 minutes for new slots
                 current_day += timedelta(days=1)
-            
+
             report = {
                 "search_start_date": start_date,
                 "search_end_date": end_date,
                 "required_duration_minutes": duration_minutes,
-                "available_slots": available_slots[:10] # Show up to 10 available slots for brevity
+                "available_slots": available_slots # Up to 10 available slots for brevity
             }
         except Exception as e:
             logger.error(f"Error finding available time slots: {e}")
@@ -323,3 +444,117 @@ class FindAvailableTimeSlotsTool(BaseTool):
         finally:
             db.close()
         return json.dumps(report, indent=2)
+
+class GetFreeBusyTool(BaseTool):
+    """Computes free/busy information for a group of attendees."""
+    def __init__(self, tool_name="get_free_busy"):
+        super().__init__(tool_name=tool_name)
+
+    @property
+    def description(self) -> str:
+        return "Returns merged busy periods for each attendee and the periods when all of them are free within a time window."
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "attendees": {"type": "array", "items": {"type": "string"}, "description": "The attendees' email addresses."},
+                "start_datetime": {"type": "string", "description": "The start of the window in 'YYYY-MM-DD HH:MM' format."},
+                "end_datetime": {"type": "string", "description": "The end of the window in 'YYYY-MM-DD HH:MM' format."}
+            },
+            "required": ["attendees", "start_datetime", "end_datetime"]
+        }
+
+    def execute(self, attendees: List[str], start_datetime: str, end_datetime: str, **kwargs: Any) -> str:
+        try:
+            window_start = _parse_event_datetime(start_datetime)
+            window_end = _parse_event_datetime(end_datetime)
+        except ValueError:
+            return json.dumps({"error": "Invalid datetime format. Please use 'YYYY-MM-DD HH:MM'."})
+        if not attendees:
+            return json.dumps({"error": "At least one attendee is required."})
+
+        db = next(get_db())
+        try:
+            busy = _busy_intervals(db, attendees, window_start, window_end)
+            per_attendee: Dict[str, List[Tuple[datetime, datetime]]] = {attendee: [] for attendee in attendees}
+            for start, end, info in busy:
+                per_attendee[info["attendee"]].append((max(start, window_start), min(end, window_end)))
+
+            # `busy` is already sorted by start, so a single sweep merges everyone's periods.
+            combined = _merge_intervals([(max(s, window_start), min(e, window_end)) for s, e, _ in busy])
+            free = []
+            cursor_time = window_start
+            for start, end in combined:
+                if start > cursor_time:
+                    free.append((cursor_time, start))
+                cursor_time = max(cursor_time, end)
+            if cursor_time < window_end:
+                free.append((cursor_time, window_end))
+
+            fmt = lambda intervals: [{"start": s.strftime('%Y-%m-%d %H:%M'), "end": e.strftime('%Y-%m-%d %H:%M')} for s, e in intervals]
+            report = {
+                "window": {"start": start_datetime, "end": end_datetime},
+                "busy": {attendee: fmt(_merge_intervals(intervals)) for attendee, intervals in per_attendee.items()},
+                "free_for_all": fmt(free)
+            }
+        except Exception as e:
+            logger.error(f"Error computing free/busy: {e}")
+            report = {"error": f"Failed to compute free/busy: {e}"}
+        finally:
+            db.close()
+        return json.dumps(report, indent=2)
+
+class DetectSchedulingConflictsTool(BaseTool):
+    """Detects conflicts between a proposed meeting time and attendees' existing events."""
+    def __init__(self, tool_name="detect_scheduling_conflicts"):
+        super().__init__(tool_name=tool_name)
+
+    @property
+    def description(self) -> str:
+        return "Checks whether a proposed meeting time conflicts with any existing events of the given attendees, and lists the conflicting events."
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "attendees": {"type": "array", "items": {"type": "string"}, "description": "The attendees' email addresses."},
+                "start_datetime": {"type": "string", "description": "The proposed start in 'YYYY-MM-DD HH:MM' format."},
+                "end_datetime": {"type": "string", "description": "The proposed end in 'YYYY-MM-DD HH:MM' format."},
+                "exclude_event_id": {"type": "string", "description": "Optional: An event to ignore, e.g. the one being rescheduled."}
+            },
+            "required": ["attendees", "start_datetime", "end_datetime"]
+        }
+
+    def execute(self, attendees: List[str], start_datetime: str, end_datetime: str, exclude_event_id: Optional[str] = None, **kwargs: Any) -> str:
+        try:
+            start = _parse_event_datetime(start_datetime)
+            end = _parse_event_datetime(end_datetime)
+        except ValueError:
+            return json.dumps({"error": "Invalid datetime format. Please use 'YYYY-MM-DD HH:MM'."})
+
+        db = next(get_db())
+        try:
+            conflicts: Dict[str, List[Dict[str, str]]] = {}
+            # The attendee index query returns exactly the events overlapping [start, end).
+            for event_start, event_end, info in _busy_intervals(db, attendees, start, end):
+                if info["event_id"] == exclude_event_id:
+                    continue
+                conflicts.setdefault(info["attendee"], []).append({
+                    "event_id": info["event_id"],
+                    "start": event_start.strftime('%Y-%m-%d %H:%M'),
+                    "end": event_end.strftime('%Y-%m-%d %H:%M')
+                })
+            report = {
+                "has_conflicts": bool(conflicts),
+                "conflicts": conflicts,
+                "available_attendees": [attendee for attendee in attendees if attendee not in conflicts]
+            }
+        except Exception as e:
+            logger.error(f"Error detecting scheduling conflicts: {e}")
+            report = {"error": f"Failed to detect scheduling conflicts: {e}"}
+        finally:
+            db.close()
+        return json.dumps(report, indent=2)
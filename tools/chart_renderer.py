@@ -0,0 +1,491 @@
+import atexit
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Suppress INFO messages from matplotlib
+logging.getLogger('matplotlib').setLevel(logging.WARNING)
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    pd = None
+    PANDAS_AVAILABLE = False
+
+try:
+    import matplotlib
+    from matplotlib import cbook
+    MATPLOTLIB_AVAILABLE = True
+except ImportError:
+    matplotlib = None
+    cbook = None
+    MATPLOTLIB_AVAILABLE = False
+    logging.warning("Matplotlib not found. Chart rendering will be unavailable.")
+
+try:
+    from scipy.stats import gaussian_kde
+    from scipy.ndimage import gaussian_filter
+    SCIPY_AVAILABLE = True
+except ImportError:
+    gaussian_kde = None
+    gaussian_filter = None
+    SCIPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CHART_DIR = os.getenv("CHART_DIR", os.path.join("static", "charts"))
+CHART_CACHE_DIR = os.getenv("CHART_CACHE_DIR", os.path.join(CHART_DIR, "cache"))
+CHART_CACHE_MAX_FILES = int(os.getenv("CHART_CACHE_MAX_FILES", 2000))
+# 0 renders in the calling process (serialized by a lock) instead of a worker pool.
+RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", os.cpu_count() or 1))
+# Bump when drawing code changes so stale cached images are not served.
+RENDER_VERSION = 1
+
+# A 10-inch figure at 100 dpi is ~1000 pixels wide; more line vertices than a few
+# per pixel column, or more than one scatter marker per pixel cell, is invisible.
+MAX_LINE_POINTS = 2000
+SCATTER_GRID = (1000, 600)
+HISTOGRAM_MAX_BINS = 200
+KDE_SAMPLE_SIZE = 20_000
+KDE_GRID_POINTS = 256
+DENSITY_GRID_BINS = 200
+MAX_FLIERS_PER_BOX = 2000
+
+
+# -- fingerprints --------------------------------------------------------------
+
+def file_fingerprint(path: str, extra: Any = None) -> str:
+    """Identifies a file's content by path, size and modification time, without reading it."""
+    stat = os.stat(path)
+    token = json.dumps([os.path.abspath(path), stat.st_size, stat.st_mtime_ns, extra], default=str)
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def frame_fingerprint(frames: Any, columns: Optional[List[str]] = None) -> str:
+    """Hashes the content of a DataFrame (or an iterable of DataFrame chunks) restricted to ``columns``."""
+    digest = hashlib.sha256()
+    if PANDAS_AVAILABLE and isinstance(frames, pd.DataFrame):
+        frames = [frames]
+    for frame in frames:
+        view = frame if columns is None else frame[columns]
+        digest.update(json.dumps([[str(c), str(t)] for c, t in view.dtypes.items()]).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(view, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# -- data reduction ------------------------------------------------------------
+
+def minmax_downsample(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Indices of the minimum and maximum of ``y`` in each of ``n_buckets`` equal-count
+    buckets, in order. Keeps every visible extreme of a dense line.
+    """
+    n = y.size
+    size = int(np.ceil(n / n_buckets))
+    rows = int(np.ceil(n / size))
+    low = np.full(rows * size, np.inf)
+    high = np.full(rows * size, -np.inf)
+    low[:n] = y
+    high[:n] = y
+    offsets = np.arange(rows) * size
+    argmin = low.reshape(rows, size).argmin(axis=1) + offsets
+    argmax = high.reshape(rows, size).argmax(axis=1) + offsets
+    return np.unique(np.concatenate([argmin, argmax]))
+
+
+def lttb_downsample(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of ``threshold`` points that preserve the line's shape."""
+    n = x.size
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_start, next_stop = stop, edges[bucket + 2] if bucket + 2 < edges.size else n
+        avg_x = x[next_start:next_stop].mean() if next_stop > next_start else x[-1]
+        avg_y = y[next_start:next_stop].mean() if next_stop > next_start else y[-1]
+        px, py = x[previous], y[previous]
+        areas = np.abs((px - avg_x) * (y[start:stop] - py) - (px - x[start:stop]) * (avg_y - py))
+        previous = start + int(areas.argmax()) if stop > start else start
+        selected[bucket + 1] = previous
+    return selected
+
+
+def downsample_line(x: np.ndarray, y: np.ndarray, threshold: int = MAX_LINE_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduces a line sorted by ``x`` to about ``threshold`` points: a min-max pass first, then LTTB."""
+    if x.size <= threshold:
+        return x, y
+    if x.size > 4 * threshold:
+        keep = minmax_downsample(y, 2 * threshold)
+        x, y = x[keep], y[keep]
+    keep = lttb_downsample(x, y, threshold)
+    return x[keep], y[keep]
+
+
+class ScatterThinner:
+    """
+    Streams points into a pixel grid over fixed axis ranges and keeps the first
+    point that lands in each cell; the rendered image is indistinguishable from
+    drawing every point, but the marker count is bounded by the grid size.
+    """
+    def __init__(self, x_range: Tuple[float, float], y_range: Tuple[float, float], grid: Tuple[int, int] = SCATTER_GRID):
+        self.x_min, self.x_max = float(x_range[0]), float(x_range[1])
+        self.y_min, self.y_max = float(y_range[0]), float(y_range[1])
+        self.grid = grid
+        self._occupied = np.zeros(grid[0] * grid[1], dtype=bool)
+        self._x: List[np.ndarray] = []
+        self._y: List[np.ndarray] = []
+        self.seen = 0
+
+    def _cells(self, values: np.ndarray, low: float, high: float, size: int) -> np.ndarray:
+        span = high - low
+        if span <= 0:
+            return np.zeros(values.size, dtype=np.int64)
+        return np.clip(((values - low) / span * size).astype(np.int64), 0, size - 1)
+
+    def add(self, x: np.ndarray, y: np.ndarray) -> None:
+        finite = np.isfinite(x) & np.isfinite(y)
+        x, y = x[finite], y[finite]
+        self.seen += x.size
+        cells = self._cells(x, self.x_min, self.x_max, self.grid[0]) * self.grid[1] \
+            + self._cells(y, self.y_min, self.y_max, self.grid[1])
+        cells, first = np.unique(cells, return_index=True)
+        new = ~self._occupied[cells]
+        self._occupied[cells[new]] = True
+        self._x.append(x[first[new]])
+        self._y.append(y[first[new]])
+
+    def points(self) -> Tuple[np.ndarray, np.ndarray]:
+        if not self._x:
+            return np.empty(0), np.empty(0)
+        return np.concatenate(self._x), np.concatenate(self._y)
+
+
+def histogram_edges(sample: np.ndarray, low: float, high: float) -> np.ndarray:
+    """Bin edges chosen from ``sample`` (numpy's 'auto' rule) over the full ``[low, high]`` range, capped in number."""
+    if not np.isfinite(low) or not np.isfinite(high):
+        return np.linspace(0.0, 1.0, 11)
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    bins = len(np.histogram_bin_edges(sample, bins="auto", range=(low, high))) - 1 if sample.size else 10
+    return np.linspace(low, high, min(max(bins, 1), HISTOGRAM_MAX_BINS) + 1)
+
+
+def kde_curve(sample: np.ndarray, low: float, high: float, scale: float = 1.0) -> Optional[Dict[str, np.ndarray]]:
+    """Gaussian KDE of ``sample`` evaluated on a fixed grid and multiplied by ``scale``."""
+    sample = sample[np.isfinite(sample)]
+    if not SCIPY_AVAILABLE or sample.size < 2 or np.ptp(sample) == 0:
+        return None
+    if sample.size > KDE_SAMPLE_SIZE:
+        sample = np.random.default_rng(0).choice(sample, KDE_SAMPLE_SIZE, replace=False)
+    grid = np.linspace(low, high, KDE_GRID_POINTS)
+    return {"x": grid, "y": gaussian_kde(sample)(grid) * scale}
+
+
+def _numeric(series: "pd.Series") -> np.ndarray:
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _grouped(df: "pd.DataFrame", x_column: str, y_column: Optional[str]) -> Tuple[List[str], List[np.ndarray]]:
+    """Splits the numeric column of a box/violin plot into per-category arrays."""
+    if y_column is None:
+        values = _numeric(df[x_column])
+        return [x_column], [values[np.isfinite(values)]]
+    if pd.api.types.is_numeric_dtype(df[y_column]) and not pd.api.types.is_numeric_dtype(df[x_column]):
+        category, value = x_column, y_column
+    elif pd.api.types.is_numeric_dtype(df[x_column]) and not pd.api.types.is_numeric_dtype(df[y_column]):
+        category, value = y_column, x_column
+    else:
+        category, value = x_column, y_column
+    codes, labels = pd.factorize(df[category], sort=True)
+    values = _numeric(df[value])
+    keep = (codes >= 0) & np.isfinite(values)
+    codes, values = codes[keep], values[keep]
+    order = np.argsort(codes, kind="stable")
+    splits = np.searchsorted(codes[order], np.arange(1, len(labels)))
+    return [str(label) for label in labels], np.split(values[order], splits)
+
+
+def _box_stats(groups: List[np.ndarray], labels: List[str]) -> List[Dict[str, Any]]:
+    stats = []
+    for label, values in zip(labels, groups):
+        entry = cbook.boxplot_stats(values, labels=[label])[0] if values.size else \
+            {"label": label, "med": np.nan, "q1": np.nan, "q3": np.nan, "whislo": np.nan, "whishi": np.nan, "fliers": np.empty(0)}
+        if entry["fliers"].size > MAX_FLIERS_PER_BOX:
+            entry["fliers"] = np.random.default_rng(0).choice(entry["fliers"], MAX_FLIERS_PER_BOX, replace=False)
+        stats.append(entry)
+    return stats
+
+
+def _violin_stats(groups: List[np.ndarray]) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(0)
+
+    def kde(sample: np.ndarray, coords: np.ndarray) -> np.ndarray:
+        if not SCIPY_AVAILABLE or sample.size < 2 or np.ptp(sample) == 0:
+            return np.zeros_like(coords)
+        return gaussian_kde(sample)(coords)
+
+    stats = []
+    for values in groups:
+        if values.size == 0:
+            values = np.array([np.nan])
+        sample = values if values.size <= KDE_SAMPLE_SIZE else rng.choice(values, KDE_SAMPLE_SIZE, replace=False)
+        entry = cbook.violin_stats([sample], kde, points=100)[0]
+        # Summary lines describe all the data, not just the sample used for the density.
+        entry.update(mean=float(np.mean(values)), median=float(np.median(values)),
+                     min=float(np.min(values)), max=float(np.max(values)))
+        stats.append(entry)
+    return stats
+
+
+def frame_payload(plot_type: str, df: "pd.DataFrame", x_column: Optional[str] = None, y_column: Optional[str] = None,
+                  labels_column: Optional[str] = None, values_column: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Reduces ``df`` to what ``plot_type`` actually draws: downsampled lines and
+    scatters, binned histograms and densities, aggregated bars, pies and boxes.
+    """
+    if plot_type == "line":
+        frame = df[[x_column, y_column]].dropna()
+        if frame[x_column].duplicated().any():
+            frame = frame.groupby(x_column, sort=True)[y_column].mean().reset_index()  # seaborn's mean estimator
+        else:
+            frame = frame.sort_values(x_column, kind="stable")
+        x_values = frame[x_column].to_numpy()
+        y_values = _numeric(frame[y_column])
+        is_time = np.issubdtype(x_values.dtype, np.datetime64)
+        if is_time or np.issubdtype(x_values.dtype, np.number):
+            numeric_x = x_values.astype("datetime64[ns]").astype(np.int64).astype(np.float64) if is_time else x_values.astype(np.float64)
+            keep_x, y_values = downsample_line(numeric_x, y_values)
+            x_values = keep_x.astype(np.int64).astype("datetime64[ns]") if is_time else keep_x
+        return {"x": x_values, "y": y_values, "points": int(len(frame))}
+    if plot_type == "scatter":
+        x_values, y_values = _numeric(df[x_column]), _numeric(df[y_column])
+        finite = np.isfinite(x_values) & np.isfinite(y_values)
+        if not finite.any():
+            return {"x": np.empty(0), "y": np.empty(0), "points": 0}
+        thinner = ScatterThinner((x_values[finite].min(), x_values[finite].max()),
+                                 (y_values[finite].min(), y_values[finite].max()))
+        thinner.add(x_values, y_values)
+        x_kept, y_kept = thinner.points()
+        return {"x": x_kept, "y": y_kept, "points": thinner.seen}
+    if plot_type == "histogram":
+        values = _numeric(df[x_column])
+        values = values[np.isfinite(values)]
+        low, high = (float(values.min()), float(values.max())) if values.size else (0.0, 1.0)
+        edges = histogram_edges(values, low, high)
+        counts, _ = np.histogram(values, bins=edges)
+        return {"edges": edges, "counts": counts, "kde": kde_curve(values, edges[0], edges[-1], values.size * (edges[1] - edges[0])),
+                "points": int(values.size)}
+    if plot_type == "bar":
+        means = df.groupby(x_column, sort=False)[y_column].mean()  # seaborn's mean estimator
+        return {"categories": [str(c) for c in means.index], "values": means.to_numpy(dtype=np.float64), "points": int(len(df))}
+    if plot_type == "pie":
+        values = df[values_column].to_numpy(dtype=np.float64)
+        labels = df[labels_column].astype(str).tolist()
+        return {"labels": labels, "values": values, "points": len(labels)}
+    if plot_type == "box":
+        labels, groups = _grouped(df, x_column, y_column)
+        return {"stats": _box_stats(groups, labels), "labels": labels, "points": int(len(df))}
+    if plot_type == "violin":
+        labels, groups = _grouped(df, x_column, y_column)
+        return {"stats": _violin_stats(groups), "labels": labels, "points": int(len(df))}
+    if plot_type == "heatmap":
+        numerical_df = df.select_dtypes(include=['number'])
+        if numerical_df.empty: raise ValueError("No numerical columns found for heatmap generation.")
+        return {"matrix": numerical_df.corr().to_numpy(), "labels": [str(c) for c in numerical_df.columns], "points": int(len(df))}
+    if plot_type == "kde":
+        x_values = _numeric(df[x_column])
+        if y_column is None:
+            x_values = x_values[np.isfinite(x_values)]
+            low, high = (float(x_values.min()), float(x_values.max())) if x_values.size else (0.0, 1.0)
+            pad = (high - low) * 0.1
+            return {"kde": kde_curve(x_values, low - pad, high + pad), "points": int(x_values.size)}
+        y_values = _numeric(df[y_column])
+        finite = np.isfinite(x_values) & np.isfinite(y_values)
+        density, x_edges, y_edges = np.histogram2d(x_values[finite], y_values[finite], bins=DENSITY_GRID_BINS, density=True)
+        if SCIPY_AVAILABLE:
+            density = gaussian_filter(density, sigma=DENSITY_GRID_BINS / 50)
+        return {"density": density, "x_edges": x_edges, "y_edges": y_edges, "points": int(finite.sum())}
+    raise ValueError(f"Unsupported plot type: {plot_type}")
+
+
+# -- drawing (runs in the render workers) ---------------------------------------
+
+def _init_worker() -> None:
+    matplotlib.use("Agg")
+
+
+def _draw(spec: Dict[str, Any], payload: Dict[str, Any], path: str) -> None:
+    """Draws one chart with the object-oriented API (no pyplot global state) and saves it as PNG."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=tuple(spec.get("figsize", (10, 6))))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    plot_type = spec["plot_type"]
+    if plot_type == "line":
+        ax.plot(payload["x"], payload["y"], linewidth=1.5)
+    elif plot_type == "scatter":
+        ax.scatter(payload["x"], payload["y"], s=spec.get("marker_size", 20), alpha=0.8, linewidths=0)
+    elif plot_type == "histogram":
+        edges = payload["edges"]
+        ax.stairs(payload["counts"], edges, fill=True, alpha=0.6, edgecolor="white")
+        if payload.get("kde") is not None:
+            ax.plot(payload["kde"]["x"], payload["kde"]["y"], linewidth=1.5)
+    elif plot_type == "bar":
+        ax.bar(payload["categories"], payload["values"])
+    elif plot_type == "pie":
+        ax.pie(payload["values"], labels=payload["labels"], autopct='%1.1f%%', startangle=90)
+        ax.axis('equal')
+    elif plot_type == "box":
+        ax.bxp(payload["stats"], patch_artist=True)
+    elif plot_type == "violin":
+        ax.violin(payload["stats"], showmedians=True)
+        ax.set_xticks(range(1, len(payload["labels"]) + 1), payload["labels"])
+    elif plot_type == "heatmap":
+        matrix, labels = payload["matrix"], payload["labels"]
+        image = ax.imshow(matrix, cmap=spec.get("cmap", "viridis"), vmin=-1, vmax=1)
+        fig.colorbar(image, ax=ax)
+        ax.set_xticks(range(len(labels)), labels, rotation=45, ha="right")
+        ax.set_yticks(range(len(labels)), labels)
+        if spec.get("annotate", True):
+            for i in range(matrix.shape[0]):
+                for j in range(matrix.shape[1]):
+                    ax.text(j, i, f"{matrix[i, j]:.2f}", ha="center", va="center", fontsize=8)
+    elif plot_type == "kde":
+        if "density" in payload:
+            x_edges, y_edges = payload["x_edges"], payload["y_edges"]
+            centers_x = (x_edges[:-1] + x_edges[1:]) / 2
+            centers_y = (y_edges[:-1] + y_edges[1:]) / 2
+            ax.contourf(centers_x, centers_y, payload["density"].T, levels=10, cmap="Blues")
+        elif payload.get("kde") is not None:
+            ax.fill_between(payload["kde"]["x"], payload["kde"]["y"], alpha=0.5)
+            ax.plot(payload["kde"]["x"], payload["kde"]["y"])
+    else:
+        raise ValueError(f"Unsupported plot type: {plot_type}")
+
+    if spec.get("title"):
+        ax.set_title(spec["title"], fontsize=spec.get("title_fontsize"))
+    if spec.get("xlabel") is not None:
+        ax.set_xlabel(spec["xlabel"], fontsize=spec.get("label_fontsize"))
+    if spec.get("ylabel") is not None:
+        ax.set_ylabel(spec["ylabel"], fontsize=spec.get("label_fontsize"))
+    if spec.get("grid"):
+        ax.grid(True, axis=spec["grid"], alpha=spec.get("grid_alpha", 1.0))
+    fig.tight_layout()
+    fig.savefig(path, format="png", dpi=spec.get("dpi", 100))
+
+
+# -- render service ------------------------------------------------------------
+
+class ChartRenderer:
+    """
+    Renders charts in a pool of Agg worker processes (one per core by default) and
+    stores them in a content-addressed cache keyed by data fingerprint and chart
+    spec, so repeating a chart costs a file copy instead of a render.
+    """
+    def __init__(self, cache_dir: str = CHART_CACHE_DIR, workers: int = RENDER_WORKERS,
+                 max_cached_files: int = CHART_CACHE_MAX_FILES):
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.max_cached_files = max_cached_files
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._inline_lock = threading.Lock()
+        self.hits = 0
+        self.renders = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that already runs threads (servers, samplers) is unsafe.
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                                     initializer=_init_worker)
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    @staticmethod
+    def cache_key(spec: Dict[str, Any], data_key: str) -> str:
+        token = json.dumps({"spec": spec, "data": data_key, "version": RENDER_VERSION}, sort_keys=True, default=str)
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _draw(self, spec: Dict[str, Any], payload: Dict[str, Any], path: str) -> None:
+        if self.workers > 0:
+            try:
+                self._pool().submit(_draw, spec, payload, path).result()
+                return
+            except BrokenProcessPool:
+                logger.warning("Chart render pool died; rendering in-process.")
+                self.shutdown()
+        with self._inline_lock:
+            _draw(spec, payload, path)
+
+    def _prune(self) -> None:
+        entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".png")]
+        if len(entries) <= self.max_cached_files:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_cached_files]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def render(self, spec: Dict[str, Any], data_key: str, build_payload: Callable[[], Dict[str, Any]],
+               output_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Returns ``{"path", "cache_key", "cached", "points"}``. ``build_payload`` (the
+        data loading and reduction) only runs on a cache miss. Without an
+        ``output_path`` the cached file itself is returned.
+        """
+        if not MATPLOTLIB_AVAILABLE:
+            raise ImportError("Visualization libraries not installed. Please run 'pip install matplotlib'.")
+        key = self.cache_key(spec, data_key)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cached_path = os.path.join(self.cache_dir, f"{key}.png")
+        points = None
+        cached = os.path.exists(cached_path)
+        if cached:
+            self.hits += 1
+            os.utime(cached_path)
+        else:
+            payload = build_payload()
+            points = payload.get("points")
+            staged = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                self._draw(spec, payload, staged)
+                os.replace(staged, cached_path)
+            finally:
+                if os.path.exists(staged):
+                    os.remove(staged)
+            self.renders += 1
+            self._prune()
+        path = cached_path
+        if output_path and os.path.abspath(output_path) != os.path.abspath(cached_path):
+            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            shutil.copyfile(cached_path, output_path)
+            path = output_path
+        return {"path": path, "cache_key": key, "cached": cached, "points": points}
+
+
+chart_renderer = ChartRenderer()
+atexit.register(chart_renderer.shutdown)
@@ -1,25 +1,26 @@
 import logging
 import json
-import random
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, List, Union, Optional, Tuple
 from tools.base_tool import BaseTool
+from tools.model_registry import ModelRegistry, LazyModel
 
 logger = logging.getLogger(__name__)
 
 class CustomerDataGenerator:
     """Generates mock customer data for churn prediction simulation."""
-    def generate_data(self, num_customers: int = 1000) -> pd.DataFrame:
+    def generate_data(self, num_customers: int = 1000, seed: Optional[int] = None) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
         data = {
-            "age": np.random.randint(18, 70, num_customers),
-            "tenure_months": np.random.randint(1, 60, num_customers),
-            "usage_frequency": np.random.choice(["low", "medium", "high"], num_customers, p=[0.3, 0.4, 0.3]),
-            "monthly_spend": np.random.normal(50, 20, num_customers).round(2),
-            "customer_service_calls": np.random.randint(0, 5, num_customers)
+            "age": rng.integers(18, 70, num_customers),
+            "tenure_months": rng.integers(1, 60, num_customers),
+            "usage_frequency": rng.choice(["low", "medium", "high"], num_customers, p=[0.3, 0.4, 0.3]),
+            "monthly_spend": rng.normal(50, 20, num_customers).round(2),
+            "customer_service_calls": rng.integers(0, 5, num_customers)
         }
         df = pd.DataFrame(data)
         
@@ -30,60 +31,79 @@ class CustomerDataGenerator:
         # Customers with low spend and many service calls are more likely to churn
         df.loc[(df["monthly_spend"] < 30) & (df["customer_service_calls"] > 2), "churn"] = 1
         # Older customers might have a slightly higher churn rate (simulated)
-        df.loc[df["age"] > 60, "churn"] = np.random.binomial(1, 0.2, df[df["age"] > 60].shape[0])
+        df.loc[df["age"] > 60, "churn"] = rng.binomial(1, 0.2, df[df["age"] > 60].shape[0])
         
         return df
 
+NUMERIC_FEATURES = ["age", "tenure_months", "monthly_spend", "customer_service_calls"]
+USAGE_LEVELS = ["low", "medium", "high"]
+
+# Everything that determines the trained artifact. Changing any value produces a new
+# registry version; unchanged values reuse the stored one instead of retraining.
+CHURN_MODEL_CONFIG = {
+    "num_customers": 2000,
+    "seed": 42,
+    "test_size": 0.2,
+    "estimator": "LogisticRegression(solver='liblinear', random_state=42)",
+    "features": NUMERIC_FEATURES + [f"usage_frequency_{level}" for level in ("low", "medium")],
+}
+
+def encode_customers(customers: pd.DataFrame, features: List[str]) -> np.ndarray:
+    """
+    Builds the model's feature matrix column by column. Missing numeric fields are
+    0 and usage levels are one-hot encoded against the training columns, so any
+    number of rows is encoded with a few vectorized operations.
+    """
+    matrix = np.zeros((len(customers), len(features)), dtype=np.float64)
+    for index, feature in enumerate(features):
+        if feature.startswith("usage_frequency_"):
+            if "usage_frequency" in customers:
+                level = feature[len("usage_frequency_"):]
+                matrix[:, index] = (customers["usage_frequency"].astype(str).str.lower() == level).to_numpy()
+        elif feature in customers:
+            matrix[:, index] = pd.to_numeric(customers[feature], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+    return matrix
+
+def _train_churn_model() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    config = CHURN_MODEL_CONFIG
+    df = CustomerDataGenerator().generate_data(num_customers=config["num_customers"], seed=config["seed"])
+    features = config["features"]
+    X = encode_customers(df, features)
+    y = df["churn"].to_numpy()
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=config["test_size"], random_state=42)
+
+    model = LogisticRegression(random_state=42, solver='liblinear') # liblinear is good for small datasets
+    model.fit(X_train, y_train)
+
+    accuracy = accuracy_score(y_test, model.predict(X_test))
+    logger.info(f"Churn prediction model trained with accuracy: {accuracy:.2f}")
+    return {"model": model, "features": features}, {"accuracy": float(accuracy), "training_rows": int(len(X_train))}
+
 class ChurnPredictorModel:
-    """Trains and uses a simple ML model for churn prediction, using a singleton pattern."""
-    _model = None
-    _instance = None
-    _feature_encoder = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(ChurnPredictorModel, cls).__new__(cls)
-            cls._instance._train_model()
-        return cls._instance
-
-    def _train_model(self):
-        data_generator = CustomerDataGenerator()
-        df = data_generator.generate_data(num_customers=2000)
-        
-        # One-hot encode categorical features for the model
-        df_encoded = pd.get_dummies(df, columns=["usage_frequency"], drop_first=True)
-        
-        # Store feature columns to ensure consistent input for prediction
-        self._feature_encoder = list(df_encoded.drop(columns=["churn"]).columns)
+    """
+    Scores customers with the churn model from the local model registry. The model
+    is trained at most once per training configuration (by whichever process asks
+    first) and otherwise loaded lazily, memory-mapped, on the first prediction.
+    """
 
-        X = df_encoded.drop(columns=["churn"])
-        y = df_encoded["churn"]
-        
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        
-        self._model = LogisticRegression(random_state=42, solver='liblinear') # liblinear is good for small datasets
-        self._model.fit(X_train, y_train)
-        
-        accuracy = accuracy_score(y_test, self._model.predict(X_test))
-        logger.info(f"Churn prediction model trained with accuracy: {accuracy:.2f}")
+    def __init__(self, registry: Optional[ModelRegistry] = None):
+        self._model = LazyModel("churn_logistic_regression", CHURN_MODEL_CONFIG, _train_churn_model, registry)
 
-    def predict_churn(self, customer_data: Dict[str, Any]) -> Dict[str, Any]:
-        if self._model is None:
-            self._train_model() # Ensure model is trained if not already
-        
-        # Convert input customer data to DataFrame for prediction
-        input_df = pd.DataFrame([customer_data])
-        
-        # One-hot encode categorical features, ensuring all expected columns are present
-        input_df_encoded = pd.get_dummies(input_df, columns=["usage_frequency"], drop_first=True)
-        
-        # Align columns with training data features: add missing columns with 0, remove extra ones
-        for col in self._feature_encoder:
-            if col not in input_df_encoded.columns:
-                input_df_encoded[col] = 0
-        input_df_encoded = input_df_encoded[self._feature_encoder]
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self._model.get()[1]
+
+    def predict_proba(self, customers: Union[pd.DataFrame, List[Dict[str, Any]]]) -> np.ndarray:
+        """Churn probabilities for any number of customers in one vectorized pass."""
+        artifact, _ = self._model.get()
+        frame = customers if isinstance(customers, pd.DataFrame) else pd.DataFrame(customers)
+        if frame.empty:
+            return np.empty(0)
+        return artifact["model"].predict_proba(encode_customers(frame, artifact["features"]))[:, 1]
 
-        churn_probability = self._model.predict_proba(input_df_encoded)[:, 1][0]
+    def predict_churn(self, customer_data: Dict[str, Any]) -> Dict[str, Any]:
+        churn_probability = float(self.predict_proba([customer_data])[0])
         prediction = "likely to churn" if churn_probability > 0.5 else "unlikely to churn"
         
         return {
@@ -110,16 +130,21 @@ class ChurnPredictionTool(BaseTool):
                 "customer_data": {
                     "type": "object",
                     "description": "A dictionary containing customer features (e.g., {'age': 30, 'tenure_months': 12, 'usage_frequency': 'high', 'monthly_spend': 50.0, 'customer_service_calls': 1})."
+                },
+                "customers": {
+                    "type": "array",
+                    "items": {"type": "object"},
+                    "description": "A batch of customer feature dictionaries to score in one call."
+                },
+                "file_path": {
+                    "type": "string",
+                    "description": "Path to a CSV file with one customer per row to score in one call."
                 }
-            },
-            "required": ["customer_data"]
+            }
         }
 
-    def execute(self, customer_data: dict, **kwargs: Any) -> str:
-        prediction_results = churn_predictor_instance.predict_churn(customer_data)
-        churn_probability = prediction_results["churn_probability"]
-        prediction = prediction_results["prediction"]
-        
+    @staticmethod
+    def _recommendations(customer_data: Dict[str, Any], prediction: str) -> List[str]:
         recommendations = []
         if prediction == "likely to churn":
             recommendations.append("Customer is at high risk of churn. Consider proactive outreach with personalized offers or support.")
@@ -131,11 +156,45 @@ class ChurnPredictionTool(BaseTool):
                 recommendations.append("Consider offering incentives or discounts to increase engagement and perceived value.")
         else:
             recommendations.append("Customer is currently unlikely to churn. Continue to monitor engagement and satisfaction to maintain loyalty.")
+        return recommendations
+
+    def predict_batch(self, customers: Union[pd.DataFrame, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Scores a batch of customers; the model is applied once to the whole feature matrix."""
+        frame = customers if isinstance(customers, pd.DataFrame) else pd.DataFrame(customers)
+        probabilities = churn_predictor_instance.predict_proba(frame)
+        at_risk = probabilities > 0.5
+        predictions = [
+            {"churn_probability": round(float(probability), 2),
+             "prediction": "likely to churn" if risky else "unlikely to churn"}
+            for probability, risky in zip(probabilities.tolist(), at_risk.tolist())
+        ]
+        return {
+            "total_customers": int(len(frame)),
+            "likely_to_churn": int(at_risk.sum()),
+            "mean_churn_probability": round(float(probabilities.mean()), 4) if len(frame) else None,
+            "model_version": churn_predictor_instance.metadata["version"],
+            "predictions": predictions
+        }
+
+    def execute(self, customer_data: Optional[dict] = None, customers: Optional[List[Dict[str, Any]]] = None,
+                file_path: Optional[str] = None, **kwargs: Any) -> str:
+        if customers is not None or file_path is not None:
+            try:
+                batch = pd.read_csv(file_path) if file_path is not None else customers
+                return json.dumps(self.predict_batch(batch), indent=2)
+            except Exception as e:
+                return json.dumps({"error": f"Failed to score customers: {e}"})
+        if customer_data is None:
+            return json.dumps({"error": "Provide 'customer_data', 'customers' or 'file_path'."})
+
+        prediction_results = churn_predictor_instance.predict_churn(customer_data)
+        churn_probability = prediction_results["churn_probability"]
+        prediction = prediction_results["prediction"]
         
         report = {
             "customer_data": customer_data,
             "churn_probability": round(churn_probability, 2),
             "prediction": prediction,
-            "recommendations": recommendations
+            "recommendations": self._recommendations(customer_data, prediction)
         }
-        return json.dumps(report, indent=2)
\ No newline at end of file
+        return json.dumps(report, indent=2)
@@ -113,6 +113,7 @@ snippet_manager = SnippetManager()
 
 class AddCodeSnippetTool(BaseTool):
     """Adds a new code snippet to the manager."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="add_code_snippet"):
         super().__init__(tool_name=tool_name)
 
@@ -145,6 +146,7 @@ class AddCodeSnippetTool(BaseTool):
 
 class GetCodeSnippetTool(BaseTool):
     """Retrieves a code snippet by name."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_code_snippet"):
         super().__init__(tool_name=tool_name)
 
@@ -169,6 +171,7 @@ class GetCodeSnippetTool(BaseTool):
 
 class UpdateCodeSnippetTool(BaseTool):
     """Updates an existing code snippet."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="update_code_snippet"):
         super().__init__(tool_name=tool_name)
 
@@ -200,6 +203,7 @@ class UpdateCodeSnippetTool(BaseTool):
 
 class DeleteCodeSnippetTool(BaseTool):
     """Deletes a code snippet."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="delete_code_snippet"):
         super().__init__(tool_name=tool_name)
 
@@ -225,6 +229,7 @@ class DeleteCodeSnippetTool(BaseTool):
 
 class ListCodeSnippetsTool(BaseTool):
     """Lists all stored code snippets, optionally filtered by tags."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_code_snippets"):
         super().__init__(tool_name=tool_name)
 
@@ -252,6 +257,7 @@ class ListCodeSnippetsTool(BaseTool):
 
 class SearchCodeSnippetsByContentTool(BaseTool):
     """Searches for code snippets based on keywords or patterns within their code content."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="search_code_snippets_by_content"):
         super().__init__(tool_name=tool_name)
 
@@ -1,30 +1,27 @@
 import logging
 import json
-import random
-import base64
-import os
-from io import BytesIO
-from typing import Union, List, Dict, Any, Optional
-
-# Deferring heavy imports
-try:
-    from transformers import pipeline
-    from PIL import Image
-    import requests
-    import torch
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
-    logging.warning("transformers, PIL, or requests not found. Computer Vision tools will not be fully functional. Please install 'transformers', 'torch', 'Pillow', 'requests'.")
+from typing import Union, List, Dict, Any, Optional, Iterator
 
 from tools.base_tool import BaseTool
+from tools.vision_inference_service import PIL_AVAILABLE, TRANSFORMERS_AVAILABLE, vision_service
 
 logger = logging.getLogger(__name__)
 
+if not (PIL_AVAILABLE and TRANSFORMERS_AVAILABLE):
+    logging.warning("transformers, torch, or PIL not found. Computer Vision tools will not be fully functional. Please install 'transformers', 'torch', 'Pillow', 'requests'.")
+
+IMAGES_PARAMETER = {
+    "type": "array",
+    "items": {"type": "object"},
+    "description": "Optional: Several images, each {'image_path'|'image_url'|'image_base64': ...}. They are processed together in shared batches."
+}
+STREAM_PARAMETER = {"type": "boolean", "description": "With 'images': yield one JSON result per image as soon as it is ready, instead of a single JSON document.", "default": False}
+
 class ComputerVisionModel:
-    """Manages AI models for computer vision tasks, using a singleton pattern."""
-    _object_detector = None
-    _image_classifier = None
+    """
+    Computer vision operations on the shared vision inference service, which loads
+    each model once per process and batches images across all callers.
+    """
     _instance = None
 
     def __new__(cls):
@@ -32,64 +29,61 @@ class ComputerVisionModel:
             cls._instance = super(ComputerVisionModel, cls).__new__(cls)
             if not TRANSFORMERS_AVAILABLE:
                 logger.error("Required libraries for computer vision are not installed.")
-                return cls._instance # Return instance without models
-            
-            try:
-                logger.info("Initializing object detection model (facebook/detr-resnet-50)...")
-                cls._instance._object_detector = pipeline("object-detection", model="facebook/detr-resnet-50")
-                logger.info("Initializing image classification model (google/vit-base-patch16-224)...")
-                cls._instance._image_classifier = pipeline("image-classification", model="google/vit-base-patch16-224")
-            except Exception as e:
-                logger.error(f"Failed to load AI models for computer vision: {e}")
         return cls._instance
 
-    def _load_image(self, image_path: str = None, image_url: str = None, image_base64: str = None) -> Image.Image:
-        if image_path:
-            if not os.path.exists(image_path):
-                raise FileNotFoundError(f"Image file not found at {image_path}")
-            return Image.open(image_path).convert("RGB")
-        elif image_url:
-            response = requests.get(image_url, stream=True, timeout=10)
-            response.raise_for_status() # Raise an exception for HTTP errors
-            return Image.open(BytesIO(response.content)).convert("RGB")
-        elif image_base64:
-            image_bytes = base64.b64decode(image_base64)
-            return Image.open(BytesIO(image_bytes)).convert("RGB")
-        else:
-            raise ValueError("One of image_path, image_url, or image_base64 must be provided.")
+    @staticmethod
+    def _source(image_path: str = None, image_url: str = None, image_base64: str = None) -> Dict[str, Any]:
+        return {"image_path": image_path, "image_url": image_url, "image_base64": image_base64}
+
+    @staticmethod
+    def format_objects(detections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [{"box": det['box'], "label": det['label'], "score": round(det['score'], 2)} for det in detections]
+
+    @staticmethod
+    def format_categories(predictions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [{"label": p['label'], "score": round(p['score'], 2)} for p in predictions]
 
     def detect_objects(self, image_path: str = None, image_url: str = None, image_base64: str = None) -> List[Dict[str, Any]]:
-        if not self._object_detector: return [{"error": "Object detection model not available. Check logs for loading errors."}]
+        if not vision_service.available("detect"): return [{"error": "Object detection model not available. Check logs for loading errors."}]
         try:
-            image = self._load_image(image_path, image_url, image_base64)
-            detection_results = self._object_detector(image)
-            objects = [{"box": det['box'], "label": det['label'], "score": round(det['score'], 2)} for det in detection_results]
-            return objects
+            return self.format_objects(vision_service.run("detect", self._source(image_path, image_url, image_base64)))
         except Exception as e:
             logger.error(f"Object detection failed: {e}")
             return [{"error": f"Object detection failed: {e}"}]
 
     def classify_image(self, image_path: str = None, image_url: str = None, image_base64: str = None, top_k: int = 3) -> List[Dict[str, Any]]:
-        if not self._image_classifier: return [{"error": "Image classification model not available. Check logs for loading errors."}]
+        if not vision_service.available("classify"): return [{"error": "Image classification model not available. Check logs for loading errors."}]
         try:
-            image = self._load_image(image_path, image_url, image_base64)
-            predictions = self._image_classifier(image, top_k=top_k)
-            categories = [{"label": p['label'], "score": round(p['score'], 2)} for p in predictions]
-            return categories
+            return self.format_categories(vision_service.run("classify", self._source(image_path, image_url, image_base64), top_k=top_k))
         except Exception as e:
             logger.error(f"Image classification failed: {e}")
             return [{"error": f"Image classification failed: {e}"}]
 
 computer_vision_model_instance = ComputerVisionModel()
 
+def _multi_image_response(task: str, images: List[Dict[str, Any]], result_key: str, formatter, stream: bool,
+                          **params: Any) -> Union[str, Iterator[str]]:
+    """Runs ``task`` over several images; either one JSON document in input order or a stream of per-image JSON results."""
+    def entries() -> Iterator[Dict[str, Any]]:
+        for entry in vision_service.stream(task, images, **params):
+            if "error" in entry:
+                yield {"index": entry["index"], "image_source": entry["image_source"], "error": entry["error"]}
+            else:
+                yield {"index": entry["index"], "image_source": entry["image_source"], result_key: formatter(entry["result"])}
+
+    if stream:
+        return (json.dumps(entry) for entry in entries())
+    return json.dumps({"results": sorted(entries(), key=lambda entry: entry["index"])}, indent=2)
+
 class ObjectDetectionTool(BaseTool):
     """Detects objects within an image using an AI model."""
+    thread_safe = True  # the shared vision service batches concurrent callers
     def __init__(self, tool_name="object_detection"):
         super().__init__(tool_name=tool_name)
 
     @property
     def description(self) -> str:
-        return "Detects objects within an image (from path, URL, or base64) and returns a list of detected objects with their confidence and bounding box coordinates using an AI model."
+        return "Detects objects within one or more images (from path, URL, or base64) and returns a list of detected objects with their confidence and bounding box coordinates using an AI model."
 
     @property
     def parameters(self) -> Dict[str, Any]:
@@ -98,26 +92,32 @@ class ObjectDetectionTool(BaseTool):
             "properties": {
                 "image_path": {"type": "string", "description": "Optional: The absolute path to the image file.", "default": None},
                 "image_url": {"type": "string", "description": "Optional: The URL of the image.", "default": None},
-                "image_base64": {"type": "string", "description": "Optional: Base64 encoded image data.", "default": None}
+                "image_base64": {"type": "string", "description": "Optional: Base64 encoded image data.", "default": None},
+                "images": IMAGES_PARAMETER,
+                "stream": STREAM_PARAMETER
             },
             "required": [] # One of the image sources must be provided
         }
 
-    def execute(self, image_path: str = None, image_url: str = None, image_base64: str = None, **kwargs: Any) -> str:
+    def execute(self, image_path: str = None, image_url: str = None, image_base64: str = None,
+                images: Optional[List[Dict[str, Any]]] = None, stream: bool = False, **kwargs: Any) -> Union[str, Iterator[str]]:
         if not TRANSFORMERS_AVAILABLE:
             return json.dumps({"error": "AI models for computer vision are not available. Please install 'transformers', 'torch', 'Pillow', 'requests'."})
 
+        if images:
+            return _multi_image_response("detect", images, "detected_objects", ComputerVisionModel.format_objects, stream)
         detected_objects = computer_vision_model_instance.detect_objects(image_path, image_url, image_base64)
         return json.dumps({"detected_objects": detected_objects}, indent=2)
 
 class ImageClassificationTool(BaseTool):
     """Classifies an image into predefined categories using an AI model."""
+    thread_safe = True  # the shared vision service batches concurrent callers
     def __init__(self, tool_name="image_classification"):
         super().__init__(tool_name=tool_name)
 
     @property
     def description(self) -> str:
-        return "Classifies an image (from path, URL, or base64) into predefined categories and returns the top predicted categories with confidence scores using an AI model."
+        return "Classifies one or more images (from path, URL, or base64) into predefined categories and returns the top predicted categories with confidence scores using an AI model."
 
     @property
     def parameters(self) -> Dict[str, Any]:
@@ -127,14 +127,19 @@ class ImageClassificationTool(BaseTool):
                 "image_path": {"type": "string", "description": "Optional: The absolute path to the image file.", "default": None},
                 "image_url": {"type": "string", "description": "Optional: The URL of the image.", "default": None},
                 "image_base64": {"type": "string", "description": "Optional: Base64 encoded image data.", "default": None},
-                "top_k": {"type": "integer", "description": "The number of top categories to return.", "default": 3}
+                "top_k": {"type": "integer", "description": "The number of top categories to return.", "default": 3},
+                "images": IMAGES_PARAMETER,
+                "stream": STREAM_PARAMETER
             },
             "required": [] # One of the image sources must be provided
         }
 
-    def execute(self, image_path: str = None, image_url: str = None, image_base64: str = None, top_k: int = 3, **kwargs: Any) -> str:
+    def execute(self, image_path: str = None, image_url: str = None, image_base64: str = None, top_k: int = 3,
+                images: Optional[List[Dict[str, Any]]] = None, stream: bool = False, **kwargs: Any) -> Union[str, Iterator[str]]:
         if not TRANSFORMERS_AVAILABLE:
             return json.dumps({"error": "AI models for computer vision are not available. Please install 'transformers', 'torch', 'Pillow', 'requests'."})
 
+        if images:
+            return _multi_image_response("classify", images, "predicted_categories", ComputerVisionModel.format_categories, stream, top_k=top_k)
         predicted_categories = computer_vision_model_instance.classify_image(image_path, image_url, image_base64, top_k)
-        return json.dumps({"predicted_categories": predicted_categories}, indent=2)
\ No newline at end of file
+        return json.dumps({"predicted_categories": predicted_categories}, indent=2)
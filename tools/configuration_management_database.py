@@ -92,6 +92,7 @@ cmdb_manager = CMDBManager()
 
 class CreateCITool(BaseTool):
     """Creates a new Configuration Item (CI) in the CMDB."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="create_ci"):
         super().__init__(tool_name=tool_name)
 
@@ -123,6 +124,7 @@ class CreateCITool(BaseTool):
 
 class GetCITool(BaseTool):
     """Retrieves a Configuration Item (CI) by its ID."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_ci"):
         super().__init__(tool_name=tool_name)
 
@@ -147,6 +149,7 @@ class GetCITool(BaseTool):
 
 class UpdateCITool(BaseTool):
     """Updates an existing Configuration Item (CI) in the CMDB."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="update_ci"):
         super().__init__(tool_name=tool_name)
 
@@ -177,6 +180,7 @@ class UpdateCITool(BaseTool):
 
 class DeleteCITool(BaseTool):
     """Deletes a Configuration Item (CI) from the CMDB."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="delete_ci"):
         super().__init__(tool_name=tool_name)
 
@@ -202,6 +206,7 @@ class DeleteCITool(BaseTool):
 
 class ListCITool(BaseTool):
     """Lists all Configuration Items (CIs), optionally filtered by type."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_cis"):
         super().__init__(tool_name=tool_name)
 
@@ -109,6 +109,7 @@ image_manager = ImageManager()
 
 class BuildContainerImageTool(BaseTool):
     """Builds a new container image and stores its metadata persistently."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="build_container_image"):
         super().__init__(tool_name=tool_name)
 
@@ -137,6 +138,7 @@ class BuildContainerImageTool(BaseTool):
 
 class TagContainerImageTool(BaseTool):
     """Tags an existing container image with a new tag."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="tag_container_image"):
         super().__init__(tool_name=tool_name)
 
@@ -164,6 +166,7 @@ class TagContainerImageTool(BaseTool):
 
 class PushContainerImageTool(BaseTool):
     """Pushes a container image to a registry."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="push_container_image"):
         super().__init__(tool_name=tool_name)
 
@@ -191,6 +194,7 @@ class PushContainerImageTool(BaseTool):
 
 class ListContainerImagesTool(BaseTool):
     """Lists all built container images."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_container_images"):
         super().__init__(tool_name=tool_name)
 
@@ -117,6 +117,7 @@ orchestration_manager = OrchestrationManager()
 
 class CreateDeploymentTool(BaseTool):
     """Creates a new container deployment in the orchestration system."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="create_deployment"):
         super().__init__(tool_name=tool_name)
 
@@ -148,6 +149,7 @@ class CreateDeploymentTool(BaseTool):
 
 class GetDeploymentTool(BaseTool):
     """Retrieves details of a specific container deployment."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_deployment"):
         super().__init__(tool_name=tool_name)
 
@@ -172,6 +174,7 @@ class GetDeploymentTool(BaseTool):
 
 class UpdateDeploymentTool(BaseTool):
     """Updates an existing container deployment."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="update_deployment"):
         super().__init__(tool_name=tool_name)
 
@@ -201,6 +204,7 @@ class UpdateDeploymentTool(BaseTool):
 
 class ScaleDeploymentTool(BaseTool):
     """Scales a container deployment up or down."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="scale_deployment"):
         super().__init__(tool_name=tool_name)
 
@@ -229,6 +233,7 @@ class ScaleDeploymentTool(BaseTool):
 
 class DeleteDeploymentTool(BaseTool):
     """Deletes a container deployment."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="delete_deployment"):
         super().__init__(tool_name=tool_name)
 
@@ -254,6 +259,7 @@ class DeleteDeploymentTool(BaseTool):
 
 class ListDeploymentsTool(BaseTool):
     """Lists all container deployments."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_deployments"):
         super().__init__(tool_name=tool_name)
 
@@ -274,6 +280,7 @@ class ListDeploymentsTool(BaseTool):
 
 class GetClusterHealthTool(BaseTool):
     """Retrieves the current health status of the container cluster."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_cluster_health"):
         super().__init__(tool_name=tool_name)
 
@@ -157,6 +157,7 @@ content_item_manager = ContentItemManager()
 
 class CreateUserProfileTool(BaseTool):
     """Creates a new user profile for content personalization."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="create_user_profile"):
         super().__init__(tool_name=tool_name)
 
@@ -188,6 +189,7 @@ class CreateUserProfileTool(BaseTool):
 
 class AddContentItemTool(BaseTool):
     """Adds a new content item to the personalization engine."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="add_content_item"):
         super().__init__(tool_name=tool_name)
 
@@ -219,6 +221,7 @@ class AddContentItemTool(BaseTool):
 
 class PersonalizeContentTool(BaseTool):
     """Personalizes content for a user based on their profile and preferences."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="personalize_content"):
         super().__init__(tool_name=tool_name)
 
@@ -275,6 +278,7 @@ class PersonalizeContentTool(BaseTool):
 
 class TrackUserContentEngagementTool(BaseTool):
     """Tracks a user's engagement with a specific content item, updating their profile."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="track_user_content_engagement"):
         super().__init__(tool_name=tool_name)
 
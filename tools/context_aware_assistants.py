@@ -160,6 +160,7 @@ llm_context_assistant_instance = LLMContextAssistant()
 
 class GetContextTool(BaseTool):
     """Retrieves the current context for a user."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_context"):
         super().__init__(tool_name=tool_name)
 
@@ -181,6 +182,7 @@ class GetContextTool(BaseTool):
 
 class SetContextTool(BaseTool):
     """Sets the context for a user."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="set_context"):
         super().__init__(tool_name=tool_name)
 
@@ -210,6 +212,7 @@ class SetContextTool(BaseTool):
 
 class ContextAwareResponseTool(BaseTool):
     """Generates a context-aware response to a user query using an AI model."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="context_aware_response"):
         super().__init__(tool_name=tool_name)
 
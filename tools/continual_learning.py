@@ -98,6 +98,7 @@ continual_learning_manager = ContinualLearningManager()
 
 class InitializeContinualLearningModelTool(BaseTool):
     """Initializes a new continual learning model."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="initialize_cl_model"):
         super().__init__(tool_name=tool_name)
 
@@ -127,6 +128,7 @@ class InitializeContinualLearningModelTool(BaseTool):
 
 class TrainIncrementallyTool(BaseTool):
     """Simulates training a model incrementally on new data without forgetting old knowledge."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="train_incrementally"):
         super().__init__(tool_name=tool_name)
 
@@ -163,6 +165,7 @@ class TrainIncrementallyTool(BaseTool):
 
 class EvaluateForgettingTool(BaseTool):
     """Evaluates a model for catastrophic forgetting on old tasks."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="evaluate_forgetting"):
         super().__init__(tool_name=tool_name)
 
@@ -207,6 +210,7 @@ class EvaluateForgettingTool(BaseTool):
 
 class GetModelPerformanceTool(BaseTool):
     """Retrieves the current performance of a continual learning model on all tasks."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_model_performance"):
         super().__init__(tool_name=tool_name)
 
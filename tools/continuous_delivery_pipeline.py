@@ -117,6 +117,7 @@ pipeline_manager = PipelineManager()
 
 class StartCDPipelineTool(BaseTool):
     """Starts a CI/CD pipeline for a specified project and branch."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="start_cd_pipeline"):
         super().__init__(tool_name=tool_name)
 
@@ -143,6 +144,7 @@ class StartCDPipelineTool(BaseTool):
 
 class GetCDPipelineStatusTool(BaseTool):
     """Retrieves the current status of a CI/CD pipeline."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_cd_pipeline_status"):
         super().__init__(tool_name=tool_name)
 
@@ -166,6 +168,7 @@ class GetCDPipelineStatusTool(BaseTool):
 
 class StopCDPipelineTool(BaseTool):
     """Stops a running CI/CD pipeline."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="stop_cd_pipeline"):
         super().__init__(tool_name=tool_name)
 
@@ -190,6 +193,7 @@ class StopCDPipelineTool(BaseTool):
 
 class ListCDPipelinesTool(BaseTool):
     """Lists all defined CI/CD pipelines."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_cd_pipelines"):
         super().__init__(tool_name=tool_name)
 
@@ -105,6 +105,7 @@ contract_manager = ContractManager()
 
 class CreateContractTool(BaseTool):
     """Creates a new contract in the contract lifecycle manager."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="create_contract"):
         super().__init__(tool_name=tool_name)
 
@@ -151,6 +152,7 @@ class CreateContractTool(BaseTool):
 
 class GetContractDetailsTool(BaseTool):
     """Retrieves details of a specific contract."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_contract_details"):
         super().__init__(tool_name=tool_name)
 
@@ -175,6 +177,7 @@ class GetContractDetailsTool(BaseTool):
 
 class UpdateContractStatusTool(BaseTool):
     """Updates the status of a contract."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="update_contract_status"):
         super().__init__(tool_name=tool_name)
 
@@ -203,6 +206,7 @@ class UpdateContractStatusTool(BaseTool):
 
 class DeleteContractTool(BaseTool):
     """Deletes a contract."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="delete_contract"):
         super().__init__(tool_name=tool_name)
 
@@ -228,6 +232,7 @@ class DeleteContractTool(BaseTool):
 
 class ListContractsTool(BaseTool):
     """Lists all contracts, optionally filtered by status."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_contracts"):
         super().__init__(tool_name=tool_name)
 
@@ -254,6 +259,7 @@ class ListContractsTool(BaseTool):
 
 class MonitorContractMilestonesTool(BaseTool):
     """Monitors contract milestones and updates their status."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="monitor_contract_milestones"):
         super().__init__(tool_name=tool_name)
 
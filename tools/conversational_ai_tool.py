@@ -64,6 +64,7 @@ conversation_manager = ConversationManager()
 
 class ConversationalAITool(BaseTool):
     """Generates conversational AI responses using a local LLM."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="conversational_ai"):
         super().__init__(tool_name=tool_name)
         self.llm = HfLLM()
@@ -106,6 +107,7 @@ class ConversationalAITool(BaseTool):
 
 class GetConversationHistoryTool(BaseTool):
     """Retrieves the conversation history for a user."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_conversation_history"):
         super().__init__(tool_name=tool_name)
 
@@ -130,6 +132,7 @@ class GetConversationHistoryTool(BaseTool):
 
 class ClearConversationHistoryTool(BaseTool):
     """Clears the conversation history for a user."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="clear_conversation_history"):
         super().__init__(tool_name=tool_name)
 
@@ -144,6 +144,7 @@ cart_manager = CartManager()
 
 class AddProductTool(BaseTool):
     """Adds a new product to the product catalog."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="add_product"):
         super().__init__(tool_name=tool_name)
 
@@ -175,6 +176,7 @@ class AddProductTool(BaseTool):
 
 class ListProductsTool(BaseTool):
     """Lists all available products in the catalog."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_products"):
         super().__init__(tool_name=tool_name)
 
@@ -195,6 +197,7 @@ class ListProductsTool(BaseTool):
 
 class AddToCartTool(BaseTool):
     """Adds a product to a user's shopping cart."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="add_to_cart"):
         super().__init__(tool_name=tool_name)
 
@@ -231,6 +234,7 @@ class AddToCartTool(BaseTool):
 
 class RemoveFromCartTool(BaseTool):
     """Removes a product from a user's shopping cart."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="remove_from_cart"):
         super().__init__(tool_name=tool_name)
 
@@ -265,6 +269,7 @@ class RemoveFromCartTool(BaseTool):
 
 class ViewCartTool(BaseTool):
     """Views the contents of a user's shopping cart."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="view_cart"):
         super().__init__(tool_name=tool_name)
 
@@ -319,6 +324,7 @@ class ViewCartTool(BaseTool):
 
 class CheckoutTool(BaseTool):
     """Simulates the checkout process for a user's shopping cart."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="checkout"):
         super().__init__(tool_name=tool_name)
 
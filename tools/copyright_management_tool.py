@@ -111,6 +111,7 @@ infringement_detection_model_instance = InfringementDetectionModel()
 
 class RegisterCopyrightTool(BaseTool):
     """Registers a new copyright for a creative work."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="register_copyright"):
         super().__init__(tool_name=tool_name)
 
@@ -141,6 +142,7 @@ class RegisterCopyrightTool(BaseTool):
 
 class MonitorCopyrightInfringementTool(BaseTool):
     """Monitors for copyright infringement of a registered work using an AI model."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="monitor_copyright_infringement"):
         super().__init__(tool_name=tool_name)
 
@@ -178,6 +180,7 @@ class MonitorCopyrightInfringementTool(BaseTool):
 
 class GetCopyrightDetailsTool(BaseTool):
     """Retrieves details of a specific copyright."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_copyright_details"):
         super().__init__(tool_name=tool_name)
 
@@ -202,6 +205,7 @@ class GetCopyrightDetailsTool(BaseTool):
 
 class ListCopyrightsTool(BaseTool):
     """Lists all registered copyrights."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_copyrights"):
         super().__init__(tool_name=tool_name)
 
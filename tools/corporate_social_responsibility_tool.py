@@ -87,6 +87,7 @@ csr_manager = CSRManager()
 
 class CreateCSRInitiativeTool(BaseTool):
     """Creates a new Corporate Social Responsibility (CSR) initiative."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="create_csr_initiative"):
         super().__init__(tool_name=tool_name)
 
@@ -118,6 +119,7 @@ class CreateCSRInitiativeTool(BaseTool):
 
 class TrackCSRImpactTool(BaseTool):
     """Tracks and updates impact metrics for a specific CSR initiative."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="track_csr_impact"):
         super().__init__(tool_name=tool_name)
 
@@ -151,6 +153,7 @@ class TrackCSRImpactTool(BaseTool):
 
 class GetCSRInitiativeDetailsTool(BaseTool):
     """Retrieves details of a specific CSR initiative."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_csr_initiative_details"):
         super().__init__(tool_name=tool_name)
 
@@ -175,6 +178,7 @@ class GetCSRInitiativeDetailsTool(BaseTool):
 
 class ListCSRInitiativesTool(BaseTool):
     """Lists all CSR initiatives."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_csr_initiatives"):
         super().__init__(tool_name=tool_name)
 
@@ -201,6 +205,7 @@ class ListCSRInitiativesTool(BaseTool):
 
 class GenerateCSRReportTool(BaseTool):
     """Generates a summary report of a CSR initiative's impact."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="generate_csr_report"):
         super().__init__(tool_name=tool_name)
 
@@ -147,6 +147,7 @@ crisis_planning_model_instance = CrisisPlanningModel()
 
 class CreateCrisisPlanTool(BaseTool):
     """Creates a new crisis plan in the crisis management system."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="create_crisis_plan"):
         super().__init__(tool_name=tool_name)
 
@@ -178,6 +179,7 @@ class CreateCrisisPlanTool(BaseTool):
 
 class AssessCrisisRiskTool(BaseTool):
     """Assesses risks for a crisis plan using an AI model."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="assess_crisis_risk"):
         super().__init__(tool_name=tool_name)
 
@@ -220,6 +222,7 @@ class AssessCrisisRiskTool(BaseTool):
 
 class DefineCommunicationStrategyTool(BaseTool):
     """Defines a communication strategy for a crisis plan using an AI model."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="define_communication_strategy"):
         super().__init__(tool_name=tool_name)
 
@@ -262,6 +265,7 @@ class DefineCommunicationStrategyTool(BaseTool):
 
 class GetCrisisPlanDetailsTool(BaseTool):
     """Retrieves details of a specific crisis plan."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_crisis_plan_details"):
         super().__init__(tool_name=tool_name)
 
@@ -286,6 +290,7 @@ class GetCrisisPlanDetailsTool(BaseTool):
 
 class ListCrisisPlansTool(BaseTool):
     """Lists all crisis plans."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_crisis_plans"):
         super().__init__(tool_name=tool_name)
 
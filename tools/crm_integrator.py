@@ -92,6 +92,7 @@ else:
 
 class ConfigureCRMIntegrationTool(BaseTool):
     """Configures integration details for a CRM system."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="configure_crm_integration"):
         super().__init__(tool_name=tool_name)
 
@@ -121,6 +122,7 @@ class ConfigureCRMIntegrationTool(BaseTool):
 
 class SyncCRMContactsTool(BaseTool):
     """Simulates synchronizing contacts with a CRM system."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="sync_crm_contacts"):
         super().__init__(tool_name=tool_name)
 
@@ -164,6 +166,7 @@ class SyncCRMContactsTool(BaseTool):
 
 class SyncCRMOpportunitiesTool(BaseTool):
     """Simulates synchronizing opportunities with a CRM system."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="sync_crm_opportunities"):
         super().__init__(tool_name=tool_name)
 
@@ -204,6 +207,7 @@ class SyncCRMOpportunitiesTool(BaseTool):
 
 class ListCRMIntegrationsTool(BaseTool):
     """Lists all configured CRM integrations."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_crm_integrations"):
         super().__init__(tool_name=tool_name)
 
@@ -1,29 +1,20 @@
 import logging
 import json
-import random
-import base64
-import os
-from io import BytesIO
-from typing import Union, List, Dict, Any, Optional
-
-# Deferring heavy imports
-try:
-    from transformers import pipeline
-    from PIL import Image
-    import requests
-    import torch
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
-    logging.warning("transformers, PIL, or requests not found. Crowd counting tools will not be fully functional. Please install 'transformers', 'torch', 'Pillow', 'requests'.")
+from typing import Union, List, Dict, Any, Optional, Iterator
 
 from tools.base_tool import BaseTool
+from tools.vision_inference_service import PIL_AVAILABLE, TRANSFORMERS_AVAILABLE, vision_service
 
 logger = logging.getLogger(__name__)
 
+if not (PIL_AVAILABLE and TRANSFORMERS_AVAILABLE):
+    logging.warning("transformers, torch, or PIL not found. Crowd counting tools will not be fully functional. Please install 'transformers', 'torch', 'Pillow', 'requests'.")
+
 class CrowdCountingModel:
-    """Manages AI models for crowd counting tasks, using a singleton pattern."""
-    _object_detector = None
+    """
+    Counts people with the object detector of the shared vision inference service,
+    so crowd counting and object detection share one model and one batch queue.
+    """
     _instance = None
 
     def __new__(cls):
@@ -31,52 +22,58 @@ class CrowdCountingModel:
             cls._instance = super(CrowdCountingModel, cls).__new__(cls)
             if not TRANSFORMERS_AVAILABLE:
                 logger.error("Required libraries for crowd counting are not installed.")
-                return cls._instance # Return instance without models
-            
-            try:
-                logger.info("Initializing object detection model (facebook/detr-resnet-50) for crowd counting...")
-                cls._instance._object_detector = pipeline("object-detection", model="facebook/detr-resnet-50")
-            except Exception as e:
-                logger.error(f"Failed to load object detection model: {e}")
         return cls._instance
 
-    def _load_image(self, image_path: str = None, image_url: str = None, image_base64: str = None) -> Image.Image:
-        if image_path:
-            if not os.path.exists(image_path):
-                raise FileNotFoundError(f"Image file not found at {image_path}")
-            return Image.open(image_path).convert("RGB")
-        elif image_url:
-            response = requests.get(image_url, stream=True, timeout=10)
-            response.raise_for_status() # Raise an exception for HTTP errors
-            return Image.open(BytesIO(response.content)).convert("RGB")
-        elif image_base64:
-            image_bytes = base64.b64decode(image_base64)
-            return Image.open(BytesIO(image_bytes)).convert("RGB")
-        else:
-            raise ValueError("One of image_path, image_url, or image_base64 must be provided.")
+    @staticmethod
+    def people_from_detections(detection_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        people_detections = [{"box": det['box'], "score": round(det['score'], 2)}
+                             for det in detection_results if det['label'].lower() == 'person']
+        return {"people_count": len(people_detections), "people_detections": people_detections}
 
     def count_people(self, image_path: str = None, image_url: str = None, image_base64: str = None) -> Dict[str, Any]:
-        if not self._object_detector: return {"error": "Object detection model not available. Check logs for loading errors."}
+        if not vision_service.available("detect"): return {"error": "Object detection model not available. Check logs for loading errors."}
         try:
-            image = self._load_image(image_path, image_url, image_base64)
-            detection_results = self._object_detector(image)
-            
-            people_count = 0
-            people_detections = []
-            for det in detection_results:
-                if det['label'].lower() == 'person':
-                    people_count += 1
-                    people_detections.append({"box": det['box'], "score": round(det['score'], 2)})
-            
-            return {"people_count": people_count, "people_detections": people_detections}
+            detection_results = vision_service.run("detect", {"image_path": image_path, "image_url": image_url, "image_base64": image_base64})
+            return self.people_from_detections(detection_results)
         except Exception as e:
             logger.error(f"People counting failed: {e}")
             return {"error": f"People counting failed: {e}"}
 
+    def count_people_stream(self, images: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yields {"index", "image_source", "people_count", "people_detections"} per image as each finishes."""
+        for entry in vision_service.stream("detect", images):
+            if "error" in entry:
+                yield {"index": entry["index"], "image_source": entry["image_source"], "error": f"People counting failed: {entry['error']}"}
+            else:
+                yield {"index": entry["index"], "image_source": entry["image_source"], **self.people_from_detections(entry["result"])}
+
 crowd_counting_model_instance = CrowdCountingModel()
 
+IMAGES_PARAMETER = {
+    "type": "array",
+    "items": {"type": "object"},
+    "description": "Optional: Several images or video frames, each {'image_path'|'image_url'|'image_base64': ...}. They are processed together in shared batches."
+}
+STREAM_PARAMETER = {"type": "boolean", "description": "With 'images': yield one JSON result per image as soon as it is ready, instead of a single JSON document.", "default": False}
+
+def _density_category(people_count: int) -> str:
+    # These thresholds are arbitrary and would depend on actual image resolution/area
+    density_category = "sparse"
+    if people_count > 50:
+        density_category = "medium"
+    if people_count > 200:
+        density_category = "dense"
+    return density_category
+
+def _multi_image_response(images: List[Dict[str, Any]], format_entry, stream: bool) -> Union[str, Iterator[str]]:
+    entries = (entry if "error" in entry else format_entry(entry) for entry in crowd_counting_model_instance.count_people_stream(images))
+    if stream:
+        return (json.dumps(entry) for entry in entries)
+    return json.dumps({"results": sorted(entries, key=lambda entry: entry["index"])}, indent=2)
+
 class CountPeopleTool(BaseTool):
     """Counts the number of people in an image or video frame using an AI model."""
+    thread_safe = True  # the shared vision service batches concurrent callers
     def __init__(self, tool_name="count_people"):
         super().__init__(tool_name=tool_name)
 
@@ -91,15 +88,22 @@ class CountPeopleTool(BaseTool):
             "properties": {
                 "image_path": {"type": "string", "description": "Optional: The absolute path to the image file.", "default": None},
                 "image_url": {"type": "string", "description": "Optional: The URL of the image.", "default": None},
-                "image_base64": {"type": "string", "description": "Optional: Base64 encoded image data.", "default": None}
+                "image_base64": {"type": "string", "description": "Optional: Base64 encoded image data.", "default": None},
+                "images": IMAGES_PARAMETER,
+                "stream": STREAM_PARAMETER
             },
             "required": [] # One of the image sources must be provided
         }
 
-    def execute(self, image_path: str = None, image_url: str = None, image_base64: str = None, **kwargs: Any) -> str:
+    def execute(self, image_path: str = None, image_url: str = None, image_base64: str = None,
+                images: Optional[List[Dict[str, Any]]] = None, stream: bool = False, **kwargs: Any) -> Union[str, Iterator[str]]:
         if not TRANSFORMERS_AVAILABLE:
             return json.dumps({"error": "AI models for crowd counting are not available. Please install 'transformers', 'torch', 'Pillow', 'requests'."})
 
+        if images:
+            return _multi_image_response(images, lambda entry: {
+                "index": entry["index"], "image_source": entry["image_source"], "crowd_count": entry["people_count"],
+                "people_detections_sample": entry["people_detections"][:5]}, stream)
         result = crowd_counting_model_instance.count_people(image_path, image_url, image_base64)
         if "error" in result:
             return json.dumps(result)
@@ -113,6 +117,7 @@ class CountPeopleTool(BaseTool):
 
 class EstimateCrowdDensityTool(BaseTool):
     """Estimates crowd density in an image or video frame using an AI model."""
+    thread_safe = True  # the shared vision service batches concurrent callers
     def __init__(self, tool_name="estimate_crowd_density"):
         super().__init__(tool_name=tool_name)
 
@@ -127,15 +132,22 @@ class EstimateCrowdDensityTool(BaseTool):
             "properties": {
                 "image_path": {"type": "string", "description": "Optional: The absolute path to the image file.", "default": None},
                 "image_url": {"type": "string", "description": "Optional: The URL of the image.", "default": None},
-                "image_base64": {"type": "string", "description": "Optional: Base64 encoded image data.", "default": None}
+                "image_base64": {"type": "string", "description": "Optional: Base64 encoded image data.", "default": None},
+                "images": IMAGES_PARAMETER,
+                "stream": STREAM_PARAMETER
             },
             "required": [] # One of the image sources must be provided
         }
 
-    def execute(self, image_path: str = None, image_url: str = None, image_base64: str = None, **kwargs: Any) -> str:
+    def execute(self, image_path: str = None, image_url: str = None, image_base64: str = None,
+                images: Optional[List[Dict[str, Any]]] = None, stream: bool = False, **kwargs: Any) -> Union[str, Iterator[str]]:
         if not TRANSFORMERS_AVAILABLE:
             return json.dumps({"error": "AI models for crowd counting are not available. Please install 'transformers', 'torch', 'Pillow', 'requests'."})
 
+        if images:
+            return _multi_image_response(images, lambda entry: {
+                "index": entry["index"], "image_source": entry["image_source"], "people_count": entry["people_count"],
+                "density_category": _density_category(entry["people_count"])}, stream)
         result = crowd_counting_model_instance.count_people(image_path, image_url, image_base64)
         if "error" in result:
             return json.dumps(result)
@@ -143,12 +155,7 @@ class EstimateCrowdDensityTool(BaseTool):
         people_count = result["people_count"]
         
         # Simulate density estimation based on count (and implicitly, image size)
-        # These thresholds are arbitrary and would depend on actual image resolution/area
-        density_category = "sparse"
-        if people_count > 50:
-            density_category = "medium"
-        if people_count > 200:
-            density_category = "dense"
+        density_category = _density_category(people_count)
         
         return json.dumps({
             "image_source": image_path or image_url or "base64_data",
@@ -96,6 +96,7 @@ class LearningModel:
 
 class DesignCurriculumTool(BaseTool):
     """Designs a learning curriculum for an AI model."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="design_curriculum"):
         super().__init__(tool_name=tool_name)
 
@@ -137,6 +138,7 @@ class DesignCurriculumTool(BaseTool):
 
 class TrainWithCurriculumTool(BaseTool):
     """Simulates training an AI model using a designed curriculum."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="train_with_curriculum"):
         super().__init__(tool_name=tool_name)
 
@@ -177,6 +179,7 @@ class TrainWithCurriculumTool(BaseTool):
 
 class GetCurriculumDetailsTool(BaseTool):
     """Retrieves the details of a specific learning curriculum."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_curriculum_details"):
         super().__init__(tool_name=tool_name)
 
@@ -201,6 +204,7 @@ class GetCurriculumDetailsTool(BaseTool):
 
 class ListCurriculumsTool(BaseTool):
     """Lists all designed learning curriculums."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_curriculums"):
         super().__init__(tool_name=tool_name)
 
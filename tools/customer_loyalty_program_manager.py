@@ -137,6 +137,7 @@ reward_manager = RewardManager()
 
 class EnrollCustomerTool(BaseTool):
     """Enrolls a new customer in the loyalty program."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="enroll_customer"):
         super().__init__(tool_name=tool_name)
 
@@ -165,6 +166,7 @@ class EnrollCustomerTool(BaseTool):
 
 class AddPointsTool(BaseTool):
     """Adds points to a customer's loyalty account."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="add_points"):
         super().__init__(tool_name=tool_name)
 
@@ -193,6 +195,7 @@ class AddPointsTool(BaseTool):
 
 class DefineRewardTool(BaseTool):
     """Defines a new loyalty reward."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="define_reward"):
         super().__init__(tool_name=tool_name)
 
@@ -223,6 +226,7 @@ class DefineRewardTool(BaseTool):
 
 class ListRewardsTool(BaseTool):
     """Lists all available loyalty rewards."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_rewards"):
         super().__init__(tool_name=tool_name)
 
@@ -243,6 +247,7 @@ class ListRewardsTool(BaseTool):
 
 class RedeemRewardTool(BaseTool):
     """Redeems a loyalty reward for a customer."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="redeem_reward"):
         super().__init__(tool_name=tool_name)
 
@@ -291,6 +296,7 @@ class RedeemRewardTool(BaseTool):
 
 class GetCustomerLoyaltyStatusTool(BaseTool):
     """Retrieves a customer's loyalty status."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_customer_loyalty_status"):
         super().__init__(tool_name=tool_name)
 
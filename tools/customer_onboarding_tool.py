@@ -99,6 +99,7 @@ onboarding_manager = OnboardingManager()
 
 class StartOnboardingTool(BaseTool):
     """Starts a new onboarding process for a customer."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="start_onboarding"):
         super().__init__(tool_name=tool_name)
 
@@ -136,6 +137,7 @@ class StartOnboardingTool(BaseTool):
 
 class AdvanceOnboardingStepTool(BaseTool):
     """Advances a customer's onboarding process to the next step."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="advance_onboarding_step"):
         super().__init__(tool_name=tool_name)
 
@@ -168,6 +170,7 @@ class AdvanceOnboardingStepTool(BaseTool):
 
 class GetOnboardingStatusTool(BaseTool):
     """Retrieves the current status of a customer's onboarding process."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_onboarding_status"):
         super().__init__(tool_name=tool_name)
 
@@ -192,6 +195,7 @@ class GetOnboardingStatusTool(BaseTool):
 
 class ListOnboardingPlansTool(BaseTool):
     """Lists all available onboarding plans."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="list_onboarding_plans"):
         super().__init__(tool_name=tool_name)
 
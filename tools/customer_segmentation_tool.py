@@ -1,24 +1,36 @@
 import logging
 import json
+import os
 import random
 import pandas as pd
 import numpy as np
 from sklearn.cluster import KMeans
 from sklearn.metrics import silhouette_score
-from typing import Union, List, Dict, Any, Optional
+from typing import Union, List, Dict, Any, Optional, Iterator, Tuple, Callable
 from tools.base_tool import BaseTool
+from tools.model_registry import model_registry
 
 # Deferring scikit-learn and transformers imports
 try:
-    from sklearn.cluster import KMeans
+    from sklearn.cluster import KMeans, MiniBatchKMeans, Birch
     from sklearn.metrics import silhouette_score
+    from joblib import Parallel, delayed
     SKLEARN_AVAILABLE = True
 except ImportError:
     KMeans = None
+    MiniBatchKMeans = None
+    Birch = None
     silhouette_score = None
     SKLEARN_AVAILABLE = False
     logging.warning("Scikit-learn library not found. Customer segmentation will be limited.")
 
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pq = None
+    PYARROW_AVAILABLE = False
+
 try:
     from transformers import pipeline
     TRANSFORMERS_AVAILABLE = True
@@ -53,6 +65,282 @@ def _load_data_to_df(data_source: Union[str, List[Dict[str, Any]], Any]) -> pd.D
     else:
         raise ValueError("Unsupported data source type.")
 
+SEGMENTATION_CHUNK_ROWS = int(os.getenv("SEGMENTATION_CHUNK_ROWS", 200_000))
+# File inputs larger than this are segmented out-of-core in "auto" mode.
+STREAMING_THRESHOLD_BYTES = int(os.getenv("SEGMENTATION_STREAMING_BYTES", 64 * 1024 ** 2))
+K_SELECTION_SAMPLE_ROWS = 50_000
+SILHOUETTE_SAMPLE_SIZE = 5_000
+MINIBATCH_SIZE = 10_240
+DEFAULT_K_RANGE = (2, 10)
+REGISTRY_PREFIX = "customer_segments_"
+
+
+def _numeric_feature_columns(path: str) -> List[str]:
+    """Numeric columns of a .csv/.parquet file, judged from its head."""
+    if path.endswith('.parquet'):
+        head = next(pq.ParquetFile(path).iter_batches(batch_size=1000)).to_pandas()
+    else:
+        head = pd.read_csv(path, nrows=1000)
+    return head.select_dtypes(include=np.number).columns.tolist()
+
+
+def _iter_feature_chunks(path: str, features: List[str], chunk_rows: int = SEGMENTATION_CHUNK_ROWS,
+                         keep_columns: bool = False) -> Iterator[pd.DataFrame]:
+    """
+    Streams ``features`` of a .csv/.parquet file as float64 chunks (or every column,
+    with the features coerced, when ``keep_columns`` is set).
+    """
+    columns = None if keep_columns else features
+    if path.endswith('.parquet'):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Reading Parquet files requires 'pyarrow'. Please install it with 'pip install pyarrow'.")
+        chunks = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns))
+    elif path.endswith('.csv'):
+        chunks = pd.read_csv(path, chunksize=chunk_rows, usecols=columns)
+    else:
+        raise ValueError("Streaming segmentation supports .csv and .parquet files.")
+    for chunk in chunks:
+        for feature in features:
+            chunk[feature] = pd.to_numeric(chunk[feature], errors="coerce").astype(np.float64)
+        yield chunk
+
+
+class _StreamingProfile:
+    """Feature means/variances over complete rows plus a uniform reservoir sample of those rows."""
+
+    def __init__(self, n_features: int, sample_rows: int = K_SELECTION_SAMPLE_ROWS, seed: int = 42):
+        self.count = 0
+        self.sum = np.zeros(n_features)
+        self.sumsq = np.zeros(n_features)
+        self.sample_rows = sample_rows
+        self.sample = np.empty((0, n_features))
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, X: np.ndarray) -> None:
+        X = X[~np.isnan(X).any(axis=1)]
+        n = X.shape[0]
+        if n == 0:
+            return
+        self.sum += X.sum(axis=0)
+        self.sumsq += (X * X).sum(axis=0)
+        seen = self.count
+        take = min(max(self.sample_rows - self.sample.shape[0], 0), n)
+        if take:
+            self.sample = np.vstack([self.sample, X[:take]])
+            seen += take
+        rest = X[take:]
+        if rest.shape[0]:
+            # Vectorized Algorithm R over rows.
+            positions = seen + np.arange(1, rest.shape[0] + 1)
+            slots = (self._rng.random(rest.shape[0]) * positions).astype(np.int64)
+            keep = slots < self.sample_rows
+            self.sample[slots[keep]] = rest[keep]
+        self.count += n
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.sum / max(self.count, 1)
+
+    @property
+    def std(self) -> np.ndarray:
+        variance = self.sumsq / max(self.count, 1) - self.mean ** 2
+        return np.sqrt(np.maximum(variance, 0.0))
+
+
+def _fit_candidate(sample: np.ndarray, k: int, random_state: int) -> Tuple[int, float, np.ndarray]:
+    """Fits k clusters on the sample and scores them with a sampled silhouette."""
+    model = MiniBatchKMeans(n_clusters=k, random_state=random_state, n_init=3, batch_size=MINIBATCH_SIZE).fit(sample)
+    labels = model.labels_
+    score = float("nan")
+    if len(np.unique(labels)) > 1:
+        score = float(silhouette_score(sample, labels, sample_size=min(SILHOUETTE_SAMPLE_SIZE, sample.shape[0]),
+                                       random_state=random_state))
+    return k, score, model.cluster_centers_
+
+
+def select_n_segments(sample: np.ndarray, k_values: List[int], n_jobs: int = -1,
+                      random_state: int = 42) -> Tuple[int, Dict[int, float], Dict[int, np.ndarray]]:
+    """
+    Picks the number of segments with the best sampled silhouette score. Candidates
+    are fitted in parallel on the (already small) sample.
+    """
+    k_values = [k for k in k_values if 2 <= k < sample.shape[0]]
+    if not k_values:
+        raise ValueError("Not enough rows to choose a number of segments.")
+    results = Parallel(n_jobs=n_jobs)(delayed(_fit_candidate)(sample, k, random_state) for k in k_values)
+    scores = {k: score for k, score, _ in results}
+    centers = {k: center for k, _, center in results}
+    best = max(k_values, key=lambda k: (np.nan_to_num(scores[k], nan=-1.0), -k))
+    return best, scores, centers
+
+
+class SegmentationModel:
+    """
+    A persisted centroid model. Assigning a customer is a nearest-centroid lookup,
+    O(k) per row, in the (optionally standardized) feature space it was fitted in.
+    """
+    __slots__ = ("features", "mean", "scale", "centroids", "algorithm", "silhouette", "rows_fitted", "segment_summary")
+
+    def __init__(self, features: List[str], mean: np.ndarray, scale: np.ndarray, centroids: np.ndarray,
+                 algorithm: str, silhouette: Optional[float] = None, rows_fitted: int = 0):
+        self.features = list(features)
+        self.mean = mean
+        self.scale = scale
+        self.centroids = centroids
+        self.algorithm = algorithm
+        self.silhouette = silhouette
+        self.rows_fitted = rows_fitted
+        self.segment_summary: Dict[str, Any] = {}
+
+    @property
+    def n_segments(self) -> int:
+        return int(self.centroids.shape[0])
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return (X - self.mean) / self.scale
+
+    def assign(self, X: np.ndarray) -> np.ndarray:
+        """Nearest-centroid labels; rows with missing features get -1."""
+        Z = self.transform(X)
+        complete = ~np.isnan(Z).any(axis=1)
+        labels = np.full(X.shape[0], -1, dtype=np.int64)
+        Zc = Z[complete]
+        # ||z - c||^2 = ||z||^2 - 2 z.c + ||c||^2; the ||z||^2 term does not change the argmin.
+        distances = (self.centroids ** 2).sum(axis=1) - 2.0 * Zc @ self.centroids.T
+        labels[complete] = distances.argmin(axis=1)
+        return labels
+
+    def centroids_original(self) -> np.ndarray:
+        return self.centroids * self.scale + self.mean
+
+
+class _SegmentAccumulator:
+    """Per-segment count, mean and standard deviation of each feature, accumulated chunk by chunk."""
+
+    def __init__(self, n_segments: int, features: List[str]):
+        self.features = features
+        self.counts = np.zeros(n_segments, dtype=np.int64)
+        self.sums = np.zeros((n_segments, len(features)))
+        self.sumsq = np.zeros((n_segments, len(features)))
+
+    def update(self, X: np.ndarray, labels: np.ndarray) -> None:
+        keep = labels >= 0
+        X, labels = X[keep], labels[keep]
+        n_segments = self.counts.size
+        self.counts += np.bincount(labels, minlength=n_segments)
+        for j in range(X.shape[1]):
+            self.sums[:, j] += np.bincount(labels, weights=X[:, j], minlength=n_segments)
+            self.sumsq[:, j] += np.bincount(labels, weights=X[:, j] ** 2, minlength=n_segments)
+
+    def summary(self) -> Dict[str, Any]:
+        result = {}
+        for segment, count in enumerate(self.counts):
+            entry: Dict[str, Any] = {"count": int(count)}
+            for j, feature in enumerate(self.features):
+                if count == 0:
+                    entry[feature] = {"mean": None, "std": None}
+                    continue
+                mean = self.sums[segment, j] / count
+                # Sample standard deviation, matching DataFrame.std.
+                variance = (self.sumsq[segment, j] - count * mean * mean) / (count - 1) if count > 1 else float("nan")
+                std = float(np.sqrt(max(variance, 0.0))) if count > 1 else None
+                entry[feature] = {"mean": float(mean), "std": std}
+            result[str(segment)] = entry
+        return result
+
+
+def fit_segments(chunks: Callable[[], Iterator[pd.DataFrame]], features: List[str], n_segments: Union[int, str] = 3,
+                 algorithm: str = "minibatch_kmeans", standardize: bool = True,
+                 k_range: Tuple[int, int] = DEFAULT_K_RANGE, n_jobs: int = -1, birch_threshold: float = 0.5,
+                 random_state: int = 42, on_assigned: Optional[Callable[[pd.DataFrame, np.ndarray], None]] = None
+                 ) -> Tuple[SegmentationModel, Dict[int, float]]:
+    """
+    Fits a centroid model over a re-iterable stream of DataFrame chunks in three
+    passes, holding only one chunk plus a fixed-size sample in memory:
+
+    1. profile feature means/variances and draw a reservoir sample (k is chosen
+       on the sample when ``n_segments`` is "auto");
+    2. ``partial_fit`` MiniBatchKMeans (seeded with the sample's centroids) or
+       BIRCH, whose subclusters are then reduced to ``k`` centroids;
+    3. assign every row and accumulate per-segment statistics; ``on_assigned``
+       receives each chunk with its labels (e.g. to write them out).
+    """
+    def matrices() -> Iterator[np.ndarray]:
+        for chunk in chunks():
+            yield chunk[features].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    profile = _StreamingProfile(len(features), seed=random_state)
+    for X in matrices():
+        profile.update(X)
+    if profile.count == 0:
+        raise ValueError("No complete rows found for the selected features.")
+    mean = profile.mean if standardize else np.zeros(len(features))
+    scale = profile.std if standardize else np.ones(len(features))
+    scale = np.where(scale > 0, scale, 1.0)
+    sample = (profile.sample - mean) / scale
+
+    k_scores: Dict[int, float] = {}
+    if n_segments == "auto":
+        k, k_scores, candidate_centers = select_n_segments(sample, list(range(k_range[0], k_range[1] + 1)), n_jobs, random_state)
+        init_centers = candidate_centers[k]
+    else:
+        k = int(n_segments)
+        if profile.count < k:
+            raise ValueError(f"Number of samples ({profile.count}) is less than the number of segments ({k}). Cannot perform clustering.")
+        init_centers = None
+
+    if algorithm == "birch":
+        birch = Birch(threshold=birch_threshold, n_clusters=None)
+        for X in matrices():
+            Z = (X[~np.isnan(X).any(axis=1)] - mean) / scale
+            if Z.shape[0]:
+                birch.partial_fit(Z)
+        subclusters = birch.subcluster_centers_
+        if subclusters.shape[0] < k:
+            raise ValueError(f"BIRCH found only {subclusters.shape[0]} subclusters; lower 'birch_threshold'.")
+        centroids = KMeans(n_clusters=k, random_state=random_state, n_init=10).fit(subclusters).cluster_centers_
+    elif algorithm == "minibatch_kmeans":
+        if init_centers is None:
+            init_centers = MiniBatchKMeans(n_clusters=k, random_state=random_state, n_init=3,
+                                           batch_size=MINIBATCH_SIZE).fit(sample).cluster_centers_
+        kmeans = MiniBatchKMeans(n_clusters=k, init=init_centers, n_init=1, random_state=random_state,
+                                 batch_size=MINIBATCH_SIZE)
+        for X in matrices():
+            Z = (X[~np.isnan(X).any(axis=1)] - mean) / scale
+            for start in range(0, Z.shape[0], MINIBATCH_SIZE):
+                kmeans.partial_fit(Z[start:start + MINIBATCH_SIZE])
+        centroids = kmeans.cluster_centers_
+    else:
+        raise ValueError(f"Unsupported algorithm '{algorithm}'. Use 'minibatch_kmeans' or 'birch'.")
+
+    model = SegmentationModel(features, mean, scale, centroids, algorithm, rows_fitted=profile.count)
+    sample_labels = model.assign(profile.sample)
+    if len(np.unique(sample_labels)) > 1:
+        model.silhouette = float(silhouette_score(sample, sample_labels, sample_size=min(SILHOUETTE_SAMPLE_SIZE, sample.shape[0]),
+                                                  random_state=random_state))
+    accumulator = _SegmentAccumulator(k, features)
+    for chunk in chunks():
+        X = chunk[features].to_numpy(dtype=np.float64, na_value=np.nan)
+        labels = model.assign(X)
+        accumulator.update(X, labels)
+        if on_assigned is not None:
+            on_assigned(chunk, labels)
+    model.segment_summary = accumulator.summary()
+    return model, k_scores
+
+
+segmentation_models: Dict[str, SegmentationModel] = {}
+
+
+def get_segmentation_model(model_name: str) -> SegmentationModel:
+    """Returns a fitted model from memory, falling back to the latest registry version."""
+    model = segmentation_models.get(model_name)
+    if model is None:
+        model = model_registry.load(REGISTRY_PREFIX + model_name, mmap_mode=None)
+        segmentation_models[model_name] = model
+    return model
+
+
 class SegmentAnalysisModel:
     """Manages the text generation model for segment analysis, using a singleton pattern."""
     _generator = None
@@ -89,13 +377,20 @@ class SegmentAnalysisModel:
 segment_analysis_model_instance = SegmentAnalysisModel()
 
 class SegmentCustomersTool(BaseTool):
-    """Segments customers into distinct groups using K-Means clustering."""
+    """
+    Segments customers into distinct groups using K-Means clustering.
+
+    Large .csv/.parquet inputs are streamed in chunks and clustered with
+    MiniBatchKMeans or BIRCH in bounded memory; the fitted centroids can be saved
+    under a model name and used by AssignCustomerSegmentsTool without refitting.
+    """
     def __init__(self, tool_name="segment_customers"):
         super().__init__(tool_name=tool_name)
 
     @property
     def description(self) -> str:
-        return "Segments customers into distinct groups using K-Means clustering based on provided customer data and features."
+        return ("Segments customers into distinct groups using K-Means clustering based on provided customer data and features. "
+                "Large files are streamed and clustered with mini-batch K-Means or BIRCH; the number of segments can be chosen automatically.")
 
     @property
     def parameters(self) -> Dict[str, Any]:
@@ -104,71 +399,218 @@ class SegmentCustomersTool(BaseTool):
             "properties": {
                 "data": {
                     "type": ["string", "array", "object"],
-                    "description": "Customer data as a DataFrame, list of dicts, JSON string, or .csv/.json file path."
+                    "description": "Customer data as a DataFrame, list of dicts, JSON string, or .csv/.json/.parquet file path."
                 },
-                "n_segments": {"type": "integer", "description": "The number of customer segments to create.", "default": 3},
+                "n_segments": {"type": ["integer", "string"], "description": "The number of customer segments to create, or 'auto' to pick it by silhouette score.", "default": 3},
                 "features": {
                     "type": "array",
                     "items": {"type": "string"},
                     "description": "Optional: A list of numerical features to use for segmentation. If not provided, all numerical features will be used.",
                     "default": []
-                }
+                },
+                "mode": {"type": "string", "enum": ["auto", "in_memory", "streaming"], "description": "'streaming' processes .csv/.parquet files chunk by chunk; 'auto' streams files larger than 64 MB.", "default": "auto"},
+                "algorithm": {"type": "string", "enum": ["minibatch_kmeans", "birch"], "description": "Clustering algorithm for streaming mode.", "default": "minibatch_kmeans"},
+                "standardize": {"type": "boolean", "description": "Scale features to zero mean and unit variance before clustering. Defaults to true in streaming mode and false in memory."},
+                "k_min": {"type": "integer", "description": "Smallest number of segments tried when n_segments is 'auto'.", "default": DEFAULT_K_RANGE[0]},
+                "k_max": {"type": "integer", "description": "Largest number of segments tried when n_segments is 'auto'.", "default": DEFAULT_K_RANGE[1]},
+                "model_name": {"type": "string", "description": "Optional: Save the fitted centroid model under this name for later assignment."},
+                "output_path": {"type": "string", "description": "Optional: CSV file to write every input row with its 'segment' column."},
+                "n_jobs": {"type": "integer", "description": "Parallel workers for choosing the number of segments (-1 uses all cores).", "default": -1}
             },
             "required": ["data"]
         }
 
-    def execute(self, data: Union[str, List[Dict[str, Any]], Any], n_segments: int = 3, features: Optional[List[str]] = None, **kwargs: Any) -> str:
+    def _segment_in_memory(self, X: pd.DataFrame, n_segments: Union[int, str], standardize: bool,
+                           k_range: Tuple[int, int], n_jobs: int) -> Tuple[SegmentationModel, Dict[int, float], np.ndarray]:
+        """The original full-batch K-Means path, producing the same centroid model as streaming mode."""
+        features = list(X.columns)
+        values = X.to_numpy(dtype=np.float64, na_value=np.nan)
+        mean = np.nanmean(values, axis=0) if standardize else np.zeros(len(features))
+        scale = np.nanstd(values, axis=0) if standardize else np.ones(len(features))
+        scale = np.where(scale > 0, scale, 1.0)
+        Z = (values - mean) / scale
+        k_scores: Dict[int, float] = {}
+        if n_segments == "auto":
+            n_segments, k_scores, _ = select_n_segments(Z, list(range(k_range[0], k_range[1] + 1)), n_jobs)
+        kmeans = KMeans(n_clusters=int(n_segments), random_state=42, n_init=10).fit(Z)
+        model = SegmentationModel(features, mean, scale, kmeans.cluster_centers_, "kmeans", rows_fitted=len(Z))
+        labels = kmeans.labels_
+        if Z.shape[0] > 1 and len(np.unique(labels)) > 1:
+            try:
+                model.silhouette = float(silhouette_score(Z, labels, sample_size=min(SILHOUETTE_SAMPLE_SIZE, Z.shape[0]), random_state=42))
+            except Exception as e:
+                logger.warning(f"Could not calculate silhouette score: {e}")
+        accumulator = _SegmentAccumulator(model.n_segments, features)
+        accumulator.update(values, labels)
+        model.segment_summary = accumulator.summary()
+        return model, k_scores, labels
+
+    def execute(self, data: Union[str, List[Dict[str, Any]], Any], n_segments: Union[int, str] = 3, features: Optional[List[str]] = None, **kwargs: Any) -> str:
         if not SKLEARN_AVAILABLE:
             return json.dumps({"error": "Scikit-learn library is not installed. Please install it with 'pip install scikit-learn'."})
         if pd is None:
             return json.dumps({"error": "Pandas library is not installed. Please install it with 'pip install pandas'."})
 
+        mode = kwargs.get("mode", "auto")
+        algorithm = kwargs.get("algorithm", "minibatch_kmeans")
+        k_range = (int(kwargs.get("k_min", DEFAULT_K_RANGE[0])), int(kwargs.get("k_max", DEFAULT_K_RANGE[1])))
+        n_jobs = int(kwargs.get("n_jobs", -1))
+        model_name = kwargs.get("model_name")
+        output_path = kwargs.get("output_path")
+        if n_segments != "auto":
+            try:
+                n_segments = int(n_segments)
+            except (TypeError, ValueError):
+                return json.dumps({"error": "'n_segments' must be an integer or 'auto'."})
+
+        is_file = isinstance(data, str) and os.path.isfile(data)
+        if mode == "auto":
+            mode = "streaming" if is_file and os.path.getsize(data) > STREAMING_THRESHOLD_BYTES else "in_memory"
+        standardize = kwargs.get("standardize")
+        if standardize is None:
+            standardize = mode == "streaming"
+
         try:
-            df = _load_data_to_df(data)
-        except (ImportError, ValueError, json.JSONDecodeError, FileNotFoundError) as e:
-            return json.dumps({"error": f"Failed to load data: {e}"})
+            if mode == "streaming":
+                if not is_file:
+                    return json.dumps({"error": "Streaming mode requires a .csv or .parquet file path."})
+                numeric_columns = _numeric_feature_columns(data)
+                if features:
+                    header = pd.read_csv(data, nrows=0).columns if data.endswith('.csv') else pq.ParquetFile(data).schema_arrow.names
+                    missing_features = [f for f in features if f not in header]
+                    if missing_features:
+                        return json.dumps({"error": f"Missing specified features in data: {', '.join(missing_features)}."})
+                else:
+                    features = numeric_columns
+                if not features:
+                    return json.dumps({"error": "No numerical features found in the provided data for segmentation."})
 
-        numerical_df = df.select_dtypes(include=np.number)
-        if numerical_df.empty:
-            return json.dumps({"error": "No numerical features found in the provided data for segmentation."})
+                written = {"rows": 0}
+                on_assigned = None
+                if output_path:
+                    if os.path.exists(output_path):
+                        os.remove(output_path)
 
-        if features:
-            missing_features = [f for f in features if f not in numerical_df.columns]
-            if missing_features:
-                return json.dumps({"error": f"Missing specified features in data: {', '.join(missing_features)}."})
-            X = numerical_df[features]
-        else:
-            X = numerical_df
+                    def on_assigned(chunk: pd.DataFrame, labels: np.ndarray) -> None:
+                        chunk.assign(segment=labels).to_csv(output_path, mode="a", index=False, header=written["rows"] == 0)
+                        written["rows"] += len(chunk)
 
-        if X.shape[0] < n_segments:
-            return json.dumps({"error": f"Number of samples ({X.shape[0]}) is less than the number of segments ({n_segments}). Cannot perform clustering."})
-        
-        try:
-            kmeans = KMeans(n_clusters=n_segments, random_state=42, n_init=10)
-            df['segment'] = kmeans.fit_predict(X)
-            
-            # Calculate silhouette score for evaluation
-            score = None
-            if X.shape[0] > 1 and len(np.unique(df['segment'])) > 1:
+                model, k_scores = fit_segments(
+                    lambda: _iter_feature_chunks(data, features, keep_columns=bool(output_path)),
+                    features, n_segments, algorithm, standardize, k_range, n_jobs,
+                    birch_threshold=float(kwargs.get("birch_threshold", 0.5)), on_assigned=on_assigned)
+                sample = None
+            else:
                 try:
-                    score = silhouette_score(X, df['segment'])
-                except Exception as e:
-                    logger.warning(f"Could not calculate silhouette score: {e}")
+                    df = _load_data_to_df(data)
+                except (ImportError, ValueError, json.JSONDecodeError, FileNotFoundError) as e:
+                    return json.dumps({"error": f"Failed to load data: {e}"})
 
-            # Summarize segments
-            segment_summary = df.groupby('segment').agg(['mean', 'std']).to_dict('index')
-            
-            return json.dumps({
+                numerical_df = df.select_dtypes(include=np.number)
+                if numerical_df.empty:
+                    return json.dumps({"error": "No numerical features found in the provided data for segmentation."})
+
+                if features:
+                    missing_features = [f for f in features if f not in numerical_df.columns]
+                    if missing_features:
+                        return json.dumps({"error": f"Missing specified features in data: {', '.join(missing_features)}."})
+                    X = numerical_df[features]
+                else:
+                    X = numerical_df
+
+                if n_segments != "auto" and X.shape[0] < n_segments:
+                    return json.dumps({"error": f"Number of samples ({X.shape[0]}) is less than the number of segments ({n_segments}). Cannot perform clustering."})
+                model, k_scores, labels = self._segment_in_memory(X, n_segments, standardize, k_range, n_jobs)
+                df['segment'] = labels
+                if output_path:
+                    df.to_csv(output_path, index=False)
+                sample = df[['segment']].head().to_dict('index')  # Return segment for first few customer indices
+
+            result = {
                 "message": "Customer segmentation performed successfully.",
-                "n_segments": n_segments,
-                "silhouette_score": score,
-                "segment_summary": segment_summary,
-                "customer_segments_sample": df[['segment']].head().to_dict('index') # Return segment for first few customer indices
-            }, indent=2)
+                "mode": mode,
+                "algorithm": model.algorithm,
+                "n_segments": model.n_segments,
+                "rows": model.rows_fitted,
+                "silhouette_score": model.silhouette,
+                "segment_summary": model.segment_summary,
+            }
+            if k_scores:
+                result["k_selection"] = {str(k): score for k, score in k_scores.items()}
+            if sample is not None:
+                result["customer_segments_sample"] = sample
+            if output_path:
+                result["output_path"] = output_path
+            if model_name:
+                segmentation_models[model_name] = model
+                record = model_registry.register(REGISTRY_PREFIX + model_name, model,
+                                                 {"features": model.features, "n_segments": model.n_segments, "rows": model.rows_fitted})
+                result["model"] = {"name": model_name, "version": record["version"]}
+            return json.dumps(result, indent=2)
         except Exception as e:
             logger.error(f"Error during K-Means clustering: {e}")
             return json.dumps({"error": f"Error during K-Means clustering: {e}"})
 
+class AssignCustomerSegmentsTool(BaseTool):
+    """Assigns new customers to the segments of a saved segmentation model without refitting."""
+    def __init__(self, tool_name="assign_customer_segments"):
+        super().__init__(tool_name=tool_name)
+
+    @property
+    def description(self) -> str:
+        return "Assigns customers to the nearest segment of a segmentation model saved by segment_customers, without refitting."
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "model_name": {"type": "string", "description": "Name the model was saved under with segment_customers."},
+                "data": {
+                    "type": ["string", "array", "object"],
+                    "description": "Customers as a DataFrame, list of dicts, JSON string, or .csv/.json/.parquet file path."
+                },
+                "output_path": {"type": "string", "description": "Optional: CSV file to write the rows with their 'segment' column (required for large files)."}
+            },
+            "required": ["model_name", "data"]
+        }
+
+    def execute(self, model_name: str, data: Union[str, List[Dict[str, Any]], Any], **kwargs: Any) -> str:
+        try:
+            model = get_segmentation_model(model_name)
+        except Exception as e:
+            return json.dumps({"error": f"Segmentation model '{model_name}' not found: {e}"})
+        output_path = kwargs.get("output_path")
+        try:
+            if isinstance(data, str) and os.path.isfile(data) and (data.endswith('.parquet') or output_path):
+                if not output_path:
+                    return json.dumps({"error": "'output_path' is required to assign segments for a file."})
+                counts = np.zeros(model.n_segments, dtype=np.int64)
+                rows = 0
+                for chunk in _iter_feature_chunks(data, model.features, keep_columns=True):
+                    labels = model.assign(chunk[model.features].to_numpy(dtype=np.float64, na_value=np.nan))
+                    counts += np.bincount(labels[labels >= 0], minlength=model.n_segments)
+                    chunk.assign(segment=labels).to_csv(output_path, mode="w" if rows == 0 else "a", index=False, header=rows == 0)
+                    rows += len(chunk)
+                return json.dumps({"model_name": model_name, "rows": rows, "output_path": output_path,
+                                   "segment_counts": {str(i): int(c) for i, c in enumerate(counts)}}, indent=2)
+
+            df = _load_data_to_df(data)
+            missing_features = [f for f in model.features if f not in df.columns]
+            if missing_features:
+                return json.dumps({"error": f"Missing specified features in data: {', '.join(missing_features)}."})
+            values = df[model.features].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            labels = model.assign(values)
+            if output_path:
+                df.assign(segment=labels).to_csv(output_path, index=False)
+            return json.dumps({"model_name": model_name, "rows": len(labels),
+                               "segments": [int(label) for label in labels],
+                               "centroids": {str(i): dict(zip(model.features, map(float, c)))
+                                             for i, c in enumerate(model.centroids_original())}}, indent=2)
+        except Exception as e:
+            logger.error(f"Error assigning customer segments: {e}")
+            return json.dumps({"error": f"Error assigning customer segments: {e}"})
+
 class AnalyzeCustomerSegmentsTool(BaseTool):
     """Analyzes the characteristics of identified customer segments using an AI model."""
     def __init__(self, tool_name="analyze_customer_segments"):
@@ -215,4 +657,38 @@ class AnalyzeCustomerSegmentsTool(BaseTool):
         try:
             return json.dumps(json.loads(llm_response), indent=2)
         except json.JSONDecodeError:
-            return json.dumps({"error": "LLM response was not valid JSON.", "raw_llm_response": llm_response})
\ No newline at end of file
+            return json.dumps({"error": "LLM response was not valid JSON.", "raw_llm_response": llm_response})
+
+
+if __name__ == '__main__':
+    import resource
+    import sys
+    import tempfile
+    import time
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    rng = np.random.default_rng(0)
+    centers = np.array([[20, 200, 2], [35, 1500, 12], [50, 600, 30], [65, 3000, 5], [28, 80, 50]], dtype=float)
+    path = os.path.join(tempfile.mkdtemp(), "customers.csv")
+    written = 0
+    while written < rows:
+        n = min(1_000_000, rows - written)
+        labels = rng.integers(0, len(centers), n)
+        points = centers[labels] + rng.normal(size=(n, 3)) * centers[labels] * 0.1
+        pd.DataFrame(points, columns=["age", "annual_spend", "orders"]).to_csv(path, mode="a", index=False, header=written == 0)
+        written += n
+    print(f"{rows:,} customers, {os.path.getsize(path) / 1024 ** 2:.0f} MB")
+
+    tool = SegmentCustomersTool()
+    started = time.perf_counter()
+    result = json.loads(tool.execute(data=path, n_segments="auto", mode="streaming", model_name="benchmark", k_max=8))
+    elapsed = time.perf_counter() - started
+    print(f"streaming fit: {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s), k={result['n_segments']}, "
+          f"silhouette={result['silhouette_score']:.3f}, peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    for segment, summary in result["segment_summary"].items():
+        print(f"  segment {segment}: {summary['count']:,} customers, mean spend {summary['annual_spend']['mean']:.0f}")
+
+    started = time.perf_counter()
+    assigned = json.loads(AssignCustomerSegmentsTool().execute(model_name="benchmark", data=[{"age": 34, "annual_spend": 1450, "orders": 11}]))
+    print(f"assign new customer: segment {assigned['segments'][0]} in {(time.perf_counter() - started) * 1000:.1f} ms")
+    os.remove(path)
@@ -104,6 +104,7 @@ customer_support_model_instance = CustomerSupportModel()
 
 class HandleCustomerQueryTool(BaseTool):
     """Handles a customer query using an LLM, leveraging conversation history."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="handle_customer_query"):
         super().__init__(tool_name=tool_name)
         self.specific_conversational_ai_tool = SpecificConversationalAITool() if CONVERSATIONAL_AI_TOOL_AVAILABLE else None
@@ -137,6 +138,7 @@ class HandleCustomerQueryTool(BaseTool):
 
 class EscalateToHumanTool(BaseTool):
     """Escalates a customer query to a human agent."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="escalate_to_human"):
         super().__init__(tool_name=tool_name)
 
@@ -183,6 +185,7 @@ class EscalateToHumanTool(BaseTool):
 
 class ProvideFAQAnswerTool(BaseTool):
     """Provides an answer to a customer query from a predefined FAQ knowledge base."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="provide_faq_answer"):
         super().__init__(tool_name=tool_name)
 
@@ -207,6 +210,7 @@ class ProvideFAQAnswerTool(BaseTool):
 
 class CollectCustomerFeedbackTool(BaseTool):
     """Collects customer feedback and analyzes its sentiment."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="collect_customer_feedback"):
         super().__init__(tool_name=tool_name)
         self.sentiment_analyzer = AnalyzeFeedbackSentimentTool() if FEEDBACK_ANALYZER_AVAILABLE else None
@@ -259,6 +263,7 @@ class CollectCustomerFeedbackTool(BaseTool):
 
 class AddFAQEntryTool(BaseTool):
     """Adds a new FAQ entry to the knowledge base."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="add_faq_entry"):
         super().__init__(tool_name=tool_name)
 
@@ -130,6 +130,7 @@ threat_analysis_model_instance = ThreatAnalysisModel()
 
 class AddThreatIndicatorTool(BaseTool):
     """Adds a new cyber threat indicator to the intelligence database."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="add_threat_indicator"):
         super().__init__(tool_name=tool_name)
 
@@ -161,6 +162,7 @@ class AddThreatIndicatorTool(BaseTool):
 
 class GetLatestThreatsTool(BaseTool):
     """Retrieves the latest threat intelligence."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="get_latest_threats"):
         super().__init__(tool_name=tool_name)
 
@@ -187,6 +189,7 @@ class GetLatestThreatsTool(BaseTool):
 
 class AnalyzeThreatIndicatorTool(BaseTool):
     """Analyzes a specific threat indicator using an AI model."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="analyze_threat_indicator"):
         super().__init__(tool_name=tool_name)
 
@@ -220,6 +223,7 @@ class AnalyzeThreatIndicatorTool(BaseTool):
 
 class SearchThreatIntelligenceTool(BaseTool):
     """Searches for threat intelligence based on a query."""
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name="search_threat_intelligence"):
         super().__init__(tool_name=tool_name)
 
@@ -1,7 +1,11 @@
 import logging
 import json
 import os
-from typing import Union, List, Dict, Any, Optional
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Union, List, Dict, Any, Optional, Iterator, Tuple
 
 # Suppress INFO messages from matplotlib
 logging.getLogger('matplotlib').setLevel(logging.WARNING)
@@ -16,132 +20,639 @@ except ImportError:
     logging.warning("Pandas library not found. Data analysis tools will be limited.")
 
 try:
-    from sklearn.model_selection import train_test_split
-    from sklearn.linear_model import LinearRegression
-    from sklearn.metrics import mean_squared_error, r2_score
     import numpy as np
-    SKLEARN_AVAILABLE = True
+    NUMPY_AVAILABLE = True
 except ImportError:
-    train_test_split = None
-    LinearRegression = None
-    mean_squared_error = None
-    r2_score = None
     np = None
-    SKLEARN_AVAILABLE = False
-    logging.warning("Scikit-learn library not found. Machine learning tools will be limited.")
+    NUMPY_AVAILABLE = False
+    logging.warning("Numpy library not found. Data analysis tools will be limited.")
 
 try:
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    MATPLOTLIB_AVAILABLE = True
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
 except ImportError:
-    plt = None
-    sns = None
-    MATPLOTLIB_AVAILABLE = False
-    logging.warning("Matplotlib or Seaborn not found. Visualization tools will be limited.")
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+    logging.warning("PyArrow not found. Large CSV datasets will be streamed from the source file instead of Parquet.")
 
-from tools.base_tool import BaseTool
+from tools.base_tool import CURRENT_USER, BaseTool
+from tools.chart_renderer import (MATPLOTLIB_AVAILABLE, ScatterThinner, chart_renderer, file_fingerprint,
+                                  frame_fingerprint, histogram_edges, kde_curve)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SESSION = "default"
+DEFAULT_DATASET = "default"
+
+# Files up to this size are loaded straight into a DataFrame; anything larger is
+# kept out-of-core and processed chunk by chunk.
+IN_MEMORY_THRESHOLD_BYTES = int(os.getenv("DATA_ANALYSIS_IN_MEMORY_BYTES", 64 * 1024 ** 2))
+CHUNK_ROWS = int(os.getenv("DATA_ANALYSIS_CHUNK_ROWS", 250_000))
+DTYPE_SAMPLE_ROWS = 10_000
+# Quartiles are computed from a per-column reservoir sample; they are exact as
+# long as the column has no more values than the reservoir holds.
+QUANTILE_SAMPLE_SIZE = 100_000
+DATASET_CACHE_DIR = os.getenv("DATA_ANALYSIS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "mic_datasets"))
+
+
+def _infer_csv_dtypes(path: str, usecols: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Infers a stable column type map from the head of a CSV file.
+
+    Numeric columns are widened to float64 so that missing values in later
+    chunks do not change the schema; everything else is read as text.
+    """
+    sample = pd.read_csv(path, nrows=DTYPE_SAMPLE_ROWS, usecols=usecols)
+    dtypes = {}
+    for column, dtype in sample.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            dtypes[column] = "object"
+        elif pd.api.types.is_numeric_dtype(dtype):
+            dtypes[column] = "float64"
+        else:
+            dtypes[column] = "object"
+    return dtypes
+
+
+def _coerce_chunk(chunk: "pd.DataFrame", dtypes: Dict[str, str]) -> "pd.DataFrame":
+    """Forces a chunk onto the inferred schema; unparsable numbers become NaN."""
+    for column, dtype in dtypes.items():
+        if dtype == "float64" and chunk[column].dtype != np.float64:
+            chunk[column] = pd.to_numeric(chunk[column], errors="coerce").astype(np.float64)
+        elif dtype == "object" and chunk[column].dtype != object:
+            chunk[column] = chunk[column].astype(object).where(chunk[column].notna(), None)
+    return chunk
+
+
+class Dataset:
+    """
+    A named table owned by one session.
+
+    Small inputs live in memory as a DataFrame. Large CSV files are scanned once
+    at load time; with PyArrow installed they are converted to a Parquet file so
+    later scans only touch the projected columns, otherwise the CSV is re-read in
+    chunks with ``usecols``. Every analysis reads through ``iter_chunks`` so the
+    same code serves both layouts.
+    """
+
+    def __init__(self, session_id: str, name: str, chunk_rows: int = CHUNK_ROWS):
+        self.session_id = session_id
+        self.name = name
+        self.chunk_rows = chunk_rows
+        self.frame: Optional["pd.DataFrame"] = None
+        self.source_path: Optional[str] = None
+        self.parquet_path: Optional[str] = None
+        self.spill_path: Optional[str] = None
+        self.usecols: Optional[List[str]] = None
+        self.dtypes: Dict[str, str] = {}
+        self.row_count = 0
+        self.non_null_counts: Dict[str, int] = {}
+        self.last_access = time.monotonic()
+        self._fingerprints: Dict[Optional[Tuple[str, ...]], str] = {}
+        self._lock = threading.RLock()
+
+    # -- construction -----------------------------------------------------
+
+    def attach_frame(self, frame: "pd.DataFrame") -> None:
+        self.frame = frame
+        self._fingerprints = {}
+        self.dtypes = {column: str(dtype) for column, dtype in frame.dtypes.items()}
+        self.row_count = len(frame)
+        self.non_null_counts = {column: int(count) for column, count in frame.count().items()}
+
+    def attach_csv(self, path: str, usecols: Optional[List[str]] = None) -> None:
+        """Profiles a large CSV in one streaming pass, converting it to Parquet when possible."""
+        self.source_path = path
+        self.usecols = usecols
+        self.dtypes = _infer_csv_dtypes(path, usecols)
+        text_columns = {column: "object" for column, dtype in self.dtypes.items() if dtype == "object"}
+        row_count = 0
+        non_null = {column: 0 for column in self.dtypes}
+        writer = None
+        target = None
+        if PYARROW_AVAILABLE:
+            os.makedirs(DATASET_CACHE_DIR, exist_ok=True)
+            fd, target = tempfile.mkstemp(prefix=f"{self.name}_", suffix=".parquet", dir=DATASET_CACHE_DIR)
+            os.close(fd)
+            schema = pa.schema([(column, pa.float64() if dtype == "float64" else pa.string())
+                                for column, dtype in self.dtypes.items()])
+        try:
+            for chunk in pd.read_csv(path, chunksize=self.chunk_rows, usecols=usecols, dtype=text_columns):
+                chunk = _coerce_chunk(chunk, self.dtypes)
+                row_count += len(chunk)
+                for column, count in chunk.count().items():
+                    non_null[column] += int(count)
+                if target is not None:
+                    table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(target, schema)
+                    writer.write_table(table)
+        except Exception:
+            if target is not None and os.path.exists(target):
+                os.remove(target)
+            raise
+        finally:
+            if writer is not None:
+                writer.close()
+        self.parquet_path = target if writer is not None else None
+        if target is not None and self.parquet_path is None and os.path.exists(target):
+            os.remove(target)
+        self.row_count = row_count
+        self.non_null_counts = non_null
+
+    # -- access -----------------------------------------------------------
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.dtypes)
+
+    @property
+    def storage(self) -> str:
+        if self.frame is not None:
+            return "memory"
+        if self.parquet_path:
+            return "parquet"
+        if self.spill_path:
+            return "parquet" if self.spill_path.endswith(".parquet") else "spill"
+        return "csv"
+
+    @property
+    def resident_bytes(self) -> int:
+        if self.frame is None:
+            return 0
+        return int(self.frame.memory_usage(deep=True).sum())
+
+    def numeric_columns(self) -> List[str]:
+        if self.frame is not None:
+            return self.frame.select_dtypes(include=np.number).columns.tolist()
+        return [column for column, dtype in self.dtypes.items() if dtype == "float64"]
+
+    def touch(self) -> None:
+        self.last_access = time.monotonic()
+
+    def fingerprint(self, columns: Optional[List[str]] = None) -> str:
+        """Content key for ``columns``, used to cache charts. CSV-backed datasets are keyed by file stat."""
+        key = tuple(columns) if columns is not None else None
+        with self._lock:
+            if key not in self._fingerprints:
+                if self.source_path:
+                    self._fingerprints[key] = file_fingerprint(self.source_path, [self.usecols, columns])
+                else:
+                    self._fingerprints[key] = frame_fingerprint(self.iter_chunks(columns), columns)
+            return self._fingerprints[key]
+
+    def iter_chunks(self, columns: Optional[List[str]] = None) -> Iterator["pd.DataFrame"]:
+        """Yields the dataset (projected to ``columns``) as a sequence of DataFrames."""
+        self.touch()
+        if columns is not None:
+            missing = [column for column in columns if column not in self.dtypes]
+            if missing:
+                raise KeyError(f"Column '{missing[0]}' not found in the DataFrame.")
+        frame = self.frame
+        if frame is not None:
+            view = frame if columns is None else frame[columns]
+            for start in range(0, len(view), self.chunk_rows):
+                yield view.iloc[start:start + self.chunk_rows]
+            return
+        if self.parquet_path or (self.spill_path and self.spill_path.endswith(".parquet")):
+            parquet_file = pq.ParquetFile(self.parquet_path or self.spill_path)
+            for batch in parquet_file.iter_batches(batch_size=self.chunk_rows, columns=columns):
+                yield batch.to_pandas()
+            return
+        if self.spill_path:
+            spilled = pd.read_pickle(self.spill_path)  # nosec B301 - written by this process
+            view = spilled if columns is None else spilled[columns]
+            for start in range(0, len(view), self.chunk_rows):
+                yield view.iloc[start:start + self.chunk_rows]
+            return
+        if self.source_path:
+            wanted = columns if columns is not None else self.usecols
+            dtypes = {column: self.dtypes[column] for column in (wanted or self.dtypes)}
+            text_columns = {column: "object" for column, dtype in dtypes.items() if dtype == "object"}
+            for chunk in pd.read_csv(self.source_path, chunksize=self.chunk_rows, usecols=wanted, dtype=text_columns):
+                chunk = _coerce_chunk(chunk, dtypes)
+                yield chunk if columns is None else chunk[columns]
+            return
+        raise ValueError(f"Dataset '{self.name}' has no backing data.")
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> "pd.DataFrame":
+        """Materializes the projected columns. Only use for bounded outputs such as plots."""
+        if self.frame is not None:
+            self.touch()
+            return self.frame if columns is None else self.frame[columns]
+        chunks = list(self.iter_chunks(columns))
+        if not chunks:
+            return pd.DataFrame(columns=columns or self.columns)
+        return pd.concat(chunks, ignore_index=True)
+
+    # -- lifecycle --------------------------------------------------------
+
+    def release(self) -> int:
+        """Drops the in-memory frame, spilling it to disk first if nothing else backs it."""
+        with self._lock:
+            if self.frame is None:
+                return 0
+            freed = self.resident_bytes
+            if not (self.parquet_path or self.source_path or self.spill_path):
+                os.makedirs(DATASET_CACHE_DIR, exist_ok=True)
+                suffix = ".parquet" if PYARROW_AVAILABLE else ".pkl"
+                fd, path = tempfile.mkstemp(prefix=f"{self.name}_", suffix=suffix, dir=DATASET_CACHE_DIR)
+                os.close(fd)
+                if PYARROW_AVAILABLE:
+                    self.frame.to_parquet(path, index=False)
+                else:
+                    self.frame.to_pickle(path)
+                self.spill_path = path
+            self.frame = None
+            return freed
+
+    def close(self) -> None:
+        with self._lock:
+            self.frame = None
+            for path in (self.parquet_path, self.spill_path):
+                if path and os.path.exists(path):
+                    os.remove(path)
+            self.parquet_path = None
+            self.spill_path = None
+
+
+class DatasetRegistry:
+    """
+    Holds the datasets of every session, keyed by ``(session_id, name)``.
+
+    Entries are kept in least-recently-used order. When the resident DataFrames
+    exceed ``max_resident_bytes`` the coldest ones are released to disk, and
+    datasets idle for longer than ``max_idle_seconds`` are dropped entirely.
+    """
+
+    def __init__(self, max_resident_bytes: int = int(os.getenv("DATA_ANALYSIS_MAX_RESIDENT_BYTES", 512 * 1024 ** 2)),
+                 max_idle_seconds: float = float(os.getenv("DATA_ANALYSIS_MAX_IDLE_SECONDS", 3600))):
+        self.max_resident_bytes = max_resident_bytes
+        self.max_idle_seconds = max_idle_seconds
+        self._datasets: "OrderedDict[Tuple[str, str], Dataset]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def put(self, dataset: Dataset) -> Dataset:
+        key = (dataset.session_id, dataset.name)
+        with self._lock:
+            previous = self._datasets.pop(key, None)
+            if previous is not None:
+                previous.close()
+            self._datasets[key] = dataset
+            self._evict()
+        return dataset
+
+    def get(self, session_id: str, name: str) -> Dataset:
+        key = (session_id, name)
+        with self._lock:
+            dataset = self._datasets.get(key)
+            if dataset is None:
+                raise ValueError("No data loaded. Please load data using 'load_data' before calling any analysis methods.")
+            self._datasets.move_to_end(key)
+            dataset.touch()
+            self._evict()
+        return dataset
+
+    def remove(self, session_id: str, name: str) -> bool:
+        with self._lock:
+            dataset = self._datasets.pop((session_id, name), None)
+        if dataset is None:
+            return False
+        dataset.close()
+        return True
+
+    def list(self, session_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            datasets = [dataset for (owner, _), dataset in self._datasets.items() if owner == session_id]
+        return [{"name": dataset.name, "rows": dataset.row_count, "columns": len(dataset.dtypes),
+                 "storage": dataset.storage} for dataset in datasets]
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(dataset.resident_bytes for dataset in self._datasets.values())
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, dataset in self._datasets.items()
+                   if now - dataset.last_access > self.max_idle_seconds]
+        for key in expired:
+            logger.info(f"Dropping idle dataset {key}.")
+            self._datasets.pop(key).close()
+        resident = sum(dataset.resident_bytes for dataset in self._datasets.values())
+        # The most recently used dataset always stays resident.
+        for key in list(self._datasets)[:-1]:
+            if resident <= self.max_resident_bytes:
+                break
+            freed = self._datasets[key].release()
+            if freed:
+                logger.info(f"Released dataset {key} from memory ({freed / 1024**2:.2f} MB).")
+            resident -= freed
+
+
+dataset_registry = DatasetRegistry()
+
+
+class _ColumnStats:
+    """Mergeable count/mean/M2/min/max plus a reservoir sample for quartiles."""
+
+    def __init__(self, sample_size: int = QUANTILE_SAMPLE_SIZE, seed: int = 42):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sample_size = sample_size
+        self.reservoir = np.empty(0, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: "np.ndarray") -> None:
+        values = values[~np.isnan(values)]
+        n = values.size
+        if n == 0:
+            return
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._sample(values)
+        self.count = total
+
+    def _sample(self, values: "np.ndarray") -> None:
+        room = self.sample_size - self.reservoir.size
+        if room > 0:
+            self.reservoir = np.concatenate([self.reservoir, values[:room]])
+            values = values[room:]
+            seen = self.count + room
+        else:
+            seen = self.count
+        if values.size == 0:
+            return
+        # Vectorized Algorithm R: element i (1-based stream position t) replaces
+        # slot j ~ U[0, t) when j falls inside the reservoir.
+        positions = seen + np.arange(1, values.size + 1)
+        slots = (self._rng.random(values.size) * positions).astype(np.int64)
+        keep = slots < self.sample_size
+        self.reservoir[slots[keep]] = values[keep]
+
+    def summary(self) -> Dict[str, float]:
+        if self.count == 0:
+            nan = float("nan")
+            return {"count": 0.0, "mean": nan, "std": nan, "min": nan, "25%": nan, "50%": nan, "75%": nan, "max": nan}
+        q25, q50, q75 = np.quantile(self.reservoir, [0.25, 0.5, 0.75])
+        std = float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else float("nan")
+        return {"count": float(self.count), "mean": self.mean, "std": std, "min": self.min,
+                "25%": float(q25), "50%": float(q50), "75%": float(q75), "max": self.max}
+
+
+def streaming_describe(chunks: Iterator["pd.DataFrame"], columns: List[str]) -> Dict[str, Dict[str, float]]:
+    stats = {column: _ColumnStats() for column in columns}
+    for chunk in chunks:
+        for column in columns:
+            stats[column].update(chunk[column].to_numpy(dtype=np.float64, na_value=np.nan))
+    return {column: stats[column].summary() for column in columns}
+
+
+def streaming_correlation(chunks: Iterator["pd.DataFrame"], columns: List[str]) -> "np.ndarray":
+    """
+    Pearson correlation over pairwise-complete observations, like ``DataFrame.corr``.
+
+    Per pair the sufficient statistics are accumulated with a handful of matrix
+    products per chunk; values are shifted by the first chunk's means to keep the
+    raw sums well conditioned.
+    """
+    k = len(columns)
+    n = np.zeros((k, k))
+    sx = np.zeros((k, k))
+    sxx = np.zeros((k, k))
+    sxy = np.zeros((k, k))
+    shift = None
+    for chunk in chunks:
+        values = chunk[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        if values.shape[0] == 0:
+            continue
+        if shift is None:
+            with np.errstate(invalid="ignore"):
+                shift = np.nan_to_num(np.nanmean(values, axis=0)) if np.isfinite(values).any() else np.zeros(k)
+        present = ~np.isnan(values)
+        mask = present.astype(np.float64)
+        centered = np.where(present, values - shift, 0.0)
+        n += mask.T @ mask
+        sx += centered.T @ mask
+        sxx += (centered ** 2).T @ mask
+        sxy += centered.T @ centered
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = n * sxy - sx * sx.T
+        variance = (n * sxx - sx ** 2) * (n * sxx.T - (sx.T) ** 2)
+        corr = covariance / np.sqrt(variance)
+    corr[n < 2] = np.nan
+    corr = np.clip(corr, -1.0, 1.0)
+    diagonal = np.isfinite(np.diag(corr))
+    corr[np.diag_indices(k)] = np.where(diagonal, 1.0, np.nan)
+    return corr
+
+
+def streaming_linear_regression(chunks: Iterator["pd.DataFrame"], feature_columns: List[str], target_column: str,
+                                test_size: float = 0.2, random_state: int = 42) -> Dict[str, Any]:
+    """
+    Ordinary least squares from accumulated normal equations.
+
+    Each row is assigned to the train or test split by a seeded draw, train rows
+    update X'X and X'y, and test rows update the same statistics so the test MSE
+    and R^2 fall out of the fitted coefficients without a second pass.
+    """
+    k = len(feature_columns) + 1
+    rng = np.random.default_rng(random_state)
+    train_xtx = np.zeros((k, k))
+    train_xty = np.zeros(k)
+    test_xtx = np.zeros((k, k))
+    test_xty = np.zeros(k)
+    test_yy = test_sy = 0.0
+    train_yy = train_sy = 0.0
+    train_rows = test_rows = 0
+    shift_x = shift_y = None
+    for chunk in chunks:
+        values = chunk[feature_columns + [target_column]].to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values).any(axis=1)]
+        if values.shape[0] == 0:
+            continue
+        if shift_x is None:
+            shift_x = values[:, :-1].mean(axis=0)
+            shift_y = values[:, -1].mean()
+        design = np.empty((values.shape[0], k))
+        design[:, 0] = 1.0
+        design[:, 1:] = values[:, :-1] - shift_x
+        target = values[:, -1] - shift_y
+        is_test = rng.random(values.shape[0]) < test_size
+        train, test = ~is_test, is_test
+        train_xtx += design[train].T @ design[train]
+        train_xty += design[train].T @ target[train]
+        train_yy += float(target[train] @ target[train])
+        train_sy += float(target[train].sum())
+        train_rows += int(train.sum())
+        test_xtx += design[test].T @ design[test]
+        test_xty += design[test].T @ target[test]
+        test_yy += float(target[test] @ target[test])
+        test_sy += float(target[test].sum())
+        test_rows += int(test.sum())
+    if train_rows < 2:
+        raise ValueError("Linear regression requires at least two complete rows.")
+    beta = np.linalg.lstsq(train_xtx, train_xty, rcond=None)[0]
+    if test_rows == 0:
+        # Too few rows to hold any out; report in-sample fit instead.
+        test_xtx, test_xty, test_yy, test_sy, test_rows = train_xtx, train_xty, train_yy, train_sy, train_rows
+    sse = max(test_yy - 2.0 * beta @ test_xty + beta @ test_xtx @ beta, 0.0)
+    sst = test_yy - test_sy ** 2 / test_rows
+    coefficients = beta[1:]
+    intercept = beta[0] + shift_y - float(coefficients @ shift_x)
+    return {
+        "coefficients": {column: float(value) for column, value in zip(feature_columns, coefficients)},
+        "intercept": float(intercept),
+        "mean_squared_error": float(sse / test_rows),
+        "r_squared": float(1.0 - sse / sst) if sst > 0 else float("nan"),
+        "train_rows": train_rows,
+        "test_rows": test_rows,
+    }
+
+
 class DataAnalysisManager:
     """
     A comprehensive manager for loading, analyzing, and visualizing data.
-    This manager holds a pandas DataFrame in state and provides a suite of methods
-    for data manipulation, statistical analysis, machine learning, and visualization.
+    Each manager is bound to one session and works on a named dataset held in the
+    shared ``dataset_registry``; statistics are computed from streamed chunks so
+    datasets larger than memory can be analyzed.
     """
-    _instance = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(DataAnalysisManager, cls).__new__(cls)
-            if not PANDAS_AVAILABLE:
-                logger.error("Pandas library is not installed. Data analysis manager will not function.")
-                cls._instance.df = None
-            else:
-                cls._instance.df: Optional[pd.DataFrame] = None
-        return cls._instance
 
-    def _ensure_df_loaded(self) -> None:
-        """Checks if a DataFrame is loaded, raising an error if not."""
-        if self.df is None:
-            raise ValueError("No data loaded. Please load data using 'load_data' before calling any analysis methods.")
+    def __init__(self, session_id: str = DEFAULT_SESSION, registry: Optional[DatasetRegistry] = None):
+        self.session_id = session_id
+        self.registry = registry or dataset_registry
+
+    @property
+    def df(self) -> Optional["pd.DataFrame"]:
+        """The default dataset as a DataFrame, or ``None`` if nothing is loaded."""
+        try:
+            return self._dataset(DEFAULT_DATASET).to_frame()
+        except ValueError:
+            return None
+
+    def _dataset(self, dataset: str = DEFAULT_DATASET) -> Dataset:
+        if not PANDAS_AVAILABLE or not NUMPY_AVAILABLE:
+            raise ImportError("The 'pandas' and 'numpy' libraries are required for data analysis.")
+        return self.registry.get(self.session_id, dataset)
+
+    def _numeric_columns(self, data: Dataset, columns: List[str]) -> None:
+        numeric = set(data.numeric_columns())
+        for col in columns:
+            if col not in data.dtypes:
+                raise KeyError(f"Column '{col}' not found in the DataFrame.")
+            if col not in numeric:
+                raise TypeError(f"Column '{col}' must be of a numeric type for this analysis.")
 
-    def load_data(self, data_source: Union[str, List[Dict[str, Any]], pd.DataFrame], file_type: str = "csv") -> str:
+    def load_data(self, data_source: Union[str, List[Dict[str, Any]], "pd.DataFrame"], file_type: str = "csv",
+                  dataset: str = DEFAULT_DATASET, columns: Optional[List[str]] = None) -> Dataset:
         """
-        Loads data from various sources into the internal DataFrame.
+        Loads data from various sources into a named dataset of this session.
+
+        CSV files above ``IN_MEMORY_THRESHOLD_BYTES`` are not read into memory;
+        they are profiled in chunks and analyzed out-of-core. ``columns`` limits
+        the load to a subset of columns.
         """
         if not PANDAS_AVAILABLE:
             raise ImportError("The 'pandas' library is not installed.")
 
+        data = Dataset(self.session_id, dataset)
         if isinstance(data_source, pd.DataFrame):
-            self.df = data_source
+            data.attach_frame(data_source if columns is None else data_source[columns])
         elif isinstance(data_source, list) and all(isinstance(i, dict) for i in data_source):
-            self.df = pd.DataFrame(data_source)
+            frame = pd.DataFrame(data_source)
+            data.attach_frame(frame if columns is None else frame[columns])
         elif isinstance(data_source, str):
             if not os.path.exists(data_source):
                 raise FileNotFoundError(f"The file '{data_source}' was not found.")
-            
+
             if file_type.lower() == "csv":
-                self.df = pd.read_csv(data_source)
+                if os.path.getsize(data_source) > IN_MEMORY_THRESHOLD_BYTES:
+                    data.attach_csv(data_source, usecols=columns)
+                else:
+                    data.attach_frame(pd.read_csv(data_source, usecols=columns))
             elif file_type.lower() == "json":
-                self.df = pd.read_json(data_source)
+                frame = pd.read_json(data_source)
+                data.attach_frame(frame if columns is None else frame[columns])
             elif file_type.lower() == "excel":
                 try:
-                    self.df = pd.read_excel(data_source)
+                    data.attach_frame(pd.read_excel(data_source, usecols=columns))
                 except ImportError:
                     raise ImportError("To read Excel files, please install 'openpyxl' with 'pip install openpyxl'.")
             else:
                 raise ValueError(f"Unsupported file type: {file_type}. Use 'csv', 'json', or 'excel'.")
         else:
             raise ValueError("Unsupported data source type. Provide a file path, list of dicts, or a pandas DataFrame.")
-        
-        return f"Data loaded successfully. Shape: {self.df.shape}, Columns: {list(self.df.columns)}"
 
-    def get_info(self) -> Dict[str, Any]:
+        return self.registry.put(data)
+
+    def unload_data(self, dataset: str = DEFAULT_DATASET) -> bool:
+        return self.registry.remove(self.session_id, dataset)
+
+    def list_datasets(self) -> List[Dict[str, Any]]:
+        return self.registry.list(self.session_id)
+
+    def get_info(self, dataset: str = DEFAULT_DATASET) -> Dict[str, Any]:
         """
-        Retrieves concise information about the loaded DataFrame.
+        Retrieves concise information about a loaded dataset.
 
         Returns:
             A dictionary containing data types, non-null values, and memory usage.
         """
-        self._ensure_df_loaded()
+        data = self._dataset(dataset)
         info_dict = {
-            "columns": self.df.columns.tolist(),
-            "dtypes": {col: str(dtype) for col, dtype in self.df.dtypes.items()},
-            "non_null_counts": self.df.count().to_dict(),
-            "total_rows": len(self.df),
-            "memory_usage": f"{self.df.memory_usage(deep=True).sum() / 1024**2:.2f} MB"
+            "columns": data.columns,
+            "dtypes": dict(data.dtypes),
+            "non_null_counts": dict(data.non_null_counts),
+            "total_rows": data.row_count,
+            "storage": data.storage,
+            "memory_usage": f"{data.resident_bytes / 1024**2:.2f} MB"
         }
         return info_dict
 
-    def describe_data(self) -> Dict[str, Any]:
+    def describe_data(self, dataset: str = DEFAULT_DATASET) -> Dict[str, Any]:
         """
         Generates descriptive statistics for numerical columns.
 
         Returns:
             A dictionary of descriptive statistics (mean, std, etc.) for each numerical column.
         """
-        self._ensure_df_loaded()
-        return self.df.describe().to_dict()
+        data = self._dataset(dataset)
+        columns = data.numeric_columns()
+        if not columns:
+            raise ValueError("describe_data requires at least one numerical column.")
+        return streaming_describe(data.iter_chunks(columns), columns)
 
-    def get_correlation_matrix(self) -> Dict[str, Any]:
+    def get_correlation_matrix(self, dataset: str = DEFAULT_DATASET) -> Dict[str, Any]:
         """
         Computes the pairwise correlation of numerical columns.
 
         Returns:
             A dictionary representing the correlation matrix.
         """
-        self._ensure_df_loaded()
-        numerical_df = self.df.select_dtypes(include=np.number)
-        if numerical_df.shape[1] < 2:
+        data = self._dataset(dataset)
+        columns = data.numeric_columns()
+        if len(columns) < 2:
             raise ValueError("Correlation matrix requires at least two numerical columns.")
-        return numerical_df.corr().to_dict()
+        corr = streaming_correlation(data.iter_chunks(columns), columns)
+        return {col: {row: float(corr[i, j]) for i, row in enumerate(columns)} for j, col in enumerate(columns)}
 
-    def plot_histogram(self, column: str, save_path: str) -> str:
+    def plot_histogram(self, column: str, save_path: str, dataset: str = DEFAULT_DATASET) -> str:
         """
         Generates and saves a histogram for a specified numerical column.
 
+        The histogram is binned while streaming over the dataset and drawn by the
+        shared chart renderer, so only the bin counts reach the render worker.
+
         Args:
             column: The numerical column to plot.
             save_path: The file path to save the histogram image (e.g., 'histogram.png').
@@ -149,29 +660,38 @@ class DataAnalysisManager:
         Returns:
             A confirmation message with the path to the saved plot.
         """
-        self._ensure_df_loaded()
+        data = self._dataset(dataset)
         if not MATPLOTLIB_AVAILABLE:
-            raise ImportError("Visualization libraries not installed. Please run 'pip install matplotlib seaborn'.")
-        if column not in self.df.columns:
+            raise ImportError("Visualization libraries not installed. Please run 'pip install matplotlib'.")
+        if column not in data.dtypes:
             raise KeyError(f"Column '{column}' not found in the DataFrame.")
-        if not pd.api.types.is_numeric_dtype(self.df[column]):
+        if column not in data.numeric_columns():
             raise TypeError(f"Column '{column}' must be of a numeric type to plot a histogram.")
 
-        plt.figure(figsize=(10, 6))
-        sns.histplot(self.df[column], kde=True)
-        plt.title(f'Histogram of {column}', fontsize=16)
-        plt.xlabel(column, fontsize=12)
-        plt.ylabel('Frequency', fontsize=12)
-        plt.grid(axis='y', alpha=0.75)
-        plt.tight_layout()
-        plt.savefig(save_path)
-        plt.close()
+        def build() -> Dict[str, Any]:
+            stats = _ColumnStats()
+            for chunk in data.iter_chunks([column]):
+                stats.update(chunk[column].to_numpy(dtype=np.float64, na_value=np.nan))
+            edges = histogram_edges(stats.reservoir, stats.min, stats.max)
+            counts = np.zeros(len(edges) - 1, dtype=np.int64)
+            for chunk in data.iter_chunks([column]):
+                values = chunk[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                counts += np.histogram(values[~np.isnan(values)], bins=edges)[0]
+            curve = kde_curve(stats.reservoir, edges[0], edges[-1], stats.count * (edges[1] - edges[0]))
+            return {"edges": edges, "counts": counts, "kde": curve, "points": stats.count}
+
+        spec = {"plot_type": "histogram", "figsize": [10, 6], "title": f'Histogram of {column}', "title_fontsize": 16,
+                "xlabel": column, "ylabel": 'Frequency', "label_fontsize": 12, "grid": "y", "grid_alpha": 0.75}
+        chart_renderer.render(spec, data.fingerprint([column]), build, save_path)
         return f"Histogram saved to '{save_path}'"
 
-    def plot_scatter(self, x_column: str, y_column: str, save_path: str) -> str:
+    def plot_scatter(self, x_column: str, y_column: str, save_path: str, dataset: str = DEFAULT_DATASET) -> str:
         """
         Generates and saves a scatter plot for two specified numerical columns.
 
+        Points are thinned to one per pixel cell while streaming, which bounds the
+        marker count without changing what the image shows.
+
         Args:
             x_column: The column for the x-axis.
             y_column: The column for the y-axis.
@@ -180,27 +700,37 @@ class DataAnalysisManager:
         Returns:
             A confirmation message with the path to the saved plot.
         """
-        self._ensure_df_loaded()
+        data = self._dataset(dataset)
         if not MATPLOTLIB_AVAILABLE:
-            raise ImportError("Visualization libraries not installed. Please run 'pip install matplotlib seaborn'.")
+            raise ImportError("Visualization libraries not installed. Please run 'pip install matplotlib'.")
+        numeric = data.numeric_columns()
         for col in [x_column, y_column]:
-            if col not in self.df.columns:
+            if col not in data.dtypes:
                 raise KeyError(f"Column '{col}' not found in the DataFrame.")
-            if not pd.api.types.is_numeric_dtype(self.df[col]):
+            if col not in numeric:
                 raise TypeError(f"Column '{col}' must be of a numeric type for a scatter plot.")
-
-        plt.figure(figsize=(10, 6))
-        sns.scatterplot(x=self.df[x_column], y=self.df[y_column])
-        plt.title(f'Scatter Plot of {y_column} vs. {x_column}', fontsize=16)
-        plt.xlabel(x_column, fontsize=12)
-        plt.ylabel(y_column, fontsize=12)
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(save_path)
-        plt.close()
+        columns = list(dict.fromkeys([x_column, y_column]))
+
+        def build() -> Dict[str, Any]:
+            bounds = np.array([[np.inf, -np.inf], [np.inf, -np.inf]])
+            for chunk in data.iter_chunks(columns):
+                for row, col in enumerate([x_column, y_column]):
+                    values = chunk[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                    if not np.isnan(values).all():
+                        bounds[row] = [min(bounds[row, 0], np.nanmin(values)), max(bounds[row, 1], np.nanmax(values))]
+            thinner = ScatterThinner(tuple(bounds[0]), tuple(bounds[1]))
+            for chunk in data.iter_chunks(columns):
+                thinner.add(chunk[x_column].to_numpy(dtype=np.float64, na_value=np.nan),
+                            chunk[y_column].to_numpy(dtype=np.float64, na_value=np.nan))
+            x_values, y_values = thinner.points()
+            return {"x": x_values, "y": y_values, "points": thinner.seen}
+
+        spec = {"plot_type": "scatter", "figsize": [10, 6], "title": f'Scatter Plot of {y_column} vs. {x_column}',
+                "title_fontsize": 16, "xlabel": x_column, "ylabel": y_column, "label_fontsize": 12, "grid": "both"}
+        chart_renderer.render(spec, data.fingerprint(columns), build, save_path)
         return f"Scatter plot saved to '{save_path}'"
 
-    def plot_correlation_heatmap(self, save_path: str) -> str:
+    def plot_correlation_heatmap(self, save_path: str, dataset: str = DEFAULT_DATASET) -> str:
         """
         Generates and saves a heatmap of the correlation matrix for numerical columns.
 
@@ -210,66 +740,61 @@ class DataAnalysisManager:
         Returns:
             A confirmation message with the path to the saved plot.
         """
-        self._ensure_df_loaded()
         if not MATPLOTLIB_AVAILABLE:
-            raise ImportError("Visualization libraries not installed. Please run 'pip install matplotlib seaborn'.")
-        
-        numerical_df = self.df.select_dtypes(include=np.number)
-        if numerical_df.shape[1] < 2:
-            raise ValueError("Correlation heatmap requires at least two numerical columns.")
-            
-        corr_matrix = numerical_df.corr()
-
-        plt.figure(figsize=(12, 8))
-        sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', fmt=".2f")
-        plt.title('Correlation Heatmap', fontsize=16)
-        plt.tight_layout()
-        plt.savefig(save_path)
-        plt.close()
+            raise ImportError("Visualization libraries not installed. Please run 'pip install matplotlib'.")
+        data = self._dataset(dataset)
+        columns = data.numeric_columns()
+
+        def build() -> Dict[str, Any]:
+            corr_matrix = pd.DataFrame(self.get_correlation_matrix(dataset))
+            return {"matrix": corr_matrix.to_numpy(), "labels": [str(c) for c in corr_matrix.columns], "points": data.row_count}
+
+        spec = {"plot_type": "heatmap", "figsize": [12, 8], "title": 'Correlation Heatmap', "title_fontsize": 16,
+                "cmap": "coolwarm", "annotate": True}
+        chart_renderer.render(spec, data.fingerprint(columns), build, save_path)
         return f"Correlation heatmap saved to '{save_path}'"
 
-    def perform_linear_regression(self, feature_columns: List[str], target_column: str) -> Dict[str, Any]:
+    def perform_linear_regression(self, feature_columns: List[str], target_column: str,
+                                  dataset: str = DEFAULT_DATASET) -> Dict[str, Any]:
         """
         Performs linear regression on specified feature and target columns.
 
+        The fit is computed from streamed normal equations, so only the projected
+        columns of one chunk are in memory at a time. Rows with missing values are
+        skipped and 20% of the remaining rows are held out for evaluation.
+
         Returns:
             A dictionary containing the model coefficients, intercept, Mean Squared Error (MSE), and R-squared value.
         """
-        self._ensure_df_loaded()
-        if not SKLEARN_AVAILABLE:
-            raise ImportError("Scikit-learn not installed. Please run 'pip install scikit-learn'.")
-        if not PANDAS_AVAILABLE:
-            raise ImportError("Pandas not installed. Please run 'pip install pandas'.")
-        if not np:
-            raise ImportError("Numpy not installed. Please run 'pip install numpy'.")
+        data = self._dataset(dataset)
+        columns = list(dict.fromkeys(feature_columns + [target_column]))
+        self._numeric_columns(data, columns)
+        return streaming_linear_regression(data.iter_chunks(columns), feature_columns, target_column)
 
-        for col in feature_columns + [target_column]:
-            if col not in self.df.columns:
-                raise KeyError(f"Column '{col}' not found in the DataFrame.")
-            if not pd.api.types.is_numeric_dtype(self.df[col]):
-                raise TypeError(f"Column '{col}' must be of a numeric type for linear regression.")
-
-        X = self.df[feature_columns]
-        y = self.df[target_column]
-
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        
-        model = LinearRegression()
-        model.fit(X_train, y_train)
-        
-        y_pred = model.predict(X_test)
-        
-        mse = mean_squared_error(y_test, y_pred)
-        r2 = r2_score(y_test, y_pred)
 
-        return {
-            "coefficients": dict(zip(feature_columns, model.coef_)),
-            "intercept": model.intercept_,
-            "mean_squared_error": mse,
-            "r_squared": r2
-        }
+_managers: Dict[str, DataAnalysisManager] = {}
+_managers_lock = threading.Lock()
 
-data_analysis_manager = DataAnalysisManager()
+
+def get_data_analysis_manager(session_id: Optional[str] = None) -> DataAnalysisManager:
+    """
+    Returns the manager bound to ``session_id``, creating it on first use. Tools pass no
+    session: it is the user the request is being handled for (set by core.process_input),
+    never something the model chooses, and the shared default session without one.
+    """
+    session_id = session_id or CURRENT_USER.get() or DEFAULT_SESSION
+    with _managers_lock:
+        manager = _managers.get(session_id)
+        if manager is None:
+            manager = _managers[session_id] = DataAnalysisManager(session_id)
+        return manager
+
+
+data_analysis_manager = get_data_analysis_manager(DEFAULT_SESSION)
+
+_SESSION_PROPERTIES = {
+    "dataset": {"type": "string", "default": DEFAULT_DATASET, "description": "The name of the dataset within the user's session."}
+}
 
 class LoadDataTool(BaseTool):
     """Loads data into the data analysis manager."""
@@ -289,19 +814,25 @@ class LoadDataTool(BaseTool):
                     "type": ["string", "array", "object"],
                     "description": "Path to a CSV, JSON, or Excel file, a list of dictionaries, or a JSON string representing the data."
                 },
-                "file_type": {"type": "string", "enum": ["csv", "json", "excel"], "default": "csv", "description": "The type of the file if data_source is a path."}
+                "file_type": {"type": "string", "enum": ["csv", "json", "excel"], "default": "csv", "description": "The type of the file if data_source is a path."},
+                "columns": {"type": "array", "items": {"type": "string"}, "description": "Optional subset of columns to load."},
+                **_SESSION_PROPERTIES
             },
             "required": ["data_source"]
         }
 
-    def execute(self, data_source: Union[str, List[Dict[str, Any]], Any], file_type: str = "csv", **kwargs: Any) -> str:
+    def execute(self, data_source: Union[str, List[Dict[str, Any]], Any], file_type: str = "csv", columns: Optional[List[str]] = None,
+                dataset: str = DEFAULT_DATASET, **kwargs: Any) -> str:
         try:
+            manager = get_data_analysis_manager()
             if isinstance(data_source, str) and (data_source.startswith('[') or data_source.startswith('{')):
                 # Assume it's a JSON string if it starts with [ or {
-                result = data_analysis_manager.load_data(json.loads(data_source), file_type)
+                data = manager.load_data(json.loads(data_source), file_type, dataset=dataset, columns=columns)
             else:
-                result = data_analysis_manager.load_data(data_source, file_type)
-            return json.dumps({"message": result, "shape": list(data_analysis_manager.df.shape), "columns": data_analysis_manager.df.columns.tolist()}, indent=2)
+                data = manager.load_data(data_source, file_type, dataset=dataset, columns=columns)
+            shape = [data.row_count, len(data.columns)]
+            return json.dumps({"message": f"Data loaded successfully. Shape: {tuple(shape)}, Columns: {data.columns}",
+                               "dataset": dataset, "storage": data.storage, "shape": shape, "columns": data.columns}, indent=2)
         except Exception as e:
             return json.dumps({"error": f"Failed to load data: {e}"})
 
@@ -316,11 +847,11 @@ class GetDataInfoTool(BaseTool):
 
     @property
     def parameters(self) -> Dict[str, Any]:
-        return {"type": "object", "properties": {}}
+        return {"type": "object", "properties": {**_SESSION_PROPERTIES}}
 
-    def execute(self, **kwargs: Any) -> str:
+    def execute(self, dataset: str = DEFAULT_DATASET, **kwargs: Any) -> str:
         try:
-            info = data_analysis_manager.get_info()
+            info = get_data_analysis_manager().get_info(dataset)
             return json.dumps(info, indent=2)
         except Exception as e:
             return json.dumps({"error": f"Failed to get data info: {e}"})
@@ -336,11 +867,11 @@ class DescribeDataTool(BaseTool):
 
     @property
     def parameters(self) -> Dict[str, Any]:
-        return {"type": "object", "properties": {}}
+        return {"type": "object", "properties": {**_SESSION_PROPERTIES}}
 
-    def execute(self, **kwargs: Any) -> str:
+    def execute(self, dataset: str = DEFAULT_DATASET, **kwargs: Any) -> str:
         try:
-            description = data_analysis_manager.describe_data()
+            description = get_data_analysis_manager().describe_data(dataset)
             return json.dumps(description, indent=2)
         except Exception as e:
             return json.dumps({"error": f"Failed to describe data: {e}"})
@@ -356,11 +887,11 @@ class GetCorrelationMatrixTool(BaseTool):
 
     @property
     def parameters(self) -> Dict[str, Any]:
-        return {"type": "object", "properties": {}}
+        return {"type": "object", "properties": {**_SESSION_PROPERTIES}}
 
-    def execute(self, **kwargs: Any) -> str:
+    def execute(self, dataset: str = DEFAULT_DATASET, **kwargs: Any) -> str:
         try:
-            correlation_matrix = data_analysis_manager.get_correlation_matrix()
+            correlation_matrix = get_data_analysis_manager().get_correlation_matrix(dataset)
             return json.dumps(correlation_matrix, indent=2)
         except Exception as e:
             return json.dumps({"error": f"Failed to get correlation matrix: {e}"})
@@ -380,14 +911,15 @@ class PlotHistogramTool(BaseTool):
             "type": "object",
             "properties": {
                 "column": {"type": "string", "description": "The numerical column to plot."},
-                "save_path": {"type": "string", "description": "The absolute file path to save the histogram image (e.g., 'path/to/histogram.png')."}
+                "save_path": {"type": "string", "description": "The absolute file path to save the histogram image (e.g., 'path/to/histogram.png')."},
+                **_SESSION_PROPERTIES
             },
             "required": ["column", "save_path"]
         }
 
-    def execute(self, column: str, save_path: str, **kwargs: Any) -> str:
+    def execute(self, column: str, save_path: str, dataset: str = DEFAULT_DATASET, **kwargs: Any) -> str:
         try:
-            result = data_analysis_manager.plot_histogram(column, save_path)
+            result = get_data_analysis_manager().plot_histogram(column, save_path, dataset)
             return json.dumps({"message": result, "file_path": os.path.abspath(save_path)}, indent=2)
         except Exception as e:
             return json.dumps({"error": f"Failed to plot histogram: {e}"})
@@ -408,14 +940,15 @@ class PlotScatterTool(BaseTool):
             "properties": {
                 "x_column": {"type": "string", "description": "The column for the x-axis."},
                 "y_column": {"type": "string", "description": "The column for the y-axis."},
-                "save_path": {"type": "string", "description": "The absolute file path to save the scatter plot image (e.g., 'path/to/scatter.png')."}
+                "save_path": {"type": "string", "description": "The absolute file path to save the scatter plot image (e.g., 'path/to/scatter.png')."},
+                **_SESSION_PROPERTIES
             },
             "required": ["x_column", "y_column", "save_path"]
         }
 
-    def execute(self, x_column: str, y_column: str, save_path: str, **kwargs: Any) -> str:
+    def execute(self, x_column: str, y_column: str, save_path: str, dataset: str = DEFAULT_DATASET, **kwargs: Any) -> str:
         try:
-            result = data_analysis_manager.plot_scatter(x_column, y_column, save_path)
+            result = get_data_analysis_manager().plot_scatter(x_column, y_column, save_path, dataset)
             return json.dumps({"message": result, "file_path": os.path.abspath(save_path)}, indent=2)
         except Exception as e:
             return json.dumps({"error": f"Failed to plot scatter plot: {e}"})
@@ -434,14 +967,15 @@ class PlotCorrelationHeatmapTool(BaseTool):
         return {
             "type": "object",
             "properties": {
-                "save_path": {"type": "string", "description": "The absolute file path to save the heatmap image (e.g., 'path/to/heatmap.png')."}
+                "save_path": {"type": "string", "description": "The absolute file path to save the heatmap image (e.g., 'path/to/heatmap.png')."},
+                **_SESSION_PROPERTIES
             },
             "required": ["save_path"]
         }
 
-    def execute(self, save_path: str, **kwargs: Any) -> str:
+    def execute(self, save_path: str, dataset: str = DEFAULT_DATASET, **kwargs: Any) -> str:
         try:
-            result = data_analysis_manager.plot_correlation_heatmap(save_path)
+            result = get_data_analysis_manager().plot_correlation_heatmap(save_path, dataset)
             return json.dumps({"message": result, "file_path": os.path.abspath(save_path)}, indent=2)
         except Exception as e:
             return json.dumps({"error": f"Failed to plot correlation heatmap: {e}"})
@@ -461,14 +995,55 @@ class PerformLinearRegressionTool(BaseTool):
             "type": "object",
             "properties": {
                 "feature_columns": {"type": "array", "items": {"type": "string"}, "description": "A list of column names to be used as features (X)."},
-                "target_column": {"type": "string", "description": "The column name to be used as the target (y)."}
+                "target_column": {"type": "string", "description": "The column name to be used as the target (y)."},
+                **_SESSION_PROPERTIES
             },
             "required": ["feature_columns", "target_column"]
         }
 
-    def execute(self, feature_columns: List[str], target_column: str, **kwargs: Any) -> str:
+    def execute(self, feature_columns: List[str], target_column: str, dataset: str = DEFAULT_DATASET, **kwargs: Any) -> str:
         try:
-            results = data_analysis_manager.perform_linear_regression(feature_columns, target_column)
+            results = get_data_analysis_manager().perform_linear_regression(feature_columns, target_column, dataset)
             return json.dumps(results, indent=2)
         except Exception as e:
             return json.dumps({"error": f"Failed to perform linear regression: {e}"})
+
+class ListDatasetsTool(BaseTool):
+    """Lists the datasets loaded in a session."""
+    def __init__(self, tool_name="list_datasets"):
+        super().__init__(tool_name=tool_name)
+
+    @property
+    def description(self) -> str:
+        return "Lists the datasets loaded in the user's session with their row counts and whether they are held in memory or on disk."
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    def execute(self, **kwargs: Any) -> str:
+        try:
+            return json.dumps({"datasets": get_data_analysis_manager().list_datasets()}, indent=2)
+        except Exception as e:
+            return json.dumps({"error": f"Failed to list datasets: {e}"})
+
+class UnloadDataTool(BaseTool):
+    """Removes a dataset from a session and deletes its on-disk cache."""
+    def __init__(self, tool_name="unload_data"):
+        super().__init__(tool_name=tool_name)
+
+    @property
+    def description(self) -> str:
+        return "Removes a loaded dataset from the user's session, freeing its memory and cached files."
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {"type": "object", "properties": {**_SESSION_PROPERTIES}}
+
+    def execute(self, dataset: str = DEFAULT_DATASET, **kwargs: Any) -> str:
+        try:
+            if not get_data_analysis_manager().unload_data(dataset):
+                return json.dumps({"error": f"Dataset '{dataset}' is not loaded."})
+            return json.dumps({"message": f"Dataset '{dataset}' unloaded."}, indent=2)
+        except Exception as e:
+            return json.dumps({"error": f"Failed to unload data: {e}"})
@@ -12,6 +12,7 @@ class DataArchivingTool(BaseTool):
     """
     A tool for archiving and retrieving data on the local file system.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_archiving_tool"):
         super().__init__(tool_name)
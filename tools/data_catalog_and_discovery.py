@@ -11,6 +11,7 @@ class DataCatalogAndDiscoveryTool(BaseTool):
     """
     A tool for managing a data catalog.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_catalog_and_discovery"):
         super().__init__(tool_name)
@@ -11,6 +11,7 @@ class DataCatalogManagerTool(BaseTool):
     """
     A tool for managing a data catalog.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_catalog_manager"):
         super().__init__(tool_name)
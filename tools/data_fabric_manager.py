@@ -12,6 +12,7 @@ class DataFabricManagerTool(BaseTool):
     """
     A tool for managing a data fabric.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_fabric_manager"):
         super().__init__(tool_name)
@@ -11,6 +11,7 @@ class DataGovernanceEnforcerTool(BaseTool):
     """
     A tool for defining and simulating the enforcement of data governance policies.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_governance_enforcer"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DataGovernanceFrameworkTool(BaseTool):
     A tool for simulating a data governance framework, managing policies,
     user roles, and data domains with persistent storage.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_governance_framework"):
         super().__init__(tool_name)
@@ -1,22 +1,1321 @@
 import logging
 import os
+import re
 import json
-from typing import List, Dict, Any, Optional, Union
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Union, Iterator, Tuple
 from tools.base_tool import BaseTool
 
 try:
     import pandas as pd
+    import numpy as np
     PANDAS_AVAILABLE = True
 except ImportError:
     pd = None
+    np = None
     PANDAS_AVAILABLE = False
 
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pq = None
+    PYARROW_AVAILABLE = False
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    duckdb = None
+    DUCKDB_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+BATCH_ROWS = 262_144
+SCAN_THREADS = max(1, min(8, os.cpu_count() or 1))
+DATA_FILE_FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+
+# --- Lake catalog ---
+
+def _partition_value(raw: str) -> Any:
+    if raw == "__HIVE_DEFAULT_PARTITION__":
+        return None
+    for cast in (int, float):
+        try:
+            return cast(raw)
+        except ValueError:
+            pass
+    return raw
+
+class LakeTable:
+    """
+    A table in the lake: either a single CSV/Parquet file, or a directory of them.
+    Directory tables may be Hive-partitioned (``year=2024/month=01/part-0.parquet``);
+    the ``key=value`` path segments become columns.
+    """
+
+    def __init__(self, name: str, root: str):
+        self.name = name
+        self.root = root
+        self.files: List[Tuple[str, Dict[str, Any]]] = []
+        self.partition_columns: List[str] = []
+        if os.path.isdir(root):
+            for directory, _, file_names in sorted(os.walk(root)):
+                relative = os.path.relpath(directory, root)
+                partitions = {}
+                if relative != ".":
+                    for segment in relative.split(os.sep):
+                        if "=" in segment:
+                            key, value = segment.split("=", 1)
+                            partitions[key] = _partition_value(value)
+                for file_name in sorted(file_names):
+                    if os.path.splitext(file_name)[1].lower() in DATA_FILE_FORMATS:
+                        self.files.append((os.path.join(directory, file_name), partitions))
+                        for key in partitions:
+                            if key not in self.partition_columns:
+                                self.partition_columns.append(key)
+        else:
+            self.files.append((root, {}))
+        if not self.files:
+            raise ValueError(f"Table '{name}' contains no CSV or Parquet files.")
+        formats = {DATA_FILE_FORMATS[os.path.splitext(path)[1].lower()] for path, _ in self.files}
+        if len(formats) > 1:
+            raise ValueError(f"Table '{name}' mixes CSV and Parquet files.")
+        self.format = formats.pop()
+        if self.format == "parquet" and not PYARROW_AVAILABLE:
+            raise ImportError("Reading Parquet tables requires 'pyarrow'. Please install it with 'pip install pyarrow'.")
+        self._columns: Optional[List[str]] = None
+
+    @property
+    def columns(self) -> List[str]:
+        if self._columns is None:
+            path = self.files[0][0]
+            if self.format == "parquet":
+                names = pq.read_schema(path).names
+            else:
+                names = pd.read_csv(path, nrows=0).columns.tolist()
+            self._columns = names + [column for column in self.partition_columns if column not in names]
+        return self._columns
+
+class LakeCatalog:
+    """Maps table names to the files under a data lake directory."""
+
+    def __init__(self, data_lake_path: str):
+        if not os.path.isdir(data_lake_path):
+            raise FileNotFoundError(f"Data lake path '{data_lake_path}' does not exist or is not a directory.")
+        self.root = data_lake_path
+        self._tables: Dict[str, LakeTable] = {}
+
+    def table_names(self) -> List[str]:
+        names = []
+        for entry in sorted(os.listdir(self.root)):
+            stem, extension = os.path.splitext(entry)
+            if os.path.isdir(os.path.join(self.root, entry)):
+                names.append(entry)
+            elif extension.lower() in DATA_FILE_FORMATS:
+                names.append(stem)
+        return names
+
+    def table(self, name: str) -> LakeTable:
+        if name in self._tables:
+            return self._tables[name]
+        stem = os.path.splitext(name)[0]
+        candidates = [os.path.join(self.root, name), os.path.join(self.root, stem)]
+        candidates += [os.path.join(self.root, stem + extension) for extension in DATA_FILE_FORMATS]
+        for candidate in candidates:
+            if os.path.exists(candidate) and (os.path.isdir(candidate) or os.path.splitext(candidate)[1].lower() in DATA_FILE_FORMATS):
+                self._tables[name] = LakeTable(stem, candidate)
+                return self._tables[name]
+        raise FileNotFoundError(f"Table '{name}' not found in data lake path '{self.root}'.")
+
+# --- SQL syntax tree ---
+
+class _Node:
+    __slots__ = ()
+
+    def _fields(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) is type(other) and self._fields() == other._fields()
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__,) + self._fields())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}{self._fields()!r}"
+
+class Column(_Node):
+    __slots__ = ("name", "table")
+
+    def __init__(self, name: str, table: Optional[str] = None):
+        self.name = name
+        self.table = table
+
+class Ref(_Node):
+    """A column bound to a label in the batches flowing through the plan."""
+    __slots__ = ("label",)
+
+    def __init__(self, label: str):
+        self.label = label
+
+class Literal(_Node):
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+class Star(_Node):
+    __slots__ = ("table",)
+
+    def __init__(self, table: Optional[str] = None):
+        self.table = table
+
+class BinaryOp(_Node):
+    __slots__ = ("op", "left", "right")
+
+    def __init__(self, op: str, left: _Node, right: _Node):
+        self.op = op
+        self.left = left
+        self.right = right
+
+class UnaryOp(_Node):
+    __slots__ = ("op", "operand")
+
+    def __init__(self, op: str, operand: _Node):
+        self.op = op
+        self.operand = operand
+
+class FuncCall(_Node):
+    __slots__ = ("name", "args", "distinct")
+
+    def __init__(self, name: str, args: tuple, distinct: bool = False):
+        self.name = name
+        self.args = args
+        self.distinct = distinct
+
+class InList(_Node):
+    __slots__ = ("expr", "values", "negated")
+
+    def __init__(self, expr: _Node, values: tuple, negated: bool = False):
+        self.expr = expr
+        self.values = values
+        self.negated = negated
+
+class Between(_Node):
+    __slots__ = ("expr", "low", "high", "negated")
+
+    def __init__(self, expr: _Node, low: _Node, high: _Node, negated: bool = False):
+        self.expr = expr
+        self.low = low
+        self.high = high
+        self.negated = negated
+
+class IsNull(_Node):
+    __slots__ = ("expr", "negated")
+
+    def __init__(self, expr: _Node, negated: bool = False):
+        self.expr = expr
+        self.negated = negated
+
+class Like(_Node):
+    __slots__ = ("expr", "pattern", "negated")
+
+    def __init__(self, expr: _Node, pattern: str, negated: bool = False):
+        self.expr = expr
+        self.pattern = pattern
+        self.negated = negated
+
+AGGREGATES = {"count", "sum", "avg", "min", "max"}
+SCALAR_FUNCTIONS = {"lower", "upper", "abs", "round", "coalesce", "length"}
+COMPARISONS = {"=", "!=", "<>", "<", "<=", ">", ">="}
+FLIPPED = {"=": "=", "!=": "!=", "<>": "<>", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+class SelectQuery:
+    def __init__(self):
+        self.distinct = False
+        self.items: List[Tuple[_Node, Optional[str]]] = []
+        self.tables: List[Tuple[str, str]] = []  # (table name, alias)
+        # Where each of ``tables`` is named in the SQL, as (start, end) character offsets; an empty
+        # span marks where the FROM clause of the legacy form would go.
+        self.table_spans: List[Tuple[int, int]] = []
+        self.joins: List[Tuple[str, _Node]] = []  # (join type, ON condition) for tables[1:]
+        self.where: Optional[_Node] = None
+        self.group_by: List[_Node] = []
+        self.having: Optional[_Node] = None
+        self.order_by: List[Tuple[_Node, bool]] = []
+        self.limit: Optional[int] = None
+        self.offset = 0
+
+# --- SQL parser ---
+
+_TOKEN_RE = re.compile(r"""\s*(?:
+    (?P<number>\d+\.\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?|\d+(?:[eE][-+]?\d+)?)
+  | (?P<string>'(?:[^']|'')*')
+  | (?P<quoted>"[^"]+")
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op><>|!=|<=|>=|[=<>*,()+\-/%.;])
+)""", re.VERBOSE)
+
+_KEYWORDS = {
+    "select", "distinct", "from", "where", "group", "by", "having", "order", "asc", "desc", "limit", "offset",
+    "and", "or", "not", "in", "between", "is", "null", "like", "as", "join", "inner", "left", "outer", "on",
+    "true", "false",
+}
+
+def _tokenize(sql: str, spans: Optional[List[Tuple[int, int]]] = None) -> List[Tuple[str, Any]]:
+    """The tokens of ``sql``; their (start, end) character offsets are appended to ``spans`` if given."""
+    tokens, position = [], 0
+    sql = sql.rstrip()
+    while position < len(sql):
+        match = _TOKEN_RE.match(sql, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unexpected character in SQL at position {position}: {sql[position:position + 10]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        text = match.group(kind)
+        if spans is not None and text != ";":
+            spans.append((match.start(kind), position))
+        if kind == "number":
+            tokens.append(("literal", float(text) if any(c in text for c in ".eE") else int(text)))
+        elif kind == "string":
+            tokens.append(("literal", text[1:-1].replace("''", "'")))
+        elif kind == "quoted":
+            tokens.append(("ident", text[1:-1]))
+        elif kind == "ident":
+            lowered = text.lower()
+            tokens.append(("keyword", lowered) if lowered in _KEYWORDS else ("ident", text))
+        elif text != ";":
+            tokens.append(("op", text))
+        elif sql[position:].strip():
+            raise ValueError("Only a single SQL statement is allowed.")
+    tokens.append(("end", None))
+    if spans is not None:
+        spans.append((len(sql), len(sql)))
+    return tokens
+
+class SqlParser:
+    """
+    Recursive-descent parser for the SELECT subset the lake engine executes:
+    projections with aliases, inner/left equi-joins, WHERE, GROUP BY, HAVING,
+    ORDER BY, LIMIT/OFFSET and the count/sum/avg/min/max aggregates.
+    """
+
+    def __init__(self, sql: str, default_table: Optional[str] = None):
+        self.spans: List[Tuple[int, int]] = []
+        self.tokens = _tokenize(sql, self.spans)
+        self.position = 0
+        self.default_table = default_table
+
+    def _peek(self, offset: int = 0) -> Tuple[str, Any]:
+        return self.tokens[min(self.position + offset, len(self.tokens) - 1)]
+
+    def _next(self) -> Tuple[str, Any]:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _accept(self, kind: str, value: Any = None) -> bool:
+        token = self._peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self.position += 1
+            return True
+        return False
+
+    def _expect(self, kind: str, value: Any = None) -> Any:
+        token = self._next()
+        if token[0] != kind or (value is not None and token[1] != value):
+            raise ValueError(f"Expected {value or kind} in SQL but found {token[1]!r}.")
+        return token[1]
+
+    def parse(self) -> SelectQuery:
+        query = SelectQuery()
+        self._expect("keyword", "select")
+        query.distinct = self._accept("keyword", "distinct")
+        query.items.append(self._select_item())
+        while self._accept("op", ","):
+            query.items.append(self._select_item())
+        if self._accept("keyword", "from"):
+            query.table_spans.append(self.spans[self.position])
+            query.tables.append(self._table_ref())
+            while True:
+                if self._accept("keyword", "join") or (self._accept("keyword", "inner") and self._expect("keyword", "join")):
+                    join_type = "inner"
+                elif self._accept("keyword", "left"):
+                    self._accept("keyword", "outer")
+                    self._expect("keyword", "join")
+                    join_type = "left"
+                elif self._accept("op", ","):
+                    raise ValueError("Comma joins are not supported; use JOIN ... ON.")
+                else:
+                    break
+                query.table_spans.append(self.spans[self.position])
+                query.tables.append(self._table_ref())
+                self._expect("keyword", "on")
+                query.joins.append((join_type, self._expr()))
+        elif self.default_table:
+            # Legacy form 'SELECT * WHERE ...' runs against the file named in the request.
+            start = self.spans[self.position][0]
+            query.table_spans.append((start, start))
+            query.tables.append((self.default_table, os.path.splitext(self.default_table)[0]))
+        else:
+            raise ValueError("The query has no FROM clause and no 'file_name' was given.")
+        if self._accept("keyword", "where"):
+            query.where = self._expr()
+        if self._accept("keyword", "group"):
+            self._expect("keyword", "by")
+            query.group_by.append(self._expr())
+            while self._accept("op", ","):
+                query.group_by.append(self._expr())
+        if self._accept("keyword", "having"):
+            query.having = self._expr()
+        if self._accept("keyword", "order"):
+            self._expect("keyword", "by")
+            while True:
+                expr = self._expr()
+                descending = self._accept("keyword", "desc")
+                if not descending:
+                    self._accept("keyword", "asc")
+                query.order_by.append((expr, not descending))
+                if not self._accept("op", ","):
+                    break
+        if self._accept("keyword", "limit"):
+            query.limit = int(self._expect("literal"))
+        if self._accept("keyword", "offset"):
+            query.offset = int(self._expect("literal"))
+        if self._peek()[0] != "end":
+            raise ValueError(f"Unexpected token in SQL: {self._peek()[1]!r}")
+        return query
+
+    def _table_ref(self) -> Tuple[str, str]:
+        token = self._next()
+        if token[0] not in ("ident", "literal"):
+            raise ValueError(f"Expected a table name in SQL but found {token[1]!r}.")
+        name = str(token[1])
+        alias = os.path.splitext(name)[0]
+        if self._accept("keyword", "as"):
+            alias = self._expect("ident")
+        elif self._peek()[0] == "ident":
+            alias = self._next()[1]
+        return name, alias
+
+    def _select_item(self) -> Tuple[_Node, Optional[str]]:
+        if self._accept("op", "*"):
+            return Star(), None
+        if self._peek()[0] == "ident" and self._peek(1) == ("op", ".") and self._peek(2) == ("op", "*"):
+            table = self._next()[1]
+            self.position += 2
+            return Star(table), None
+        expr = self._expr()
+        alias = None
+        if self._accept("keyword", "as"):
+            alias = self._expect("ident")
+        elif self._peek()[0] == "ident":
+            alias = self._next()[1]
+        return expr, alias
+
+    def _expr(self) -> _Node:
+        left = self._and()
+        while self._accept("keyword", "or"):
+            left = BinaryOp("or", left, self._and())
+        return left
+
+    def _and(self) -> _Node:
+        left = self._not()
+        while self._accept("keyword", "and"):
+            left = BinaryOp("and", left, self._not())
+        return left
+
+    def _not(self) -> _Node:
+        if self._accept("keyword", "not"):
+            return UnaryOp("not", self._not())
+        return self._predicate()
+
+    def _predicate(self) -> _Node:
+        left = self._additive()
+        token = self._peek()
+        if token[0] == "op" and token[1] in COMPARISONS:
+            self.position += 1
+            return BinaryOp("!=" if token[1] == "<>" else token[1], left, self._additive())
+        if self._accept("keyword", "is"):
+            negated = self._accept("keyword", "not")
+            self._expect("keyword", "null")
+            return IsNull(left, negated)
+        negated = self._accept("keyword", "not")
+        if self._accept("keyword", "in"):
+            self._expect("op", "(")
+            values = [self._additive()]
+            while self._accept("op", ","):
+                values.append(self._additive())
+            self._expect("op", ")")
+            return InList(left, tuple(values), negated)
+        if self._accept("keyword", "between"):
+            low = self._additive()
+            self._expect("keyword", "and")
+            return Between(left, low, self._additive(), negated)
+        if self._accept("keyword", "like"):
+            return Like(left, str(self._expect("literal")), negated)
+        if negated:
+            raise ValueError("Expected IN, BETWEEN or LIKE after NOT.")
+        return left
+
+    def _additive(self) -> _Node:
+        left = self._multiplicative()
+        while self._peek()[0] == "op" and self._peek()[1] in ("+", "-"):
+            left = BinaryOp(self._next()[1], left, self._multiplicative())
+        return left
+
+    def _multiplicative(self) -> _Node:
+        left = self._unary()
+        while self._peek()[0] == "op" and self._peek()[1] in ("*", "/", "%"):
+            left = BinaryOp(self._next()[1], left, self._unary())
+        return left
+
+    def _unary(self) -> _Node:
+        if self._accept("op", "-"):
+            operand = self._unary()
+            if isinstance(operand, Literal) and isinstance(operand.value, (int, float)):
+                return Literal(-operand.value)
+            return UnaryOp("-", operand)
+        return self._primary()
+
+    def _primary(self) -> _Node:
+        kind, value = self._next()
+        if kind == "literal":
+            return Literal(value)
+        if kind == "keyword" and value in ("null", "true", "false"):
+            return Literal({"null": None, "true": True, "false": False}[value])
+        if kind == "op" and value == "(":
+            expr = self._expr()
+            self._expect("op", ")")
+            return expr
+        if kind == "ident":
+            if self._accept("op", "("):
+                name = value.lower()
+                if name not in AGGREGATES and name not in SCALAR_FUNCTIONS:
+                    raise ValueError(f"Unsupported SQL function '{value}'.")
+                distinct = self._accept("keyword", "distinct")
+                args: List[_Node] = []
+                if self._accept("op", "*"):
+                    args.append(Star())
+                elif not self._accept("op", ")"):
+                    args.append(self._expr())
+                    while self._accept("op", ","):
+                        args.append(self._expr())
+                if args:
+                    self._expect("op", ")")
+                return FuncCall(name, tuple(args), distinct)
+            if self._accept("op", "."):
+                return Column(self._expect("ident"), value)
+            return Column(value)
+        raise ValueError(f"Unexpected token in SQL: {value!r}")
+
+def _sql_text(node: _Node) -> str:
+    """Renders an (unbound) expression back to SQL; used to name unaliased select items."""
+    if isinstance(node, Column):
+        return f"{node.table}.{node.name}" if node.table else node.name
+    if isinstance(node, Ref):
+        return node.label
+    if isinstance(node, Literal):
+        return "NULL" if node.value is None else repr(node.value) if isinstance(node.value, str) else str(node.value)
+    if isinstance(node, Star):
+        return f"{node.table}.*" if node.table else "*"
+    if isinstance(node, BinaryOp):
+        return f"({_sql_text(node.left)} {node.op} {_sql_text(node.right)})"
+    if isinstance(node, UnaryOp):
+        return f"{node.op} {_sql_text(node.operand)}" if node.op == "not" else f"-{_sql_text(node.operand)}"
+    if isinstance(node, FuncCall):
+        return f"{node.name}({'distinct ' if node.distinct else ''}{', '.join(_sql_text(arg) for arg in node.args)})"
+    return repr(node)
+
+def _transform(node: _Node, leaf: Any) -> _Node:
+    """Rebuilds an expression tree, replacing each Column via ``leaf(column)``."""
+    if isinstance(node, Column):
+        return leaf(node)
+    if isinstance(node, BinaryOp):
+        return BinaryOp(node.op, _transform(node.left, leaf), _transform(node.right, leaf))
+    if isinstance(node, UnaryOp):
+        return UnaryOp(node.op, _transform(node.operand, leaf))
+    if isinstance(node, FuncCall):
+        return FuncCall(node.name, tuple(_transform(arg, leaf) for arg in node.args), node.distinct)
+    if isinstance(node, InList):
+        return InList(_transform(node.expr, leaf), tuple(_transform(value, leaf) for value in node.values), node.negated)
+    if isinstance(node, Between):
+        return Between(_transform(node.expr, leaf), _transform(node.low, leaf), _transform(node.high, leaf), node.negated)
+    if isinstance(node, IsNull):
+        return IsNull(_transform(node.expr, leaf), node.negated)
+    if isinstance(node, Like):
+        return Like(_transform(node.expr, leaf), node.pattern, node.negated)
+    return node
+
+def _children(node: _Node) -> List[_Node]:
+    if isinstance(node, BinaryOp):
+        return [node.left, node.right]
+    if isinstance(node, UnaryOp):
+        return [node.operand]
+    if isinstance(node, FuncCall):
+        return list(node.args)
+    if isinstance(node, InList):
+        return [node.expr, *node.values]
+    if isinstance(node, Between):
+        return [node.expr, node.low, node.high]
+    if isinstance(node, (IsNull, Like)):
+        return [node.expr]
+    return []
+
+def _refs(node: _Node) -> List[str]:
+    if isinstance(node, Ref):
+        return [node.label]
+    return [label for child in _children(node) for label in _refs(child)]
+
+def _aggregate_calls(node: _Node, found: List[FuncCall]) -> List[FuncCall]:
+    if isinstance(node, FuncCall) and node.name in AGGREGATES:
+        if any(_aggregate_calls(arg, []) for arg in node.args):
+            raise ValueError("Aggregate functions cannot be nested.")
+        if node not in found:
+            found.append(node)
+        return found
+    for child in _children(node):
+        _aggregate_calls(child, found)
+    return found
+
+def _conjuncts(node: Optional[_Node]) -> List[_Node]:
+    if node is None:
+        return []
+    if isinstance(node, BinaryOp) and node.op == "and":
+        return _conjuncts(node.left) + _conjuncts(node.right)
+    return [node]
+
+def _like_regex(pattern: str) -> str:
+    return "^" + "".join(".*" if c == "%" else "." if c == "_" else re.escape(c) for c in pattern) + "$"
+
+def _as_series(value: Any, frame: "pd.DataFrame") -> "pd.Series":
+    if isinstance(value, pd.Series):
+        return value
+    return pd.Series([value] * len(frame), index=frame.index, dtype=object if value is None or isinstance(value, str) else None)
+
+def _evaluate(node: _Node, frame: "pd.DataFrame", substitutions: Optional[Dict[_Node, str]] = None) -> Any:
+    """Evaluates an expression over a batch, returning a Series or a scalar."""
+    if substitutions and node in substitutions:
+        return frame[substitutions[node]]
+    if isinstance(node, Ref):
+        if substitutions is not None and node.label not in frame.columns:
+            raise ValueError(f"Column '{node.label}' must appear in the GROUP BY clause or be used in an aggregate function.")
+        return frame[node.label]
+    if isinstance(node, Literal):
+        return node.value
+    if isinstance(node, BinaryOp):
+        if node.op in ("and", "or"):
+            left = _as_series(_evaluate(node.left, frame, substitutions), frame).fillna(False).astype(bool)
+            right = _as_series(_evaluate(node.right, frame, substitutions), frame).fillna(False).astype(bool)
+            return left & right if node.op == "and" else left | right
+        left = _evaluate(node.left, frame, substitutions)
+        right = _evaluate(node.right, frame, substitutions)
+        if node.op in COMPARISONS:
+            if left is None or right is None:
+                return _as_series(False, frame)
+            left_series, right_series = _as_series(left, frame), _as_series(right, frame)
+            result = {"=": left_series.__eq__, "!=": left_series.__ne__, "<": left_series.__lt__,
+                      "<=": left_series.__le__, ">": left_series.__gt__, ">=": left_series.__ge__}[node.op](right_series)
+            # SQL three-valued logic: any comparison with NULL is not true.
+            return result & left_series.notna() & right_series.notna()
+        if node.op == "+":
+            return left + right
+        if node.op == "-":
+            return left - right
+        if node.op == "*":
+            return left * right
+        if node.op == "/":
+            return left / right
+        if node.op == "%":
+            return left % right
+    if isinstance(node, UnaryOp):
+        operand = _evaluate(node.operand, frame, substitutions)
+        if node.op == "not":
+            return ~_as_series(operand, frame).fillna(False).astype(bool)
+        return -operand
+    if isinstance(node, InList):
+        values = [_evaluate(value, frame, substitutions) for value in node.values]
+        series = _as_series(_evaluate(node.expr, frame, substitutions), frame)
+        result = series.isin(values) & series.notna()
+        return ~result & series.notna() if node.negated else result
+    if isinstance(node, Between):
+        series = _as_series(_evaluate(node.expr, frame, substitutions), frame)
+        result = (series >= _evaluate(node.low, frame, substitutions)) & (series <= _evaluate(node.high, frame, substitutions))
+        return ~result & series.notna() if node.negated else result
+    if isinstance(node, IsNull):
+        series = _as_series(_evaluate(node.expr, frame, substitutions), frame)
+        return series.notna() if node.negated else series.isna()
+    if isinstance(node, Like):
+        series = _as_series(_evaluate(node.expr, frame, substitutions), frame)
+        result = series.astype(str).str.match(_like_regex(node.pattern)) & series.notna()
+        return ~result & series.notna() if node.negated else result
+    if isinstance(node, FuncCall):
+        if node.name in AGGREGATES:
+            raise ValueError(f"Aggregate function '{node.name}' is not allowed here.")
+        args = [_evaluate(arg, frame, substitutions) for arg in node.args]
+        if node.name == "coalesce":
+            result = _as_series(args[0], frame)
+            for arg in args[1:]:
+                result = result.where(result.notna(), _as_series(arg, frame))
+            return result
+        value = _as_series(args[0], frame)
+        if node.name == "lower":
+            return value.str.lower()
+        if node.name == "upper":
+            return value.str.upper()
+        if node.name == "length":
+            return value.str.len()
+        if node.name == "abs":
+            return value.abs()
+        if node.name == "round":
+            return value.round(int(args[1]) if len(args) > 1 else 0)
+    raise ValueError(f"Cannot evaluate expression {_sql_text(node)}.")
+
+# --- Scan pruning ---
+
+def _simple_predicate(node: _Node) -> Optional[Tuple[str, str, Any]]:
+    """Reduces a pushed conjunct to (label, op, value) when it can prune files or row groups."""
+    if isinstance(node, BinaryOp) and node.op in COMPARISONS:
+        if isinstance(node.left, Ref) and isinstance(node.right, Literal) and node.right.value is not None:
+            return node.left.label, node.op, node.right.value
+        if isinstance(node.right, Ref) and isinstance(node.left, Literal) and node.left.value is not None:
+            return node.right.label, FLIPPED[node.op], node.left.value
+    if isinstance(node, InList) and not node.negated and isinstance(node.expr, Ref) \
+            and all(isinstance(value, Literal) for value in node.values):
+        return node.expr.label, "in", [value.value for value in node.values]
+    if isinstance(node, Between) and not node.negated and isinstance(node.expr, Ref) \
+            and isinstance(node.low, Literal) and isinstance(node.high, Literal):
+        return node.expr.label, "between", (node.low.value, node.high.value)
+    if isinstance(node, IsNull) and isinstance(node.expr, Ref):
+        return node.expr.label, "is not null" if node.negated else "is null", None
+    return None
+
+def _value_may_match(op: str, value: Any, candidate: Any) -> bool:
+    """Exact test of a partition value against a simple predicate."""
+    if op == "is null":
+        return candidate is None
+    if op == "is not null":
+        return candidate is not None
+    if candidate is None:
+        return False
+    return _range_may_match(op, value, candidate, candidate)
+
+def _range_may_match(op: str, value: Any, low: Any, high: Any) -> bool:
+    """Whether any value in [low, high] can satisfy the predicate (True when unsure)."""
+    try:
+        if op == "=":
+            return low <= value <= high
+        if op == "!=":
+            return not (low == high == value)
+        if op == "<":
+            return low < value
+        if op == "<=":
+            return low <= value
+        if op == ">":
+            return high > value
+        if op == ">=":
+            return high >= value
+        if op == "in":
+            return any(low <= item <= high for item in value)
+        if op == "between":
+            return value[0] <= high and value[1] >= low
+    except TypeError:
+        return True
+    return True
+
+def _row_group_may_match(row_group: Any, column_index: Dict[str, int], predicates: List[Tuple[str, str, Any]]) -> bool:
+    for column, op, value in predicates:
+        index = column_index.get(column)
+        if index is None:
+            continue
+        statistics = row_group.column(index).statistics
+        if statistics is None:
+            continue
+        if op == "is null":
+            if statistics.null_count == 0:
+                return False
+            continue
+        if op == "is not null":
+            if statistics.null_count == row_group.num_rows:
+                return False
+            continue
+        if statistics.has_min_max and not _range_may_match(op, value, statistics.min, statistics.max):
+            return False
+    return True
+
+# --- Operators ---
+
+class _HashJoin:
+    """
+    Equi-join against a materialized build side. The build rows are grouped by key
+    once; each probe batch is matched with a single vectorized index lookup.
+    """
+
+    def __init__(self, build: "pd.DataFrame", build_keys: List[str], probe_keys: List[str], how: str):
+        build = build.dropna(subset=build_keys).reset_index(drop=True)
+        self.probe_keys = probe_keys
+        self.how = how
+        keys = build[build_keys[0]] if len(build_keys) == 1 else pd.MultiIndex.from_frame(build[build_keys])
+        codes, uniques = pd.factorize(keys)
+        order = np.argsort(codes, kind="stable")
+        self.build = build.iloc[order].reset_index(drop=True)
+        self.counts = np.bincount(codes, minlength=len(uniques))
+        self.starts = np.cumsum(self.counts) - self.counts
+        self.index = pd.Index(uniques)
+
+    def probe(self, batch: "pd.DataFrame") -> "pd.DataFrame":
+        if len(self.probe_keys) == 1:
+            keys = batch[self.probe_keys[0]]
+        else:
+            keys = pd.MultiIndex.from_frame(batch[self.probe_keys])
+        positions = self.index.get_indexer(keys) if len(self.index) else np.full(len(batch), -1)
+        matched = positions >= 0
+        counts = np.where(matched, self.counts[positions], 0)
+        starts = np.where(matched, self.starts[positions], 0)
+        total = int(counts.sum())
+        probe_rows = np.repeat(np.arange(len(batch)), counts)
+        within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        build_rows = np.repeat(starts, counts) + within
+        joined = pd.concat([batch.iloc[probe_rows].reset_index(drop=True),
+                            self.build.iloc[build_rows].reset_index(drop=True)], axis=1)
+        if self.how == "left" and not matched.all():
+            unmatched = batch.iloc[np.flatnonzero(~matched)].reset_index(drop=True)
+            padding = pd.DataFrame({column: pd.Series([None] * len(unmatched), dtype=self.build[column].dtype if self.build[column].dtype.kind in "fO" else object)
+                                    for column in self.build.columns})
+            joined = pd.concat([joined, pd.concat([unmatched, padding], axis=1)], ignore_index=True)
+        return joined
+
+class _GroupAggregator:
+    """
+    Hash aggregation over a stream of batches. Each batch is reduced to partial
+    aggregates (count, sum, min, max per group), and partials are re-aggregated
+    once they grow past ``COMPACT_ROWS`` so memory stays proportional to the number
+    of groups rather than the number of rows.
+    """
+    COMPACT_ROWS = 500_000
+
+    def __init__(self, keys: List[_Node], calls: List[FuncCall]):
+        self.keys = keys
+        self.calls = calls
+        self.key_columns = [f"k{i}" for i in range(len(keys))] or ["__all"]
+        self.partials: List["pd.DataFrame"] = []
+        self.partial_rows = 0
+        self.distinct: Dict[int, List["pd.DataFrame"]] = {}
+        self.named: Dict[str, Tuple[str, str]] = {}
+        self.merge: Dict[str, str] = {}
+        for j, call in enumerate(calls):
+            if call.distinct:
+                if call.name != "count":
+                    raise ValueError("DISTINCT is only supported inside COUNT.")
+                self.distinct[j] = []
+            elif call.name == "count":
+                self.named[f"n{j}"] = (f"v{j}", "sum" if self._is_star(call) else "count")
+            elif call.name in ("sum", "avg"):
+                self.named[f"s{j}"] = (f"v{j}", "sum")
+                self.named[f"n{j}"] = (f"v{j}", "count")
+            else:
+                self.named[f"m{j}"] = (f"v{j}", call.name)
+        for column, (_, function) in self.named.items():
+            self.merge[column] = function if function in ("min", "max") else "sum"
+
+    @staticmethod
+    def _is_star(call: FuncCall) -> bool:
+        return not call.args or isinstance(call.args[0], Star)
+
+    def update(self, frame: "pd.DataFrame") -> None:
+        if len(frame) == 0:
+            return
+        data: Dict[str, Any] = {}
+        for i, key in enumerate(self.keys):
+            data[f"k{i}"] = _as_series(_evaluate(key, frame), frame)
+        if not self.keys:
+            data["__all"] = np.zeros(len(frame), dtype=np.int8)
+        for j, call in enumerate(self.calls):
+            if self._is_star(call):
+                data[f"v{j}"] = np.ones(len(frame), dtype=np.int64)
+            else:
+                data[f"v{j}"] = _as_series(_evaluate(call.args[0], frame), frame)
+        for j in self.distinct:
+            values = pd.DataFrame({column: data[column] for column in self.key_columns + [f"v{j}"]}, index=frame.index)
+            self.distinct[j].append(values.dropna(subset=[f"v{j}"]).drop_duplicates())
+            if sum(len(part) for part in self.distinct[j]) > self.COMPACT_ROWS:
+                self.distinct[j] = [pd.concat(self.distinct[j], ignore_index=True).drop_duplicates()]
+        codes, first = self._group_codes(data)
+        groups = len(first)
+        columns = {column: data[column].take(first).to_numpy() if isinstance(data[column], pd.Series) else data[column][first]
+                   for column in self.key_columns}
+        for column, (source, function) in self.named.items():
+            series = data[source] if isinstance(data[source], pd.Series) else pd.Series(data[source])
+            if function == "sum" and series.dtype.kind in "biuf":
+                present = series.notna().to_numpy()
+                weights = series.to_numpy(dtype=np.float64, na_value=0.0)
+                sums = np.bincount(codes, weights=weights if present.all() else np.where(present, weights, 0.0), minlength=groups)
+                columns[column] = np.rint(sums).astype(np.int64) if series.dtype.kind in "biu" else sums
+            elif function == "count":
+                present = series.notna().to_numpy()
+                columns[column] = np.bincount(codes[present], minlength=groups)
+            else:
+                reduced = getattr(series.groupby(codes, sort=True), function)()
+                columns[column] = reduced.reindex(range(groups)).to_numpy()
+        partial = pd.DataFrame(columns)
+        self.partials.append(partial)
+        self.partial_rows += len(partial)
+        if self.partial_rows > self.COMPACT_ROWS:
+            self._compact()
+
+    def _group_codes(self, values: Dict[str, Any]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Dense group ids per row (NULL keys form their own group) and each group's first row."""
+        if not self.keys:
+            return np.zeros(len(values["__all"]), dtype=np.intp), np.zeros(1, dtype=np.intp)
+        combined = None
+        for column in self.key_columns:
+            codes, uniques = pd.factorize(values[column], use_na_sentinel=False)
+            combined = codes if combined is None else combined * (len(uniques) + 1) + codes
+            if len(self.key_columns) > 1:
+                combined, _ = pd.factorize(combined)
+        # Codes are numbered in order of first appearance; scatter in reverse so the
+        # earliest row of each group is the one that sticks.
+        first = np.empty(int(combined.max()) + 1 if len(combined) else 0, dtype=np.intp)
+        first[combined[::-1]] = np.arange(len(combined) - 1, -1, -1)
+        return combined, first
+
+    def _compact(self) -> "pd.DataFrame":
+        if not self.partials:
+            return pd.DataFrame(columns=self.key_columns + list(self.named))
+        merged = pd.concat(self.partials, ignore_index=True)
+        if len(self.partials) > 1:
+            if self.named:
+                merged = merged.groupby(self.key_columns, dropna=False, sort=False).agg(
+                    **{column: (column, function) for column, function in self.merge.items()}).reset_index()
+            else:
+                merged = merged.drop_duplicates()
+        self.partials = [merged]
+        self.partial_rows = len(merged)
+        return merged
+
+    def result(self) -> "pd.DataFrame":
+        merged = self._compact()
+        if merged.empty and not self.keys:
+            # A global aggregate over no rows still yields one row.
+            merged = pd.DataFrame({"__all": [0], **{column: [0 if column.startswith("n") else None] for column in self.named}})
+        out = merged[self.key_columns].copy()
+        for j, call in enumerate(self.calls):
+            if call.distinct:
+                parts = self.distinct[j]
+                pairs = pd.concat(parts, ignore_index=True).drop_duplicates() if parts else pd.DataFrame(columns=self.key_columns + [f"v{j}"])
+                counts = pairs.groupby(self.key_columns, dropna=False, sort=False).size().rename(f"a{j}").reset_index()
+                out = out.merge(counts, on=self.key_columns, how="left")
+                out[f"a{j}"] = out[f"a{j}"].fillna(0).astype(np.int64)
+            elif call.name == "count":
+                out[f"a{j}"] = merged[f"n{j}"].astype(np.int64).to_numpy()
+            elif call.name == "sum":
+                out[f"a{j}"] = merged[f"s{j}"].where(merged[f"n{j}"] > 0).to_numpy()
+            elif call.name == "avg":
+                out[f"a{j}"] = (merged[f"s{j}"] / merged[f"n{j}"].where(merged[f"n{j}"] > 0)).to_numpy()
+            else:
+                out[f"a{j}"] = merged[f"m{j}"].to_numpy()
+        return out
+
+    def substitutions(self) -> Dict[_Node, str]:
+        substitutions: Dict[_Node, str] = {key: f"k{i}" for i, key in enumerate(self.keys)}
+        substitutions.update({call: f"a{j}" for j, call in enumerate(self.calls)})
+        return substitutions
+
+# --- Query engine ---
+
+class LakeQueryEngine:
+    """
+    Vectorized SQL executor over a lake directory.
+
+    The plan is scan -> hash join(s) -> filter -> (hash aggregate) -> project ->
+    sort/limit. Projections and single-table WHERE conjuncts are pushed into the
+    scans: partitions and Parquet row groups whose statistics cannot satisfy a
+    predicate are skipped, only referenced columns are decoded, and row groups are
+    read on a small thread pool. Results are produced as a stream of DataFrame
+    batches; without ORDER BY or DISTINCT a LIMIT stops the scan early.
+    """
+
+    def __init__(self, catalog: LakeCatalog, batch_rows: int = BATCH_ROWS, scan_threads: int = SCAN_THREADS):
+        self.catalog = catalog
+        self.batch_rows = batch_rows
+        self.scan_threads = scan_threads
+        self.stats = {"files_scanned": 0, "files_pruned": 0, "row_groups_scanned": 0,
+                      "row_groups_skipped": 0, "rows_scanned": 0}
+
+    # -- binding ----------------------------------------------------------
+
+    def _bind_tables(self, query: SelectQuery) -> None:
+        self.tables: List[Tuple[LakeTable, str]] = []
+        for name, alias in query.tables:
+            if any(alias == existing for _, existing in self.tables):
+                raise ValueError(f"Table alias '{alias}' is used more than once.")
+            self.tables.append((self.catalog.table(name), alias))
+        self.single = len(self.tables) == 1
+        self.owner: Dict[str, Tuple[str, str]] = {}
+        for table, alias in self.tables:
+            for column in table.columns:
+                self.owner[self._label(alias, column)] = (alias, column)
+
+    def _label(self, alias: str, column: str) -> str:
+        return column if self.single else f"{alias}.{column}"
+
+    def _bind(self, node: _Node, aliases: Optional[Dict[str, _Node]] = None) -> _Node:
+        def leaf(column: Column) -> _Node:
+            if column.table is not None:
+                for table, alias in self.tables:
+                    if column.table in (alias, table.name):
+                        if column.name not in table.columns:
+                            raise KeyError(f"Column '{column.name}' not found in table '{column.table}'.")
+                        return Ref(self._label(alias, column.name))
+                raise KeyError(f"Unknown table '{column.table}' in column reference '{column.table}.{column.name}'.")
+            owners = [alias for table, alias in self.tables if column.name in table.columns]
+            if len(owners) > 1:
+                raise ValueError(f"Column reference '{column.name}' is ambiguous.")
+            if owners:
+                return Ref(self._label(owners[0], column.name))
+            if aliases and column.name in aliases:
+                return aliases[column.name]
+            raise KeyError(f"Column '{column.name}' not found.")
+        return _transform(node, leaf)
+
+    def _star_columns(self, star: Star) -> List[Tuple[str, str]]:
+        """(label, output name) pairs for ``*`` or ``table.*``."""
+        columns = []
+        names = [column for table, _ in self.tables for column in table.columns]
+        for table, alias in self.tables:
+            if star.table is not None and star.table not in (alias, table.name):
+                continue
+            for column in table.columns:
+                label = self._label(alias, column)
+                columns.append((label, column if names.count(column) == 1 else label))
+        if not columns:
+            raise KeyError(f"Unknown table '{star.table}' in '{star.table}.*'.")
+        return columns
+
+    # -- scans ------------------------------------------------------------
+
+    def _ordered_map(self, function: Any, tasks: List[tuple]) -> Iterator[Any]:
+        if self.scan_threads <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield function(*task)
+            return
+        pending: deque = deque()
+        with ThreadPoolExecutor(max_workers=self.scan_threads) as pool:
+            try:
+                for task in tasks:
+                    pending.append(pool.submit(function, *task))
+                    if len(pending) >= self.scan_threads * 2:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _finish_batch(self, frame: "pd.DataFrame", partitions: Dict[str, Any], alias: str,
+                      columns: List[str], predicate: Optional[_Node]) -> "pd.DataFrame":
+        for column in columns:
+            if column not in frame.columns:
+                frame[column] = pd.Series([partitions.get(column)] * len(frame), index=frame.index)
+        frame = frame[columns]
+        if not self.single:
+            frame = frame.rename(columns={column: self._label(alias, column) for column in columns})
+        if predicate is not None and len(frame):
+            frame = frame[_as_series(_evaluate(predicate, frame), frame).to_numpy(dtype=bool)]
+        return frame
+
+    def _read_row_group(self, path: str, metadata: Any, row_group: int, file_columns: List[str],
+                        partitions: Dict[str, Any], alias: str, columns: List[str], predicate: Optional[_Node]) -> "pd.DataFrame":
+        table = pq.ParquetFile(path, metadata=metadata).read_row_group(row_group, columns=file_columns)
+        frame = table.to_pandas()
+        if not file_columns:
+            frame = pd.DataFrame(index=pd.RangeIndex(table.num_rows))
+        return self._finish_batch(frame, partitions, alias, columns, predicate)
+
+    def _scan(self, table: LakeTable, alias: str, columns: List[str], conjuncts: List[_Node]) -> Iterator["pd.DataFrame"]:
+        predicate = None
+        for conjunct in conjuncts:
+            predicate = conjunct if predicate is None else BinaryOp("and", predicate, conjunct)
+        simple = [(self.owner[label][1], op, value) for label, op, value in
+                  filter(None, (_simple_predicate(conjunct) for conjunct in conjuncts))]
+        partition_predicates = [item for item in simple if item[0] in table.partition_columns]
+        file_predicates = [item for item in simple if item[0] not in table.partition_columns]
+        files = []
+        for path, partitions in table.files:
+            if all(_value_may_match(op, value, partitions.get(column)) for column, op, value in partition_predicates):
+                files.append((path, partitions))
+            else:
+                self.stats["files_pruned"] += 1
+        self.stats["files_scanned"] += len(files)
+
+        if table.format == "parquet":
+            tasks = []
+            for path, partitions in files:
+                parquet_file = pq.ParquetFile(path)
+                names = parquet_file.schema_arrow.names
+                file_columns = [column for column in columns if column in names]
+                column_index = {name: index for index, name in enumerate(parquet_file.schema.names)}
+                metadata = parquet_file.metadata
+                for row_group in range(metadata.num_row_groups):
+                    if _row_group_may_match(metadata.row_group(row_group), column_index, file_predicates):
+                        self.stats["row_groups_scanned"] += 1
+                        self.stats["rows_scanned"] += metadata.row_group(row_group).num_rows
+                        tasks.append((path, metadata, row_group, file_columns, partitions, alias, columns, predicate))
+                    else:
+                        self.stats["row_groups_skipped"] += 1
+            yield from self._ordered_map(self._read_row_group, tasks)
+        else:
+            for path, partitions in files:
+                header = pd.read_csv(path, nrows=0).columns.tolist()
+                file_columns = [column for column in columns if column in header]
+                for chunk in pd.read_csv(path, usecols=file_columns or header[:1], chunksize=self.batch_rows):
+                    if not file_columns:
+                        chunk = pd.DataFrame(index=chunk.index)
+                    self.stats["rows_scanned"] += len(chunk)
+                    yield self._finish_batch(chunk, partitions, alias, columns, predicate)
+
+    # -- execution --------------------------------------------------------
+
+    def execute(self, sql: str, default_table: Optional[str] = None) -> Iterator["pd.DataFrame"]:
+        query = SqlParser(sql, default_table).parse()
+        self._bind_tables(query)
+        select_aliases = {alias: expr for expr, alias in query.items if alias}
+        items = []
+        for expr, alias in query.items:
+            if isinstance(expr, Star):
+                items.append((expr, None))
+            else:
+                items.append((self._bind(expr), alias or (expr.name if isinstance(expr, Column) else _sql_text(expr))))
+        bound_aliases = {alias: self._bind(expr) for alias, expr in select_aliases.items()}
+        group_by = [self._bind(expr, bound_aliases) for expr in query.group_by]
+        having = self._bind(query.having, bound_aliases) if query.having is not None else None
+
+        # ORDER BY may name an output column (alias or 1-based position) or any expression.
+        output_names = [name for expr, name in items if name]
+        order: List[Tuple[str, bool, Optional[_Node]]] = []
+        for i, (expr, ascending) in enumerate(query.order_by):
+            if isinstance(expr, Literal) and isinstance(expr.value, int):
+                if not 1 <= expr.value <= len(output_names):
+                    raise ValueError(f"ORDER BY position {expr.value} is out of range.")
+                order.append((output_names[expr.value - 1], ascending, None))
+            elif isinstance(expr, Column) and expr.table is None and expr.name in select_aliases:
+                order.append((expr.name, ascending, None))
+            else:
+                order.append((f"__order{i}", ascending, self._bind(expr, bound_aliases)))
+
+        # Predicate pushdown: a WHERE conjunct that touches one table goes into that
+        # table's scan, unless the table is the nullable side of a LEFT JOIN.
+        join_types = {alias: join_type for (_, alias), (join_type, _) in zip(self.tables[1:], query.joins)}
+        pushed: Dict[str, List[_Node]] = {alias: [] for _, alias in self.tables}
+        residual: List[_Node] = []
+        for conjunct in _conjuncts(self._bind(query.where) if query.where is not None else None):
+            if _aggregate_calls(conjunct, []):
+                raise ValueError("Aggregate functions are not allowed in WHERE; use HAVING.")
+            owners = {self.owner[label][0] for label in _refs(conjunct)}
+            if len(owners) == 1 and join_types.get(next(iter(owners))) != "left":
+                pushed[owners.pop()].append(conjunct)
+            else:
+                residual.append(conjunct)
+
+        joins = []
+        seen_aliases = {self.tables[0][1]}
+        for (table, alias), (join_type, condition) in zip(self.tables[1:], query.joins):
+            build_keys, probe_keys, post_filters = [], [], []
+            for conjunct in _conjuncts(self._bind(condition)):
+                owners = {self.owner[label][0] for label in _refs(conjunct)}
+                if owners == {alias}:
+                    pushed[alias].append(conjunct)
+                elif isinstance(conjunct, BinaryOp) and conjunct.op == "=" and isinstance(conjunct.left, Ref) \
+                        and isinstance(conjunct.right, Ref) and alias in owners and owners - {alias} <= seen_aliases:
+                    left_is_build = self.owner[conjunct.left.label][0] == alias
+                    build_keys.append((conjunct.left if left_is_build else conjunct.right).label)
+                    probe_keys.append((conjunct.right if left_is_build else conjunct.left).label)
+                elif join_type == "inner":
+                    post_filters.append(conjunct)
+                else:
+                    raise ValueError("LEFT JOIN conditions must be equalities between the joined tables.")
+            if not build_keys:
+                raise ValueError(f"JOIN with '{alias}' needs at least one equality condition on both tables.")
+            joins.append((table, alias, join_type, build_keys, probe_keys, post_filters))
+            seen_aliases.add(alias)
+
+        calls: List[FuncCall] = []
+        for expr, _ in items:
+            if not isinstance(expr, Star):
+                _aggregate_calls(expr, calls)
+        if having is not None:
+            _aggregate_calls(having, calls)
+        for _, _, expr in order:
+            if expr is not None:
+                _aggregate_calls(expr, calls)
+        aggregate = bool(calls or group_by)
+        if having is not None and not aggregate:
+            raise ValueError("HAVING requires GROUP BY or an aggregate function.")
+
+        # Projection pushdown: collect every column the plan touches.
+        needed: Dict[str, List[str]] = {alias: [] for _, alias in self.tables}
+        expressions = [expr for expr, _ in items if not isinstance(expr, Star)] + group_by + residual
+        expressions += [expr for _, _, expr in order if expr is not None]
+        expressions += [having] if having is not None else []
+        expressions += [conjunct for conjuncts in pushed.values() for conjunct in conjuncts]
+        expressions += [conjunct for join in joins for conjunct in join[5]]
+        labels = [label for expr in expressions for label in _refs(expr)]
+        labels += [label for join in joins for label in join[3] + join[4]]
+        for expr, _ in items:
+            if isinstance(expr, Star):
+                if aggregate:
+                    raise ValueError("SELECT * cannot be combined with GROUP BY or aggregate functions.")
+                labels += [label for label, _ in self._star_columns(expr)]
+        for label in labels:
+            alias, column = self.owner[label]
+            if column not in needed[alias]:
+                needed[alias].append(column)
+        for table, alias in self.tables:
+            if not needed[alias] and not table.partition_columns:
+                # count(*) and friends still need the row count of some column.
+                needed[alias].append(table.columns[0])
+
+        stream = self._scan(self.tables[0][0], self.tables[0][1], needed[self.tables[0][1]], pushed[self.tables[0][1]])
+        for table, alias, join_type, build_keys, probe_keys, post_filters in joins:
+            build_batches = list(self._scan(table, alias, needed[alias], pushed[alias]))
+            build = pd.concat(build_batches, ignore_index=True) if build_batches else \
+                pd.DataFrame({self._label(alias, column): [] for column in needed[alias]})
+            stream = self._join_stream(stream, _HashJoin(build, build_keys, probe_keys, join_type), post_filters)
+        if residual:
+            stream = self._filter_stream(stream, residual)
+
+        if aggregate:
+            aggregator = _GroupAggregator(group_by, calls)
+            for batch in stream:
+                aggregator.update(batch)
+            grouped = aggregator.result()
+            substitutions = aggregator.substitutions()
+            if having is not None:
+                grouped = grouped[_as_series(_evaluate(having, grouped, substitutions), grouped).to_numpy(dtype=bool)]
+            results: Iterator["pd.DataFrame"] = iter([self._project(grouped, items, order, substitutions)])
+            materialize = True
+        else:
+            results = (self._project(batch, items, order, None) for batch in stream)
+            materialize = bool(order) or query.distinct
+        yield from self._finish(results, query, order, materialize)
+
+    def _join_stream(self, stream: Iterator["pd.DataFrame"], join: _HashJoin, post_filters: List[_Node]) -> Iterator["pd.DataFrame"]:
+        for batch in stream:
+            joined = join.probe(batch)
+            for condition in post_filters:
+                joined = joined[_as_series(_evaluate(condition, joined), joined).to_numpy(dtype=bool)]
+            yield joined
+
+    def _filter_stream(self, stream: Iterator["pd.DataFrame"], conditions: List[_Node]) -> Iterator["pd.DataFrame"]:
+        for batch in stream:
+            for condition in conditions:
+                batch = batch[_as_series(_evaluate(condition, batch), batch).to_numpy(dtype=bool)]
+            yield batch
+
+    def _project(self, frame: "pd.DataFrame", items: List[Tuple[_Node, Optional[str]]],
+                 order: List[Tuple[str, bool, Optional[_Node]]], substitutions: Optional[Dict[_Node, str]]) -> "pd.DataFrame":
+        columns: Dict[str, Any] = {}
+        for expr, name in items:
+            pairs = self._star_columns(expr) if isinstance(expr, Star) else [(None, name)]
+            for label, output in pairs:
+                value = frame[label] if label is not None else _as_series(_evaluate(expr, frame, substitutions), frame)
+                unique, suffix = output, 1
+                while unique in columns:
+                    suffix += 1
+                    unique = f"{output}_{suffix}"
+                columns[unique] = value.to_numpy() if isinstance(value, pd.Series) else value
+        for name, _, expr in order:
+            if expr is not None:
+                columns[name] = _as_series(_evaluate(expr, frame, substitutions), frame).to_numpy()
+        return pd.DataFrame(columns, index=pd.RangeIndex(len(frame)))
+
+    def _finish(self, results: Iterator["pd.DataFrame"], query: SelectQuery,
+                order: List[Tuple[str, bool, Optional[_Node]]], materialize: bool) -> Iterator["pd.DataFrame"]:
+        hidden = [name for name, _, expr in order if expr is not None]
+        skip, remaining = query.offset, query.limit
+        if not materialize:
+            for batch in results:
+                if skip:
+                    dropped = min(skip, len(batch))
+                    batch, skip = batch.iloc[dropped:], skip - dropped
+                if remaining is not None:
+                    batch = batch.iloc[:remaining]
+                    remaining -= len(batch)
+                if len(batch):
+                    yield batch.reset_index(drop=True)
+                if remaining == 0:
+                    return
+            return
+        keep = None if query.limit is None or query.distinct else query.offset + query.limit
+        by = [name for name, _, _ in order]
+        ascending = [ascending for _, ascending, _ in order]
+        buffer = None
+        for batch in results:
+            buffer = batch if buffer is None else pd.concat([buffer, batch], ignore_index=True)
+            if keep is not None and by and len(buffer) > max(keep * 4, self.batch_rows):
+                # Keep only the running top-N for ORDER BY ... LIMIT.
+                buffer = buffer.sort_values(by, ascending=ascending, kind="stable", na_position="last").head(keep)
+        if buffer is None:
+            return
+        if query.distinct:
+            visible = [column for column in buffer.columns if column not in hidden]
+            buffer = buffer.drop_duplicates(subset=visible)
+        if by:
+            buffer = buffer.sort_values(by, ascending=ascending, kind="stable", na_position="last")
+        buffer = buffer.drop(columns=hidden).iloc[query.offset:]
+        if query.limit is not None:
+            buffer = buffer.iloc[:query.limit]
+        buffer = buffer.reset_index(drop=True)
+        for start in range(0, len(buffer), self.batch_rows):
+            yield buffer.iloc[start:start + self.batch_rows]
+
+def _duckdb_query(catalog: LakeCatalog, sql: str, default_table: Optional[str], batch_rows: int) -> Iterator["pd.DataFrame"]:
+    """
+    Runs the query on DuckDB with one view per lake table; DuckDB does its own pushdown.
+    The SQL comes from the LLM, so only what the native parser accepts (a single SELECT over
+    the lake's tables with whitelisted functions) reaches DuckDB, and file access is then
+    locked down to the files behind the views.
+    """
+    names = catalog.table_names()
+    query = SqlParser(sql, default_table).parse()
+    for name, _ in query.tables:
+        if os.path.splitext(name)[0] not in names:
+            raise ValueError(f"Unknown table '{name}'. Available tables: {', '.join(names)}.")
+    connection = duckdb.connect()
+    try:
+        lake_files = []
+        for name in names:
+            table = catalog.table(name)
+            lake_files += [os.path.abspath(path) for path, _ in table.files]
+            paths = ", ".join("'" + path.replace("'", "''") + "'" for path, _ in table.files)
+            reader = "read_parquet" if table.format == "parquet" else "read_csv_auto"
+            options = ", hive_partitioning=true" if table.partition_columns else ""
+            connection.execute(f'CREATE VIEW "{name}" AS SELECT * FROM {reader}([{paths}]{options})')
+        connection.execute("SET allowed_paths = ?", [lake_files])
+        connection.execute("SET enable_external_access = false")
+        connection.execute("SET lock_configuration = true")
+        # Each table reference the parser found names its view instead ("sales.csv" -> "sales"), and
+        # the legacy form gets its FROM clause; the rest of the SQL is passed on untouched.
+        for (name, _), (start, end) in sorted(zip(query.tables, query.table_spans), key=lambda item: item[1], reverse=True):
+            view = '"' + os.path.splitext(name)[0] + '"'
+            sql = sql[:start] + (view if end > start else f" FROM {view} ") + sql[end:]
+        result = connection.execute(sql)
+        while True:
+            chunk = result.fetch_df_chunk(max(1, batch_rows // 2048))
+            if chunk.empty:
+                break
+            yield chunk
+    finally:
+        connection.close()
+
 class DataLakeAnalyticsTool(BaseTool):
     """
-    A tool for simulating data lake analytics operations on local CSV files.
+    A tool for data lake analytics over a local directory of CSV and Parquet files.
     """
+    thread_safe = True  # every query gets its own catalog, engine and DuckDB connection
 
     def __init__(self, tool_name: str = "data_lake_analytics"):
         super().__init__(tool_name)
@@ -24,7 +1323,7 @@ class DataLakeAnalyticsTool(BaseTool):
 
     @property
     def description(self) -> str:
-        return "Performs data lake analytics: loads data, runs SQL-like queries, generates summary reports, and lists contents."
+        return "Performs data lake analytics: loads data, runs SQL queries (projections, filters, joins, grouping) over CSV/Parquet tables, generates summary reports, and lists contents."
 
     @property
     def parameters(self) -> Dict[str, Any]:
@@ -34,7 +1333,7 @@ class DataLakeAnalyticsTool(BaseTool):
                 "operation": {
                     "type": "string",
                     "description": "The analytics operation to perform.",
-                    "enum": ["load_data", "run_query", "generate_summary", "list_contents"]
+                    "enum": ["load_data", "run_query", "stream_query", "generate_summary", "list_contents", "list_tables"]
                 },
                 "data_lake_path": {
                     "type": "string",
@@ -46,7 +1345,17 @@ class DataLakeAnalyticsTool(BaseTool):
                 },
                 "sql_query": {
                     "type": "string",
-                    "description": "A simplified SQL-like query string (e.g., 'SELECT * WHERE age > 30')."
+                    "description": "A SQL SELECT query. Tables are the files or (optionally Hive-partitioned) directories in the data lake, e.g. 'SELECT region, SUM(sales) FROM sales_data WHERE units > 10 GROUP BY region'. Without a FROM clause the query runs against 'file_name'."
+                },
+                "engine": {
+                    "type": "string",
+                    "description": "Query engine: 'duckdb', the built-in 'native' engine, or 'auto' to use DuckDB when it is installed.",
+                    "enum": ["auto", "duckdb", "native"],
+                    "default": "auto"
+                },
+                "max_rows": {
+                    "type": "integer",
+                    "description": "Optional cap on the number of result rows returned by run_query."
                 },
                 "group_by_column": {
                     "type": "string",
@@ -74,19 +1383,37 @@ class DataLakeAnalyticsTool(BaseTool):
         except Exception as e:
             raise RuntimeError(f"Failed to load data from '{file_name}': {e}")
 
-    def _run_sql_query(self, data_lake_path: str, file_name: str, sql_query: str) -> List[Dict[str, Any]]:
-        df = self._load_data_from_lake(data_lake_path, file_name)
-        query_parts = sql_query.upper().split("WHERE", 1)
-        if len(query_parts) < 2:
-            return df.to_dict(orient='records')
+    def _query_batches(self, data_lake_path: str, file_name: Optional[str], sql_query: str,
+                       engine: str = "auto") -> Iterator[pd.DataFrame]:
+        """Yields the result of ``sql_query`` as a stream of DataFrame batches."""
+        catalog = LakeCatalog(data_lake_path)
+        if engine == "duckdb" and not DUCKDB_AVAILABLE:
+            raise ImportError("The 'duckdb' engine requires the duckdb package. Please install it with 'pip install duckdb'.")
+        if engine == "duckdb" or (engine == "auto" and DUCKDB_AVAILABLE):
+            return _duckdb_query(catalog, sql_query, file_name, BATCH_ROWS)
+        if engine not in ("auto", "native"):
+            raise ValueError(f"Unknown query engine '{engine}'.")
+        return LakeQueryEngine(catalog).execute(sql_query, default_table=file_name)
 
-        where_clause = query_parts[1].strip()
+    def _run_sql_query(self, data_lake_path: str, file_name: Optional[str], sql_query: str,
+                       engine: str = "auto", max_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
         try:
-            filtered_df = df.query(where_clause)
-            logger.info(f"Query '{sql_query}' executed on '{file_name}'. Results shape: {filtered_df.shape}")
-            return filtered_df.to_dict(orient='records')
-        except Exception as e:
-            raise ValueError(f"Invalid SQL-like query '{sql_query}': {e}")
+            for batch in self._query_batches(data_lake_path, file_name, sql_query, engine):
+                if max_rows is not None:
+                    batch = batch.iloc[:max_rows - len(records)]
+                records.extend(batch.to_dict(orient='records'))
+                if max_rows is not None and len(records) >= max_rows:
+                    break
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Invalid SQL query '{sql_query}': {e}")
+        logger.info(f"Query '{sql_query}' executed on '{data_lake_path}'. Returned {len(records)} rows.")
+        return records
+
+    def _stream_sql_query(self, data_lake_path: str, file_name: Optional[str], sql_query: str,
+                          engine: str = "auto") -> Iterator[List[Dict[str, Any]]]:
+        for batch in self._query_batches(data_lake_path, file_name, sql_query, engine):
+            yield batch.to_dict(orient='records')
 
     def _generate_summary_report(self, data_lake_path: str, file_name: str, group_by_column: Optional[str] = None) -> Dict[str, Any]:
         df = self._load_data_from_lake(data_lake_path, file_name)
@@ -103,6 +1430,15 @@ class DataLakeAnalyticsTool(BaseTool):
             report["overall_summary"] = df.describe(include='all').to_dict()
         return report
 
+    def _list_tables(self, data_lake_path: str) -> List[Dict[str, Any]]:
+        catalog = LakeCatalog(data_lake_path)
+        tables = []
+        for name in catalog.table_names():
+            table = catalog.table(name)
+            tables.append({"name": name, "format": table.format, "files": len(table.files),
+                           "columns": table.columns, "partition_columns": table.partition_columns})
+        return tables
+
     def _list_data_lake_contents(self, data_lake_path: str) -> List[str]:
         if not os.path.exists(data_lake_path):
             raise FileNotFoundError(f"Data lake path '{data_lake_path}' does not exist.")
@@ -110,26 +1446,34 @@ class DataLakeAnalyticsTool(BaseTool):
             raise ValueError(f"Data lake path '{data_lake_path}' is not a directory.")
         return os.listdir(data_lake_path)
 
-    def execute(self, operation: str, data_lake_path: str, **kwargs: Any) -> Union[pd.DataFrame, List[Dict[str, Any]], Dict[str, Any], List[str]]:
+    def execute(self, operation: str, data_lake_path: str, **kwargs: Any) -> Union[pd.DataFrame, List[Dict[str, Any]], Dict[str, Any], List[str], Iterator[List[Dict[str, Any]]]]:
         if operation == "load_data":
             file_name = kwargs.get("file_name")
             if not file_name: raise ValueError("'file_name' is required for load_data operation.")
             return self._load_data_from_lake(data_lake_path, file_name)
-        elif operation == "run_query":
-            file_name = kwargs.get("file_name")
+        elif operation in ("run_query", "stream_query"):
             sql_query = kwargs.get("sql_query")
-            if not all([file_name, sql_query]): raise ValueError("'file_name' and 'sql_query' are required for run_query operation.")
-            return self._run_sql_query(data_lake_path, file_name, sql_query)
+            if not sql_query: raise ValueError(f"'sql_query' is required for {operation} operation.")
+            engine = kwargs.get("engine", "auto")
+            if operation == "stream_query":
+                return self._stream_sql_query(data_lake_path, kwargs.get("file_name"), sql_query, engine)
+            return self._run_sql_query(data_lake_path, kwargs.get("file_name"), sql_query, engine, kwargs.get("max_rows"))
         elif operation == "generate_summary":
             file_name = kwargs.get("file_name")
             if not file_name: raise ValueError("'file_name' is required for generate_summary operation.")
             return self._generate_summary_report(data_lake_path, file_name, kwargs.get("group_by_column"))
         elif operation == "list_contents":
             return self._list_data_lake_contents(data_lake_path)
+        elif operation == "list_tables":
+            return self._list_tables(data_lake_path)
         else:
             raise ValueError(f"Invalid operation: {operation}")
 
 if __name__ == '__main__':
+    import sys
+    import time
+    import tempfile
+
     print("Demonstrating DataLakeAnalyticsTool functionality...")
     tool = DataLakeAnalyticsTool()
     
@@ -155,9 +1499,57 @@ if __name__ == '__main__':
         query_results = tool.execute(operation="run_query", data_lake_path=data_lake_dir, file_name="sales_data.csv", sql_query="SELECT * WHERE sales > 100")
         print(json.dumps(query_results, indent=2))
 
+        print("\n--- Running SQL Query (sales per product) ---")
+        query_results = tool.execute(operation="run_query", data_lake_path=data_lake_dir,
+                                     sql_query="SELECT product, SUM(sales) AS total, COUNT(*) AS orders FROM sales_data GROUP BY product ORDER BY total DESC")
+        print(json.dumps(query_results, indent=2))
+
+        # Benchmark: aggregations over a day-partitioned lake (default 20M rows; pass a row
+        # count on the command line, ~400M rows is roughly 10 GB of CSV-equivalent data).
+        total_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000_000
+        file_format = "parquet" if PYARROW_AVAILABLE else "csv"
+        print(f"\n--- Benchmark: {total_rows:,} rows as {file_format} ---")
+        with tempfile.TemporaryDirectory() as bench_dir:
+            rng = np.random.default_rng(7)
+            days = 30
+            rows_per_day = total_rows // days
+            for day in range(days):
+                partition = os.path.join(bench_dir, "events", f"day={day + 1}")
+                os.makedirs(partition)
+                events = pd.DataFrame({
+                    "user_id": rng.integers(0, 1_000_000, rows_per_day),
+                    "country": rng.choice(["US", "DE", "IN", "BR", "JP"], rows_per_day),
+                    "latency_ms": rng.gamma(2.0, 40.0, rows_per_day),
+                    "bytes": rng.integers(100, 100_000, rows_per_day),
+                }).sort_values("latency_ms")
+                if file_format == "parquet":
+                    events.to_parquet(os.path.join(partition, "part-0.parquet"), index=False, row_group_size=100_000)
+                else:
+                    events.to_csv(os.path.join(partition, "part-0.csv"), index=False)
+            on_disk = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(bench_dir) for name in names)
+            print(f"Lake size on disk: {on_disk / 1024**2:,.0f} MB")
+            queries = {
+                "global aggregate": "SELECT COUNT(*) AS n, AVG(latency_ms) AS avg_latency, SUM(bytes) AS total_bytes FROM events",
+                "group by": "SELECT country, COUNT(*) AS n, MAX(latency_ms) AS worst FROM events GROUP BY country ORDER BY n DESC",
+                "selective filter": "SELECT day, COUNT(*) AS n FROM events WHERE latency_ms > 400 AND day <= 7 GROUP BY day",
+            }
+            engines = ["native"] + (["duckdb"] if DUCKDB_AVAILABLE else [])
+            for label, sql in queries.items():
+                for engine in engines:
+                    started = time.perf_counter()
+                    if engine == "native":
+                        query_engine = LakeQueryEngine(LakeCatalog(bench_dir))
+                        rows = sum(len(batch) for batch in query_engine.execute(sql))
+                        detail = f", row groups skipped={query_engine.stats['row_groups_skipped']}, files pruned={query_engine.stats['files_pruned']}"
+                    else:
+                        rows = sum(len(batch) for batch in _duckdb_query(LakeCatalog(bench_dir), sql, None, BATCH_ROWS))
+                        detail = ""
+                    elapsed = time.perf_counter() - started
+                    print(f"{label} [{engine}]: {elapsed:.2f}s ({total_rows / elapsed:,.0f} rows/s), {rows} result rows{detail}")
+
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
         if os.path.exists(data_lake_dir):
             shutil.rmtree(data_lake_dir)
-        print("\nCleanup complete.")
\ No newline at end of file
+        print("\nCleanup complete.")
@@ -12,6 +12,7 @@ class DataLakeGovernanceTool(BaseTool):
     A tool for defining and simulating the enforcement of data governance policies
     within a data lake context.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_lake_governance_tool"):
         super().__init__(tool_name)
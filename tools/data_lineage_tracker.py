@@ -11,6 +11,7 @@ class DataLineageTrackerTool(BaseTool):
     """
     A tool for tracking and visualizing data lineage.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_lineage_tracker"):
         super().__init__(tool_name)
@@ -14,6 +14,7 @@ class DataLossPreventionTool(BaseTool):
     A tool for identifying, redacting, and quarantining sensitive information
     to prevent data loss.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_loss_prevention_tool"):
         super().__init__(tool_name)
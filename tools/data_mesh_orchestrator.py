@@ -12,6 +12,7 @@ class DataMeshOrchestratorTool(BaseTool):
     A tool for orchestrating a data mesh, allowing for the definition,
     discovery, and management of data products.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_mesh_orchestrator"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DataModelingTool(BaseTool):
     A tool for managing data models, allowing for their creation, validation,
     and retrieval.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_modeling_tool"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DataPipelineOrchestratorTool(BaseTool):
     A tool for orchestrating data pipelines, allowing for their creation,
     starting, stopping, and status monitoring.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_pipeline_orchestrator"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DataPrivacyManagementTool(BaseTool):
     A tool for managing data privacy, allowing for the definition of policies,
     recording and checking user consents, and simulating policy enforcement.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_privacy_management"):
         super().__init__(tool_name)
@@ -13,6 +13,7 @@ class DataQualityManagementTool(BaseTool):
     A tool for managing data quality, allowing for the definition of rules,
     checking data quality against those rules, and simulating data cleaning.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_quality_management"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DataReplicationTool(BaseTool):
     """
     A tool for simulating data replication processes.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_replication_tool"):
         super().__init__(tool_name)
@@ -11,6 +11,7 @@ class DataRetentionPolicyEnforcerTool(BaseTool):
     """
     A tool for defining and simulating the enforcement of data retention policies.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_retention_policy_enforcer"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DataSecurityAuditorTool(BaseTool):
     A tool for defining security standards and simulating data system audits
     against those standards.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_security_auditor"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DataSharingPlatformTool(BaseTool):
     A tool for simulating a data sharing platform, allowing for the registration
     of data assets, definition of sharing agreements, and management of access.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_sharing_platform"):
         super().__init__(tool_name)
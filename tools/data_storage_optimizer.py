@@ -12,6 +12,7 @@ class DataStorageOptimizerTool(BaseTool):
     A tool for simulating data storage optimization actions, including
     registering storage systems, analyzing usage, and applying optimizations.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_storage_optimizer"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DataStreamingPlatformTool(BaseTool):
     A tool for simulating a data streaming platform, allowing for the creation
     of data streams, publishing data records, and consuming data records.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_streaming_platform"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DataSyndicationTool(BaseTool):
     A tool for simulating data syndication processes, allowing for the definition
     of syndication configurations and the simulation of data distribution.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_syndication_tool"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DataTieringOptimizerTool(BaseTool):
     A tool for simulating data tiering optimization, allowing for the registration
     of data sets, analysis of access patterns, and optimization of storage tiers.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_tiering_optimizer"):
         super().__init__(tool_name)
@@ -11,6 +11,7 @@ class DataTransformationEngineTool(BaseTool):
     """
     A tool for defining and executing data transformation pipelines.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_transformation_engine"):
         super().__init__(tool_name)
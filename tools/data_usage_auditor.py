@@ -12,6 +12,7 @@ class DataUsageAuditorTool(BaseTool):
     A tool for simulating data usage auditing, allowing for the recording of
     usage events and the generation of audit reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_usage_auditor"):
         super().__init__(tool_name)
@@ -13,6 +13,7 @@ class DataValidationAndProfilingTool(BaseTool):
     A tool for defining data validation rules, validating data against them,
     and profiling data to understand its characteristics.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_validation_and_profiling"):
         super().__init__(tool_name)
@@ -13,6 +13,7 @@ class DataValidationTool(BaseTool):
     A simplified tool for defining data validation rules and validating in-memory
     data (lists of dictionaries) against those rules.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_validation_tool"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DataVersioningTool(BaseTool):
     """
     A tool for simulating a data versioning system.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_versioning_system"):
         super().__init__(tool_name)
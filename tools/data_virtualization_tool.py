@@ -12,6 +12,7 @@ class DataVirtualizationTool(BaseTool):
     A tool for simulating data virtualization, allowing for the creation
     and querying of virtual views over simulated data sources.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_virtualization_tool"):
         super().__init__(tool_name)
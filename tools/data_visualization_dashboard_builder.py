@@ -11,6 +11,7 @@ class DataVisualizationDashboardBuilderTool(BaseTool):
     """
     A tool for simulating the creation and management of data visualization dashboards.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_visualization_dashboard_builder"):
         super().__init__(tool_name)
@@ -4,10 +4,7 @@ import json
 import shutil
 from typing import List, Dict, Any, Optional, Union
 from tools.base_tool import BaseTool
-
-# Suppress INFO messages from matplotlib and seaborn
-logging.getLogger('matplotlib').setLevel(logging.WARNING)
-logging.getLogger('seaborn').setLevel(logging.WARNING)
+from tools.chart_renderer import MATPLOTLIB_AVAILABLE, chart_renderer, file_fingerprint, frame_fingerprint, frame_payload
 
 try:
     import pandas as pd
@@ -16,21 +13,16 @@ except ImportError:
     pd = None
     PANDAS_AVAILABLE = False
 
-try:
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    plt = None
-    sns = None
-    MATPLOTLIB_AVAILABLE = False
-
 logger = logging.getLogger(__name__)
 
 class DataVisualizationTool(BaseTool):
     """
     A comprehensive tool for generating various data visualizations (line, bar, scatter,
     histogram, box, pie, heatmap, violin, KDE plots).
+
+    Data is reduced to what can be seen before drawing (downsampled lines and
+    scatters, binned histograms and densities) and charts are rendered by the
+    shared render pool, which caches images by data fingerprint and chart spec.
     """
 
     def __init__(self, tool_name: str = "data_visualization_tool"):
@@ -76,7 +68,7 @@ class DataVisualizationTool(BaseTool):
         if not PANDAS_AVAILABLE:
             raise ImportError("The 'pandas' library is not installed. Please install it with 'pip install pandas'.")
         if not MATPLOTLIB_AVAILABLE:
-            raise ImportError("The 'matplotlib' and 'seaborn' libraries are not installed. Please install them with 'pip install matplotlib seaborn'.")
+            raise ImportError("The 'matplotlib' library is not installed. Please install it with 'pip install matplotlib'.")
 
     def _load_data(self, data_source: Union[str, List[Dict[str, Any]], pd.DataFrame]) -> pd.DataFrame:
         if isinstance(data_source, pd.DataFrame): return data_source
@@ -91,96 +83,92 @@ class DataVisualizationTool(BaseTool):
                 except json.JSONDecodeError: raise ValueError("'data_source' is not a valid file path, JSON string, or DataFrame.")
         else: raise ValueError("Unsupported data source type.")
 
-    def _save_plot(self, output_path: str) -> str:
-        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
-        plt.tight_layout()
-        plt.savefig(output_path)
-        plt.close()
-        return f"Plot saved to '{output_path}'."
-
-    def _line_plot(self, df: pd.DataFrame, x_column: str, y_column: str, output_path: str, title: Optional[str], xlabel: Optional[str], ylabel: Optional[str], figsize: tuple) -> str:
-        if x_column not in df.columns or y_column not in df.columns: raise KeyError(f"One or both columns ('{x_column}', '{y_column}') not found in data.")
-        plt.figure(figsize=figsize); sns.lineplot(x=df[x_column], y=df[y_column])
-        plt.title(title if title else f"Line Plot of {y_column} vs. {x_column}"); plt.xlabel(xlabel if xlabel else x_column); plt.ylabel(ylabel if ylabel else y_column)
-        return self._save_plot(output_path)
-
-    def _bar_plot(self, df: pd.DataFrame, x_column: str, y_column: str, output_path: str, title: Optional[str], xlabel: Optional[str], ylabel: Optional[str], figsize: tuple) -> str:
-        if x_column not in df.columns or y_column not in df.columns: raise KeyError(f"One or both columns ('{x_column}', '{y_column}') not found in data.")
-        plt.figure(figsize=figsize); sns.barplot(x=df[x_column], y=df[y_column])
-        plt.title(title if title else f"Bar Plot of {y_column} by {x_column}"); plt.xlabel(xlabel if xlabel else x_column); plt.ylabel(ylabel if ylabel else y_column)
-        return self._save_plot(output_path)
-
-    def _scatter_plot(self, df: pd.DataFrame, x_column: str, y_column: str, output_path: str, title: Optional[str], xlabel: Optional[str], ylabel: Optional[str], figsize: tuple) -> str:
-        if x_column not in df.columns or y_column not in df.columns: raise KeyError(f"One or both columns ('{x_column}', '{y_column}') not found in data.")
-        plt.figure(figsize=figsize); sns.scatterplot(x=df[x_column], y=df[y_column])
-        plt.title(title if title else f"Scatter Plot of {y_column} vs. {x_column}"); plt.xlabel(xlabel if xlabel else x_column); plt.ylabel(ylabel if ylabel else y_column)
-        return self._save_plot(output_path)
-
-    def _histogram(self, df: pd.DataFrame, x_column: str, output_path: str, title: Optional[str], xlabel: Optional[str], figsize: tuple) -> str:
-        if x_column not in df.columns: raise KeyError(f"Column '{x_column}' not found in data.")
-        if not pd.api.types.is_numeric_dtype(df[x_column]): raise TypeError(f"Column '{x_column}' must be numerical for a histogram.")
-        plt.figure(figsize=figsize); sns.histplot(x=df[x_column], kde=True)
-        plt.title(title if title else f"Histogram of {x_column}"); plt.xlabel(xlabel if xlabel else x_column); plt.ylabel("Frequency")
-        return self._save_plot(output_path)
-
-    def _box_plot(self, df: pd.DataFrame, x_column: str, y_column: Optional[str], output_path: str, title: Optional[str], xlabel: Optional[str], ylabel: Optional[str], figsize: tuple) -> str:
-        if x_column not in df.columns: raise KeyError(f"Column '{x_column}' not found in data.")
-        if y_column and y_column not in df.columns: raise KeyError(f"Column '{y_column}' not found in data.")
-        plt.figure(figsize=figsize); sns.boxplot(x=df[x_column], y=df[y_column] if y_column else None)
-        plt.title(title if title else (f"Box Plot of {y_column} by {x_column}" if y_column else f"Box Plot of {x_column}")); plt.xlabel(xlabel if xlabel else x_column); plt.ylabel(ylabel if ylabel else y_column if y_column else "")
-        return self._save_plot(output_path)
-
-    def _pie_chart(self, df: pd.DataFrame, labels_column: str, values_column: str, output_path: str, title: Optional[str], figsize: tuple) -> str:
-        if labels_column not in df.columns or values_column not in df.columns: raise KeyError(f"One or both columns ('{labels_column}', '{values_column}') not found in data.")
-        plt.figure(figsize=figsize); plt.pie(df[values_column], labels=df[labels_column], autopct='%1.1f%%', startangle=90)
-        plt.title(title if title else f"Pie Chart of {values_column} by {labels_column}"); plt.axis('equal')
-        return self._save_plot(output_path)
-
-    def _heatmap(self, df: pd.DataFrame, output_path: str, title: Optional[str], figsize: tuple) -> str:
-        numerical_df = df.select_dtypes(include=['number'])
-        if numerical_df.empty: raise ValueError("No numerical columns found for heatmap generation.")
-        plt.figure(figsize=figsize); sns.heatmap(numerical_df.corr(), annot=True, fmt=".2f", cmap="viridis")
-        plt.title(title if title else "Correlation Heatmap")
-        return self._save_plot(output_path)
-
-    def _violin_plot(self, df: pd.DataFrame, x_column: str, y_column: Optional[str], output_path: str, title: Optional[str], xlabel: Optional[str], ylabel: Optional[str], figsize: tuple) -> str:
-        if x_column not in df.columns: raise KeyError(f"Column '{x_column}' not found in data.")
-        if y_column and y_column not in df.columns: raise KeyError(f"Column '{y_column}' not found in data.")
-        plt.figure(figsize=figsize); sns.violinplot(x=df[x_column], y=df[y_column] if y_column else None)
-        plt.title(title if title else (f"Violin Plot of {y_column} by {x_column}" if y_column else f"Violin Plot of {x_column}")); plt.xlabel(xlabel if xlabel else x_column); plt.ylabel(ylabel if ylabel else y_column if y_column else "")
-        return self._save_plot(output_path)
-
-    def _kde_plot(self, df: pd.DataFrame, x_column: str, y_column: Optional[str], output_path: str, title: Optional[str], xlabel: Optional[str], ylabel: Optional[str], figsize: tuple) -> str:
-        if x_column not in df.columns: raise KeyError(f"Column '{x_column}' not found in data.")
-        if y_column and y_column not in df.columns: raise KeyError(f"Column '{y_column}' not found in data.")
-        plt.figure(figsize=figsize); sns.kdeplot(x=df[x_column], y=df[y_column] if y_column else None, fill=True)
-        plt.title(title if title else (f"KDE Plot of {y_column} vs. {x_column}" if y_column else f"KDE Plot of {x_column}")); plt.xlabel(xlabel if xlabel else x_column); plt.ylabel(ylabel if ylabel else y_column if y_column else "Density")
-        return self._save_plot(output_path)
-
-    def execute(self, plot_type: str, data_source: Union[str, List[Dict[str, Any]], pd.DataFrame], output_path: str, **kwargs: Any) -> str:
-        df = self._load_data(data_source)
+    @staticmethod
+    def _columns_for(plot_type: str, kwargs: Dict[str, Any]) -> Optional[List[str]]:
+        """The columns a plot reads (None means all of them), in a stable order."""
+        if plot_type == "heatmap":
+            return None
+        if plot_type == "pie":
+            required, optional = ["labels_column", "values_column"], []
+        elif plot_type in ("line", "bar", "scatter"):
+            required, optional = ["x_column", "y_column"], []
+        else:
+            required, optional = ["x_column"], ["y_column"]
+        for name in required:
+            if not kwargs.get(name): raise KeyError(name)
+        return [kwargs[name] for name in required + optional if kwargs.get(name)]
+
+    @staticmethod
+    def _validate(plot_type: str, df: pd.DataFrame, columns: Optional[List[str]]) -> None:
+        missing = [column for column in (columns or []) if column not in df.columns]
+        if missing:
+            if len(columns) == 1 or plot_type in ("box", "violin", "kde", "histogram"):
+                raise KeyError(f"Column '{missing[0]}' not found in data.")
+            raise KeyError(f"One or both columns ('{columns[0]}', '{columns[1]}') not found in data.")
+        if plot_type == "histogram" and not pd.api.types.is_numeric_dtype(df[columns[0]]):
+            raise TypeError(f"Column '{columns[0]}' must be numerical for a histogram.")
+
+    @staticmethod
+    def _spec(plot_type: str, kwargs: Dict[str, Any], figsize: tuple) -> Dict[str, Any]:
+        x, y = kwargs.get("x_column"), kwargs.get("y_column")
+        labels, values = kwargs.get("labels_column"), kwargs.get("values_column")
+        default_titles = {
+            "line": f"Line Plot of {y} vs. {x}",
+            "bar": f"Bar Plot of {y} by {x}",
+            "scatter": f"Scatter Plot of {y} vs. {x}",
+            "histogram": f"Histogram of {x}",
+            "box": f"Box Plot of {y} by {x}" if y else f"Box Plot of {x}",
+            "pie": f"Pie Chart of {values} by {labels}",
+            "heatmap": "Correlation Heatmap",
+            "violin": f"Violin Plot of {y} by {x}" if y else f"Violin Plot of {x}",
+            "kde": f"KDE Plot of {y} vs. {x}" if y else f"KDE Plot of {x}",
+        }
+        default_ylabels = {"histogram": "Frequency", "kde": y if y else "Density", "box": y if y else "", "violin": y if y else ""}
+        spec = {"plot_type": plot_type, "figsize": list(figsize), "title": kwargs.get("title") or default_titles[plot_type]}
+        if plot_type not in ("pie", "heatmap"):
+            spec["xlabel"] = kwargs.get("xlabel") or x
+            spec["ylabel"] = kwargs.get("ylabel") or default_ylabels.get(plot_type, y)
+        return spec
+
+    def render(self, plot_type: str, data_source: Union[str, List[Dict[str, Any]], pd.DataFrame],
+               output_path: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Renders a chart and returns the renderer's result (path, cache key, whether it
+        was served from cache). File sources are fingerprinted by path and mtime, so a
+        repeated chart of an unchanged file is served without reading it.
+        """
+        try:
+            columns = self._columns_for(plot_type, kwargs)
+        except KeyError as e:
+            raise KeyError(f"Missing required parameter {e} for a {plot_type} plot.")
         figsize = (kwargs.get("figsize_width", 10), kwargs.get("figsize_height", 6))
-        
-        if plot_type == "line":
-            return self._line_plot(df, kwargs["x_column"], kwargs["y_column"], output_path, kwargs.get("title"), kwargs.get("xlabel"), kwargs.get("ylabel"), figsize)
-        elif plot_type == "bar":
-            return self._bar_plot(df, kwargs["x_column"], kwargs["y_column"], output_path, kwargs.get("title"), kwargs.get("xlabel"), kwargs.get("ylabel"), figsize)
-        elif plot_type == "scatter":
-            return self._scatter_plot(df, kwargs["x_column"], kwargs["y_column"], output_path, kwargs.get("title"), kwargs.get("xlabel"), kwargs.get("ylabel"), figsize)
-        elif plot_type == "histogram":
-            return self._histogram(df, kwargs["x_column"], output_path, kwargs.get("title"), kwargs.get("xlabel"), figsize)
-        elif plot_type == "box":
-            return self._box_plot(df, kwargs["x_column"], kwargs.get("y_column"), output_path, kwargs.get("title"), kwargs.get("xlabel"), kwargs.get("ylabel"), figsize)
-        elif plot_type == "pie":
-            return self._pie_chart(df, kwargs["labels_column"], kwargs["values_column"], output_path, kwargs.get("title"), figsize)
-        elif plot_type == "heatmap":
-            return self._heatmap(df, output_path, kwargs.get("title"), figsize)
-        elif plot_type == "violin":
-            return self._violin_plot(df, kwargs["x_column"], kwargs.get("y_column"), output_path, kwargs.get("title"), kwargs.get("xlabel"), kwargs.get("ylabel"), figsize)
-        elif plot_type == "kde":
-            return self._kde_plot(df, kwargs["x_column"], kwargs.get("y_column"), output_path, kwargs.get("title"), kwargs.get("xlabel"), kwargs.get("ylabel"), figsize)
+        spec = self._spec(plot_type, kwargs, figsize)
+        loaded: Dict[str, pd.DataFrame] = {}
+
+        def load() -> pd.DataFrame:
+            if "df" not in loaded:
+                df = self._load_data(data_source)
+                self._validate(plot_type, df, columns)
+                loaded["df"] = df
+            return loaded["df"]
+
+        if isinstance(data_source, str) and os.path.exists(data_source):
+            data_key = file_fingerprint(data_source, columns)
         else:
+            df = load()
+            data_key = frame_fingerprint(df, columns)
+
+        def build() -> Dict[str, Any]:
+            return frame_payload(plot_type, load(), kwargs.get("x_column"), kwargs.get("y_column"),
+                                 kwargs.get("labels_column"), kwargs.get("values_column"))
+
+        return chart_renderer.render(spec, data_key, build, output_path)
+
+    def execute(self, plot_type: str, data_source: Union[str, List[Dict[str, Any]], pd.DataFrame], output_path: str, **kwargs: Any) -> str:
+        if plot_type not in ("line", "bar", "scatter", "histogram", "box", "pie", "heatmap", "violin", "kde"):
             raise ValueError(f"Unsupported plot type: {plot_type}")
+        result = self.render(plot_type, data_source, output_path, **kwargs)
+        return f"Plot saved to '{result['path']}'."
 
 if __name__ == '__main__':
     print("Demonstrating DataVisualizationTool functionality...")
@@ -205,6 +193,22 @@ if __name__ == '__main__':
         print("\n--- Generating Bar Plot ---")
         tool.execute(plot_type="bar", data_source=test_data_path, output_path=os.path.join(output_dir, 'bar_plot.png'), x_column='category', y_column='sales', title="Sales by Category")
 
+        print("\n--- Benchmark: 2M-row charts (first render, then cache hit) ---")
+        import time
+        import numpy as np
+        rows = 2_000_000
+        rng = np.random.default_rng(0)
+        big = pd.DataFrame({"t": np.arange(rows, dtype=np.float64), "signal": np.cumsum(rng.normal(size=rows)),
+                            "noise": rng.normal(size=rows)})
+        for plot_type, columns in [("line", {"x_column": "t", "y_column": "signal"}),
+                                   ("scatter", {"x_column": "signal", "y_column": "noise"}),
+                                   ("histogram", {"x_column": "noise"}),
+                                   ("kde", {"x_column": "signal", "y_column": "noise"})]:
+            for attempt in ("render", "cached"):
+                started = time.perf_counter()
+                result = tool.render(plot_type, big, os.path.join(output_dir, f"big_{plot_type}.png"), **columns)
+                print(f"{plot_type:>9} {attempt}: {time.perf_counter() - started:.2f}s (cached={result['cached']}, points={result['points']})")
+
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
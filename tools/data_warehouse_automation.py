@@ -12,6 +12,7 @@ class DataWarehouseAutomationTool(BaseTool):
     A tool for simulating data warehouse automation, allowing for the definition
     and execution of automation tasks such as data loading, schema updates, etc.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "data_warehouse_automation"):
         super().__init__(tool_name)
@@ -2,7 +2,7 @@ import logging
 import os
 import json
 import random
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Iterator, Tuple
 from .base_tool import BaseTool
 
 try:
@@ -12,8 +12,420 @@ except ImportError:
     pd = None
     PANDAS_AVAILABLE = False
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pc = None
+    ds = None
+    PYARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 10_000
+_JOIN_TYPES = {"inner": "inner", "left": "left outer", "right": "right outer", "outer": "full outer"}
+_ROW_ID = "__wrangling_row_id"
+
+
+class _ColumnAccessor:
+    """
+    Stands in for ``record`` when a create_feature expression is evaluated once
+    over whole columns (Arrow-backed pandas Series) instead of once per row.
+    """
+    def __init__(self, columns: Dict[str, Any], num_rows: int):
+        self._columns = columns
+        self._num_rows = num_rows
+        self._series: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._series:
+            self._series[key] = self._columns[key].to_pandas(types_mapper=pd.ArrowDtype)
+        return self._series[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self._columns else default
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._columns
+
+
+class _Project:
+    """
+    A fused run of row-wise steps (fill_missing, standardize_case, rename_column,
+    change_type, create_feature). All of them are applied to one column map per
+    batch and the batch is rebuilt once, however many steps were fused.
+    """
+    kind = "Project"
+
+    def __init__(self):
+        self.steps: List[Dict[str, Any]] = []
+
+    def describe(self) -> str:
+        names = []
+        for step in self.steps:
+            if step["type"] == "rename_column":
+                names.append(f"rename({step.get('old_name')}->{step.get('new_name')})")
+            else:
+                names.append(f"{step['type']}({step.get('column') or step.get('new_column')})")
+        return f"Project[{', '.join(names)}]"
+
+    def run(self, table: "pa.Table") -> "pa.Table":
+        columns: Dict[str, Any] = {name: table.column(name) for name in table.column_names}
+        num_rows = table.num_rows
+        for step in self.steps:
+            _apply_row_step(columns, num_rows, step)
+        if not columns:
+            return pa.table({})
+        return pa.table(columns)
+
+
+def _combine(column: Any) -> Any:
+    return column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+
+
+def _apply_row_step(columns: Dict[str, Any], num_rows: int, step: Dict[str, Any]) -> None:
+    step_type = step["type"]
+    if step_type == "fill_missing":
+        column = step.get("column")
+        if column not in columns:
+            return
+        values = columns[column]
+        fill_value = step.get("value")
+        if pa.types.is_null(values.type):
+            columns[column] = pa.array([fill_value] * num_rows)
+            return
+        missing = pc.is_null(values)
+        if pa.types.is_string(values.type) or pa.types.is_large_string(values.type):
+            missing = pc.or_kleene(missing, pc.equal(pc.utf8_trim_whitespace(values), ""))
+        try:
+            fill = pa.scalar(fill_value).cast(values.type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            raise ValueError(f"Cannot fill column '{column}' of type {values.type} with {fill_value!r}.")
+        columns[column] = pc.if_else(missing, fill, values)
+    elif step_type == "standardize_case":
+        column = step.get("column")
+        if column not in columns or not pa.types.is_string(columns[column].type):
+            return
+        case_type = step.get("case", "lower")
+        kernel = {"lower": pc.utf8_lower, "upper": pc.utf8_upper, "title": pc.utf8_title}.get(case_type)
+        if kernel is not None:
+            columns[column] = kernel(columns[column])
+    elif step_type == "rename_column":
+        old_name, new_name = step.get("old_name"), step.get("new_name")
+        if old_name in columns:
+            # Like record[new] = record.pop(old): an existing 'new' is replaced and the column moves last.
+            values = columns.pop(old_name)
+            columns.pop(new_name, None)
+            columns[new_name] = values
+    elif step_type == "change_type":
+        column, new_type = step.get("column"), step.get("new_type")
+        if column not in columns or new_type not in ("int", "float", "str"):
+            return
+        columns[column] = _change_type(column, columns[column], new_type)
+    elif step_type == "create_feature":
+        columns[step["new_column"]] = _create_feature(columns, num_rows, step["new_column"], step["expression"])
+
+
+def _change_type(column: str, values: Any, new_type: str) -> Any:
+    target = {"int": pa.int64(), "float": pa.float64(), "str": pa.string()}[new_type]
+    kind = values.type
+    # Arrow renders floats and booleans differently from Python's str(); only use the kernel where they agree.
+    if new_type != "str" or pa.types.is_integer(kind) or pa.types.is_string(kind):
+        try:
+            # Strings are parsed strictly (like int("3.5") failing); numbers truncate like int(3.5).
+            return pc.cast(values, target, safe=not pa.types.is_floating(kind))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+    converter = {"int": int, "float": float, "str": str}[new_type]
+    converted = []
+    for value in values.to_pylist():
+        if value is None:
+            converted.append(None)
+            continue
+        try:
+            converted.append(converter(value))
+        except ValueError:
+            logger.warning(f"Could not convert value '{value}' in column '{column}' to type '{new_type}'.")
+            converted.append(None)
+    return pa.array(converted, type=target)
+
+
+def _create_feature(columns: Dict[str, Any], num_rows: int, new_column: str, expression: str) -> Any:
+    try:
+        code = compile(expression, "<feature>", "eval")
+        if "record" not in code.co_names:
+            # A constant: evaluate once and repeat it.
+            return pa.array([eval(code, {"__builtins__": {}}, {})] * num_rows)
+        result = eval(code, {"__builtins__": {}}, {"record": _ColumnAccessor(columns, num_rows)})
+        # Only a column-shaped result is a vectorized answer; anything else (e.g. record['name'][0],
+        # which indexes the column instead of each value) is evaluated per record below.
+        if isinstance(result, pd.Series) and len(result) == num_rows:
+            return pa.Array.from_pandas(result)
+    except Exception:
+        pass  # Not vectorizable (e.g. conditionals on values); fall back to one evaluation per record.
+    names = list(columns)
+    rows = pa.table({name: columns[name] for name in names}).to_pylist() if names else [{}] * num_rows
+    results = []
+    for record in rows:
+        try:
+            results.append(eval(expression, {"__builtins__": {}}, {"record": record}))
+        except Exception as e:
+            logger.warning(f"Could not create feature '{new_column}' with expression '{expression}' for record {record}. Error: {e}")
+            results.append(None)
+    try:
+        return pa.array(results)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if value is None else str(value) for value in results], type=pa.string())
+
+
+class _Distinct:
+    kind = "Distinct"
+
+    def __init__(self, subset: Optional[List[str]]):
+        self.subset = subset
+
+    def describe(self) -> str:
+        return f"Distinct({', '.join(self.subset) if self.subset else '*'})"
+
+    def run(self, table: "pa.Table") -> "pa.Table":
+        keys = [name for name in (self.subset or table.column_names) if name in table.column_names]
+        if not keys or table.num_rows == 0:
+            return table
+        # Keep the first occurrence of each key, in input order (like drop_duplicates).
+        with_ids = table.select(keys).append_column(_ROW_ID, pa.array(range(table.num_rows), type=pa.int64()))
+        first = with_ids.group_by(keys, use_threads=False).aggregate([(_ROW_ID, "min")]).column(f"{_ROW_ID}_min")
+        return table.take(first.take(pc.sort_indices(first)))
+
+
+class _HashJoin:
+    kind = "HashJoin"
+
+    def __init__(self, right: "pa.Table", on_key: str, how: str):
+        self.right = right
+        self.on_key = on_key
+        self.how = how
+
+    def describe(self) -> str:
+        return f"HashJoin({self.how} on {self.on_key}, right={self.right.num_rows} rows)"
+
+    def run(self, table: "pa.Table") -> "pa.Table":
+        left = table.append_column(f"{_ROW_ID}_l", pa.array(range(table.num_rows), type=pa.int64()))
+        right = self.right.append_column(f"{_ROW_ID}_r", pa.array(range(self.right.num_rows), type=pa.int64()))
+        joined = left.join(right, keys=self.on_key, join_type=_JOIN_TYPES[self.how], left_suffix="_x", right_suffix="_y",
+                           use_threads=True)
+        # Arrow's hash join does not preserve order; restore pandas.merge's ordering.
+        if self.how == "outer":
+            order = [(self.on_key, "ascending"), (f"{_ROW_ID}_l", "ascending"), (f"{_ROW_ID}_r", "ascending")]
+        elif self.how == "right":
+            order = [(f"{_ROW_ID}_r", "ascending"), (f"{_ROW_ID}_l", "ascending")]
+        else:
+            order = [(f"{_ROW_ID}_l", "ascending"), (f"{_ROW_ID}_r", "ascending")]
+        joined = joined.sort_by(order).drop_columns([f"{_ROW_ID}_l", f"{_ROW_ID}_r"])
+        # Key column where pandas puts it: among the left columns, not appended after them.
+        names = joined.column_names
+        left_names = [name if name == self.on_key or name in names else f"{name}_x" for name in table.column_names]
+        return joined.select(left_names + [name for name in names if name not in left_names])
+
+
+class _Pivot:
+    kind = "Pivot"
+
+    def __init__(self, index: str, columns: str, values: str, aggfunc: str):
+        self.index, self.columns, self.values, self.aggfunc = index, columns, values, aggfunc
+
+    def describe(self) -> str:
+        return f"Pivot(index={self.index}, columns={self.columns}, {self.aggfunc}({self.values}))"
+
+    def run(self, table: "pa.Table") -> "pa.Table":
+        for name in (self.index, self.columns, self.values):
+            if name not in table.column_names:
+                raise KeyError(name)
+        keys = [self.index, self.columns]
+        grouped = table.select(keys + [self.values]).filter(
+            pc.and_(pc.is_valid(table.column(self.index)), pc.is_valid(table.column(self.columns))))
+        aggregated = grouped.group_by(keys, use_threads=False).aggregate([(self.values, self.aggfunc)])
+        result_column = f"{self.values}_{self.aggfunc}"
+        index_values = pc.unique(aggregated.column(self.index))
+        index_values = index_values.take(pc.sort_indices(index_values))
+        column_values = pc.unique(aggregated.column(self.columns))
+        column_values = column_values.take(pc.sort_indices(column_values))
+        row_positions = pc.index_in(aggregated.column(self.index), value_set=index_values).to_numpy(zero_copy_only=False)
+        col_positions = pc.index_in(aggregated.column(self.columns), value_set=column_values).to_numpy(zero_copy_only=False)
+        results = aggregated.column(result_column).to_pylist()
+        grid: List[List[Any]] = [[None] * len(index_values) for _ in range(len(column_values))]
+        for row, col, value in zip(row_positions, col_positions, results):
+            grid[col][row] = value
+        output = {self.index: index_values}
+        for position, name in enumerate(column_values.to_pylist()):
+            if any(value is not None for value in grid[position]):  # pivot_table drops all-missing columns
+                output[str(name)] = pa.array(grid[position])
+        return pa.table(output)
+
+
+def _as_table(data: Any) -> "pa.Table":
+    if isinstance(data, pa.Table):
+        return data
+    if PANDAS_AVAILABLE and isinstance(data, pd.DataFrame):
+        return pa.Table.from_pandas(data, preserve_index=False)
+    if isinstance(data, list) and all(isinstance(item, dict) for item in data):
+        try:
+            return pa.Table.from_pylist(data)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(f"Input records cannot be represented as typed columns (mixed value types?): {e}")
+    raise ValueError("Input data must be a list of dictionaries.")
+
+
+class WranglingPipeline:
+    """
+    A lazy chain of clean/transform/merge/pivot steps over Arrow tables.
+
+    Steps are only recorded until the pipeline is run. The plan fuses adjacent
+    row-wise steps into one projection; de-duplication, joins and pivots are the
+    only blocking operators. Results are converted to Python records once, at the
+    end, or batch by batch with ``iter_batches`` (fully streaming when the source
+    is a .csv/.parquet file and the plan has no blocking operator).
+    """
+
+    def __init__(self, data: Any):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("The pipeline API requires 'pyarrow'. Please install it with 'pip install pyarrow'.")
+        self._source = data
+        self._steps: List[Tuple[str, Dict[str, Any]]] = []
+
+    def clean(self, cleaning_rules: List[Dict[str, Any]]) -> "WranglingPipeline":
+        self._steps.append(("clean_data", {"cleaning_rules": cleaning_rules}))
+        return self
+
+    def transform(self, transformations: List[Dict[str, Any]]) -> "WranglingPipeline":
+        self._steps.append(("transform_data", {"transformations": transformations}))
+        return self
+
+    def merge(self, data2: Any, on_key: str, how: str = "inner") -> "WranglingPipeline":
+        if not on_key: raise ValueError("Merge requires an 'on_key'.")
+        if how not in _JOIN_TYPES: raise ValueError(f"Unsupported merge type '{how}'.")
+        self._steps.append(("merge_data", {"data2": data2, "on_key": on_key, "how": how}))
+        return self
+
+    def pivot(self, index: str, columns: str, values: str, aggfunc: str = "sum") -> "WranglingPipeline":
+        if not all([index, columns, values]): raise ValueError("Pivot requires 'index', 'columns', and 'values'.")
+        if aggfunc not in ['sum', 'mean', 'count']: raise ValueError(f"Unsupported aggregation function '{aggfunc}'.")
+        self._steps.append(("pivot_data", {"index": index, "columns": columns, "values": values, "aggfunc": aggfunc}))
+        return self
+
+    def add_step(self, step: Dict[str, Any]) -> "WranglingPipeline":
+        """Adds a step given in the tool's JSON form: {"operation": ..., <operation parameters>}."""
+        operation = step.get("operation")
+        if operation == "clean_data":
+            return self.clean(step.get("cleaning_rules", []))
+        if operation == "transform_data":
+            return self.transform(step.get("transformations", []))
+        if operation == "merge_data":
+            return self.merge(step.get("data2"), step.get("on_key"), step.get("how", "inner"))
+        if operation == "pivot_data":
+            return self.pivot(step.get("index"), step.get("columns"), step.get("values"), step.get("aggfunc", "sum"))
+        raise ValueError(f"Invalid pipeline operation: {operation}")
+
+    # -- planning ---------------------------------------------------------------
+
+    def _plan(self) -> List[Any]:
+        operators: List[Any] = []
+
+        def project() -> _Project:
+            if not operators or not isinstance(operators[-1], _Project):
+                operators.append(_Project())
+            return operators[-1]
+
+        for operation, params in self._steps:
+            if operation == "clean_data":
+                for rule in params["cleaning_rules"]:
+                    rule_type = rule.get("type")
+                    if rule_type in ("fill_missing", "standardize_case"):
+                        if not rule.get("column"):
+                            raise ValueError(f"{'Fill missing' if rule_type == 'fill_missing' else 'Standardize case'} rule requires 'column'.")
+                        project().steps.append(rule)
+                    elif rule_type == "remove_duplicates":
+                        operators.append(_Distinct(rule.get("subset")))
+                    else:
+                        logger.warning(f"Unsupported cleaning rule type: '{rule_type}'. Skipping.")
+            elif operation == "transform_data":
+                for transform in params["transformations"]:
+                    transform_type = transform.get("type")
+                    if transform_type == "rename_column":
+                        if not transform.get("old_name") or not transform.get("new_name"): raise ValueError("Rename column requires 'old_name' and 'new_name'.")
+                    elif transform_type == "change_type":
+                        if not transform.get("column") or not transform.get("new_type"): raise ValueError("Change type requires 'column' and 'new_type'.")
+                    elif transform_type == "create_feature":
+                        if not transform.get("new_column") or not transform.get("expression"): raise ValueError("Create feature requires 'new_column' and 'expression'.")
+                    else:
+                        logger.warning(f"Unsupported transformation type: '{transform_type}'. Skipping.")
+                        continue
+                    project().steps.append(transform)
+            elif operation == "merge_data":
+                operators.append(_HashJoin(_as_table(params["data2"]), params["on_key"], params["how"]))
+            elif operation == "pivot_data":
+                operators.append(_Pivot(params["index"], params["columns"], params["values"], params["aggfunc"]))
+        return operators
+
+    def _scan(self) -> Tuple[str, Any]:
+        source = self._source
+        if isinstance(source, str):
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"Data file not found: {source}")
+            file_format = "parquet" if source.lower().endswith(".parquet") else "csv"
+            return f"Scan({file_format}: {os.path.basename(source)})", ds.dataset(source, format=file_format)
+        table = _as_table(source)
+        return f"Scan({table.num_rows} rows)", table
+
+    def explain(self) -> List[str]:
+        """The physical plan, one operator per line."""
+        description, _ = self._scan()
+        return [description] + [operator.describe() for operator in self._plan()]
+
+    # -- execution --------------------------------------------------------------
+
+    def _source_batches(self, source: Any, batch_size: int) -> Iterator["pa.RecordBatch"]:
+        if isinstance(source, pa.Table):
+            yield from source.to_batches(max_chunksize=batch_size)
+        else:
+            yield from source.to_batches(batch_size=batch_size)
+
+    def collect(self) -> "pa.Table":
+        """Runs the whole plan once and returns the result as an Arrow table."""
+        _, source = self._scan()
+        table = source if isinstance(source, pa.Table) else source.to_table()
+        for operator in self._plan():
+            table = operator.run(table)
+        return table
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        return self.collect().to_pylist()
+
+    def iter_batches(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yields the result as lists of at most ``batch_size`` records. Everything up to
+        the last blocking operator is materialized; the trailing projection is
+        applied batch by batch.
+        """
+        _, source = self._scan()
+        operators = self._plan()
+        blocking = [i for i, operator in enumerate(operators) if not isinstance(operator, _Project)]
+        tail_start = blocking[-1] + 1 if blocking else 0
+        if blocking:
+            table = source if isinstance(source, pa.Table) else source.to_table()
+            for operator in operators[:tail_start]:
+                table = operator.run(table)
+            source = table
+        tail = operators[tail_start:]
+        for batch in self._source_batches(source, batch_size):
+            table = pa.Table.from_batches([batch])
+            for operator in tail:
+                table = operator.run(table)
+            yield table.to_pylist()
+
+
 class DataWranglingTool(BaseTool):
     """
     A tool for performing various data wrangling operations such as cleaning,
@@ -35,9 +447,18 @@ class DataWranglingTool(BaseTool):
                 "operation": {
                     "type": "string",
                     "description": "The wrangling operation to perform.",
-                    "enum": ["clean_data", "transform_data", "merge_data", "pivot_data"]
+                    "enum": ["clean_data", "transform_data", "merge_data", "pivot_data",
+                             "run_pipeline", "stream_pipeline", "explain_pipeline"]
                 },
-                "data": {"type": "array", "items": {"type": "object"}},
+                "data": {
+                    "type": ["array", "string"], "items": {"type": "object"},
+                    "description": "Records, or (pipeline operations only) a path to a .csv or .parquet file."
+                },
+                "steps": {
+                    "type": "array", "items": {"type": "object"},
+                    "description": "Pipeline steps: {'operation': 'clean_data'|'transform_data'|'merge_data'|'pivot_data', ...same parameters as the single operation}."
+                },
+                "batch_size": {"type": "integer", "description": "Records per batch for 'stream_pipeline'.", "default": DEFAULT_BATCH_SIZE},
                 "cleaning_rules": {"type": "array", "items": {"type": "object"}},
                 "transformations": {"type": "array", "items": {"type": "object"}},
                 "data2": {"type": "array", "items": {"type": "object"}},
@@ -160,8 +581,45 @@ class DataWranglingTool(BaseTool):
             logger.warning("Pandas not available. Pivot operation is not fully supported without pandas.")
             return data
 
+    def pipeline(self, data: Any) -> WranglingPipeline:
+        """Starts a lazy pipeline over records, a DataFrame, an Arrow table or a .csv/.parquet path."""
+        return WranglingPipeline(data)
+
+    def _build_pipeline(self, data: Any, steps: List[Dict[str, Any]]) -> WranglingPipeline:
+        wrangling_pipeline = self.pipeline(data)
+        for step in steps:
+            wrangling_pipeline.add_step(step)
+        return wrangling_pipeline
+
+    def _run_steps_eagerly(self, data: List[Dict[str, Any]], steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for step in steps:
+            params = {key: value for key, value in step.items() if key != "operation"}
+            data = self.execute(step.get("operation"), data, **params)
+        return data
+
+    def _run_pipeline(self, data: Any, steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not PYARROW_AVAILABLE:
+            logger.warning("pyarrow not available. Running pipeline steps one by one.")
+            return self._run_steps_eagerly(data, steps)
+        return self._build_pipeline(data, steps).to_records()
+
+    def _stream_pipeline(self, data: Any, steps: List[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        if not PYARROW_AVAILABLE:
+            logger.warning("pyarrow not available. Running pipeline steps one by one.")
+            records = self._run_steps_eagerly(data, steps)
+            for start in range(0, len(records), batch_size):
+                yield records[start:start + batch_size]
+            return
+        yield from self._build_pipeline(data, steps).iter_batches(batch_size)
+
     def execute(self, operation: str, data: List[Dict[str, Any]], **kwargs: Any) -> List[Dict[str, Any]]:
-        if operation == "clean_data":
+        if operation == "run_pipeline":
+            return self._run_pipeline(data, kwargs.get("steps", []))
+        elif operation == "stream_pipeline":
+            return self._stream_pipeline(data, kwargs.get("steps", []), kwargs.get("batch_size", DEFAULT_BATCH_SIZE))
+        elif operation == "explain_pipeline":
+            return self._build_pipeline(data, kwargs.get("steps", [])).explain()
+        elif operation == "clean_data":
             return self._clean_data(data, kwargs.get("cleaning_rules", []))
         elif operation == "transform_data":
             return self._transform_data(data, kwargs.get("transformations", []))
@@ -194,5 +652,39 @@ if __name__ == '__main__':
         transformed_data = tool.execute(operation="transform_data", data=cleaned_data, transformations=transformations)
         print(json.dumps(transformed_data, indent=2))
 
+        if PYARROW_AVAILABLE:
+            print("\n--- Lazy Pipeline (clean -> transform -> merge, executed once) ---")
+            steps = [
+                {"operation": "clean_data", "cleaning_rules": cleaning_rules + [{"type": "standardize_case", "column": "status", "case": "upper"}]},
+                {"operation": "transform_data", "transformations": transformations + [{"type": "create_feature", "new_column": "age_next_year", "expression": "record['age'] + 1"}]},
+                {"operation": "merge_data", "data2": [{"id": 1, "team": "red"}, {"id": 2, "team": "blue"}], "on_key": "id", "how": "left"},
+            ]
+            print("\n".join(tool.execute(operation="explain_pipeline", data=sample_data, steps=steps)))
+            print(json.dumps(tool.execute(operation="run_pipeline", data=sample_data, steps=steps), indent=2))
+
+            print("\n--- Benchmark: chained single operations vs. one pipeline ---")
+            import time
+            rng = random.Random(0)
+            n_rows = 200_000
+            big_data = [{"id": i, "name": rng.choice(["alice", "bob", " ", None]), "amount": rng.random() * 100,
+                         "category": rng.choice("abcdef"), "qty": str(rng.randint(1, 9))} for i in range(n_rows)]
+            lookup = [{"category": c, "weight": w} for w, c in enumerate("abcdef", start=1)]
+            bench_steps = [
+                {"operation": "clean_data", "cleaning_rules": [{"type": "fill_missing", "column": "name", "value": "unknown"},
+                                                               {"type": "standardize_case", "column": "name", "case": "title"}]},
+                {"operation": "transform_data", "transformations": [{"type": "change_type", "column": "qty", "new_type": "int"},
+                                                                    {"type": "create_feature", "new_column": "total", "expression": "record['amount'] * record['qty']"}]},
+                {"operation": "merge_data", "data2": lookup, "on_key": "category", "how": "left"},
+                {"operation": "pivot_data", "index": "name", "columns": "category", "values": "total", "aggfunc": "sum"},
+            ]
+            start = time.perf_counter()
+            eager_result = tool._run_steps_eagerly(big_data, bench_steps)
+            eager_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            pipeline_result = tool.execute(operation="run_pipeline", data=big_data, steps=bench_steps)
+            pipeline_seconds = time.perf_counter() - start
+            print(f"{n_rows} rows: chained {eager_seconds:.2f}s, pipeline {pipeline_seconds:.2f}s "
+                  f"({eager_seconds / pipeline_seconds:.1f}x), {len(pipeline_result)} output rows (chained: {len(eager_result)})")
+
     except Exception as e:
         print(f"An error occurred: {e}")
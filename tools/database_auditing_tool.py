@@ -13,6 +13,7 @@ class DatabaseAuditingTool(BaseTool):
     A tool for defining database audit rules and simulating audits against
     database configurations.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "database_auditing_tool"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DatabaseBackupRecoveryTool(BaseTool):
     """
     A tool for simulating database backup and recovery operations.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "database_backup_recovery"):
         super().__init__(tool_name)
@@ -11,6 +11,7 @@ class DatabaseMigrationTool(BaseTool):
     """
     A tool for simulating database migration processes.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "database_migration_tool"):
         super().__init__(tool_name)
@@ -13,6 +13,7 @@ class DatabaseMonitoringTool(BaseTool):
     A tool for simulating database monitoring actions, including recording and
     retrieving metrics, listing active/slow queries, and checking database health.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "database_monitoring_tool"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DatabaseQueryTool(BaseTool):
     """
     A tool for simulating database query operations.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "database_query_tool"):
         super().__init__(tool_name)
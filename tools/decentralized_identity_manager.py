@@ -11,6 +11,7 @@ class DecentralizedIdentityManagerTool(BaseTool):
     """
     A tool for simulating a decentralized identity (DID) system.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "decentralized_identity_manager"):
         super().__init__(tool_name)
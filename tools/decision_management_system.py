@@ -14,6 +14,7 @@ class DecisionManagementSystemTool(BaseTool):
     A tool for simulating a decision management system, allowing for the definition
     and execution of decision models, and logging of decision outcomes.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "decision_management_system"):
         super().__init__(tool_name=tool_name)
@@ -13,6 +13,7 @@ class DeepLearningFrameworkIntegratorTool(BaseTool):
     A tool for simulating deep learning framework integration actions, including
     creating, training, performing inference with, loading, saving, and fine-tuning models.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "deep_learning_framework_integrator"):
         super().__init__(tool_name)
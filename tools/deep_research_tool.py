@@ -11,6 +11,7 @@ class DeepResearchTool(BaseTool):
     """
     A tool for simulating multi-step, complex research tasks.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "deep_research_tool"):
         super().__init__(tool_name)
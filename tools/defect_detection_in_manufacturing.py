@@ -12,6 +12,7 @@ class DefectDetectionInManufacturingTool(BaseTool):
     """
     A tool for simulating defect detection in manufacturing.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "defect_detection_in_manufacturing"):
         super().__init__(tool_name)
@@ -11,6 +11,7 @@ class DefectTrackingSystemTool(BaseTool):
     """
     A tool for simulating a defect tracking system.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "defect_tracking_system"):
         super().__init__(tool_name)
@@ -13,6 +13,7 @@ class DependencyVulnerabilityScannerTool(BaseTool):
     A tool for scanning project dependencies for known vulnerabilities using
     various package managers (pip, npm, cargo).
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "dependency_vulnerability_scanner"):
         super().__init__(tool_name)
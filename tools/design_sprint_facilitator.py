@@ -11,6 +11,7 @@ class DesignSprintFacilitatorTool(BaseTool):
     """
     A tool for simulating the facilitation of design sprints.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "design_sprint_facilitator"):
         super().__init__(tool_name)
@@ -11,6 +11,7 @@ class DevEnvironmentProvisionerTool(BaseTool):
     """
     A tool for simulating the provisioning and management of development environments.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "dev_environment_provisioner"):
         super().__init__(tool_name)
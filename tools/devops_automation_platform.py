@@ -12,6 +12,7 @@ class DevOpsAutomationPlatformTool(BaseTool):
     """
     A tool for simulating a DevOps automation platform.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "devops_automation_platform"):
         super().__init__(tool_name)
@@ -13,6 +13,7 @@ class DialogueStateTrackerTool(BaseTool):
     A tool for simulating dialogue state tracking, maintaining context and
     understanding user intent across multi-turn conversations.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "dialogue_state_tracker"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DigitalAssetManagementSystemTool(BaseTool):
     """
     A tool for simulating a Digital Asset Management (DAM) system.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "digital_asset_management_system"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DigitalMarketingOptimizerTool(BaseTool):
     """
     A tool for simulating digital marketing optimization actions.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "digital_marketing_optimizer"):
         super().__init__(tool_name)
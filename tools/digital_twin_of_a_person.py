@@ -12,6 +12,7 @@ class DigitalTwinOfAPersonTool(BaseTool):
     """
     A tool for simulating a digital twin of a person, modeling health choices and their impacts.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "digital_twin_of_a_person"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DigitalTwinSimulatorTool(BaseTool):
     """
     A tool for simulating the creation and operation of digital twins for physical assets.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "digital_twin_simulator"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DisasterRecoveryOrchestratorTool(BaseTool):
     """
     A tool for simulating disaster recovery (DR) orchestration.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "disaster_recovery_orchestrator"):
         super().__init__(tool_name)
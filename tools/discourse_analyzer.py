@@ -13,6 +13,7 @@ class DiscourseAnalyzerTool(BaseTool):
     A tool for simulating discourse analysis, understanding the structure and
     coherence of texts or conversations.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "discourse_analyzer"):
         super().__init__(tool_name)
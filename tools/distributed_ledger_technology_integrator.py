@@ -12,6 +12,7 @@ class DistributedLedgerTechnologyIntegratorTool(BaseTool):
     """
     A tool for simulating Distributed Ledger Technology (DLT) integration actions.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "distributed_ledger_technology_integrator"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DocumentManagementSystemTool(BaseTool):
     """
     A tool for simulating a Document Management System (DMS).
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "document_management_system"):
         super().__init__(tool_name)
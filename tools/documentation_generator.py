@@ -12,6 +12,7 @@ class DocumentationGeneratorTool(BaseTool):
     """
     A tool for simulating documentation generation for projects.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "documentation_generator"):
         super().__init__(tool_name)
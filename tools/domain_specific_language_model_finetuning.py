@@ -13,6 +13,7 @@ class DomainSpecificLanguageModelFinetuningTool(BaseTool):
     A tool for simulating the fine-tuning and evaluation of language models
     on domain-specific datasets.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "domain_specific_language_model_finetuning"):
         super().__init__(tool_name)
@@ -11,6 +11,7 @@ class DonorRelationshipManagerTool(BaseTool):
     """
     A tool for simulating donor relationship management.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "donor_relationship_manager"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DreamJournalAndAnalyzerTool(BaseTool):
     """
     A tool for journaling dreams and analyzing them for recurring themes and patterns.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "dream_journal_and_analyzer"):
         super().__init__(tool_name)
@@ -12,6 +12,7 @@ class DrugDiscoveryAndMolecularDesignTool(BaseTool):
     """
     A tool for simulating drug discovery and molecular design processes.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "drug_discovery_and_molecular_design"):
         super().__init__(tool_name)
@@ -1,13 +1,697 @@
 import logging
-from typing import Dict, Any, List
+import os
+import re
+import hmac
+import math
+import heapq
+import pickle  # nosec B403 - checkpoints are HMAC-signed and verified before they are unpickled
+import asyncio
+import hashlib
+import itertools
+import threading
+from typing import Dict, Any, List, Tuple, Callable, Optional, Iterable, Union
 from .base_tool import BaseTool
 
 logger = logging.getLogger(__name__)
 
+# Tool checkpoints live under this root, one directory per job name. Checkpoints are signed with
+# STREAM_CHECKPOINT_KEY or, if unset, a random key kept (owner-only) in the root, and a file
+# whose signature does not verify is never unpickled.
+STREAM_CHECKPOINT_DIR = os.getenv("STREAM_CHECKPOINT_DIR", os.path.join(os.path.expanduser("~"), ".cache", "mic", "stream_checkpoints"))
+_JOB_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,127}")
+_checkpoint_keys: Dict[str, bytes] = {}
+_checkpoint_key_lock = threading.Lock()
+
+def checkpoint_dir_for(job_name: str) -> str:
+    """The checkpoint directory of a named job under STREAM_CHECKPOINT_DIR."""
+    if not isinstance(job_name, str) or not _JOB_NAME.fullmatch(job_name):
+        raise ValueError(f"Invalid checkpoint job name '{job_name}'.")
+    return os.path.join(STREAM_CHECKPOINT_DIR, job_name)
+
+def _checkpoint_key() -> bytes:
+    configured = os.getenv("STREAM_CHECKPOINT_KEY")
+    if configured:
+        return configured.encode("utf-8")
+    path = os.path.join(STREAM_CHECKPOINT_DIR, ".key")
+    with _checkpoint_key_lock:
+        if path not in _checkpoint_keys:
+            os.makedirs(STREAM_CHECKPOINT_DIR, exist_ok=True)
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                pass
+            else:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(os.urandom(32))
+            with open(path, "rb") as f:
+                _checkpoint_keys[path] = f.read()
+        return _checkpoint_keys[path]
+
+# --- Stream elements ---
+
+class Record:
+    """A data element with its event time and (after key_by) its key."""
+    __slots__ = ("value", "timestamp", "key")
+
+    def __init__(self, value: Any, timestamp: float, key: Any = None):
+        self.value = value
+        self.timestamp = timestamp
+        self.key = key
+
+class Watermark:
+    """Asserts that no more records with an event time <= `timestamp` will arrive."""
+    __slots__ = ("timestamp",)
+
+    def __init__(self, timestamp: float):
+        self.timestamp = timestamp
+
+class Barrier:
+    """A checkpoint barrier; operators snapshot their state as it passes."""
+    __slots__ = ("checkpoint_id",)
+
+    def __init__(self, checkpoint_id: int):
+        self.checkpoint_id = checkpoint_id
+
+class _EndOfStream:
+    pass
+
+END_OF_STREAM = _EndOfStream()
+
+# --- Window assigners ---
+
+class TumblingWindow:
+    """Fixed-size, non-overlapping event-time windows."""
+
+    def __init__(self, size: float):
+        self.size = size
+
+    def assign(self, timestamp: float) -> List[Tuple[float, float]]:
+        start = timestamp - (timestamp % self.size)
+        return [(start, start + self.size)]
+
+class SlidingWindow:
+    """Fixed-size windows that start every `slide` units, so one record can fall into several windows."""
+
+    def __init__(self, size: float, slide: float):
+        if slide <= 0 or slide > size:
+            raise ValueError("Sliding window 'slide' must be positive and no larger than 'size'.")
+        self.size = size
+        self.slide = slide
+
+    def assign(self, timestamp: float) -> List[Tuple[float, float]]:
+        last_start = timestamp - (timestamp % self.slide)
+        windows = []
+        start = last_start
+        while start > timestamp - self.size:
+            windows.append((start, start + self.size))
+            start -= self.slide
+        return windows
+
+class SessionWindow:
+    """Per-key windows that close after `gap` units of inactivity; overlapping sessions are merged."""
+
+    def __init__(self, gap: float):
+        self.gap = gap
+
+# --- Aggregations ---
+
+class AggregateFunction:
+    """Incremental aggregation: accumulators are created per window, updated per record and merged for sessions."""
+
+    def create_accumulator(self) -> Any:
+        raise NotImplementedError
+
+    def add(self, accumulator: Any, value: Any) -> Any:
+        raise NotImplementedError
+
+    def merge(self, a: Any, b: Any) -> Any:
+        raise NotImplementedError
+
+    def get_result(self, accumulator: Any) -> Any:
+        return accumulator
+
+class _FieldAggregate(AggregateFunction):
+    def __init__(self, field: Optional[str] = None):
+        self.field = field
+
+    def _get(self, value: Any) -> Any:
+        return value if self.field is None else value[self.field]
+
+class CountAggregate(AggregateFunction):
+    def create_accumulator(self): return 0
+    def add(self, accumulator, value): return accumulator + 1
+    def merge(self, a, b): return a + b
+
+class SumAggregate(_FieldAggregate):
+    def create_accumulator(self): return 0
+    def add(self, accumulator, value): return accumulator + self._get(value)
+    def merge(self, a, b): return a + b
+
+class MinAggregate(_FieldAggregate):
+    def create_accumulator(self): return None
+    def add(self, accumulator, value):
+        v = self._get(value)
+        return v if accumulator is None or v < accumulator else accumulator
+    def merge(self, a, b): return b if a is None else a if b is None else min(a, b)
+
+class MaxAggregate(_FieldAggregate):
+    def create_accumulator(self): return None
+    def add(self, accumulator, value):
+        v = self._get(value)
+        return v if accumulator is None or v > accumulator else accumulator
+    def merge(self, a, b): return b if a is None else a if b is None else max(a, b)
+
+class AvgAggregate(_FieldAggregate):
+    def create_accumulator(self): return (0, 0)
+    def add(self, accumulator, value): return (accumulator[0] + self._get(value), accumulator[1] + 1)
+    def merge(self, a, b): return (a[0] + b[0], a[1] + b[1])
+    def get_result(self, accumulator): return accumulator[0] / accumulator[1] if accumulator[1] else None
+
+_AGGREGATES = {"count": CountAggregate, "sum": SumAggregate, "min": MinAggregate, "max": MaxAggregate, "avg": AvgAggregate}
+
+def make_aggregate(spec: Union[str, Dict[str, Any], AggregateFunction]) -> AggregateFunction:
+    """Builds an aggregate from "count", {"type": "sum", "field": "bytes"} or an AggregateFunction instance."""
+    if isinstance(spec, AggregateFunction):
+        return spec
+    if isinstance(spec, str):
+        spec = {"type": spec}
+    kind = spec.get("type")
+    if kind not in _AGGREGATES:
+        raise ValueError(f"Unsupported aggregation: {kind}")
+    return _AGGREGATES[kind]() if kind == "count" else _AGGREGATES[kind](spec.get("field"))
+
+# --- Operators ---
+
+class Operator:
+    """
+    A pipeline stage. It consumes batches of stream elements from a bounded asyncio queue and puts its
+    output batches on the queues of its downstream operators, so a slow consumer blocks its producers.
+    """
+
+    def __init__(self, env: "StreamEnvironment", name: str):
+        self.env = env
+        self.name = name
+        self.inputs: List[asyncio.Queue] = []
+        self.outputs: List[asyncio.Queue] = []
+
+    def process(self, record: Record) -> Iterable[Record]:
+        return (record,)
+
+    def on_watermark(self, timestamp: float) -> Iterable[Record]:
+        return ()
+
+    def snapshot(self) -> Any:
+        return None
+
+    def restore(self, state: Any):
+        pass
+
+    async def emit(self, batch: List[Any]):
+        for queue in self.outputs:
+            await queue.put(batch)
+
+    async def run(self):
+        queue = self.inputs[0]
+        while True:
+            batch = await queue.get()
+            out: List[Any] = []
+            for element in batch:
+                if type(element) is Record:
+                    out.extend(self.process(element))
+                elif type(element) is Watermark:
+                    out.extend(self.on_watermark(element.timestamp))
+                    out.append(element)
+                elif type(element) is Barrier:
+                    self.env._snapshot(self.name, element.checkpoint_id, self.snapshot())
+                    out.append(element)
+                else:
+                    out.extend(self.on_watermark(math.inf))
+                    out.append(END_OF_STREAM)
+                    await self.emit(out)
+                    return
+            if out:
+                await self.emit(out)
+
+class MapOperator(Operator):
+    def __init__(self, env, name, fn: Callable[[Any], Any]):
+        super().__init__(env, name)
+        self.fn = fn
+
+    def process(self, record):
+        return (Record(self.fn(record.value), record.timestamp, record.key),)
+
+class FilterOperator(Operator):
+    def __init__(self, env, name, predicate: Callable[[Any], bool]):
+        super().__init__(env, name)
+        self.predicate = predicate
+
+    def process(self, record):
+        return (record,) if self.predicate(record.value) else ()
+
+class KeyByOperator(Operator):
+    def __init__(self, env, name, key: Union[str, Callable[[Any], Any]]):
+        super().__init__(env, name)
+        self.key_fn = key if callable(key) else (lambda value, field=key: value[field])
+
+    def process(self, record):
+        return (Record(record.value, record.timestamp, self.key_fn(record.value)),)
+
+class WindowAggregateOperator(Operator):
+    """
+    Keyed event-time window aggregation. Windows fire when the watermark passes their end; records for
+    windows that have already fired are dropped and counted as late. State is per (key, window).
+    """
+
+    def __init__(self, env, name, assigner, aggregate: AggregateFunction):
+        super().__init__(env, name)
+        self.assigner = assigner
+        self.aggregate = aggregate
+        self.windows: Dict[Tuple[Any, float, float], Any] = {}
+        self.sessions: Dict[Any, List[List[Any]]] = {}
+        self.timers: List[Tuple[float, int, Any, float]] = []
+        self._timer_seq = itertools.count()
+        self.watermark = -math.inf
+        self.late_records = 0
+
+    def _result(self, key, start, end, accumulator) -> Record:
+        value = {"key": key, "window_start": start, "window_end": end, "result": self.aggregate.get_result(accumulator)}
+        return Record(value, end, key)
+
+    def process(self, record):
+        if isinstance(self.assigner, SessionWindow):
+            return self._process_session(record)
+        for start, end in self.assigner.assign(record.timestamp):
+            if end <= self.watermark:
+                self.late_records += 1
+                continue
+            window = (record.key, start, end)
+            accumulator = self.windows.get(window)
+            if accumulator is None:
+                accumulator = self.aggregate.create_accumulator()
+                heapq.heappush(self.timers, (end, next(self._timer_seq), record.key, start))
+            self.windows[window] = self.aggregate.add(accumulator, record.value)
+        return ()
+
+    def _process_session(self, record):
+        start, end = record.timestamp, record.timestamp + self.assigner.gap
+        if end <= self.watermark:
+            self.late_records += 1
+            return ()
+        accumulator = self.aggregate.add(self.aggregate.create_accumulator(), record.value)
+        kept = []
+        for session in self.sessions.get(record.key, []):
+            if session[0] < end and start < session[1]:
+                start, end = min(start, session[0]), max(end, session[1])
+                accumulator = self.aggregate.merge(session[2], accumulator)
+            else:
+                kept.append(session)
+        kept.append([start, end, accumulator])
+        self.sessions[record.key] = kept
+        heapq.heappush(self.timers, (end, next(self._timer_seq), record.key, start))
+        return ()
+
+    def on_watermark(self, timestamp):
+        self.watermark = max(self.watermark, timestamp)
+        fired = []
+        while self.timers and self.timers[0][0] <= self.watermark:
+            end, _, key, start = heapq.heappop(self.timers)
+            if isinstance(self.assigner, SessionWindow):
+                # Timers for sessions that were later merged or extended are stale; skip them.
+                sessions = self.sessions.get(key, [])
+                match = next((s for s in sessions if s[0] == start and s[1] == end), None)
+                if match is None:
+                    continue
+                sessions.remove(match)
+                if not sessions:
+                    del self.sessions[key]
+                fired.append(self._result(key, start, end, match[2]))
+            else:
+                accumulator = self.windows.pop((key, start, end), None)
+                if accumulator is not None:
+                    fired.append(self._result(key, start, end, accumulator))
+        return fired
+
+    def snapshot(self):
+        return {"windows": dict(self.windows), "sessions": {k: [list(s) for s in v] for k, v in self.sessions.items()},
+                "timers": list(self.timers), "watermark": self.watermark, "late_records": self.late_records}
+
+    def restore(self, state):
+        self.windows = state["windows"]
+        self.sessions = state["sessions"]
+        self.timers = state["timers"]
+        heapq.heapify(self.timers)
+        self._timer_seq = itertools.count(max((t[1] for t in self.timers), default=0) + 1)
+        self.watermark = state["watermark"]
+        self.late_records = state["late_records"]
+
+class WindowJoinOperator(Operator):
+    """
+    Joins two keyed streams: records with the same key that fall into the same tumbling window are
+    paired when the combined watermark (the minimum of both inputs) passes the window end.
+    Checkpoint barriers are aligned across both inputs before the snapshot is taken.
+    """
+
+    def __init__(self, env, name, size: float, join_fn: Callable[[Any, Any], Any] = None):
+        super().__init__(env, name)
+        self.assigner = TumblingWindow(size)
+        self.join_fn = join_fn or (lambda left, right: {"left": left, "right": right})
+        self.buffers: Dict[Tuple[Any, float, float], Tuple[List[Any], List[Any]]] = {}
+        self.watermarks = [-math.inf, -math.inf]
+        self.late_records = 0
+
+    def _add(self, side: int, record: Record):
+        (start, end), = self.assigner.assign(record.timestamp)
+        if end <= min(self.watermarks):
+            self.late_records += 1
+            return
+        self.buffers.setdefault((record.key, start, end), ([], []))[side].append(record.value)
+
+    def _fire(self, watermark: float) -> List[Record]:
+        fired = []
+        for window in [w for w in self.buffers if w[2] <= watermark]:
+            lefts, rights = self.buffers.pop(window)
+            for left in lefts:
+                for right in rights:
+                    fired.append(Record(self.join_fn(left, right), window[2], window[0]))
+        return fired
+
+    async def run(self):
+        pending = {side: asyncio.ensure_future(self.inputs[side].get()) for side in (0, 1)}
+        barrier_sides: Dict[int, Barrier] = {}
+        ended = set()
+        while pending:
+            done, _ = await asyncio.wait(pending.values(), return_when=asyncio.FIRST_COMPLETED)
+            for side in [s for s, future in pending.items() if future in done]:
+                batch = pending.pop(side).result()
+                out: List[Any] = []
+                rearm = True
+                for element in batch:
+                    if type(element) is Record:
+                        self._add(side, element)
+                    elif type(element) is Watermark:
+                        previous = min(self.watermarks)
+                        self.watermarks[side] = max(self.watermarks[side], element.timestamp)
+                        if min(self.watermarks) > previous:
+                            out.extend(self._fire(min(self.watermarks)))
+                            out.append(Watermark(min(self.watermarks)))
+                    elif type(element) is Barrier:
+                        # Stop reading this input until the other side delivers the same barrier.
+                        barrier_sides[side] = element
+                        rearm = False
+                    else:
+                        ended.add(side)
+                        self.watermarks[side] = math.inf
+                        rearm = False
+                if out:
+                    await self.emit(out)
+                if rearm:
+                    pending[side] = asyncio.ensure_future(self.inputs[side].get())
+            if barrier_sides and all(side in barrier_sides or side in ended for side in (0, 1)):
+                barrier = next(iter(barrier_sides.values()))
+                self.env._snapshot(self.name, barrier.checkpoint_id, self.snapshot())
+                await self.emit([barrier])
+                for side in list(barrier_sides):
+                    pending[side] = asyncio.ensure_future(self.inputs[side].get())
+                barrier_sides.clear()
+            if len(ended) == 2 and not pending:
+                await self.emit(self._fire(math.inf) + [END_OF_STREAM])
+                return
+
+    def snapshot(self):
+        return {"buffers": {k: (list(v[0]), list(v[1])) for k, v in self.buffers.items()},
+                "watermarks": list(self.watermarks), "late_records": self.late_records}
+
+    def restore(self, state):
+        self.buffers = state["buffers"]
+        self.watermarks = state["watermarks"]
+        self.late_records = state["late_records"]
+
+class SinkOperator(Operator):
+    """Terminal operator: collects results (or passes them to a callback) and acknowledges checkpoints."""
+
+    def __init__(self, env, name, callback: Callable[[Any], Any] = None):
+        super().__init__(env, name)
+        self.callback = callback
+        self.results: List[Any] = []
+
+    async def run(self):
+        queue = self.inputs[0]
+        while True:
+            batch = await queue.get()
+            for element in batch:
+                if type(element) is Record:
+                    if self.callback is None:
+                        self.results.append(element.value)
+                    else:
+                        outcome = self.callback(element.value)
+                        if asyncio.iscoroutine(outcome):
+                            await outcome
+                elif type(element) is Barrier:
+                    self.env._acknowledge(self.name, element.checkpoint_id)
+                elif element is END_OF_STREAM:
+                    return
+
+class SourceOperator(Operator):
+    """
+    Reads an iterable or async iterable, assigns event times, and emits bounded-out-of-orderness
+    watermarks and periodic checkpoint barriers. Its state is the number of events consumed.
+    """
+
+    def __init__(self, env, name, events, timestamp: Union[str, Callable[[Any], float]], max_out_of_orderness: float,
+                 batch_size: int):
+        super().__init__(env, name)
+        self.events = events
+        self.timestamp_fn = timestamp if callable(timestamp) else (lambda value, field=timestamp: value[field])
+        self.max_out_of_orderness = max_out_of_orderness
+        self.batch_size = batch_size
+        self.offset = 0
+
+    def snapshot(self):
+        return self.offset
+
+    def restore(self, state):
+        self.offset = state
+
+    async def _iterate(self):
+        skip = self.offset
+        if hasattr(self.events, "__aiter__"):
+            async for event in self.events:
+                if skip:
+                    skip -= 1
+                    continue
+                yield event
+        else:
+            for event in itertools.islice(self.events, skip, None):
+                yield event
+
+    async def run(self):
+        interval = self.env.checkpoint_interval
+        max_timestamp = -math.inf
+        batch: List[Any] = []
+        async for event in self._iterate():
+            timestamp = self.timestamp_fn(event)
+            if timestamp > max_timestamp:
+                max_timestamp = timestamp
+            batch.append(Record(event, timestamp))
+            self.offset += 1
+            if len(batch) >= self.batch_size:
+                batch.append(Watermark(max_timestamp - self.max_out_of_orderness))
+                await self.emit(batch)
+                batch = []
+            if interval and self.offset % interval == 0:
+                checkpoint_id = self.env._next_checkpoint_id()
+                self.env._snapshot(self.name, checkpoint_id, self.snapshot())
+                batch.append(Barrier(checkpoint_id))
+                await self.emit(batch)
+                batch = []
+        batch.extend([Watermark(math.inf), END_OF_STREAM])
+        await self.emit(batch)
+
+# --- Fluent API ---
+
+class DataStream:
+    """A handle on an operator's output used to chain further operators."""
+
+    def __init__(self, env: "StreamEnvironment", operator: Operator, keyed: bool = False):
+        self.env = env
+        self.operator = operator
+        self.keyed = keyed
+
+    def _then(self, operator: Operator, keyed: bool = None) -> "DataStream":
+        self.env._connect(self.operator, operator)
+        return DataStream(self.env, operator, self.keyed if keyed is None else keyed)
+
+    def map(self, fn: Callable[[Any], Any], name: str = None) -> "DataStream":
+        return self._then(MapOperator(self.env, self.env._name(name, "map"), fn))
+
+    def filter(self, predicate: Callable[[Any], bool], name: str = None) -> "DataStream":
+        return self._then(FilterOperator(self.env, self.env._name(name, "filter"), predicate))
+
+    def key_by(self, key: Union[str, Callable[[Any], Any]], name: str = None) -> "DataStream":
+        return self._then(KeyByOperator(self.env, self.env._name(name, "key_by"), key), keyed=True)
+
+    def window(self, assigner) -> "WindowedStream":
+        if not self.keyed:
+            raise ValueError("window() requires a keyed stream; call key_by() first.")
+        return WindowedStream(self, assigner)
+
+    def join(self, other: "DataStream", window_size: float, join_fn: Callable[[Any, Any], Any] = None,
+             name: str = None) -> "DataStream":
+        if not (self.keyed and other.keyed):
+            raise ValueError("join() requires two keyed streams.")
+        operator = WindowJoinOperator(self.env, self.env._name(name, "join"), window_size, join_fn)
+        self.env._connect(self.operator, operator)
+        self.env._connect(other.operator, operator)
+        return DataStream(self.env, operator, keyed=True)
+
+    def sink(self, callback: Callable[[Any], Any] = None, name: str = None) -> SinkOperator:
+        operator = SinkOperator(self.env, self.env._name(name, "sink"), callback)
+        self.env._connect(self.operator, operator)
+        self.env.sinks.append(operator)
+        return operator
+
+class WindowedStream:
+    def __init__(self, stream: DataStream, assigner):
+        self.stream = stream
+        self.assigner = assigner
+
+    def aggregate(self, aggregate: Union[str, Dict[str, Any], AggregateFunction], name: str = None) -> DataStream:
+        env = self.stream.env
+        operator = WindowAggregateOperator(env, env._name(name, "window"), self.assigner, make_aggregate(aggregate))
+        return self.stream._then(operator)
+
+class StreamEnvironment:
+    """
+    Builds and runs an in-process streaming dataflow on the current event loop.
+
+    Example:
+        env = StreamEnvironment(checkpoint_dir=checkpoint_dir_for("login_failures"))
+        counts = (env.from_collection(events, timestamp="ts", max_out_of_orderness=5)
+                     .filter(lambda e: e["status"] == "failed")
+                     .key_by("user")
+                     .window(TumblingWindow(60))
+                     .aggregate("count")
+                     .sink())
+        await env.execute()
+        counts.results  # [{"key": ..., "window_start": ..., "window_end": ..., "result": ...}, ...]
+
+    With a checkpoint directory, a snapshot of every operator's state and each source's offset is
+    written atomically every `checkpoint_interval` source events, and `execute()` resumes from the
+    latest snapshot if one exists. Snapshots are signed; one that fails verification is refused.
+    """
+
+    def __init__(self, queue_size: int = 64, batch_size: int = 1024, checkpoint_dir: str = None,
+                 checkpoint_interval: int = 100_000):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_interval = checkpoint_interval if checkpoint_dir else 0
+        self.operators: List[Operator] = []
+        self.sinks: List[SinkOperator] = []
+        self._counts: Dict[str, int] = {}
+        self._checkpoint_ids = itertools.count(1)
+        self._pending_checkpoints: Dict[int, Dict[str, Any]] = {}
+        self._acks: Dict[int, set] = {}
+        self.completed_checkpoint: Optional[int] = None
+
+    def _name(self, name: Optional[str], kind: str) -> str:
+        if name:
+            return name
+        self._counts[kind] = self._counts.get(kind, 0) + 1
+        return f"{kind}_{self._counts[kind]}"
+
+    def _connect(self, upstream: Operator, downstream: Operator):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        upstream.outputs.append(queue)
+        downstream.inputs.append(queue)
+        if downstream not in self.operators:
+            self.operators.append(downstream)
+
+    def from_collection(self, events, timestamp: Union[str, Callable[[Any], float]] = "timestamp",
+                        max_out_of_orderness: float = 0, name: str = None) -> DataStream:
+        """Creates a stream from an iterable or async iterable of events."""
+        source = SourceOperator(self, self._name(name, "source"), events, timestamp, max_out_of_orderness, self.batch_size)
+        self.operators.append(source)
+        return DataStream(self, source)
+
+    # --- Checkpointing ---
+
+    def _next_checkpoint_id(self) -> int:
+        return next(self._checkpoint_ids)
+
+    def _snapshot(self, operator_name: str, checkpoint_id: int, state: Any):
+        if self.checkpoint_dir:
+            self._pending_checkpoints.setdefault(checkpoint_id, {})[operator_name] = pickle.dumps(state)
+
+    def _acknowledge(self, sink_name: str, checkpoint_id: int):
+        if not self.checkpoint_dir:
+            return
+        acks = self._acks.setdefault(checkpoint_id, set())
+        acks.add(sink_name)
+        if len(acks) == len(self.sinks):
+            states = self._pending_checkpoints.pop(checkpoint_id, {})
+            self._acks.pop(checkpoint_id, None)
+            self._write_checkpoint(checkpoint_id, states)
+
+    def _write_checkpoint(self, checkpoint_id: int, states: Dict[str, bytes]):
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        path = os.path.join(self.checkpoint_dir, "checkpoint.pkl")
+        temp_path = path + ".tmp"
+        payload = pickle.dumps({"checkpoint_id": checkpoint_id, "states": states})
+        with open(temp_path, "wb") as f:
+            f.write(hmac.new(_checkpoint_key(), payload, hashlib.sha256).digest())
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        self.completed_checkpoint = checkpoint_id
+
+    def _restore(self) -> Optional[int]:
+        path = os.path.join(self.checkpoint_dir, "checkpoint.pkl")
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            signature, payload = f.read(32), f.read()
+        if not hmac.compare_digest(signature, hmac.new(_checkpoint_key(), payload, hashlib.sha256).digest()):
+            raise ValueError(f"Checkpoint {path} is not signed with this installation's key; refusing to load it.")
+        checkpoint = pickle.loads(payload)  # nosec B301 - signature verified above
+        for operator in self.operators:
+            if operator.name in checkpoint["states"]:
+                operator.restore(pickle.loads(checkpoint["states"][operator.name]))  # nosec B301
+        self._checkpoint_ids = itertools.count(checkpoint["checkpoint_id"] + 1)
+        return checkpoint["checkpoint_id"]
+
+    def clear_checkpoint(self):
+        if self.checkpoint_dir:
+            path = os.path.join(self.checkpoint_dir, "checkpoint.pkl")
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def execute(self) -> Dict[str, List[Any]]:
+        """Runs the dataflow to completion and returns each sink's collected results by name."""
+        if not self.sinks:
+            raise ValueError("The pipeline has no sink.")
+        if self.checkpoint_dir:
+            restored = self._restore()
+            if restored is not None:
+                logger.info(f"Resuming stream pipeline from checkpoint {restored}.")
+        await asyncio.gather(*(operator.run() for operator in self.operators))
+        return {sink.name: sink.results for sink in self.sinks}
+
+def _window_assigner(spec: Dict[str, Any]):
+    kind = spec.get("type", "tumbling")
+    if kind == "tumbling":
+        return TumblingWindow(spec["size"])
+    if kind == "sliding":
+        return SlidingWindow(spec["size"], spec["slide"])
+    if kind == "session":
+        return SessionWindow(spec["gap"])
+    raise ValueError(f"Unsupported window type: {kind}")
+
 class EventStreamProcessorTool(BaseTool):
     """
-    A placeholder tool.
-    This tool is not yet implemented.
+    A tool that runs keyed, event-time windowed aggregations over a batch of events using the
+    in-process stream engine. Other tools can use StreamEnvironment directly for richer pipelines.
     """
 
     def __init__(self, tool_name: str = "event_stream_processor"):
@@ -15,21 +699,73 @@ class EventStreamProcessorTool(BaseTool):
 
     @property
     def description(self) -> str:
-        return "This is a placeholder tool."
+        return "Processes a stream of events with tumbling, sliding or session windows over event time, grouping by a key and aggregating (count, sum, min, max, avg)."
 
     @property
     def parameters(self) -> Dict[str, Any]:
         return {
             "type": "object",
             "properties": {
-                "input_data": {
-                    "type": "string",
-                    "description": "Placeholder input data."
-                }
+                "events": {"type": "array", "items": {"type": "object"}, "description": "The events to process."},
+                "timestamp_field": {"type": "string", "description": "Field holding each event's time (numeric, e.g. epoch seconds).", "default": "timestamp"},
+                "key_field": {"type": "string", "description": "Field to group events by."},
+                "window": {"type": "object", "description": "Window spec, e.g. {'type': 'tumbling', 'size': 60}, {'type': 'sliding', 'size': 60, 'slide': 10} or {'type': 'session', 'gap': 30}."},
+                "aggregation": {"type": "object", "description": "Aggregation spec, e.g. {'type': 'count'} or {'type': 'sum', 'field': 'bytes'}.", "default": {"type": "count"}},
+                "filter": {"type": "object", "description": "Optional: Only keep events where event[field] == value, e.g. {'field': 'status', 'value': 'failed'}."},
+                "max_out_of_orderness": {"type": "number", "description": "How late (in time units) events may arrive before being dropped.", "default": 0},
+                "checkpoint_job": {"type": "string", "description": "Optional: A name (letters, digits, '_', '-', '.') under which state is checkpointed, enabling resume after a crash."}
             },
-            "required": ["input_data"]
+            "required": ["events", "key_field", "window"]
         }
 
-    def execute(self, input_data: str) -> str:
-        logger.warning(f"{self.tool_name} is not yet implemented. Received: {input_data}")
-        return f"{self.tool_name} executed with: {input_data} (placeholder response)"
+    def _build(self, events, timestamp_field, key_field, window, aggregation, filter, max_out_of_orderness, checkpoint_job):
+        env = StreamEnvironment(checkpoint_dir=checkpoint_dir_for(checkpoint_job) if checkpoint_job else None)
+        stream = env.from_collection(events, timestamp=timestamp_field, max_out_of_orderness=max_out_of_orderness)
+        if filter:
+            stream = stream.filter(lambda e: e.get(filter["field"]) == filter.get("value"))
+        sink = stream.key_by(lambda e: e.get(key_field)).window(_window_assigner(window)).aggregate(aggregation).sink()
+        return env, sink
+
+    # The pipeline runs on the caller's event loop; BaseTool derives the blocking execute() from this.
+    async def aexecute(self, events: List[Dict[str, Any]], key_field: str, window: Dict[str, Any], timestamp_field: str = "timestamp",
+                       aggregation: Dict[str, Any] = None, filter: Dict[str, Any] = None, max_out_of_orderness: float = 0,
+                       checkpoint_job: str = None, **kwargs: Any) -> Dict[str, Any]:
+        try:
+            env, sink = self._build(events, timestamp_field, key_field, window, aggregation or {"type": "count"},
+                                    filter, max_out_of_orderness, checkpoint_job)
+            await env.execute()
+        except (ValueError, KeyError, TypeError) as e:
+            return {"status": "error", "message": str(e)}
+        window_operator = next(op for op in env.operators if isinstance(op, WindowAggregateOperator))
+        env.clear_checkpoint()
+        return {"status": "success", "windows": sink.results, "late_events_dropped": window_operator.late_records}
+
+if __name__ == '__main__':
+    import sys
+    import time
+    import random
+
+    # Benchmark: python -m tools.event_stream_processor [num_events]
+    num_events = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(7)
+    events = [{"timestamp": i * 0.001 + rng.uniform(-0.5, 0), "user": f"user_{rng.randrange(1000)}",
+               "status": "failed" if rng.random() < 0.3 else "ok", "bytes": rng.randrange(100, 2000)}
+              for i in range(num_events)]
+
+    async def benchmark(assigner, label):
+        env = StreamEnvironment()
+        (env.from_collection(events, timestamp="timestamp", max_out_of_orderness=1)
+            .map(lambda e: dict(e, kb=e["bytes"] / 1024))
+            .filter(lambda e: e["status"] == "failed")
+            .key_by("user")
+            .window(assigner)
+            .aggregate({"type": "sum", "field": "kb"})
+            .sink())
+        started = time.perf_counter()
+        results = await env.execute()
+        elapsed = time.perf_counter() - started
+        print(f"{label}: {num_events / elapsed:,.0f} events/sec on one core ({len(results['sink_1'])} window results)")
+
+    asyncio.run(benchmark(TumblingWindow(60), "map/filter/key_by/tumbling sum"))
+    asyncio.run(benchmark(SlidingWindow(60, 15), "map/filter/key_by/sliding sum"))
+    asyncio.run(benchmark(SessionWindow(5), "map/filter/key_by/session sum"))
@@ -1,13 +1,20 @@
+import json
 import logging
-from typing import Dict, Any, List
+import numpy as np
+from typing import Dict, Any, List, Optional
 from .base_tool import BaseTool
+from .backtesting_engine import TRADING_DAYS_PER_YEAR, ewma_forecast, historical_var_cvar, load_market_data
 
 logger = logging.getLogger(__name__)
 
 class FinancialForecastingTool(BaseTool):
     """
-    A placeholder tool.
-    This tool is not yet implemented.
+    Forecasts return and risk for every symbol in a local OHLCV dataset.
+
+    Expected return and volatility are exponentially weighted estimates over the
+    recent window, scaled to the horizon; VaR and CVaR come from the historical
+    return distribution. All symbols are computed at once on the memory-mapped
+    (dates x symbols) arrays shared with the backtesting tools.
     """
 
     def __init__(self, tool_name: str = "financial_forecasting_tool"):
@@ -15,21 +22,70 @@ class FinancialForecastingTool(BaseTool):
 
     @property
     def description(self) -> str:
-        return "This is a placeholder tool."
+        return ("Forecasts expected return, volatility, Value-at-Risk and CVaR over a horizon for many symbols at once "
+                "from local OHLCV price files.")
 
     @property
     def parameters(self) -> Dict[str, Any]:
         return {
             "type": "object",
             "properties": {
-                "input_data": {
-                    "type": "string",
-                    "description": "Placeholder input data."
-                }
+                "data_path": {"type": "string", "description": "Long-format OHLCV .csv/.parquet file or a directory of per-symbol files."},
+                "symbols": {"type": "array", "items": {"type": "string"}, "description": "Optional subset of symbols."},
+                "horizon_days": {"type": "integer", "description": "Forecast horizon in trading days.", "default": 21},
+                "lookback_days": {"type": "integer", "description": "History used for the estimates.", "default": TRADING_DAYS_PER_YEAR},
+                "halflife_days": {"type": "number", "description": "Half-life of the exponential weighting.", "default": 21},
+                "alpha": {"type": "number", "description": "Confidence level for VaR/CVaR.", "default": 0.95},
+                "sort_by": {"type": "string", "enum": ["expected_return", "volatility", "sharpe", "cvar"], "default": "sharpe"},
+                "top_n": {"type": "integer", "description": "Number of symbols to report.", "default": 20}
             },
-            "required": ["input_data"]
+            "required": ["data_path"]
         }
 
-    def execute(self, input_data: str) -> str:
-        logger.warning(f"{self.tool_name} is not yet implemented. Received: {input_data}")
-        return f"{self.tool_name} executed with: {input_data} (placeholder response)"
+    def execute(self, data_path: str, symbols: Optional[List[str]] = None, horizon_days: int = 21,
+                lookback_days: int = TRADING_DAYS_PER_YEAR, halflife_days: float = 21, alpha: float = 0.95,
+                sort_by: str = "sharpe", top_n: int = 20) -> str:
+        try:
+            data = load_market_data(data_path).select(symbols)
+        except (FileNotFoundError, ValueError) as e:
+            return json.dumps({"error": str(e)}, indent=2)
+        returns = data.returns()[-lookback_days:]
+        mean, volatility, observations = ewma_forecast(returns, halflife_days)
+        enough = observations >= max(20, lookback_days // 4)
+        if not enough.any():
+            return json.dumps({"error": "Not enough price history to forecast any symbol."}, indent=2)
+        var, cvar = historical_var_cvar(returns[:, enough], alpha)
+
+        expected = mean[enough] * horizon_days
+        horizon_volatility = volatility[enough] * np.sqrt(horizon_days)
+        # Daily VaR/CVaR scaled by the square-root-of-time rule.
+        scale = np.sqrt(horizon_days)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sharpe = np.where(horizon_volatility > 0, expected / horizon_volatility, 0.0)
+        columns = {"expected_return": expected, "volatility": horizon_volatility, "sharpe": sharpe,
+                   "var": var * scale, "cvar": cvar * scale}
+        ranking = columns.get(sort_by, sharpe)
+        # Risk measures list the safest symbols first, return measures the best.
+        order = np.argsort(ranking if sort_by in ("volatility", "cvar") else -ranking, kind="stable")[:top_n]
+        names = [symbol for symbol, keep in zip(data.symbols, enough) if keep]
+        forecasts = [{"symbol": names[i], **{name: round(float(values[i]), 6) for name, values in columns.items()}} for i in order]
+        return json.dumps({
+            "as_of": str(data.dates[-1]),
+            "horizon_days": horizon_days,
+            "alpha": alpha,
+            "n_symbols": int(enough.sum()),
+            "skipped_symbols": int((~enough).sum()),
+            "forecasts": forecasts
+        }, indent=2)
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    from .backtesting_engine import synthetic_market_frame
+
+    tool = FinancialForecastingTool()
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "prices.parquet")
+        synthetic_market_frame(200, 504).to_parquet(path, index=False)
+        print(tool.execute(data_path=path, horizon_days=21, top_n=5))
+        print(tool.execute(data_path=path, sort_by="cvar", top_n=3))
@@ -1,18 +1,240 @@
 import os
+import glob
+import hashlib
+import json
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
 from PIL import Image
 import logging
-from typing import Any, Dict, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from tools.base_tool import BaseTool
 
 logger = logging.getLogger(__name__)
 
+IMAGE_BATCH_WORKERS = int(os.getenv("IMAGE_BATCH_WORKERS", os.cpu_count() or 1))
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp", ".gif", ".tif", ".tiff")
+# Records, per input file, the content hash and settings its outputs were made from.
+BATCH_MANIFEST_NAME = ".image_batch_manifest.json"
+RESAMPLING_FILTERS = {
+    "nearest": Image.Resampling.NEAREST,
+    "bilinear": Image.Resampling.BILINEAR,
+    "bicubic": Image.Resampling.BICUBIC,
+    "lanczos": Image.Resampling.LANCZOS,
+}
+# resize() first shrinks by an integer factor with reduce() (box averaging) until the
+# image is within this factor of the target, then applies the real filter: near-identical
+# output to a full Lanczos pass at a fraction of the cost.
+REDUCING_GAP = 3.0
+_FORMAT_EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp", "GIF": ".gif", "BMP": ".bmp", "TIFF": ".tif"}
+
+
+def _target_size(source_size: Tuple[int, int], width: Optional[int], height: Optional[int], fit: str) -> Tuple[int, int]:
+    """The output size for one variant. 'fit' keeps the aspect ratio inside width x height (never upscaling); 'exact' stretches."""
+    source_width, source_height = source_size
+    if fit == "exact" and width and height:
+        return int(width), int(height)
+    scale = min(width / source_width if width else float("inf"), height / source_height if height else float("inf"), 1.0)
+    return max(1, round(source_width * scale)), max(1, round(source_height * scale))
+
+
+def _save_atomically(image: "Image.Image", path: str, image_format: str, quality: int) -> int:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    options: Dict[str, Any] = {"optimize": True}
+    if image_format in ("JPEG", "WEBP"):
+        options["quality"] = quality
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+    descriptor, temporary = tempfile.mkstemp(prefix=".tmp-", suffix=os.path.splitext(path)[1], dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            image.save(f, format=image_format, **options)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return os.path.getsize(path)
+
+
+def _process_image_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Produces every output variant of one input image from a single decode. Runs in
+    the batch worker processes; the input is skipped if its content hash and the
+    settings match the manifest and all outputs still exist.
+    """
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"input": task["input"], "outputs": [], "bytes_in": 0, "bytes_out": 0}
+    try:
+        with open(task["input"], "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        result.update({"digest": digest, "bytes_in": len(data)})
+        previous = task.get("previous")
+        if (previous and previous.get("digest") == digest and previous.get("settings") == task["settings"]
+                and all(os.path.exists(path) for path in previous.get("outputs", []))):
+            result.update({"status": "skipped", "outputs": previous["outputs"], "seconds": time.perf_counter() - start})
+            return result
+
+        with Image.open(BytesIO(data)) as image:
+            source_size = image.size
+            targets = [_target_size(source_size, variant.get("width"), variant.get("height"), variant.get("fit", "fit"))
+                       for variant in task["variants"]]
+            largest = (max(size[0] for size in targets), max(size[1] for size in targets))
+            # JPEG DCT scaling: decode straight at the smallest 1/2, 1/4 or 1/8 scale still at least as large as every target.
+            if largest[0] < source_size[0] and largest[1] < source_size[1]:
+                image.draft(image.mode if image.mode in ("RGB", "L") else "RGB", largest)
+            image.load()
+            image_format = task["output_format"] or image.format or "PNG"
+            resample = RESAMPLING_FILTERS[task["resample"]]
+            outputs: Dict[int, str] = {}
+            made: List["Image.Image"] = []
+            # Largest first, so each smaller variant can be cut from an already-resized image at least
+            # twice its size instead of from the full decode.
+            for index in sorted(range(len(targets)), key=lambda i: -targets[i][0] * targets[i][1]):
+                target = targets[index]
+                base = min((candidate for candidate in made if candidate.size[0] >= 2 * target[0] and candidate.size[1] >= 2 * target[1]),
+                           key=lambda candidate: candidate.size[0], default=image)
+                output = base if base.size == target else base.resize(target, resample, reducing_gap=REDUCING_GAP)
+                made.append(output)
+                result["bytes_out"] += _save_atomically(output, task["outputs"][index], image_format.upper(), task["quality"])
+                outputs[index] = task["outputs"][index]
+            result["outputs"] = [outputs[index] for index in range(len(targets))]
+        result.update({"status": "processed", "seconds": time.perf_counter() - start})
+    except Exception as e:
+        result.update({"status": "error", "error": str(e), "seconds": time.perf_counter() - start})
+    return result
+
+
+def expand_image_inputs(inputs: Union[str, List[str]], recursive: bool = True) -> List[Tuple[str, str]]:
+    """
+    Resolves files, directories and glob patterns to (absolute image path, root) pairs,
+    where root is the directory that output paths are made relative to.
+    """
+    resolved: Dict[str, str] = {}
+    for pattern in [inputs] if isinstance(inputs, str) else inputs:
+        pattern = os.path.expanduser(pattern)
+        if os.path.isdir(pattern):
+            root = os.path.abspath(pattern)
+            walker = os.walk(root) if recursive else [(root, [], os.listdir(root))]
+            for directory, _, names in walker:
+                for name in names:
+                    if name.lower().endswith(IMAGE_EXTENSIONS):
+                        resolved.setdefault(os.path.join(directory, name), root)
+        elif glob.has_magic(pattern):
+            root = os.path.abspath(pattern.split("*")[0].split("?")[0].split("[")[0])
+            root = root if os.path.isdir(root) else os.path.dirname(root)
+            for path in glob.glob(pattern, recursive=recursive):
+                if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS):
+                    resolved.setdefault(os.path.abspath(path), root)
+        elif os.path.isfile(pattern):
+            resolved.setdefault(os.path.abspath(pattern), os.path.dirname(os.path.abspath(pattern)))
+        else:
+            raise FileNotFoundError(f"No such file, directory or matching pattern: '{pattern}'")
+    return sorted(resolved.items())
+
+
+def _output_paths(input_path: str, root: str, output_dir: str, variants: List[Dict[str, Any]],
+                  output_format: Optional[str]) -> List[str]:
+    relative = os.path.relpath(input_path, root)
+    stem, extension = os.path.splitext(relative)
+    if output_format:
+        extension = _FORMAT_EXTENSIONS.get(output_format.upper(), "." + output_format.lower())
+    paths = []
+    for variant in variants:
+        suffix = variant.get("suffix")
+        if suffix is None:
+            suffix = "" if len(variants) == 1 else f"_{variant.get('width') or 'auto'}x{variant.get('height') or 'auto'}"
+        paths.append(os.path.join(output_dir, stem + suffix + extension))
+    return paths
+
+
+def _load_manifest(path: str) -> Dict[str, Any]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def process_images_batch(inputs: Union[str, List[str]], output_dir: str, sizes: Optional[List[Dict[str, Any]]] = None,
+                         output_format: Optional[str] = None, quality: int = 85, resample: str = "lanczos",
+                         workers: int = IMAGE_BATCH_WORKERS, force: bool = False, recursive: bool = True) -> Dict[str, Any]:
+    """
+    Resizes/optimizes/converts every image matched by ``inputs`` into ``output_dir``,
+    writing one file per entry of ``sizes`` ({"width", "height", "fit": "fit"|"exact",
+    "suffix"}) from a single decode, across a process pool. Inputs whose content and
+    settings are unchanged since the last run are skipped unless ``force`` is set.
+    """
+    if resample not in RESAMPLING_FILTERS:
+        raise ValueError(f"Unsupported resample filter '{resample}'. Supported: {', '.join(RESAMPLING_FILTERS)}")
+    variants = sizes or [{}]
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, BATCH_MANIFEST_NAME)
+    manifest = {} if force else _load_manifest(manifest_path)
+    settings = json.dumps({"variants": variants, "format": output_format, "quality": quality, "resample": resample}, sort_keys=True)
+
+    start = time.perf_counter()
+    tasks = []
+    for input_path, root in expand_image_inputs(inputs, recursive):
+        if os.path.commonpath([input_path, output_dir]) == output_dir:
+            continue  # never re-process our own outputs
+        tasks.append({"input": input_path, "variants": variants, "settings": settings, "quality": quality,
+                      "output_format": output_format, "resample": resample, "previous": manifest.get(input_path),
+                      "outputs": _output_paths(input_path, root, output_dir, variants, output_format)})
+
+    results: List[Dict[str, Any]] = []
+    if workers > 1 and len(tasks) > 1:
+        try:
+            # spawn: forking a process that already runs threads (servers, samplers) is unsafe.
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                results = list(pool.map(_process_image_task, tasks, chunksize=max(1, min(64, len(tasks) // (workers * 8)))))
+        except BrokenProcessPool as e:
+            logger.warning(f"Image worker pool failed ({e}); processing in this process.")
+            results = []
+    if not results:
+        results = [_process_image_task(task) for task in tasks]
+
+    for result in results:
+        if result["status"] in ("processed", "skipped"):
+            manifest[result["input"]] = {"digest": result["digest"], "settings": settings, "outputs": result["outputs"]}
+    descriptor, temporary = tempfile.mkstemp(prefix=".tmp-", dir=output_dir)
+    with os.fdopen(descriptor, "w") as f:
+        json.dump(manifest, f)
+    os.replace(temporary, manifest_path)
+
+    elapsed = time.perf_counter() - start
+    processed = [result for result in results if result["status"] == "processed"]
+    errors = [result for result in results if result["status"] == "error"]
+    bytes_in = sum(result["bytes_in"] for result in processed)
+    return {
+        "output_dir": output_dir,
+        "inputs": len(tasks),
+        "processed": len(processed),
+        "skipped": sum(result["status"] == "skipped" for result in results),
+        "failed": len(errors),
+        "outputs_written": sum(len(result["outputs"]) for result in processed),
+        "bytes_in": bytes_in,
+        "bytes_out": sum(result["bytes_out"] for result in processed),
+        "seconds": round(elapsed, 3),
+        "images_per_second": round(len(tasks) / elapsed, 1) if elapsed > 0 else None,
+        "megabytes_per_second": round(bytes_in / 1e6 / elapsed, 2) if elapsed > 0 else None,
+        "workers": workers if workers > 1 and len(tasks) > 1 else 1,
+        "errors": [{"input": result["input"], "error": result["error"]} for result in errors[:20]],
+    }
+
 class ImageResizerOptimizerTool(BaseTool):
     def __init__(self, tool_name: str = "image_resizer_optimizer_tool"):
         super().__init__(tool_name)
 
     @property
     def description(self) -> str:
-        return "Resizes, optimizes, or converts images."
+        return ("Resizes, optimizes, or converts images, one file at a time or in bulk ('batch') over directories and glob patterns, "
+                "writing several output sizes per image.")
 
     @property
     def parameters(self) -> Dict[str, Any]:
@@ -21,15 +243,45 @@ class ImageResizerOptimizerTool(BaseTool):
             "properties": {
                 "action": {
                     "type": "string",
-                    "description": "The action to perform: 'resize', 'optimize', or 'convert'."
+                    "description": "The action to perform: 'resize', 'optimize', 'convert', or 'batch'."
                 },
                 "file_path": {
                     "type": "string",
-                    "description": "The absolute path to the input image file."
+                    "description": "The absolute path to the input image file (single-file actions)."
                 },
                 "output_path": {
                     "type": "string",
-                    "description": "The absolute path to save the processed image."
+                    "description": "The absolute path to save the processed image (single-file actions)."
+                },
+                "inputs": {
+                    "type": ["string", "array"],
+                    "items": {"type": "string"},
+                    "description": "For 'batch': image files, directories, or glob patterns (e.g. '/photos/**/*.jpg')."
+                },
+                "output_dir": {
+                    "type": "string",
+                    "description": "For 'batch': directory for the outputs; the input directory structure is preserved."
+                },
+                "sizes": {
+                    "type": "array",
+                    "items": {"type": "object"},
+                    "description": "For 'batch': output variants, each {'width', 'height', 'fit': 'fit'|'exact', 'suffix'}. All are made from one decode. Omit to keep the original size."
+                },
+                "resample": {
+                    "type": "string",
+                    "enum": list(RESAMPLING_FILTERS),
+                    "description": "Resampling filter for resizing.",
+                    "default": "lanczos"
+                },
+                "workers": {
+                    "type": "integer",
+                    "description": "For 'batch': number of worker processes.",
+                    "default": IMAGE_BATCH_WORKERS
+                },
+                "force": {
+                    "type": "boolean",
+                    "description": "For 'batch': re-process inputs even if their content and settings are unchanged.",
+                    "default": False
                 },
                 "width": {
                     "type": "integer",
@@ -46,10 +298,10 @@ class ImageResizerOptimizerTool(BaseTool):
                 },
                 "output_format": {
                     "type": "string",
-                    "description": "The target format for the 'convert' action (e.g., 'PNG', 'JPEG')."
+                    "description": "The target format for the 'convert' and 'batch' actions (e.g., 'PNG', 'JPEG')."
                 }
             },
-            "required": ["action", "file_path", "output_path"]
+            "required": ["action"]
         }
 
     def _check_paths(self, file_path: str, output_path: str = None):
@@ -63,16 +315,20 @@ class ImageResizerOptimizerTool(BaseTool):
         if output_path and not os.path.isabs(output_path):
             raise ValueError(f"Output output_path must be an absolute path: '{output_path}'")
 
-    def resize_image(self, file_path: str, width: int, height: int, output_path: str) -> str:
+    def resize_image(self, file_path: str, width: int, height: int, output_path: str, resample: str = "lanczos") -> str:
         """
         Resizes an image.
         """
         self._check_paths(file_path, output_path)
         if not all([width, height]):
             raise ValueError("'width' and 'height' are required for resize action.")
+        if resample not in RESAMPLING_FILTERS:
+            raise ValueError(f"Unsupported resample filter '{resample}'. Supported: {', '.join(RESAMPLING_FILTERS)}")
 
         with Image.open(file_path) as img:
-            resized_img = img.resize((int(width), int(height)))
+            # JPEGs decode directly at a reduced DCT scale when shrinking.
+            img.draft(img.mode if img.mode in ("RGB", "L") else "RGB", (int(width), int(height)))
+            resized_img = img.resize((int(width), int(height)), RESAMPLING_FILTERS[resample], reducing_gap=REDUCING_GAP)
             resized_img.save(output_path)
         self.logger.info(f"Resized image to {width}x{height} and saved to '{output_path}'.")
         return f"Image resized to {width}x{height} and saved to '{output_path}'."
@@ -101,12 +357,27 @@ class ImageResizerOptimizerTool(BaseTool):
         self.logger.info(f"Converted image to {output_format} and saved to '{output_path}'.")
         return f"Image converted to {output_format} and saved to '{output_path}'."
 
-    def execute(self, action: str, file_path: str, output_path: str, **kwargs: Dict[str, Any]) -> str:
+    def batch_process(self, inputs: Union[str, List[str]], output_dir: str, sizes: Optional[List[Dict[str, Any]]] = None,
+                      output_format: Optional[str] = None, quality: int = 85, resample: str = "lanczos",
+                      workers: int = IMAGE_BATCH_WORKERS, force: bool = False) -> str:
+        """
+        Processes many images at once across worker processes; returns a JSON report with throughput.
+        """
+        if not inputs:
+            raise ValueError("'inputs' is required for batch action.")
+        if not output_dir or not os.path.isabs(output_dir):
+            raise ValueError(f"'output_dir' must be an absolute path: '{output_dir}'")
+        report = process_images_batch(inputs, output_dir, sizes, output_format, quality, resample, workers, force)
+        self.logger.info(f"Batch processed {report['processed']} images ({report['skipped']} unchanged, {report['failed']} failed) "
+                         f"at {report['images_per_second']} images/sec.")
+        return json.dumps(report, indent=2)
+
+    def execute(self, action: str, file_path: str = None, output_path: str = None, **kwargs: Dict[str, Any]) -> str:
         """
         Executes an image resizing/optimization/conversion action.
 
         Args:
-            action: The action to perform: "resize", "optimize", or "convert".
+            action: The action to perform: "resize", "optimize", "convert", or "batch".
             file_path: The absolute path to the file or directory to process.
             **kwargs: Additional arguments for specific actions (e.g., width, height, quality, format, output_path).
 
@@ -115,17 +386,58 @@ class ImageResizerOptimizerTool(BaseTool):
         """
         action = action.lower()
         try:
-            if action == "resize":
-                return self.resize_image(file_path, kwargs.get("width"), kwargs.get("height"), output_path)
+            if action == "batch":
+                return self.batch_process(kwargs.get("inputs"), kwargs.get("output_dir"), kwargs.get("sizes"), kwargs.get("output_format"),
+                                          kwargs.get("quality", 85), kwargs.get("resample", "lanczos"),
+                                          kwargs.get("workers", IMAGE_BATCH_WORKERS), kwargs.get("force", False))
+            elif action == "resize":
+                return self.resize_image(file_path, kwargs.get("width"), kwargs.get("height"), output_path, kwargs.get("resample", "lanczos"))
             elif action == "optimize":
                 return self.optimize_image(file_path, output_path, kwargs.get("quality", 85))
             elif action == "convert":
                 return self.convert_image(file_path, output_path, kwargs.get("output_format"))
             else:
-                raise ValueError(f"Invalid action '{action}'. Supported actions are 'resize', 'optimize', or 'convert'.")
+                raise ValueError(f"Invalid action '{action}'. Supported actions are 'resize', 'optimize', 'convert', or 'batch'.")
         except (ValueError, FileNotFoundError, IOError) as e:
             self.logger.error(e)
             raise e
         except Exception as e:
             self.logger.error(f"An unexpected error occurred: {e}")
-            raise e
\ No newline at end of file
+            raise e
+
+if __name__ == "__main__":
+    import random
+    import shutil
+
+    n_images = int(os.getenv("IMAGE_BENCHMARK_COUNT", 10_000))
+    root = tempfile.mkdtemp(prefix="image-batch-bench-")
+    try:
+        source_dir = os.path.join(root, "in")
+        rng = random.Random(0)
+        noise = Image.effect_noise((1600, 1200), 48).convert("RGB")
+        for i in range(n_images):
+            image = Image.new("RGB", (1600, 1200), (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+            image = Image.blend(image, noise, 0.3)
+            directory = os.path.join(source_dir, f"{i // 1000:02d}")
+            os.makedirs(directory, exist_ok=True)
+            image.save(os.path.join(directory, f"img_{i:05d}.jpg"), quality=90)
+        print(f"Generated {n_images} 1600x1200 JPEGs")
+
+        tool = ImageResizerOptimizerTool()
+        sizes = [{"width": 800, "height": 800}, {"width": 400, "height": 400}, {"width": 128, "height": 128}]
+        output_dir = os.path.join(root, "out")
+        for label, kwargs in [("cold, 3 sizes per decode", {}), ("warm, unchanged inputs skipped", {})]:
+            report = json.loads(tool.execute(action="batch", inputs=source_dir, output_dir=output_dir, sizes=sizes, quality=80, **kwargs))
+            print(f"{label:32s} {report['images_per_second']:8.1f} images/sec  processed={report['processed']} "
+                  f"skipped={report['skipped']} outputs={report['outputs_written']} workers={report['workers']}")
+
+        sample = sorted(glob.glob(os.path.join(source_dir, "00", "*.jpg")))[:200]
+        start = time.perf_counter()
+        for i, path in enumerate(sample):
+            for size in sizes:
+                with Image.open(path) as img:
+                    img.resize((size["width"], size["width"] * 3 // 4)).save(os.path.join(root, f"naive_{i}_{size['width']}.jpg"), quality=80)
+        print(f"{'baseline: full decode per size':32s} {len(sample) / (time.perf_counter() - start):8.1f} images/sec (200-image sample, one process)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
@@ -17,6 +17,7 @@ class LobbyingActivityTrackerTool(BaseTool):
     A tool for tracking lobbying activities, recording expenditures, and generating reports.
     This tool provides a more realistic and robust implementation for managing lobbying data.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "LobbyingActivityTracker", data_dir: str = ".", **kwargs):
         """
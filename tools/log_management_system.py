@@ -17,6 +17,7 @@ class LogManagementSystemTool(BaseTool):
     A centralized system to ingest, search, and analyze log data from multiple sources.
     This tool provides a more realistic approach to log management and analysis.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "LogManagementSystem", data_dir: str = ".", **kwargs):
         """
@@ -28,6 +28,7 @@ class LogisticsRoutePlannerTool(BaseTool):
     A tool for intelligent logistics route planning using realistic distance calculations
     and route optimization heuristics.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "LogisticsRoutePlanner", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
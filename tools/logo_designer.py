@@ -13,6 +13,7 @@ class LogoDesignerTool(BaseTool):
     """
     A creative tool to design text-based logos with various styles and icon suggestions.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "LogoDesigner", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
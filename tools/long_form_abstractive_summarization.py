@@ -34,6 +34,7 @@ class ExtractiveSummarizerTool(BaseTool):
     """
     Performs extractive summarization on long texts using a classic NLP sentence-scoring algorithm.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ExtractiveSummarizer", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class LowCodePlatformTool(BaseTool):
     A tool to simulate a low-code/no-code platform that generates simple HTML
     representations of applications from component definitions.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "LowCodePlatform", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -18,6 +18,7 @@ class MachineLearningModelDebuggerTool(BaseTool):
     A tool for debugging machine learning models by performing real data analysis
     on predictions and datasets, and generating visualizations.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MLModelDebugger", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -16,6 +16,7 @@ class MachineLearningModelDeployerTool(BaseTool):
     Manages the deployment lifecycle of ML models as local artifacts,
     including running a simple rule-based inference engine.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MLModelDeployer", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
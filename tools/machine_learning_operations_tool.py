@@ -20,6 +20,7 @@ class MachineLearningOperationsTool(BaseTool):
     An MLOps orchestration tool that manages the lifecycle of ML models by integrating
     with other specialized tools for deployment and monitoring.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MLOpsOrchestrator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -17,6 +17,7 @@ class ManufacturingOptimizerTool(BaseTool):
     A tool to define, optimize, and analyze manufacturing processes
     using data-driven calculations instead of pure simulation.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ManufacturingOptimizer", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
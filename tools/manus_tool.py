@@ -15,6 +15,7 @@ class ManusTaskManagementTool(BaseTool):
     An intelligent task management tool that suggests assignees, prioritizes tasks,
     and manages a hierarchy of tasks and subtasks.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ManusTaskTool", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
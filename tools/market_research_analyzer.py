@@ -17,6 +17,7 @@ class MarketResearchAnalyzerTool(BaseTool):
     A tool to store and analyze market research data, performing real trend
     analysis using linear regression on time-series data.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MarketResearchAnalyzer", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
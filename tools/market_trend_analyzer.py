@@ -14,6 +14,7 @@ class MarketTrendComparisonTool(BaseTool):
     A specialized tool for comparing market data series, calculating volatility,
     and analyzing relative growth.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MarketTrendComparer", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
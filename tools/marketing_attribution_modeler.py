@@ -16,6 +16,7 @@ class MarketingAttributionModelerTool(BaseTool):
     A tool to perform marketing attribution analysis using classic models like
     'first_click', 'last_click', 'linear', and 'time_decay'.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "AttributionModeler", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -16,6 +16,7 @@ class MasterDataManagementTool(BaseTool):
     A tool for managing master data, including running data quality checks
     and preparing data for synchronization with other systems.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MDMTool", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
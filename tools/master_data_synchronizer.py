@@ -16,6 +16,7 @@ class DataReconciliationTool(BaseTool):
     A tool to find and resolve inconsistencies between different versions of a
     data record stored across multiple systems.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "DataReconciler", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -16,6 +16,7 @@ class MaterialsDiscoveryTool(BaseTool):
     A tool to simulate materials science discovery using a genetic
     algorithm-inspired approach for discovery and optimization.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MaterialsDiscovery", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
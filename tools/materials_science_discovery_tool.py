@@ -22,6 +22,7 @@ class MaterialPropertiesSimulatorTool(BaseTool):
     A tool to simulate and predict material properties based on chemical
     composition using a formula-based model.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MaterialSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
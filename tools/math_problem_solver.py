@@ -15,6 +15,7 @@ class MathProblemSolverTool(BaseTool):
     A tool to solve single-variable linear algebraic equations and provide
     a step-by-step explanation.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MathSolver", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
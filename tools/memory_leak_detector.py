@@ -17,6 +17,7 @@ class MemoryLeakSimulatorTool(BaseTool):
     A tool for simulating memory leak detection by profiling an application's
     memory usage over time and calculating the growth rate.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MemoryLeakSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
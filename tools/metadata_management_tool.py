@@ -13,6 +13,7 @@ class MetadataCatalogTool(BaseTool):
     A tool for managing a data catalog by creating, updating, versioning,
     and searching for metadata assets.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MetadataCatalog", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
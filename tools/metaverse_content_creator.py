@@ -14,6 +14,7 @@ class MetaverseAssetGeneratorTool(BaseTool):
     A tool for procedurally generating descriptive JSON files for metaverse assets
     and simulating their deployment.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MetaverseAssetGenerator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -31,6 +31,7 @@ class MicroserviceGovernanceTool(BaseTool):
     A tool to manage a microservice catalog and check for compliance
     against predefined governance policies.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MicroserviceGovernance", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
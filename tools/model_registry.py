@@ -0,0 +1,302 @@
+import logging
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Callable, Tuple, Union
+
+import joblib
+
+from tools.base_tool import BaseTool
+
+logger = logging.getLogger(__name__)
+
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", os.path.join(os.path.expanduser("~"), ".cache", "mic", "model_registry"))
+ARTIFACT_FILE = "artifact.joblib"
+METADATA_FILE = "metadata.json"
+ALIASES_FILE = "aliases.json"
+LOCK_TIMEOUT_SECONDS = 600
+
+def fingerprint(config: Dict[str, Any]) -> str:
+    """A stable hash of a training configuration, used to find an already-trained artifact."""
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class _FileLock:
+    """A cross-process lock based on exclusive file creation (works on POSIX and Windows)."""
+
+    def __init__(self, path: str, timeout: float = LOCK_TIMEOUT_SECONDS):
+        self.path = path
+        self.timeout = timeout
+
+    def __enter__(self) -> "_FileLock":
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.timeout:
+                        logger.warning(f"Removing stale registry lock {self.path}.")
+                        os.remove(self.path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for registry lock {self.path}.")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+class ModelRegistry:
+    """
+    A local, versioned store of trained model artifacts.
+
+    Layout: ``<root>/<name>/<version>/artifact.joblib`` next to a
+    ``metadata.json`` holding the artifact's SHA-256, size, creation time,
+    training fingerprint and any caller metadata. Versions are immutable
+    integers; ``aliases.json`` maps names such as ``production`` to versions.
+
+    Artifacts are written uncompressed so ``load`` can open them with joblib's
+    ``mmap_mode``: NumPy arrays inside the model are memory-mapped read-only,
+    so every worker process serving the same version shares one copy in the
+    page cache instead of holding (or re-training) its own.
+    """
+
+    def __init__(self, root: str = MODEL_REGISTRY_DIR):
+        self.root = root
+        self._loaded: Dict[Tuple[str, int], Any] = {}
+        self._lock = threading.RLock()
+
+    def _model_dir(self, name: str) -> str:
+        if not name or os.sep in name or name.startswith("."):
+            raise ValueError(f"Invalid model name '{name}'.")
+        return os.path.join(self.root, name)
+
+    def list_models(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(entry for entry in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, entry)))
+
+    def list_versions(self, name: str) -> List[Dict[str, Any]]:
+        model_dir = self._model_dir(name)
+        if not os.path.isdir(model_dir):
+            return []
+        versions = []
+        for entry in os.listdir(model_dir):
+            metadata_path = os.path.join(model_dir, entry, METADATA_FILE)
+            if entry.isdigit() and os.path.exists(metadata_path):
+                with open(metadata_path, "r", encoding="utf-8") as handle:
+                    versions.append(json.load(handle))
+        return sorted(versions, key=lambda metadata: metadata["version"])
+
+    def aliases(self, name: str) -> Dict[str, int]:
+        path = os.path.join(self._model_dir(name), ALIASES_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def set_alias(self, name: str, alias: str, version: int) -> None:
+        if not any(metadata["version"] == version for metadata in self.list_versions(name)):
+            raise ValueError(f"Model '{name}' has no version {version}.")
+        model_dir = self._model_dir(name)
+        with _FileLock(os.path.join(model_dir, ".lock")):
+            aliases = self.aliases(name)
+            aliases[alias] = version
+            self._write_json(os.path.join(model_dir, ALIASES_FILE), aliases)
+
+    def resolve(self, name: str, version: Union[int, str, None] = "latest") -> Dict[str, Any]:
+        """Returns the metadata of a version given as a number, an alias, or 'latest'."""
+        versions = self.list_versions(name)
+        if not versions:
+            raise FileNotFoundError(f"Model '{name}' is not registered.")
+        if version in (None, "latest"):
+            return versions[-1]
+        if isinstance(version, str) and not version.isdigit():
+            aliases = self.aliases(name)
+            if version not in aliases:
+                raise KeyError(f"Model '{name}' has no alias '{version}'.")
+            version = aliases[version]
+        for metadata in versions:
+            if metadata["version"] == int(version):
+                return metadata
+        raise FileNotFoundError(f"Model '{name}' has no version {version}.")
+
+    def find(self, name: str, training_fingerprint: str) -> Optional[Dict[str, Any]]:
+        """The newest version trained from the given fingerprint, if any."""
+        for metadata in reversed(self.list_versions(name)):
+            if metadata.get("fingerprint") == training_fingerprint:
+                return metadata
+        return None
+
+    @staticmethod
+    def _write_json(path: str, payload: Dict[str, Any]) -> None:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+        os.replace(temp_path, path)
+
+    def register(self, name: str, artifact: Any, metadata: Optional[Dict[str, Any]] = None,
+                 training_fingerprint: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Stores ``artifact`` as a new version and returns its metadata. If an
+        existing version has identical content, that version is returned instead.
+        """
+        model_dir = self._model_dir(name)
+        os.makedirs(model_dir, exist_ok=True)
+        fd, staged = tempfile.mkstemp(dir=model_dir, suffix=".joblib.tmp")
+        os.close(fd)
+        try:
+            joblib.dump(artifact, staged, compress=0)  # Uncompressed so arrays can be memory-mapped.
+            content_hash = _file_sha256(staged)
+            with _FileLock(os.path.join(model_dir, ".lock")):
+                versions = self.list_versions(name)
+                for existing in versions:
+                    if existing["sha256"] == content_hash:
+                        return existing
+                version = versions[-1]["version"] + 1 if versions else 1
+                version_dir = os.path.join(model_dir, str(version))
+                os.makedirs(version_dir)
+                os.replace(staged, os.path.join(version_dir, ARTIFACT_FILE))
+                record = {
+                    "name": name,
+                    "version": version,
+                    "sha256": content_hash,
+                    "size_bytes": os.path.getsize(os.path.join(version_dir, ARTIFACT_FILE)),
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "artifact_type": f"{type(artifact).__module__}.{type(artifact).__qualname__}",
+                    "fingerprint": training_fingerprint,
+                    "metadata": metadata or {},
+                }
+                # metadata.json is written last: a version directory without it is ignored.
+                self._write_json(os.path.join(version_dir, METADATA_FILE), record)
+                logger.info(f"Registered model '{name}' version {version} ({content_hash[:12]}).")
+                return record
+        finally:
+            if os.path.exists(staged):
+                os.remove(staged)
+
+    def load(self, name: str, version: Union[int, str, None] = "latest", mmap_mode: Optional[str] = "r",
+             verify: bool = True) -> Any:
+        """
+        Loads (once per process) and returns an artifact. With ``verify`` the file's
+        SHA-256 is checked against the registered hash before first use.
+        """
+        metadata = self.resolve(name, version)
+        key = (name, metadata["version"])
+        with self._lock:
+            if key in self._loaded:
+                return self._loaded[key]
+            path = os.path.join(self._model_dir(name), str(metadata["version"]), ARTIFACT_FILE)
+            if verify and _file_sha256(path) != metadata["sha256"]:
+                raise ValueError(f"Artifact for model '{name}' version {metadata['version']} does not match its registered hash.")
+            artifact = joblib.load(path, mmap_mode=mmap_mode)  # nosec B301 - artifacts are written by this registry
+            self._loaded[key] = artifact
+            return artifact
+
+    def get_or_train(self, name: str, config: Dict[str, Any], train: Callable[[], Tuple[Any, Dict[str, Any]]],
+                     mmap_mode: Optional[str] = "r") -> Tuple[Any, Dict[str, Any]]:
+        """
+        Loads the version trained from ``config``, training and registering it first
+        if no such version exists. Training runs under a registry lock, so when many
+        workers start at once only one of them trains and the rest load its artifact.
+        """
+        training_fingerprint = fingerprint(config)
+        metadata = self.find(name, training_fingerprint)
+        if metadata is None:
+            model_dir = self._model_dir(name)
+            os.makedirs(model_dir, exist_ok=True)
+            with _FileLock(os.path.join(model_dir, ".train.lock")):
+                metadata = self.find(name, training_fingerprint)
+                if metadata is None:
+                    artifact, training_metadata = train()
+                    metadata = self.register(name, artifact, {**training_metadata, "config": config}, training_fingerprint)
+        return self.load(name, metadata["version"], mmap_mode=mmap_mode), metadata
+
+    def delete_version(self, name: str, version: int) -> None:
+        with self._lock:
+            self._loaded.pop((name, version), None)
+        shutil.rmtree(os.path.join(self._model_dir(name), str(int(version))))
+
+class LazyModel:
+    """Resolves a registry model on first use, so importing a tool never trains or loads anything."""
+
+    def __init__(self, name: str, config: Dict[str, Any], train: Callable[[], Tuple[Any, Dict[str, Any]]],
+                 registry: Optional[ModelRegistry] = None):
+        self.name = name
+        self.config = config
+        self.train = train
+        self.registry = registry
+        self._artifact = None
+        self._metadata: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Tuple[Any, Dict[str, Any]]:
+        if self._artifact is None:
+            with self._lock:
+                if self._artifact is None:
+                    self._artifact, self._metadata = (self.registry or model_registry).get_or_train(self.name, self.config, self.train)
+        return self._artifact, self._metadata
+
+model_registry = ModelRegistry()
+
+class ModelRegistryTool(BaseTool):
+    """Inspects and manages versions in the local model registry."""
+
+    def __init__(self, tool_name: str = "model_registry"):
+        super().__init__(tool_name)
+
+    @property
+    def description(self) -> str:
+        return "Lists registered models and their versions, shows artifact metadata (hash, size, training config) and sets version aliases."
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "operation": {"type": "string", "enum": ["list_models", "list_versions", "get_metadata", "set_alias"]},
+                "name": {"type": "string", "description": "The registered model name."},
+                "version": {"type": ["integer", "string"], "description": "A version number, an alias or 'latest'."},
+                "alias": {"type": "string", "description": "Alias to point at 'version' (for set_alias), e.g. 'production'."}
+            },
+            "required": ["operation"]
+        }
+
+    def execute(self, operation: str, name: Optional[str] = None, version: Union[int, str, None] = "latest",
+                alias: Optional[str] = None, **kwargs: Any) -> str:
+        try:
+            if operation == "list_models":
+                return json.dumps({"models": model_registry.list_models()}, indent=2)
+            if not name:
+                return json.dumps({"error": f"'name' is required for {operation}."})
+            if operation == "list_versions":
+                return json.dumps({"versions": model_registry.list_versions(name), "aliases": model_registry.aliases(name)}, indent=2)
+            if operation == "get_metadata":
+                return json.dumps(model_registry.resolve(name, version), indent=2)
+            if operation == "set_alias":
+                if not alias:
+                    return json.dumps({"error": "'alias' is required for set_alias."})
+                model_registry.set_alias(name, alias, int(version))
+                return json.dumps({"message": f"Alias '{alias}' of model '{name}' now points to version {version}."}, indent=2)
+            return json.dumps({"error": f"Unsupported operation: {operation}"})
+        except Exception as e:
+            return json.dumps({"error": str(e)})
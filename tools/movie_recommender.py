@@ -15,6 +15,7 @@ class AdvancedMovieRecommenderTool(BaseTool):
     An advanced tool for recommending movies based on genre or a favorite movie,
     and providing detailed movie information, including search capabilities.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MovieRecommender", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class MultiAgentRLSimulatorTool(BaseTool):
     A tool that simulates a Multi-Agent Reinforcement Learning (MARL) platform,
     allowing definition of environments and agents, and running training episodes.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MultiAgentRLSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
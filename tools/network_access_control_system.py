@@ -12,6 +12,7 @@ class NetworkAccessControlSimulatorTool(BaseTool):
     A tool that simulates network access control by managing an Access Control List (ACL)
     to grant, revoke, and check user access to network resources.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "NetworkAccessControlSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -16,6 +16,7 @@ class NetworkConfigurationManagerSimulatorTool(BaseTool):
     A tool that simulates network configuration management, allowing for applying,
     backing up, and restoring configurations for network devices.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "NetworkConfigManagerSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -36,6 +36,7 @@ class NetworkSegmentationSimulatorTool(BaseTool):
     A tool that simulates network segmentation by managing network segments
     and applying policies to control traffic flow.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "NetworkSegmentationSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -1,13 +1,324 @@
 import logging
 import json
+import os
+import csv
+import struct
 import random
+import ipaddress
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator
+
+import numpy as np
 
 from tools.base_tool import BaseTool
 
 logger = logging.getLogger(__name__)
 
+PROTOCOLS = ["TCP", "UDP", "ICMP", "HTTP", "HTTPS", "DNS", "OTHER"]
+_PROTOCOL_INDEX = {name: i for i, name in enumerate(PROTOCOLS)}
+
+# One row per packet/flow record. IPs are stored as integers and protocols as indexes into PROTOCOLS,
+# so a batch of a million packets is ~23 MB and every aggregation is a NumPy reduction.
+TRAFFIC_DTYPE = np.dtype([
+    ("source_ip", np.uint32),
+    ("destination_ip", np.uint32),
+    ("protocol", np.uint8),
+    ("port", np.uint16),
+    ("size_bytes", np.uint32),
+    ("timestamp", np.float64),
+])
+
+def _ip_to_str(ip: int) -> str:
+    return str(ipaddress.IPv4Address(int(ip)))
+
+def _hash64(values: np.ndarray, seed: int) -> np.ndarray:
+    """Vectorized splitmix64 finalizer; overflow is intended."""
+    with np.errstate(over="ignore"):
+        x = values.astype(np.uint64) + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+class CountMinSketch:
+    """A Count-Min sketch over integer keys with vectorized batch updates."""
+
+    def __init__(self, width: int = 2 ** 16, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _columns(self, keys: np.ndarray) -> np.ndarray:
+        return np.stack([_hash64(keys, row + 1) % np.uint64(self.width) for row in range(self.depth)]).astype(np.intp)
+
+    def add(self, keys: np.ndarray, counts: np.ndarray = None):
+        if counts is None:
+            counts = np.ones(len(keys), dtype=np.int64)
+        columns = self._columns(keys)
+        for row in range(self.depth):
+            self.table[row] += np.bincount(columns[row], weights=counts, minlength=self.width).astype(np.int64)
+
+    def estimate(self, keys: np.ndarray) -> np.ndarray:
+        columns = self._columns(keys)
+        return np.min(np.stack([self.table[row, columns[row]] for row in range(self.depth)]), axis=0)
+
+class HyperLogLog:
+    """A HyperLogLog distinct counter with vectorized batch updates (~0.8% error at p=14)."""
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def add(self, keys: np.ndarray):
+        hashed = _hash64(keys, 0)
+        index = (hashed >> np.uint64(64 - self.precision)).astype(np.intp)
+        remaining_bits = 64 - self.precision
+        rest = hashed & np.uint64((1 << remaining_bits) - 1)
+        # frexp's exponent is the bit length; `rest` fits in a float64 mantissa so this is exact.
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (remaining_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+class TrafficAggregator:
+    """
+    Accumulates traffic statistics batch by batch. Exact mode keeps per-key counters; approximate
+    mode keeps a Count-Min sketch, a small heavy-hitter candidate set and HyperLogLog registers,
+    so its memory does not grow with the number of distinct IPs.
+    """
+
+    def __init__(self, approximate: bool = False, top_k: int = 5):
+        self.approximate = approximate
+        self.top_k = top_k
+        self.total_packets = 0
+        self.total_bytes = 0
+        self.protocol_counts = np.zeros(len(PROTOCOLS), dtype=np.int64)
+        self.packets_per_second: Counter = Counter()
+        self.bytes_per_second: Counter = Counter()
+        if approximate:
+            self.sketches = {field: CountMinSketch() for field in ("source_ip", "destination_ip", "port")}
+            self.candidates = {field: {} for field in self.sketches}
+            self.distinct = {field: HyperLogLog() for field in ("source_ip", "destination_ip")}
+        else:
+            self.counters = {field: Counter() for field in ("source_ip", "destination_ip", "port")}
+
+    def add_batch(self, batch: np.ndarray):
+        if len(batch) == 0:
+            return
+        self.total_packets += len(batch)
+        self.total_bytes += int(batch["size_bytes"].sum(dtype=np.int64))
+        self.protocol_counts += np.bincount(batch["protocol"], minlength=len(PROTOCOLS))[:len(PROTOCOLS)]
+
+        seconds, inverse = np.unique(batch["timestamp"].astype(np.int64), return_inverse=True)
+        self.packets_per_second.update(dict(zip(seconds.tolist(), np.bincount(inverse).tolist())))
+        self.bytes_per_second.update(dict(zip(seconds.tolist(), np.bincount(inverse, weights=batch["size_bytes"]).astype(np.int64).tolist())))
+
+        for field in ("source_ip", "destination_ip", "port"):
+            keys, counts = np.unique(batch[field], return_counts=True)
+            if not self.approximate:
+                self.counters[field].update(dict(zip(keys.tolist(), counts.tolist())))
+                continue
+            self.sketches[field].add(keys, counts)
+            # Only keys that are heavy within this batch can become global heavy hitters.
+            heavy = keys[np.argsort(counts)[-self.top_k * 4:]]
+            candidates = self.candidates[field]
+            candidates.update(dict.fromkeys(heavy.tolist(), 0))
+            candidate_keys = np.fromiter(candidates.keys(), dtype=np.uint64, count=len(candidates))
+            estimates = self.sketches[field].estimate(candidate_keys)
+            keep = np.argsort(estimates)[-self.top_k * 4:]
+            self.candidates[field] = dict(zip(candidate_keys[keep].tolist(), estimates[keep].tolist()))
+        if self.approximate:
+            self.distinct["source_ip"].add(batch["source_ip"])
+            self.distinct["destination_ip"].add(batch["destination_ip"])
+
+    def _top(self, field: str) -> List[List[Any]]:
+        if self.approximate:
+            ranked = sorted(self.candidates[field].items(), key=lambda item: item[1], reverse=True)[:self.top_k]
+        else:
+            ranked = self.counters[field].most_common(self.top_k)
+        if field == "port":
+            return [[int(key), int(count)] for key, count in ranked]
+        return [[_ip_to_str(key), int(count)] for key, count in ranked]
+
+    def report(self) -> Dict[str, Any]:
+        if self.total_packets == 0:
+            return {"status": "info", "message": "No traffic data provided for analysis."}
+
+        top_source_ips = self._top("source_ip")
+        top_dest_ips = self._top("destination_ip")
+        protocol_distribution = {
+            PROTOCOLS[i]: round((int(c) / self.total_packets) * 100, 2)
+            for i, c in enumerate(self.protocol_counts) if c
+        }
+
+        # Simple Anomaly Detection: High traffic from/to a single IP
+        anomalies = []
+        if top_source_ips and top_source_ips[0][1] > (self.total_packets * 0.3): # More than 30% from one source
+            anomalies.append(f"High traffic volume from source IP: {top_source_ips[0][0]} ({top_source_ips[0][1]} packets).")
+        if top_dest_ips and top_dest_ips[0][1] > (self.total_packets * 0.3): # More than 30% to one destination
+            anomalies.append(f"High traffic volume to destination IP: {top_dest_ips[0][0]} ({top_dest_ips[0][1]} packets).")
+
+        active_seconds = len(self.packets_per_second)
+        report = {
+            "total_packets": self.total_packets,
+            "total_bytes": self.total_bytes,
+            "top_source_ips": top_source_ips,
+            "top_destination_ips": top_dest_ips,
+            "protocol_distribution_percent": protocol_distribution,
+            "top_ports": self._top("port"),
+            "rates": {
+                "active_seconds": active_seconds,
+                "mean_packets_per_second": round(self.total_packets / active_seconds, 2),
+                "peak_packets_per_second": max(self.packets_per_second.values()),
+                "mean_bytes_per_second": round(self.total_bytes / active_seconds, 2),
+                "peak_bytes_per_second": max(self.bytes_per_second.values()),
+                "busiest_seconds": [
+                    [datetime.fromtimestamp(second).isoformat(), count]
+                    for second, count in self.packets_per_second.most_common(self.top_k)
+                ]
+            },
+            "anomalies_detected": anomalies,
+            "approximate": self.approximate
+        }
+        if self.approximate:
+            report["distinct_source_ips"] = self.distinct["source_ip"].count()
+            report["distinct_destination_ips"] = self.distinct["destination_ip"].count()
+        else:
+            report["distinct_source_ips"] = len(self.counters["source_ip"])
+            report["distinct_destination_ips"] = len(self.counters["destination_ip"])
+        return report
+
+def records_to_table(traffic_data: List[Dict[str, Any]]) -> np.ndarray:
+    """Converts a list of packet dicts (the tool's JSON format) into a structured traffic table."""
+    table = np.empty(len(traffic_data), dtype=TRAFFIC_DTYPE)
+    table["source_ip"] = [int(ipaddress.IPv4Address(p["source_ip"])) for p in traffic_data]
+    table["destination_ip"] = [int(ipaddress.IPv4Address(p["destination_ip"])) for p in traffic_data]
+    table["protocol"] = [_PROTOCOL_INDEX.get(p["protocol"], _PROTOCOL_INDEX["OTHER"]) for p in traffic_data]
+    table["port"] = [p["port"] for p in traffic_data]
+    table["size_bytes"] = [p["size_bytes"] for p in traffic_data]
+    table["timestamp"] = [datetime.fromisoformat(p["timestamp"]).timestamp() for p in traffic_data]
+    return table
+
+def table_to_records(table: np.ndarray) -> List[Dict[str, Any]]:
+    """Converts a structured traffic table back into the tool's list-of-dicts format."""
+    return [{
+        "source_ip": _ip_to_str(row["source_ip"]),
+        "destination_ip": _ip_to_str(row["destination_ip"]),
+        "protocol": PROTOCOLS[row["protocol"]],
+        "port": int(row["port"]),
+        "size_bytes": int(row["size_bytes"]),
+        "timestamp": datetime.fromtimestamp(float(row["timestamp"])).isoformat()
+    } for row in table]
+
+def _pcap_protocol(ip_protocol: int, port: int) -> int:
+    if ip_protocol == 1:
+        return _PROTOCOL_INDEX["ICMP"]
+    if port == 53:
+        return _PROTOCOL_INDEX["DNS"]
+    if ip_protocol == 6:
+        return _PROTOCOL_INDEX["HTTP" if port == 80 else "HTTPS" if port == 443 else "TCP"]
+    if ip_protocol == 17:
+        return _PROTOCOL_INDEX["UDP"]
+    return _PROTOCOL_INDEX["OTHER"]
+
+def _iter_pcap(file_path: str, batch_size: int) -> Iterator[np.ndarray]:
+    """Streams IPv4 packets from a classic libpcap file (Ethernet link type) in fixed-size batches."""
+    with open(file_path, "rb") as f:
+        global_header = f.read(24)
+        magic = global_header[:4]
+        if magic in (b"\xd4\xc3\xb2\xa1", b"\x4d\x3c\xb2\xa1"):
+            endian = "<"
+        elif magic in (b"\xa1\xb2\xc3\xd4", b"\xa1\xb2\x3c\x4d"):
+            endian = ">"
+        else:
+            raise ValueError(f"'{file_path}' is not a pcap file.")
+        subsecond_scale = 1e-9 if magic in (b"\x4d\x3c\xb2\xa1", b"\xa1\xb2\x3c\x4d") else 1e-6
+        record_header = struct.Struct(endian + "IIII")
+        batch = np.empty(batch_size, dtype=TRAFFIC_DTYPE)
+        filled = 0
+        while True:
+            header = f.read(16)
+            if len(header) < 16:
+                break
+            ts_sec, ts_sub, captured_length, original_length = record_header.unpack(header)
+            frame = f.read(captured_length)
+            # Ethernet II + IPv4 only; other frames are skipped.
+            if len(frame) < 34 or frame[12:14] != b"\x08\x00":
+                continue
+            ihl = (frame[14] & 0x0F) * 4
+            ip_protocol = frame[23]
+            port = 0
+            if ip_protocol in (6, 17) and len(frame) >= 14 + ihl + 4:
+                source_port, destination_port = struct.unpack_from("!HH", frame, 14 + ihl)
+                port = min(source_port, destination_port)
+            batch[filled] = (
+                int.from_bytes(frame[26:30], "big"),
+                int.from_bytes(frame[30:34], "big"),
+                _pcap_protocol(ip_protocol, port),
+                port,
+                original_length,
+                ts_sec + ts_sub * subsecond_scale,
+            )
+            filled += 1
+            if filled == batch_size:
+                yield batch.copy()
+                filled = 0
+        if filled:
+            yield batch[:filled].copy()
+
+def _iter_flow_csv(file_path: str, batch_size: int) -> Iterator[np.ndarray]:
+    """Streams a NetFlow-style CSV export with the same columns as the tool's packet dicts."""
+    with open(file_path, newline="") as f:
+        reader = csv.DictReader(f)
+        rows = []
+        for row in reader:
+            rows.append(row)
+            if len(rows) == batch_size:
+                yield records_to_table([_coerce_csv_row(r) for r in rows])
+                rows = []
+        if rows:
+            yield records_to_table([_coerce_csv_row(r) for r in rows])
+
+def _coerce_csv_row(row: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        "source_ip": row["source_ip"],
+        "destination_ip": row["destination_ip"],
+        "protocol": row["protocol"].upper(),
+        "port": int(row["port"]),
+        "size_bytes": int(row["size_bytes"]),
+        "timestamp": row["timestamp"],
+    }
+
+def _iter_flow_binary(file_path: str, batch_size: int) -> Iterator[np.ndarray]:
+    """Streams a binary flow file written by `save_traffic_table` through a memory map."""
+    table = np.memmap(file_path, dtype=TRAFFIC_DTYPE, mode="r")
+    for start in range(0, len(table), batch_size):
+        yield np.asarray(table[start:start + batch_size])
+
+def iter_traffic_file(file_path: str, batch_size: int = 1_000_000) -> Iterator[np.ndarray]:
+    """Yields structured traffic batches of at most `batch_size` rows from a .pcap, .csv or .flows file."""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in (".pcap", ".cap"):
+        return _iter_pcap(file_path, batch_size)
+    if extension == ".csv":
+        return _iter_flow_csv(file_path, batch_size)
+    if extension == ".flows":
+        return _iter_flow_binary(file_path, batch_size)
+    raise ValueError(f"Unsupported traffic file type: '{extension}'. Use .pcap, .csv or .flows.")
+
+def save_traffic_table(table: np.ndarray, file_path: str, append: bool = False):
+    """Writes a traffic table as raw TRAFFIC_DTYPE records (the .flows format)."""
+    with open(file_path, "ab" if append else "wb") as f:
+        table.astype(TRAFFIC_DTYPE, copy=False).tofile(f)
+
 class NetworkTrafficAnalyzerSimulatorTool(BaseTool):
     """
     A tool that simulates network traffic generation and analysis, providing
@@ -19,17 +330,20 @@ class NetworkTrafficAnalyzerSimulatorTool(BaseTool):
 
     @property
     def description(self) -> str:
-        return "Simulates network traffic generation and analysis to identify patterns and top talkers."
+        return "Simulates network traffic generation and analyzes traffic (in memory or streamed from pcap/NetFlow files) to identify patterns and top talkers."
 
     @property
     def parameters(self) -> Dict[str, Any]:
         return {
             "type": "object",
             "properties": {
-                "operation": {"type": "string", "enum": ["generate_traffic_data", "analyze_traffic_data"]},
+                "operation": {"type": "string", "enum": ["generate_traffic_data", "analyze_traffic_data", "analyze_traffic_file"]},
                 "num_packets": {"type": "integer", "description": "Number of packets to generate.", "default": 100},
                 "duration_seconds": {"type": "integer", "description": "Duration over which to simulate traffic generation.", "default": 60},
-                "traffic_data": {"type": "array", "items": {"type": "object"}, "description": "List of simulated traffic packets for analysis."}
+                "traffic_data": {"type": "array", "items": {"type": "object"}, "description": "List of simulated traffic packets for analysis."},
+                "file_path": {"type": "string", "description": "Path to a .pcap, NetFlow-style .csv or binary .flows file for 'analyze_traffic_file'."},
+                "batch_size": {"type": "integer", "description": "Number of packets read per batch when streaming a file.", "default": 1000000},
+                "approximate": {"type": "boolean", "description": "Use Count-Min/HyperLogLog sketches for bounded-memory counting.", "default": False}
             },
             "required": ["operation"]
         }
@@ -37,86 +351,73 @@ class NetworkTrafficAnalyzerSimulatorTool(BaseTool):
     def _generate_random_ip(self) -> str:
         return f"{random.randint(1, 254)}.{random.randint(1, 254)}.{random.randint(1, 254)}.{random.randint(1, 254)}"  # nosec B311
 
+    def generate_traffic_table(self, num_packets: int = 100, duration_seconds: int = 60, start_time: datetime = None) -> np.ndarray:
+        """Generates simulated network traffic as a structured NumPy table."""
+        rng = np.random.default_rng()
+        start = (start_time or datetime.now()).timestamp()
+        table = np.empty(num_packets, dtype=TRAFFIC_DTYPE)
+        octets = rng.integers(1, 255, size=(num_packets, 2, 4), dtype=np.uint32)
+        ips = (octets[..., 0] << 24) | (octets[..., 1] << 16) | (octets[..., 2] << 8) | octets[..., 3]
+        table["source_ip"] = ips[:, 0]
+        table["destination_ip"] = ips[:, 1]
+        protocols = rng.integers(0, _PROTOCOL_INDEX["DNS"] + 1, size=num_packets)
+        table["protocol"] = protocols
+        port_by_protocol = np.array([rng.integers(1024, 65536), rng.integers(1024, 65536), 0, 80, 443, 53, 0])
+        ports = port_by_protocol[protocols]
+        icmp = protocols == _PROTOCOL_INDEX["ICMP"]
+        ports[icmp] = rng.integers(1, 65536, size=int(icmp.sum()))
+        table["port"] = ports
+        table["size_bytes"] = rng.integers(64, 1501, size=num_packets)
+        table["timestamp"] = start + rng.uniform(0, duration_seconds, size=num_packets)
+        return table
+
     def generate_traffic_data(self, num_packets: int = 100, duration_seconds: int = 60) -> List[Dict[str, Any]]:
         """Generates simulated network traffic data."""
-        traffic_data = []
-        start_time = datetime.now()
-        
-        protocols = ["TCP", "UDP", "ICMP", "HTTP", "HTTPS", "DNS"]
-        common_ports = {"HTTP": 80, "HTTPS": 443, "DNS": 53, "TCP": random.randint(1024, 65535), "UDP": random.randint(1024, 65535)}  # nosec B311
-
-        for i in range(num_packets):
-            protocol = random.choice(protocols)  # nosec B311
-            source_ip = self._generate_random_ip()
-            destination_ip = self._generate_random_ip()
-            port = common_ports.get(protocol, random.randint(1, 65535))  # nosec B311
-            size_bytes = random.randint(64, 1500)  # nosec B311
-            timestamp = (start_time + timedelta(seconds=random.uniform(0, duration_seconds))).isoformat()  # nosec B311
-            
-            traffic_data.append({
-                "source_ip": source_ip,
-                "destination_ip": destination_ip,
-                "protocol": protocol,
-                "port": port,
-                "size_bytes": size_bytes,
-                "timestamp": timestamp
-            })
-        return traffic_data
+        return table_to_records(self.generate_traffic_table(num_packets, duration_seconds))
+
+    def analyze_traffic_table(self, batches, approximate: bool = False) -> Dict[str, Any]:
+        """Analyzes a structured traffic table, or an iterable of batches, with vectorized group-bys."""
+        aggregator = TrafficAggregator(approximate=approximate)
+        if isinstance(batches, np.ndarray):
+            batches = [batches]
+        for batch in batches:
+            aggregator.add_batch(batch)
+        return aggregator.report()
 
-    def analyze_traffic_data(self, traffic_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def analyze_traffic_data(self, traffic_data: List[Dict[str, Any]], approximate: bool = False) -> Dict[str, Any]:
         """Analyzes simulated network traffic data."""
         if not traffic_data:
             return {"status": "info", "message": "No traffic data provided for analysis."}
+        return self.analyze_traffic_table(records_to_table(traffic_data), approximate=approximate)
 
-        total_packets = len(traffic_data)
-        total_bytes = sum(p["size_bytes"] for p in traffic_data)
-
-        # Top Talkers (Source IP)
-        source_ip_counts = Counter(p["source_ip"] for p in traffic_data)
-        top_source_ips = source_ip_counts.most_common(5)
-
-        # Top Talkers (Destination IP)
-        dest_ip_counts = Counter(p["destination_ip"] for p in traffic_data)
-        top_dest_ips = dest_ip_counts.most_common(5)
-
-        # Protocol Distribution
-        protocol_counts = Counter(p["protocol"] for p in traffic_data)
-        protocol_distribution = {p: round((c / total_packets) * 100, 2) for p, c in protocol_counts.items()}
-
-        # Port Usage
-        port_counts = Counter(p["port"] for p in traffic_data)
-        top_ports = port_counts.most_common(5)
-
-        # Simple Anomaly Detection: High traffic from/to a single IP
-        anomalies = []
-        if top_source_ips and top_source_ips[0][1] > (total_packets * 0.3): # More than 30% from one source
-            anomalies.append(f"High traffic volume from source IP: {top_source_ips[0][0]} ({top_source_ips[0][1]} packets).")
-        if top_dest_ips and top_dest_ips[0][1] > (total_packets * 0.3): # More than 30% to one destination
-            anomalies.append(f"High traffic volume to destination IP: {top_dest_ips[0][0]} ({top_dest_ips[0][1]} packets).")
-
-        return {
-            "total_packets": total_packets,
-            "total_bytes": total_bytes,
-            "top_source_ips": top_source_ips,
-            "top_destination_ips": top_dest_ips,
-            "protocol_distribution_percent": protocol_distribution,
-            "top_ports": top_ports,
-            "anomalies_detected": anomalies
-        }
+    def analyze_traffic_file(self, file_path: str, batch_size: int = 1_000_000, approximate: bool = False) -> Dict[str, Any]:
+        """Streams a traffic capture in fixed-size batches and analyzes it without loading it whole."""
+        if not os.path.exists(file_path):
+            return {"status": "error", "message": f"Traffic file not found: {file_path}"}
+        report = self.analyze_traffic_table(iter_traffic_file(file_path, batch_size), approximate=approximate)
+        report["source_file"] = file_path
+        return report
 
     def execute(self, operation: str, **kwargs: Any) -> Any:
         if operation == "generate_traffic_data":
             return self.generate_traffic_data(kwargs.get("num_packets", 100), kwargs.get("duration_seconds", 60))
         elif operation == "analyze_traffic_data":
-            return self.analyze_traffic_data(kwargs["traffic_data"])
+            return self.analyze_traffic_data(kwargs["traffic_data"], kwargs.get("approximate", False))
+        elif operation == "analyze_traffic_file":
+            return self.analyze_traffic_file(kwargs["file_path"], kwargs.get("batch_size", 1_000_000), kwargs.get("approximate", False))
         else:
             raise ValueError(f"Unsupported operation: {operation}.")
 
 if __name__ == '__main__':
+    import sys
+    import time
+    import resource
+    import tempfile
+
     print("Demonstrating NetworkTrafficAnalyzerSimulatorTool functionality...")
-    
+
     analyzer_tool = NetworkTrafficAnalyzerSimulatorTool()
-    
+
     try:
         # 1. Generate some simulated traffic data
         print("\n--- Generating 200 packets over 30 seconds ---")
@@ -139,10 +440,28 @@ if __name__ == '__main__':
                 "protocol": "TCP", "port": 80, "size_bytes": 100,
                 "timestamp": datetime.now().isoformat()
             })
-        
+
         print("\n--- Analyzing anomalous traffic data ---")
         anomaly_report = analyzer_tool.execute(operation="analyze_traffic_data", traffic_data=anomalous_traffic)
         print(json.dumps(anomaly_report, indent=2))
 
+        # 4. Benchmark: stream a large binary flow file (default 10M packets) in bounded-size batches.
+        total_packets = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+        print(f"\n--- Benchmark: {total_packets} packets ---")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            flows_path = os.path.join(temp_dir, "benchmark.flows")
+            start_time = datetime.now()
+            for offset in range(0, total_packets, 1_000_000):
+                chunk = analyzer_tool.generate_traffic_table(min(1_000_000, total_packets - offset), 600,
+                                                             start_time=start_time + timedelta(seconds=offset // 10_000))
+                save_traffic_table(chunk, flows_path, append=offset > 0)
+            for approximate in (False, True):
+                started = time.perf_counter()
+                report = analyzer_tool.analyze_traffic_file(flows_path, approximate=approximate)
+                elapsed = time.perf_counter() - started
+                print(f"approximate={approximate}: {elapsed:.2f}s ({total_packets / elapsed:,.0f} packets/s), "
+                      f"distinct sources={report['distinct_source_ips']}, "
+                      f"peak RSS={resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
     except Exception as e:
-        print(f"\nAn error occurred: {e}")
\ No newline at end of file
+        print(f"\nAn error occurred: {e}")
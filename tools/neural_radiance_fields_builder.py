@@ -15,6 +15,7 @@ class NeuralRadianceFieldsSimulatorTool(BaseTool):
     by reconstructing a simulated 3D scene from 2D views and rendering novel
     views as textual descriptions.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "NeRFSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
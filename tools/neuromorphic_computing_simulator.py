@@ -14,6 +14,7 @@ class NeuromorphicSimulatorTool(BaseTool):
     A tool that simulates neuromorphic computing, demonstrating energy efficiency
     and learning capabilities of a spiking neural network.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "NeuromorphicSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -13,6 +13,7 @@ class NewProductDevelopmentTrackerTool(BaseTool):
     A tool for tracking the development lifecycle of new products,
     allowing for creation, status updates, and progress reporting.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "NewProductDevelopmentTracker", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
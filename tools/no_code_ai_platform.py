@@ -14,6 +14,7 @@ class NoCodeAIPlatformSimulatorTool(BaseTool):
     A tool that simulates a no-code AI platform, allowing users to build,
     deploy, and make predictions with AI models without writing code.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "NoCodeAIPlatformSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class OmnichannelCustomerEngagementSimulatorTool(BaseTool):
     A tool that simulates omnichannel customer engagement by managing customer
     interaction history and generating personalized experience suggestions.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "OmnichannelCustomerEngagementSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -13,6 +13,7 @@ class OnboardingWorkflowSimulatorTool(BaseTool):
     A tool that simulates an onboarding workflow system, allowing for defining
     workflows, tracking user progress, and completing individual steps.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "OnboardingWorkflowSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -24,6 +24,7 @@ class OpportunityTrackingTool(BaseTool):
     A tool for tracking sales opportunities, allowing for creation, stage updates,
     and sales forecasting.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "OpportunityTracker", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -13,6 +13,7 @@ class PartsInventoryManagerTool(BaseTool):
     A tool for managing parts inventory, allowing for adding parts, updating
     stock levels, and generating reorder reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PartsInventoryManager", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class PatchManagementSimulatorTool(BaseTool):
     A tool that simulates a patch management system, allowing for scanning
     vulnerabilities, deploying patches, and generating compliance reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PatchManagementSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -23,6 +23,7 @@ class PatentApplicationAssistantTool(BaseTool):
     A tool that simulates a patent application assistant, allowing for creating
     applications, drafting sections, and simulating prior art searches.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PatentAssistant", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -13,6 +13,7 @@ class PayrollProcessingSimulatorTool(BaseTool):
     A tool that simulates payroll processing, including managing employee records,
     calculating salaries, generating pay stubs, and processing tax deductions.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PayrollProcessingSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
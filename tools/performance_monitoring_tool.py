@@ -13,6 +13,7 @@ class PerformanceMonitoringTool(BaseTool):
     A tool to simulate performance monitoring by recording system metrics
     and checking them against defined thresholds for alerts.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PerformanceMonitor", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
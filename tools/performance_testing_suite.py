@@ -14,6 +14,7 @@ class PerformanceTestingSimulatorTool(BaseTool):
     A tool that simulates performance testing, including running load tests,
     stress tests, and generating reports based on simulated metrics.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PerformanceTestingSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class PersonalCognitiveModelSimulatorTool(BaseTool):
     A tool that simulates a personal cognitive model, capable of storing,
     querying, and simulating learning from knowledge with persistence.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PersonalCognitiveModelSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -13,6 +13,7 @@ class PersonalFinanceTrackerTool(BaseTool):
     A tool to track personal finances by recording transactions, managing budgets,
     and providing summaries with persistence.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PersonalFinanceTracker", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
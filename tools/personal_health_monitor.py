@@ -14,6 +14,7 @@ class PersonalHealthMonitorTool(BaseTool):
     A tool for personal health monitoring, providing health advice and
     tracking daily metrics like steps, sleep, and water intake.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PersonalHealthMonitor", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class PersonalizationEngineSimulatorTool(BaseTool):
     profiles, generating recommendations, and personalizing content based on
     user preferences and context.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PersonalizationEngineSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class PersonalizedFitnessPlannerTool(BaseTool):
     A tool that simulates a personalized fitness planner, generating workout
     plans based on user goals, fitness level, and available equipment.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PersonalizedFitnessPlanner", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
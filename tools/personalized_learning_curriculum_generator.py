@@ -14,6 +14,7 @@ class PersonalizedLearningCurriculumGeneratorTool(BaseTool):
     A tool for generating personalized learning curricula, suggesting resources,
     and tracking progress based on learning styles and desired depth.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PersonalizedLearningCurriculumGenerator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
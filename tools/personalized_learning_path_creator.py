@@ -14,6 +14,7 @@ class PersonalizedLearningPathCreatorTool(BaseTool):
     A tool that creates personalized learning paths for students, suggesting
     modules and tracking progress.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PersonalizedLearningPathCreator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
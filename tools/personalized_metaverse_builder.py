@@ -15,6 +15,7 @@ class PersonalizedMetaverseBuilderTool(BaseTool):
     A tool for simulating the creation and management of personalized virtual
     metaverse spaces, including adding assets and retrieving space details.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "MetaverseBuilder", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
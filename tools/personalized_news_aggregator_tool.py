@@ -15,6 +15,7 @@ class PersonalizedNewsAggregatorTool(BaseTool):
     A tool that simulates a personalized news aggregator, allowing users to set
     preferences and generate a news feed tailored to their interests.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PersonalizedNewsAggregator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class NewsFeedCustomizerTool(BaseTool):
     to define rules for blocking keywords, prioritizing sources, and blocking
     sources to tailor their news feed.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "NewsFeedCustomizer", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
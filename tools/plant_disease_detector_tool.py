@@ -15,6 +15,7 @@ class PlantDiseaseDetectorSimulatorTool(BaseTool):
     A tool that simulates plant disease detection based on image paths
     and predefined disease symptoms, suggesting treatments.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PlantDiseaseDetectorSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
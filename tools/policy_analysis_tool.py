@@ -14,6 +14,7 @@ class PolicyAnalysisSimulatorTool(BaseTool):
     A tool that simulates policy analysis, allowing for defining policies,
     evaluating their effectiveness, and predicting outcomes under different scenarios.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PolicyAnalysisSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class PolicyAsCodeEnforcerSimulatorTool(BaseTool):
     A tool that simulates policy-as-code enforcement, allowing for defining
     policies, configuring resources, auditing compliance, and simulating enforcement.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PolicyAsCodeEnforcerSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -1,16 +1,79 @@
-from mic.tool_manager import BaseTool
-from mic.llm_loader import LLMLoader as LLMLoaderClass
+import json
+import logging
+from typing import Dict, Any, List, Optional
+from .base_tool import BaseTool
+from .backtesting_engine import (TRADING_DAYS_PER_YEAR, complete_return_window, estimate_moments, load_market_data,
+                                 mean_variance_weights, min_cvar_weights, portfolio_risk, weights_table)
+
+logger = logging.getLogger(__name__)
 
 class PortfolioOptimization(BaseTool):
-    def __init__(self, tool_name: str = "Portfolio Optimization", llm_loader: LLMLoader = None):
-        super().__init__(tool_name, llm_loader)
-        self.llm_loader = llm_loader or LLMLoaderClass()
+    """
+    Optimizes long-only portfolio weights from local OHLCV data.
+
+    'mean_variance' maximizes expected return minus a risk-aversion-weighted
+    variance using a Ledoit-Wolf shrunk covariance; 'min_cvar' minimizes the
+    historical Conditional Value-at-Risk with a linear program, optionally
+    subject to a minimum expected return.
+    """
+    def __init__(self, tool_name: str = "portfolio_optimization"):
+        super().__init__(tool_name)
+
+    @property
+    def description(self) -> str:
+        return "Optimizes portfolio weights (mean-variance or minimum CVaR) over many symbols from local OHLCV price files."
 
-    def run(self, *args, **kwargs):
-        # Placeholder for portfolio optimization logic
-        return f"Running {self.tool_name} with args: {args}, kwargs: {kwargs}"
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "data_path": {"type": "string", "description": "Long-format OHLCV .csv/.parquet file or a directory of per-symbol files."},
+                "method": {"type": "string", "enum": ["mean_variance", "min_cvar"], "default": "mean_variance"},
+                "symbols": {"type": "array", "items": {"type": "string"}, "description": "Optional universe; defaults to every symbol with complete history in the lookback window."},
+                "lookback_days": {"type": "integer", "description": "Days of returns used for estimation.", "default": TRADING_DAYS_PER_YEAR},
+                "end_date": {"type": "string", "description": "Optional last date of the estimation window (YYYY-MM-DD)."},
+                "risk_aversion": {"type": "number", "description": "Mean-variance risk aversion.", "default": 5.0},
+                "max_weight": {"type": "number", "description": "Largest weight of a single asset.", "default": 0.1},
+                "alpha": {"type": "number", "description": "CVaR confidence level.", "default": 0.95},
+                "target_annual_return": {"type": "number", "description": "Optional minimum expected annual return for 'min_cvar'."}
+            },
+            "required": ["data_path"]
+        }
+
+    def execute(self, data_path: str, method: str = "mean_variance", symbols: Optional[List[str]] = None,
+                lookback_days: int = TRADING_DAYS_PER_YEAR, end_date: Optional[str] = None, risk_aversion: float = 5.0,
+                max_weight: float = 0.1, alpha: float = 0.95, target_annual_return: Optional[float] = None) -> str:
+        try:
+            data = load_market_data(data_path).select(symbols, end=end_date)
+            returns, universe = complete_return_window(data, lookback_days)
+            if len(universe) < 2 or returns.shape[0] < 2:
+                return json.dumps({"error": "Need at least two symbols with complete history in the lookback window."}, indent=2)
+            result: Dict[str, Any] = {"method": method, "as_of": str(data.dates[-1]), "lookback_days": int(returns.shape[0]),
+                                      "n_candidates": len(universe), "excluded_incomplete_history": len(data.symbols) - len(universe)}
+            if method == "mean_variance":
+                mu, cov = estimate_moments(returns)
+                weights = mean_variance_weights(mu, cov, risk_aversion=risk_aversion, max_weight=max_weight)
+            elif method == "min_cvar":
+                target = None if target_annual_return is None else target_annual_return / TRADING_DAYS_PER_YEAR
+                weights, _, _ = min_cvar_weights(returns, alpha=alpha, max_weight=max_weight, target_return=target)
+            else:
+                return json.dumps({"error": f"Unsupported method '{method}'."}, indent=2)
+        except (FileNotFoundError, ValueError, ImportError) as e:
+            self.logger.error(f"Portfolio optimization failed: {e}")
+            return json.dumps({"error": str(e)}, indent=2)
+        holdings = weights_table(weights, universe)
+        result.update({"n_holdings": len(holdings), "in_sample_metrics": portfolio_risk(weights, returns, alpha), "weights": holdings})
+        return json.dumps(result, indent=2)
 
 if __name__ == "__main__":
-    # Example usage of the PortfolioOptimization
+    import os
+    import tempfile
+    from .backtesting_engine import synthetic_market_frame
+
     tool = PortfolioOptimization()
-    print(tool.run("investment_data.csv", "risk_tolerance"))
\ No newline at end of file
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "prices.parquet")
+        synthetic_market_frame(100, 756).to_parquet(path, index=False)
+        print(tool.execute(data_path=path, method="mean_variance", max_weight=0.1))
+        print(tool.execute(data_path=path, method="min_cvar", max_weight=0.2, target_annual_return=0.05))
@@ -23,6 +23,7 @@ class PostEventFeedbackAnalyzerTool(BaseTool):
     A tool that analyzes post-event feedback to identify key insights,
     sentiment, and areas for improvement.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PostEventFeedbackAnalyzer", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class PredictiveAnalyticsSimulatorTool(BaseTool):
     A tool that simulates a predictive analytics engine, allowing for ingesting
     historical data, forecasting future trends, and identifying potential risks.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PredictiveAnalyticsSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class PresentationContentGeneratorTool(BaseTool):
     A tool that generates structured presentation content (slides data)
     based on a topic, target audience, and desired number of slides.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PresentationContentGenerator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class PricingOptimizationSimulatorTool(BaseTool):
     A tool that simulates pricing optimization, recommending prices,
     analyzing price elasticity, and simulating pricing strategies.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PricingOptimizationSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class PrivacyEnhancingComputationSimulatorTool(BaseTool):
     secure computations on sensitive data and data encryption without revealing
     the raw values.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PrivacyEnhancingComputationSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
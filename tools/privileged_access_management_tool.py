@@ -14,6 +14,7 @@ class PrivilegedAccessManagementSimulatorTool(BaseTool):
     A tool that simulates Privileged Access Management (PAM), allowing for
     requesting, approving, revoking, and auditing privileged access sessions.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PrivilegedAccessManagementSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class ProblemManagementSimulatorTool(BaseTool):
     A tool that simulates a problem management system, allowing for creating
     problem records, analyzing root causes, and tracking resolution progress.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ProblemManagementSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
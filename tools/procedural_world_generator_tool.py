@@ -15,6 +15,7 @@ class ProceduralWorldGeneratorTool(BaseTool):
     A tool that generates simulated procedural worlds based on parameters
     like world size, biome type, and resource density.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ProceduralWorldGenerator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class ProductDescriptionGeneratorTool(BaseTool):
     A tool that generates compelling product descriptions based on product
     details, features, benefits, target audience, and desired tone.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ProductDescriptionGenerator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
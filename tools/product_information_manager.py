@@ -13,6 +13,7 @@ class ProductInformationManagerTool(BaseTool):
     A tool for managing product information, including adding, retrieving,
     updating, and deleting product records.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ProductInformationManager", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
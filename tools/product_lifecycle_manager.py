@@ -13,6 +13,7 @@ class ProductLifecycleManagerTool(BaseTool):
     A tool that simulates product lifecycle management, allowing for launching
     products, managing their phases, and retiring them.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ProductLifecycleManager", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
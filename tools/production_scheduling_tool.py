@@ -14,6 +14,7 @@ class ProductionSchedulingSimulatorTool(BaseTool):
     A tool that simulates production scheduling, allowing for creating schedules,
     optimizing production, and tracking progress.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ProductionSchedulingSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -13,6 +13,7 @@ class ProjectScaffoldingTool(BaseTool):
     A tool for generating projects from templates using Cookiecutter,
     allowing for project creation, template listing, and validation.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ProjectScaffolding", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
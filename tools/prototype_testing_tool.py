@@ -14,6 +14,7 @@ class PrototypeTestingSimulatorTool(BaseTool):
     A tool that simulates prototype testing, including running user tests,
     collecting feedback, and generating reports on prototype performance.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "PrototypeTestingSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class QualityControlInspectorSimulatorTool(BaseTool):
     A tool that simulates quality control inspection, allowing for defining
     products, inspecting them based on criteria, and generating quality reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "QualityControlInspectorSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
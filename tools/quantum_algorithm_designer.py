@@ -13,6 +13,7 @@ class QuantumAlgorithmDesignerTool(BaseTool):
     """
     A tool for simulating the design, execution, and analysis of quantum algorithms.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "QuantumAlgorithmDesigner", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
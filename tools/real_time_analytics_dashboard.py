@@ -14,6 +14,7 @@ class RealtimeAnalyticsDashboardSimulatorTool(BaseTool):
     A tool that simulates a real-time analytics dashboard, allowing for
     creating dashboards and retrieving simulated real-time metrics.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "RealtimeAnalyticsDashboardSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class RealtimeCollaborationSimulatorTool(BaseTool):
     A tool that simulates real-time collaboration sessions, allowing for
     starting sessions, editing documents, sending messages, and tracking activity.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "RealtimeCollaborationSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class RealtimeDataIngestionSimulatorTool(BaseTool):
     A tool that simulates real-time data ingestion, allowing for defining
     data streams, ingesting data, and monitoring stream status.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "RealtimeDataIngestionSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class RealtimeDecisionEngineSimulatorTool(BaseTool):
     A tool that simulates a real-time decision engine, allowing for defining
     decision rules and making decisions based on incoming data streams.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "RealtimeDecisionEngineSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
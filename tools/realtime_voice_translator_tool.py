@@ -25,6 +25,7 @@ class RealtimeVoiceTranslatorSimulatorTool(BaseTool):
     A tool that simulates a real-time voice translator, translating text input
     between specified source and target languages using rule-based translations.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "RealtimeVoiceTranslatorSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class RecipeAnalyzerTool(BaseTool):
     A tool that analyzes existing recipes for nutritional information and
     complexity, and allows for rule-based modifications (e.g., making it vegetarian).
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "RecipeAnalyzer", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class RecruitmentAssistantSimulatorTool(BaseTool):
     A tool that simulates recruitment assistance, including screening resumes,
     generating interview questions, and analyzing candidate feedback.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "RecruitmentAssistantSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
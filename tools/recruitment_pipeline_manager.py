@@ -14,6 +14,7 @@ class RecruitmentPipelineSimulatorTool(BaseTool):
     A tool that simulates recruitment pipeline management, allowing for adding
     candidates, updating their stages, and generating pipeline status reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "RecruitmentPipelineSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class RegulatoryComplianceMonitorSimulatorTool(BaseTool):
     A tool that simulates regulatory compliance monitoring, allowing for
     defining regulations, checking systems against them, and generating reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "RegulatoryComplianceMonitorSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
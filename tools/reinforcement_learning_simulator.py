@@ -15,6 +15,7 @@ class ReinforcementLearningSimulatorTool(BaseTool):
     A tool that simulates a Reinforcement Learning (RL) environment and agent,
     allowing for defining environments, agents, and running training episodes.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ReinforcementLearningSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
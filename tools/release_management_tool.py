@@ -14,6 +14,7 @@ class ReleaseManagementSimulatorTool(BaseTool):
     A tool that simulates release management, allowing for creating, deploying,
     rolling back, and reporting on software releases.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ReleaseManagementSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class ResponsibleAIToolkitSimulatorTool(BaseTool):
     A tool that simulates a Responsible AI Toolkit, allowing for assessing risks,
     ensuring fairness, promoting transparency, and generating guidelines for AI systems.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ResponsibleAIToolkitSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class RMASimulatorTool(BaseTool):
     A tool that simulates Return Merchandise Authorization (RMA) processes,
     allowing for creating RMAs, tracking their status, and processing returns.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "RMASimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class ReverseEngineeringSimulatorTool(BaseTool):
     A tool that simulates reverse engineering assistance, allowing for analyzing
     binaries for basic information or potential vulnerabilities.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ReverseEngineeringSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
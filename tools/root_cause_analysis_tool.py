@@ -14,6 +14,7 @@ class RootCauseAnalysisSimulatorTool(BaseTool):
     A tool that simulates root cause analysis for incidents, identifying
     underlying problems, contributing factors, and recommending solutions.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "RootCauseAnalysisSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class RPABotDebuggerTool(BaseTool):
     allowing for defining bots, simulating debug runs with injected errors,
     and generating debug reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "RPABotDebugger", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
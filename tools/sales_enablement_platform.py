@@ -14,6 +14,7 @@ class SalesEnablementSimulatorTool(BaseTool):
     A tool that simulates a sales enablement platform, allowing for tracking
     sales activities, recommending content, and analyzing sales performance.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SalesEnablementSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
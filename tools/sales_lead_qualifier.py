@@ -14,6 +14,7 @@ class SalesLeadQualifierSimulatorTool(BaseTool):
     A tool that simulates sales lead qualification, allowing for defining
     qualification rules, qualifying leads, and generating reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SalesLeadQualifierSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class SalesLeadScorerTool(BaseTool):
     A tool that simulates sales lead scoring, allowing for defining scoring
     models and assigning a numerical score and grade to sales leads.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SalesLeadScorer", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
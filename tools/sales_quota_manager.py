@@ -14,6 +14,7 @@ class SalesQuotaManagerSimulatorTool(BaseTool):
     A tool that simulates sales quota management, allowing for setting quotas,
     tracking performance, and generating reports on sales achievement.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SalesQuotaManagerSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
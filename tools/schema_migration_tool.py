@@ -14,6 +14,7 @@ class SchemaMigrationSimulatorTool(BaseTool):
     A tool that simulates schema migration, allowing for defining migrations,
     applying, reverting, and checking the status of migrations on a simulated database.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SchemaMigrationSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class SecretManagementSimulatorTool(BaseTool):
     A tool that simulates a secret management solution, allowing for storing,
     retrieving, and deleting secrets securely.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SecretManagementSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class SASEManagerSimulatorTool(BaseTool):
     allowing for defining security policies, applying them to users,
     and managing network access to resources.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SASEManagerSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class SIEMSimulatorTool(BaseTool):
     A tool that simulates a Security Information and Event Management (SIEM) system,
     allowing for ingesting events, correlating them, detecting threats, and generating alerts and reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SIEMSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -17,6 +17,7 @@ class SeismicDataAnalyzerSimulatorTool(BaseTool):
     A tool that simulates seismic data analysis, allowing for ingesting
     seismic data, detecting events, estimating magnitudes, and generating reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SeismicDataAnalyzerSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class SelfHealingITSystemSimulatorTool(BaseTool):
     A tool that simulates self-healing IT systems, allowing for defining systems,
     detecting anomalies, diagnosing issues, and automatically remediating problems.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SelfHealingITSystemSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
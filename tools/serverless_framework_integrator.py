@@ -14,6 +14,7 @@ class ServerlessFrameworkSimulatorTool(BaseTool):
     A tool that simulates serverless framework integration, allowing for
     defining, deploying, invoking, and removing serverless functions.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ServerlessFrameworkSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class ServerlessConfigCostEstimatorTool(BaseTool):
     A tool that simulates serverless function configuration and cost estimation,
     allowing users to define function resources and get estimated monthly costs.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ServerlessConfigCostEstimator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class SLATrackerSimulatorTool(BaseTool):
     A tool that simulates Service Level Agreement (SLA) tracking, allowing for
     defining SLAs, tracking performance against them, and generating reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SLATrackerSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
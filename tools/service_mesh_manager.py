@@ -14,6 +14,7 @@ class ServiceMeshSimulatorTool(BaseTool):
     A tool that simulates service mesh management, allowing for defining
     services, deploying them, updating policies, and monitoring their status.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ServiceMeshSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
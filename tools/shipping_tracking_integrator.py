@@ -14,6 +14,7 @@ class ShippingTrackingSimulatorTool(BaseTool):
     A tool that simulates shipping tracking integration, allowing for creating
     shipments, tracking their status, and getting delivery updates.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ShippingTrackingSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
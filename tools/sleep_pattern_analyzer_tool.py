@@ -15,6 +15,7 @@ class SleepPatternAnalyzerSimulatorTool(BaseTool):
     A tool that simulates a sleep pattern analyzer, allowing for adding sleep
     records, analyzing patterns, and generating reports with insights and suggestions.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SleepPatternAnalyzerSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
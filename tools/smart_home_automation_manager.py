@@ -14,6 +14,7 @@ class SmartHomeSimulatorTool(BaseTool):
     A tool that simulates smart home automation, allowing for adding devices,
     controlling them, creating and activating scenes, and getting device status.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SmartHomeSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
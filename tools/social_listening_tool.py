@@ -14,6 +14,7 @@ class SocialListeningSimulatorTool(BaseTool):
     A tool that simulates social listening, allowing for monitoring keywords,
     analyzing sentiment, identifying influencers, and generating reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SocialListeningSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class SocialMediaSchedulerSimulatorTool(BaseTool):
     A tool that simulates social media content scheduling, allowing for
     scheduling posts, publishing them, and tracking their status.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SocialMediaSchedulerSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
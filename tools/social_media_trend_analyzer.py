@@ -14,6 +14,7 @@ class SocialMediaTrendAnalyzerSimulatorTool(BaseTool):
     A tool that simulates social media trend analysis, allowing for analyzing
     trends for a given topic or keyword across various platforms.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SocialMediaTrendAnalyzerSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class SoftwareAssetManagementSimulatorTool(BaseTool):
     A tool that simulates Software Asset Management (SAM), allowing for
     tracking licenses, monitoring usage, and generating compliance reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SoftwareAssetManagementSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class SDxManagerSimulatorTool(BaseTool):
     for defining, provisioning, configuring, and deprovisioning software-defined
     resources like networks, storage, and compute.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SDxManagerSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
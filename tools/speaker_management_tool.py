@@ -14,6 +14,7 @@ class SpeakerManagementSimulatorTool(BaseTool):
     A tool that simulates speaker management, allowing for adding speakers,
     assigning them to events, and tracking their schedules.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SpeakerManagementSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
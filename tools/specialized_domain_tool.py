@@ -15,6 +15,7 @@ class SpecializedDomainSimulatorTool(BaseTool):
     A tool that simulates a specialized domain tool, performing domain-specific
     analysis on provided data and generating reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SpecializedDomainSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
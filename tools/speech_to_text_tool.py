@@ -3,143 +3,147 @@
 import logging
 import os
 import json
-import random
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, Optional, Union
 
 from tools.base_tool import BaseTool
-import speech_recognition as sr
-from textblob import TextBlob # For basic sentiment as emotion proxy
+from tools.transcription_engine import FRAMES_PER_SECOND, TranscriptionEngine, available_backends
+
+try:
+    from textblob import TextBlob # For basic sentiment as emotion proxy
+    TEXTBLOB_AVAILABLE = True
+except ImportError:
+    TextBlob = None
+    TEXTBLOB_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 class AdvancedSpeechToTextTool(BaseTool):
     """
-    A tool that converts speech from audio files to text, and simulates
-    advanced features like speaker diarization and emotion detection.
+    A tool that converts speech from audio files to text offline, with speaker
+    diarization and a sentiment-based emotion estimate.
+
+    Transcription runs on the local transcription engine: voice activity detection
+    cuts the recording into speaker-homogeneous chunks and only each chunk's audio
+    is recognized (faster-whisper or Vosk, whichever is installed), several chunks
+    at a time on one shared model.
     """
 
     def __init__(self, tool_name: str = "AdvancedSpeechToText", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
-        self.recognizer = sr.Recognizer()
+        self.engine = TranscriptionEngine()
 
     @property
     def description(self) -> str:
-        return "Converts speech to text, and simulates speaker diarization and emotion detection."
+        return ("Converts speech to text offline with speaker diarization (who spoke when), "
+                "streams results per chunk, and estimates emotion from the transcription.")
 
     @property
     def parameters(self) -> Dict[str, Any]:
         return {
             "type": "object",
             "properties": {
-                "operation": {"type": "string", "enum": ["transcribe_with_diarization", "transcribe_with_emotion_detection"]},
+                "operation": {"type": "string", "enum": ["transcribe_with_diarization", "transcribe_with_emotion_detection", "diarize"]},
                 "audio_file_path": {"type": "string", "description": "Absolute path to the audio file (e.g., .wav, .flac)."},
-                "language": {"type": "string", "description": "Language code for transcription (e.g., 'en-US', 'es-ES').", "default": "en-US"}
+                "language": {"type": "string", "description": "Language code for transcription (e.g., 'en-US', 'es-ES').", "default": "en-US"},
+                "num_speakers": {"type": "integer", "description": "Optional: exact number of speakers, if known."},
+                "max_speakers": {"type": "integer", "description": "Optional: upper bound on the number of speakers."},
+                "stream": {"type": "boolean", "description": "For 'transcribe_with_diarization': yield one result per chunk as soon as it is transcribed.", "default": False}
             },
             "required": ["operation", "audio_file_path"]
         }
 
-    def _transcribe_audio_segment(self, audio_file_path: str, language: str, start_time: float, end_time: float) -> str:
-        """Helper to transcribe a segment of audio."""
-        # This is a simplification. Real segment transcription is more complex.
-        # For this simulation, we'll just transcribe the whole file and pretend it's a segment.
-        try:
-            with sr.AudioFile(audio_file_path) as source:
-                audio = self.recognizer.record(source)
-                return self.recognizer.recognize_google(audio, language=language)
-        except sr.UnknownValueError:
-            return "Could not understand audio"
-        except sr.RequestError as e:
-            return f"Could not request results from Google Speech Recognition service; {e}"
-        except Exception as e:
-            return f"Error during segment transcription: {e}"
-
-    def transcribe_with_diarization(self, audio_file_path: str, language: str = "en-US") -> Dict[str, Any]:
-        """Transcribes audio and simulates speaker diarization."""
-        if not os.path.exists(audio_file_path):
-            raise FileNotFoundError(f"Audio file not found at {audio_file_path}")
-        
-        # Simulate 2-3 speakers with random start/end times and transcribed text
-        speakers_segments = []
-        current_time = 0.0
-        num_speakers = random.randint(1, 3)  # nosec B311
-        
-        for i in range(num_speakers):
-            segment_duration = round(random.uniform(5.0, 20.0), 1)  # nosec B311
-            segment_start = round(current_time, 1)
-            segment_end = round(current_time + segment_duration, 1)
-            
-            # Simulate transcription for this segment
-            simulated_text = self._transcribe_audio_segment(audio_file_path, language, segment_start, segment_end)
-            
-            speakers_segments.append({
-                "speaker_id": f"Speaker_{i+1}",
-                "start_time_seconds": segment_start,
-                "end_time_seconds": segment_end,
-                "transcription": simulated_text
-            })
-            current_time += segment_duration + random.uniform(0.5, 2.0) # Add a small pause  # nosec B311
-        
-        return {"status": "success", "audio_file": audio_file_path, "language": language, "speaker_segments": speakers_segments}
+    def transcribe_with_diarization(self, audio_file_path: str, language: str = "en-US", num_speakers: Optional[int] = None,
+                                    max_speakers: Optional[int] = None) -> Dict[str, Any]:
+        """Transcribes audio with one segment per speaker turn."""
+        result = self.engine.transcribe(audio_file_path, language, diarize=True, num_speakers=num_speakers, max_speakers=max_speakers)
+        speakers_segments = [{
+            "speaker_id": segment["speaker"],
+            "start_time_seconds": segment["start"],
+            "end_time_seconds": segment["end"],
+            "transcription": segment["text"]
+        } for segment in result["segments"]]
+        return {"status": "success", "audio_file": audio_file_path, "language": language, "speakers": result["speakers"],
+                "speaker_segments": speakers_segments, "duration_seconds": result["duration_seconds"],
+                "realtime_factor": result["realtime_factor"]}
+
+    def stream_with_diarization(self, audio_file_path: str, language: str = "en-US", num_speakers: Optional[int] = None,
+                                max_speakers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yields each transcribed chunk (speaker, times, text) as soon as it is ready; 'chunk_index' gives the order."""
+        for chunk in self.engine.stream(audio_file_path, language, diarize=True, num_speakers=num_speakers, max_speakers=max_speakers):
+            yield {"chunk_index": chunk["index"], "speaker_id": chunk["speaker"], "start_time_seconds": chunk["start"],
+                   "end_time_seconds": chunk["end"], "transcription": chunk["text"]}
+
+    def diarize(self, audio_file_path: str, num_speakers: Optional[int] = None, max_speakers: Optional[int] = None) -> Dict[str, Any]:
+        """Speaker diarization only; needs no speech recognition model."""
+        analysis = self.engine.diarize(audio_file_path, num_speakers, max_speakers)
+        turns = [{"speaker_id": f"Speaker_{turn['speaker'] + 1}", "start_time_seconds": round(turn["start"] / FRAMES_PER_SECOND, 2),
+                  "end_time_seconds": round(turn["end"] / FRAMES_PER_SECOND, 2)} for turn in analysis["turns"]]
+        return {"status": "success", "audio_file": audio_file_path, "num_speakers": analysis["num_speakers"],
+                "duration_seconds": round(analysis["source"].duration, 2), "speaker_turns": turns}
 
     def transcribe_with_emotion_detection(self, audio_file_path: str, language: str = "en-US") -> Dict[str, Any]:
-        """Transcribes audio and simulates emotion detection on the transcribed text."""
-        if not os.path.exists(audio_file_path):
-            raise FileNotFoundError(f"Audio file not found at {audio_file_path}")
-        
-        transcription = self._transcribe_audio_segment(audio_file_path, language, 0, 0) # Transcribe full audio
-        
-        # Simulate emotion detection based on transcription sentiment
+        """Transcribes audio and estimates emotion from the sentiment of the transcription."""
+        transcription = self.engine.transcribe(audio_file_path, language, diarize=False)["text"]
+        if not TEXTBLOB_AVAILABLE:
+            return {"status": "success", "audio_file": audio_file_path, "language": language, "transcription": transcription,
+                    "detected_emotion": None, "message": "Install 'textblob' for emotion detection."}
+
         blob = TextBlob(transcription)
         polarity = round(blob.sentiment.polarity, 2)
-        
+
         detected_emotion = "neutral"
         if polarity > 0.3: detected_emotion = "joy"
         elif polarity < -0.3: detected_emotion = "sadness"
         elif polarity > 0.1: detected_emotion = "calm"
         elif polarity < -0.1: detected_emotion = "anger"
-        
+
         return {"status": "success", "audio_file": audio_file_path, "language": language, "transcription": transcription, "detected_emotion": detected_emotion}
 
-    def execute(self, operation: str, audio_file_path: str, **kwargs: Any) -> Any:
+    def execute(self, operation: str, audio_file_path: str, **kwargs: Any) -> Union[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        speakers = {"num_speakers": kwargs.get("num_speakers"), "max_speakers": kwargs.get("max_speakers")}
         if operation == "transcribe_with_diarization":
             # language has a default value, so no strict check needed here
-            return self.transcribe_with_diarization(audio_file_path, kwargs.get('language', 'en-US'))
+            if kwargs.get("stream"):
+                return self.stream_with_diarization(audio_file_path, kwargs.get('language', 'en-US'), **speakers)
+            return self.transcribe_with_diarization(audio_file_path, kwargs.get('language', 'en-US'), **speakers)
         elif operation == "transcribe_with_emotion_detection":
             # language has a default value, so no strict check needed here
             return self.transcribe_with_emotion_detection(audio_file_path, kwargs.get('language', 'en-US'))
+        elif operation == "diarize":
+            return self.diarize(audio_file_path, **speakers)
         else:
             raise ValueError(f"Invalid operation: {operation}.")
 
 if __name__ == '__main__':
+    import shutil
+    from tools.transcription_engine import synthetic_speech
+
     print("Demonstrating AdvancedSpeechToTextTool functionality...")
     temp_dir = "temp_advanced_stt_data"
-    if os.path.exists(temp_dir): import shutil; shutil.rmtree(temp_dir)
+    if os.path.exists(temp_dir): shutil.rmtree(temp_dir)
     os.makedirs(temp_dir)
-    
+
     stt_tool = AdvancedSpeechToTextTool()
-    
-    # Create a dummy audio file for testing
-    # Note: For actual transcription, this file needs to contain actual speech.
-    # For simulation, an empty file is sufficient for path checks.
+
+    # A synthetic three-speaker recording: diarization works on it, transcription
+    # needs real speech and an installed backend (faster-whisper or vosk).
     dummy_audio_path = os.path.join(temp_dir, "test_meeting.wav")
-    with open(dummy_audio_path, 'w') as f:
-        f.write("RIFF\x00\x00\x00\x00WAVEfmt \x10\x00\x00\x00\x01\x00\x01\x00D\xac\x00\x00\x88\xac\x00\x00\x02\x00\x10\x00data\x00\x00\x00\x00")
-    print(f"Dummy audio file created at: {dummy_audio_path}")
+    synthetic_speech(dummy_audio_path, [(0, 0.5, 6.0), (1, 6.8, 12.0), (0, 12.5, 15.5), (2, 16.2, 24.0)], 25.0)
+    print(f"Synthetic audio file created at: {dummy_audio_path}")
 
     try:
-        # 1. Transcribe with diarization
-        print("\n--- Transcribing with diarization for 'test_meeting.wav' ---")
-        diarization_result = stt_tool.execute(operation="transcribe_with_diarization", audio_file_path=dummy_audio_path)
-        print(json.dumps(diarization_result, indent=2))
+        print("\n--- Diarizing 'test_meeting.wav' ---")
+        print(json.dumps(stt_tool.execute(operation="diarize", audio_file_path=dummy_audio_path), indent=2))
 
-        # 2. Transcribe with emotion detection
-        print("\n--- Transcribing with emotion detection for 'test_meeting.wav' ---")
-        emotion_result = stt_tool.execute(operation="transcribe_with_emotion_detection", audio_file_path=dummy_audio_path)
-        print(json.dumps(emotion_result, indent=2))
+        if available_backends():
+            print("\n--- Transcribing with diarization for 'test_meeting.wav' ---")
+            diarization_result = stt_tool.execute(operation="transcribe_with_diarization", audio_file_path=dummy_audio_path)
+            print(json.dumps(diarization_result, indent=2))
+        else:
+            print("\nNo offline speech recognition backend installed; skipping transcription.")
 
     except Exception as e:
         print(f"\nAn error occurred: {e}")
     finally:
-        if os.path.exists(temp_dir): import shutil; shutil.rmtree(temp_dir)
+        if os.path.exists(temp_dir): shutil.rmtree(temp_dir)
         print(f"\nCleaned up temporary directory '{temp_dir}'.")
@@ -14,6 +14,7 @@ class SponsorshipTrackingSimulatorTool(BaseTool):
     A tool that simulates sponsorship tracking, allowing for creating deals,
     tracking performance metrics, and generating reports on sponsorship value.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SponsorshipTrackingSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
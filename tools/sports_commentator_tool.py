@@ -15,6 +15,7 @@ class SportsCommentatorSimulatorTool(BaseTool):
     A tool that simulates a sports commentator, generating dynamic textual
     commentary based on game event data.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SportsCommentatorSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
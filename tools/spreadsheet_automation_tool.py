@@ -1,20 +1,179 @@
 
 
+import atexit
+import csv
 import openpyxl
 import os
 import json
 import logging
+import tempfile
+import threading
+import time
 import pandas as pd
-from typing import Union, List, Dict, Any, Optional
+from openpyxl.utils.cell import coordinate_to_tuple, range_boundaries
+from typing import Union, List, Dict, Any, Iterator, Optional
 
 from tools.base_tool import BaseTool
 
 logger = logging.getLogger(__name__)
 
+SESSION_IDLE_FLUSH_SECONDS = float(os.getenv("SPREADSHEET_IDLE_FLUSH_SECONDS", 30))
+SESSION_MAX_IDLE_SECONDS = float(os.getenv("SPREADSHEET_MAX_IDLE_SECONDS", 600))
+EXPORT_CHUNK_ROWS = 50_000
+
+
+def _atomic_save(workbook: Any, file_path: str) -> None:
+    """Saves via a temporary file in the same directory so readers never see a partial workbook."""
+    directory = os.path.dirname(file_path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".xlsx.tmp")
+    os.close(fd)
+    try:
+        workbook.save(temp_path)
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+class WorkbookSession:
+    """
+    A workbook kept loaded between tool calls. Edits are applied in memory and only
+    written to disk by ``flush`` (on commit, on idle timeout, or at exit).
+    """
+    def __init__(self, file_path: str, workbook: Any, mtime: Optional[float]):
+        self.file_path = file_path
+        self.workbook = workbook
+        self.mtime = mtime
+        self.pending_writes = 0
+        self.last_access = time.monotonic()
+        self.lock = threading.RLock()
+
+    @property
+    def dirty(self) -> bool:
+        return self.pending_writes > 0
+
+    def touch(self) -> None:
+        self.last_access = time.monotonic()
+
+    def mark_dirty(self, writes: int = 1) -> None:
+        self.pending_writes += writes
+        self.touch()
+
+    def flush(self) -> int:
+        """Writes pending edits to disk and returns how many were flushed."""
+        with self.lock:
+            if not self.dirty:
+                return 0
+            flushed = self.pending_writes
+            _atomic_save(self.workbook, self.file_path)
+            self.mtime = os.path.getmtime(self.file_path)
+            self.pending_writes = 0
+            logger.info(f"Flushed {flushed} pending write(s) to '{self.file_path}'.")
+            return flushed
+
+
+class WorkbookSessionCache:
+    """
+    Open workbook sessions keyed by absolute file path. A daemon sweeper flushes
+    sessions idle for ``idle_flush_seconds`` and closes those idle for
+    ``max_idle_seconds``; everything still pending is flushed at interpreter exit.
+    """
+    def __init__(self, idle_flush_seconds: float = SESSION_IDLE_FLUSH_SECONDS,
+                 max_idle_seconds: float = SESSION_MAX_IDLE_SECONDS):
+        self.idle_flush_seconds = idle_flush_seconds
+        self.max_idle_seconds = max_idle_seconds
+        self._sessions: Dict[str, WorkbookSession] = {}
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        atexit.register(self.flush_all)
+
+    def _ensure_sweeper(self) -> None:
+        if self._sweeper is None or not self._sweeper.is_alive():
+            self._sweeper = threading.Thread(target=self._sweep_forever, name="workbook-session-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep_forever(self) -> None:
+        while True:
+            time.sleep(max(0.05, min(self.idle_flush_seconds, self.max_idle_seconds) / 2))
+            self.sweep()
+
+    def sweep(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            idle = now - session.last_access
+            try:
+                if session.dirty and idle >= self.idle_flush_seconds:
+                    session.flush()
+                if idle >= self.max_idle_seconds:
+                    self.close(session.file_path)
+            except Exception as e:
+                logger.error(f"Failed to flush idle workbook '{session.file_path}': {e}")
+
+    def get(self, file_path: str, create_if_not_exists: bool = False) -> WorkbookSession:
+        """Returns the open session for ``file_path``, loading the workbook on first use."""
+        with self._lock:
+            session = self._sessions.get(file_path)
+            exists = os.path.exists(file_path)
+            if session is not None and not session.dirty and exists and os.path.getmtime(file_path) != session.mtime:
+                session = None  # Changed on disk by someone else since it was loaded.
+            if session is None:
+                if exists:
+                    session = WorkbookSession(file_path, openpyxl.load_workbook(file_path), os.path.getmtime(file_path))
+                elif create_if_not_exists:
+                    session = WorkbookSession(file_path, openpyxl.Workbook(), None)
+                    session.mark_dirty()
+                else:
+                    raise FileNotFoundError(f"Workbook not found at {file_path}")
+                self._sessions[file_path] = session
+            session.touch()
+        self._ensure_sweeper()
+        return session
+
+    def peek(self, file_path: str) -> Optional[WorkbookSession]:
+        with self._lock:
+            return self._sessions.get(file_path)
+
+    def commit(self, file_path: str) -> int:
+        session = self.peek(file_path)
+        return session.flush() if session is not None else 0
+
+    def close(self, file_path: str, flush: bool = True) -> bool:
+        with self._lock:
+            session = self._sessions.pop(file_path, None)
+        if session is None:
+            return False
+        if flush:
+            session.flush()
+        session.workbook.close()
+        return True
+
+    def flush_all(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            try:
+                session.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush workbook '{session.file_path}': {e}")
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [{"file_path": session.file_path, "pending_writes": session.pending_writes,
+                     "idle_seconds": round(now - session.last_access, 1)} for session in self._sessions.values()]
+
+
+workbook_sessions = WorkbookSessionCache()
+
 class SpreadsheetAutomationTool(BaseTool):
     """
     A tool for automating spreadsheet operations, including reading/writing cells
     and ranges, creating/deleting sheets, and converting between Excel and CSV formats.
+
+    Writes go to a cached workbook session and are batched until ``commit`` (or the
+    idle timeout); reads of files without an open session stream in read-only mode.
     """
 
     def __init__(self, tool_name: str = "SpreadsheetAutomation", data_dir: str = ".", **kwargs):
@@ -23,14 +182,15 @@ class SpreadsheetAutomationTool(BaseTool):
 
     @property
     def description(self) -> str:
-        return "Automates spreadsheet operations: read/write cells/ranges, create/delete sheets, convert formats."
+        return ("Automates spreadsheet operations: read/write cells/ranges, create/delete sheets, convert formats. "
+                "Writes are batched in an open workbook session until 'commit' (or set 'autocommit').")
 
     @property
     def parameters(self) -> Dict[str, Any]:
         return {
             "type": "object",
             "properties": {
-                "operation": {"type": "string", "enum": ["read_sheet", "write_cell", "create_sheet", "delete_sheet", "list_sheets", "read_range", "write_range", "convert_to_csv", "convert_from_csv"]},
+                "operation": {"type": "string", "enum": ["read_sheet", "write_cell", "create_sheet", "delete_sheet", "list_sheets", "read_range", "write_range", "convert_to_csv", "convert_from_csv", "commit", "close_session", "list_sessions"]},
                 "file_path": {"type": "string", "description": "Absolute path to the Excel file."},
                 "sheet_name": {"type": "string", "description": "The name of the sheet."},
                 "cell": {"type": "string", "description": "The cell address (e.g., 'A1')."},
@@ -38,122 +198,224 @@ class SpreadsheetAutomationTool(BaseTool):
                 "cell_range": {"type": "string", "description": "The cell range (e.g., 'A1:B5')."},
                 "start_cell": {"type": "string", "description": "The starting cell for writing a range."},
                 "data": {"type": "array", "items": {"type": "array", "items": {"type": ["string", "number", "boolean", "null"]}}, "description": "Data to write as a list of lists."},
-                "csv_file_path": {"type": "string", "description": "Absolute path to the CSV file."}
+                "csv_file_path": {"type": "string", "description": "Absolute path to the CSV file."},
+                "autocommit": {"type": "boolean", "description": "Save the workbook immediately after a write instead of batching.", "default": False},
+                "start_row": {"type": "integer", "description": "First row (1-based) returned by 'read_sheet'.", "default": 1},
+                "max_rows": {"type": "integer", "description": "Maximum number of rows returned by 'read_sheet'."}
             },
-            "required": ["operation", "file_path"]
+            "required": ["operation"]
         }
 
-    def _load_workbook(self, file_path: str, create_if_not_exists: bool = False):
-        """Helper to load workbook."""
+    @staticmethod
+    def _check_path(file_path: str) -> None:
         if not os.path.isabs(file_path): raise ValueError(f"File path must be absolute: '{file_path}'")
-        if os.path.exists(file_path):
-            return openpyxl.load_workbook(file_path)
-        elif create_if_not_exists:
-            workbook = openpyxl.Workbook()
-            workbook.save(file_path)
-            return workbook
-        else:
+
+    def _load_workbook(self, file_path: str, create_if_not_exists: bool = False):
+        """Helper to load workbook from the session cache."""
+        self._check_path(file_path)
+        return workbook_sessions.get(file_path, create_if_not_exists).workbook
+
+    def _session_for_write(self, file_path: str) -> WorkbookSession:
+        self._check_path(file_path)
+        return workbook_sessions.get(file_path, create_if_not_exists=True)
+
+    @staticmethod
+    def _finish_write(session: WorkbookSession, writes: int, autocommit: bool, message: str) -> Dict[str, Any]:
+        session.mark_dirty(writes)
+        if autocommit:
+            session.flush()
+        return {"status": "success", "message": message, "pending_writes": session.pending_writes}
+
+    def iter_sheet_rows(self, file_path: str, sheet_name: Optional[str] = None, min_row: int = 1,
+                        max_row: Optional[int] = None, min_col: Optional[int] = None,
+                        max_col: Optional[int] = None) -> Iterator[tuple]:
+        """
+        Yields row value tuples. Uses the open session if there is one (so pending
+        writes are visible), otherwise streams the file in read-only mode.
+        """
+        self._check_path(file_path)
+        session = workbook_sessions.peek(file_path)
+        if session is not None:
+            with session.lock:
+                sheet = session.workbook[sheet_name] if sheet_name else session.workbook.active
+                rows = self._read_values(sheet, min_row, max_row, min_col, max_col)
+            yield from rows
+            return
+        if not os.path.exists(file_path):
             raise FileNotFoundError(f"Workbook not found at {file_path}")
+        workbook = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            sheet = workbook[sheet_name] if sheet_name else workbook.active
+            yield from sheet.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col,
+                                       max_col=max_col, values_only=True)
+        finally:
+            workbook.close()
 
-    def read_sheet(self, file_path: str, sheet_name: Optional[str] = None) -> List[List[Any]]:
-        """Reads data from a specific sheet."""
-        workbook = self._load_workbook(file_path)
-        if sheet_name: sheet = workbook[sheet_name]
-        else: sheet = workbook.active
+    @staticmethod
+    def _read_values(sheet: Any, min_row: int, max_row: Optional[int], min_col: Optional[int],
+                     max_col: Optional[int]) -> List[tuple]:
+        """
+        Row value tuples from a writable sheet, shaped like a read-only sheet's: rows stop at the
+        last used row. Worksheet.iter_rows would create every cell it visits, and the next flush
+        would save them, so cells are looked up instead.
+        """
+        max_row = sheet.max_row if max_row is None else min(max_row, sheet.max_row)
+        min_col = min_col or 1
+        max_col = max_col or sheet.max_column
+        cells = sheet._cells
+        return [tuple(cells[(row, col)].value if (row, col) in cells else None for col in range(min_col, max_col + 1))
+                for row in range(min_row, max_row + 1)]
 
-        data = []
-        for row in sheet.iter_rows(values_only=True): data.append(list(row))
-        return data
+    def read_sheet(self, file_path: str, sheet_name: Optional[str] = None, start_row: int = 1,
+                   max_rows: Optional[int] = None) -> List[List[Any]]:
+        """Reads data from a specific sheet, optionally a page of ``max_rows`` rows from ``start_row``."""
+        if max_rows is not None and max_rows <= 0:
+            return []
+        max_row = start_row + max_rows - 1 if max_rows is not None else None
+        return [list(row) for row in self.iter_sheet_rows(file_path, sheet_name, min_row=start_row, max_row=max_row)]
 
-    def write_cell(self, file_path: str, sheet_name: str, cell: str, value: Any) -> Dict[str, Any]:
+    def write_cell(self, file_path: str, sheet_name: str, cell: str, value: Any, autocommit: bool = False) -> Dict[str, Any]:
         """Writes content to a specific cell."""
-        workbook = self._load_workbook(file_path, create_if_not_exists=True)
-        if sheet_name in workbook.sheetnames: sheet = workbook[sheet_name]
-        else: sheet = workbook.create_sheet(title=sheet_name)
-        
-        sheet[cell] = value
-        workbook.save(file_path)
-        return {"status": "success", "message": f"Wrote '{value}' to cell '{cell}' in sheet '{sheet_name}' of '{os.path.basename(file_path)}'."}
-
-    def create_sheet(self, file_path: str, sheet_name: str) -> Dict[str, Any]:
+        session = self._session_for_write(file_path)
+        with session.lock:
+            workbook = session.workbook
+            if sheet_name in workbook.sheetnames: sheet = workbook[sheet_name]
+            else: sheet = workbook.create_sheet(title=sheet_name)
+
+            sheet[cell] = value
+            return self._finish_write(session, 1, autocommit, f"Wrote '{value}' to cell '{cell}' in sheet '{sheet_name}' of '{os.path.basename(file_path)}'.")
+
+    def create_sheet(self, file_path: str, sheet_name: str, autocommit: bool = False) -> Dict[str, Any]:
         """Creates a new sheet."""
-        workbook = self._load_workbook(file_path, create_if_not_exists=True)
-        if sheet_name not in workbook.sheetnames:
-            workbook.create_sheet(title=sheet_name)
-            workbook.save(file_path)
-            return {"status": "success", "message": f"Created new sheet '{sheet_name}' in '{os.path.basename(file_path)}'."}
-        else:
-            raise ValueError(f"Sheet '{sheet_name}' already exists.")
-
-    def delete_sheet(self, file_path: str, sheet_name: str) -> Dict[str, Any]:
+        session = self._session_for_write(file_path)
+        with session.lock:
+            if sheet_name not in session.workbook.sheetnames:
+                session.workbook.create_sheet(title=sheet_name)
+                return self._finish_write(session, 1, autocommit, f"Created new sheet '{sheet_name}' in '{os.path.basename(file_path)}'.")
+            else:
+                raise ValueError(f"Sheet '{sheet_name}' already exists.")
+
+    def delete_sheet(self, file_path: str, sheet_name: str, autocommit: bool = False) -> Dict[str, Any]:
         """Deletes a sheet."""
-        workbook = self._load_workbook(file_path)
-        if sheet_name in workbook.sheetnames:
-            workbook.remove(workbook[sheet_name])
-            workbook.save(file_path)
-            return {"status": "success", "message": f"Deleted sheet '{sheet_name}' from '{os.path.basename(file_path)}'."}
-        else:
-            raise ValueError(f"Sheet '{sheet_name}' not found.")
+        self._check_path(file_path)
+        session = workbook_sessions.get(file_path)
+        with session.lock:
+            if sheet_name in session.workbook.sheetnames:
+                session.workbook.remove(session.workbook[sheet_name])
+                return self._finish_write(session, 1, autocommit, f"Deleted sheet '{sheet_name}' from '{os.path.basename(file_path)}'.")
+            else:
+                raise ValueError(f"Sheet '{sheet_name}' not found.")
 
     def list_sheets(self, file_path: str) -> List[str]:
         """Lists all sheet names in a workbook."""
-        workbook = self._load_workbook(file_path)
-        return workbook.sheetnames
+        self._check_path(file_path)
+        session = workbook_sessions.peek(file_path)
+        if session is not None:
+            return list(session.workbook.sheetnames)
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Workbook not found at {file_path}")
+        workbook = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
 
     def read_range(self, file_path: str, sheet_name: str, cell_range: str) -> List[List[Any]]:
         """Reads data from a specific cell range."""
-        workbook = self._load_workbook(file_path)
-        sheet = workbook[sheet_name]
-        data = []
-        for row in sheet[cell_range]: data.append([cell.value for cell in row])
-        return data
+        min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+        rows = self.iter_sheet_rows(file_path, sheet_name, min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col)
+        return [list(row) for row in rows]
 
-    def write_range(self, file_path: str, sheet_name: str, start_cell: str, data: List[List[Any]]) -> Dict[str, Any]:
+    def write_range(self, file_path: str, sheet_name: str, start_cell: str, data: List[List[Any]],
+                    autocommit: bool = False) -> Dict[str, Any]:
         """Writes data to a specific cell range."""
-        workbook = self._load_workbook(file_path, create_if_not_exists=True)
-        if sheet_name in workbook.sheetnames: sheet = workbook[sheet_name]
-        else: sheet = workbook.create_sheet(title=sheet_name)
+        session = self._session_for_write(file_path)
+        with session.lock:
+            workbook = session.workbook
+            if sheet_name in workbook.sheetnames: sheet = workbook[sheet_name]
+            else: sheet = workbook.create_sheet(title=sheet_name)
+
+            start_row, start_col = coordinate_to_tuple(start_cell)
+            for r_idx, row_data in enumerate(data):
+                for c_idx, value in enumerate(row_data):
+                    sheet.cell(row=start_row + r_idx, column=start_col + c_idx, value=value)
+            return self._finish_write(session, 1, autocommit, f"Wrote data to range starting at '{start_cell}' in sheet '{sheet_name}' of '{os.path.basename(file_path)}'.")
 
-        start_row, start_col = openpyxl.utils.cell.coordinate_to_tuple(start_cell)
-        for r_idx, row_data in enumerate(data):
-            for c_idx, value in enumerate(row_data):
-                sheet.cell(row=start_row + r_idx, column=start_col + c_idx, value=value)
-        workbook.save(file_path)
-        return {"status": "success", "message": f"Wrote data to range starting at '{start_cell}' in sheet '{sheet_name}' of '{os.path.basename(file_path)}'."}
+    def commit(self, file_path: str) -> Dict[str, Any]:
+        """Saves the pending writes of the workbook's session."""
+        self._check_path(file_path)
+        flushed = workbook_sessions.commit(file_path)
+        return {"status": "success", "message": f"Committed {flushed} pending write(s) to '{os.path.basename(file_path)}'.", "flushed_writes": flushed}
+
+    def close_session(self, file_path: str) -> Dict[str, Any]:
+        """Commits and releases the workbook's session."""
+        self._check_path(file_path)
+        closed = workbook_sessions.close(file_path)
+        return {"status": "success", "message": f"{'Closed' if closed else 'No open'} session for '{os.path.basename(file_path)}'."}
 
     def convert_to_csv(self, file_path: str, csv_file_path: str, sheet_name: Optional[str] = None) -> Dict[str, Any]:
-        """Converts an Excel sheet to a CSV file."""
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
-        df.to_csv(csv_file_path, index=False)
+        """Converts an Excel sheet to a CSV file, streaming rows in read-only mode."""
+        self._check_path(file_path)
+        workbook_sessions.commit(file_path)
+        with open(csv_file_path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerows(self.iter_sheet_rows(file_path, sheet_name))
         return {"status": "success", "message": f"Converted '{os.path.basename(file_path)}' to '{os.path.basename(csv_file_path)}'."}
 
+    def write_rows_streaming(self, file_path: str, sheet_name: str, rows: Iterator[List[Any]]) -> int:
+        """Writes ``rows`` to a new single-sheet workbook in write-only mode and returns the row count."""
+        self._check_path(file_path)
+        workbook_sessions.close(file_path, flush=False)  # The file is replaced wholesale.
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(title=sheet_name)
+        count = 0
+        for row in rows:
+            sheet.append(row)
+            count += 1
+        _atomic_save(workbook, file_path)
+        return count
+
     def convert_from_csv(self, csv_file_path: str, file_path: str, sheet_name: str = "Sheet1") -> Dict[str, Any]:
-        """Converts a CSV file to an Excel sheet."""
-        df = pd.read_csv(csv_file_path)
-        df.to_excel(file_path, sheet_name=sheet_name, index=False)
-        return {"status": "success", "message": f"Converted '{os.path.basename(csv_file_path)}' to '{os.path.basename(file_path)}'."}
+        """Converts a CSV file to an Excel sheet, streaming chunks into a write-only workbook."""
+        def rows() -> Iterator[List[Any]]:
+            header_written = False
+            for chunk in pd.read_csv(csv_file_path, chunksize=EXPORT_CHUNK_ROWS):
+                if not header_written:
+                    yield list(chunk.columns)
+                    header_written = True
+                values = chunk.astype(object).where(chunk.notna(), None)
+                for row in values.itertuples(index=False, name=None):
+                    yield [value.item() if hasattr(value, "item") else value for value in row]
+
+        count = self.write_rows_streaming(file_path, sheet_name or "Sheet1", rows())
+        return {"status": "success", "message": f"Converted '{os.path.basename(csv_file_path)}' to '{os.path.basename(file_path)}'.", "rows": max(count - 1, 0)}
 
-    def execute(self, operation: str, file_path: str, **kwargs: Any) -> Any:
+    def execute(self, operation: str, file_path: Optional[str] = None, **kwargs: Any) -> Any:
         try:
+            if operation == "list_sessions":
+                return workbook_sessions.list_sessions()
+            if not file_path:
+                raise ValueError(f"Missing 'file_path' for '{operation}' operation.")
+            autocommit = bool(kwargs.get("autocommit", False))
             if operation == "read_sheet":
-                return self.read_sheet(file_path, kwargs.get("sheet_name"))
+                return self.read_sheet(file_path, kwargs.get("sheet_name"), kwargs.get("start_row") or 1, kwargs.get("max_rows"))
             elif operation == "write_cell":
                 sheet_name = kwargs.get("sheet_name")
                 cell = kwargs.get("cell")
                 value = kwargs.get("value")
                 if not all([sheet_name, cell, value is not None]):
                     raise ValueError("Missing 'sheet_name', 'cell', or 'value' for 'write_cell' operation.")
-                return self.write_cell(file_path, sheet_name, cell, value)
+                return self.write_cell(file_path, sheet_name, cell, value, autocommit)
             elif operation == "create_sheet":
                 sheet_name = kwargs.get("sheet_name")
                 if not sheet_name:
                     raise ValueError("Missing 'sheet_name' for 'create_sheet' operation.")
-                return self.create_sheet(file_path, sheet_name)
+                return self.create_sheet(file_path, sheet_name, autocommit)
             elif operation == "delete_sheet":
                 sheet_name = kwargs.get("sheet_name")
                 if not sheet_name:
                     raise ValueError("Missing 'sheet_name' for 'delete_sheet' operation.")
-                return self.delete_sheet(file_path, sheet_name)
+                return self.delete_sheet(file_path, sheet_name, autocommit)
             elif operation == "list_sheets":
                 return self.list_sheets(file_path)
             elif operation == "read_range":
@@ -168,7 +430,11 @@ class SpreadsheetAutomationTool(BaseTool):
                 data = kwargs.get("data")
                 if not all([sheet_name, start_cell, data]):
                     raise ValueError("Missing 'sheet_name', 'start_cell', or 'data' for 'write_range' operation.")
-                return self.write_range(file_path, sheet_name, start_cell, data)
+                return self.write_range(file_path, sheet_name, start_cell, data, autocommit)
+            elif operation == "commit":
+                return self.commit(file_path)
+            elif operation == "close_session":
+                return self.close_session(file_path)
             elif operation == "convert_to_csv":
                 csv_file_path = kwargs.get("csv_file_path")
                 if not csv_file_path:
@@ -187,7 +453,7 @@ class SpreadsheetAutomationTool(BaseTool):
 
 if __name__ == '__main__':
     print("Demonstrating SpreadsheetAutomationTool functionality...")
-    temp_dir = "temp_spreadsheet_data"
+    temp_dir = os.path.abspath("temp_spreadsheet_data")
     if os.path.exists(temp_dir): import shutil; shutil.rmtree(temp_dir)
     os.makedirs(temp_dir)
     
@@ -214,6 +480,10 @@ if __name__ == '__main__':
         spreadsheet_tool.execute(operation="write_range", file_path=excel_file, sheet_name="Sales", start_cell="A2", data=data_to_write)
         print("Data range written.")
 
+        # Writes are batched in the workbook session until committed
+        print("\n--- Committing pending writes ---")
+        print(spreadsheet_tool.execute(operation="commit", file_path=excel_file)["message"])
+
         # 3. Read the sheet
         print("\n--- Reading 'Sales' sheet ---")
         sheet_data = spreadsheet_tool.execute(operation="read_sheet", file_path=excel_file, sheet_name="Sales")
@@ -229,6 +499,28 @@ if __name__ == '__main__':
         sheets = spreadsheet_tool.execute(operation="list_sheets", file_path=excel_file)
         print(json.dumps(sheets, indent=2))
 
+        # 6. Benchmark: cell-by-cell writes, and a 500k-row export/streamed read
+        import sys
+        bench_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+        print("\n--- Benchmark ---")
+        bench_file = os.path.join(temp_dir, "cells.xlsx")
+        started = time.perf_counter()
+        for i in range(1, 1001):
+            spreadsheet_tool.execute(operation="write_cell", file_path=bench_file, sheet_name="Data", cell=f"A{i}", value=i)
+        spreadsheet_tool.execute(operation="commit", file_path=bench_file)
+        print(f"1,000 single-cell writes + commit: {time.perf_counter() - started:.2f}s")
+
+        big_csv = os.path.join(temp_dir, "big.csv")
+        big_xlsx = os.path.join(temp_dir, "big.xlsx")
+        pd.DataFrame({"id": range(bench_rows), "value": [i * 0.5 for i in range(bench_rows)],
+                      "label": [f"row-{i % 100}" for i in range(bench_rows)]}).to_csv(big_csv, index=False)
+        started = time.perf_counter()
+        spreadsheet_tool.execute(operation="convert_from_csv", csv_file_path=big_csv, file_path=big_xlsx, sheet_name="Data")
+        print(f"write-only export of {bench_rows:,} rows: {time.perf_counter() - started:.1f}s")
+        started = time.perf_counter()
+        streamed = sum(1 for _ in spreadsheet_tool.iter_sheet_rows(big_xlsx, "Data"))
+        print(f"read-only streaming of {streamed:,} rows: {time.perf_counter() - started:.1f}s")
+
     except Exception as e:
         print(f"\nAn error occurred: {e}")
     finally:
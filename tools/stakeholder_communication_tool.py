@@ -14,6 +14,7 @@ class StakeholderCommunicationSimulatorTool(BaseTool):
     A tool that simulates stakeholder communication, allowing for managing
     stakeholder profiles, sending updates, collecting feedback, and generating reports.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "StakeholderCommunicationSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -15,6 +15,7 @@ class StaticCodeAnalyzerSimulatorTool(BaseTool):
     A tool that simulates static code analysis, identifying potential issues,
     code smells, or security vulnerabilities in code snippets.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "StaticCodeAnalyzerSimulator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
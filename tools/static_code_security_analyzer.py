@@ -16,6 +16,7 @@ class StaticCodeSecurityAnalyzerTool(BaseTool):
     A tool that simulates static code security analysis, identifying potential
     security vulnerabilities in code snippets based on predefined patterns.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "StaticCodeSecurityAnalyzer", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
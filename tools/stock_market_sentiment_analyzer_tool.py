@@ -16,6 +16,7 @@ class StockMarketSentimentAnalyzerTool(BaseTool):
     A tool that analyzes news headlines or social media posts related to a stock,
     calculates sentiment, and provides an overall sentiment score and label.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "StockMarketSentimentAnalyzer", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
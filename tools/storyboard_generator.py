@@ -16,6 +16,7 @@ class StoryboardGeneratorTool(BaseTool):
     A tool for generating detailed storyboards with customizable scenes and
     visual descriptions, and managing them with persistence.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "StoryboardGenerator", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
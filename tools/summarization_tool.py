@@ -4,7 +4,16 @@ import json
 import re
 from typing import Union, List, Dict, Any
 from tools.base_tool import BaseTool
-from transformers import pipeline
+
+try:
+    from mic.model_server import remote_model
+except ImportError:  # imported from the repository root, without the mic package: no model server
+    remote_model = None
+
+try:
+    from transformers import pipeline
+except ImportError:  # only needed when summarization runs in-process
+    pipeline = None
 # from sumy.parsers.plaintext import PlaintextParser # For extractive summarization
 # from sumy.nlp.tokenizers import Tokenizer
 # from sumy.summarizers.lsa import LsaSummarizer
@@ -28,6 +37,9 @@ class SummarizationTool(BaseTool):
         self.device = self.config.getint('DEFAULT', 'summarization_device', fallback=-1) # -1 for CPU, 0 for GPU
         self.summarizer_pipeline = None
         # self._load_summarizer_pipeline() # REMOVED: This will be called lazily
+        # With "summarization" in MODEL_SERVER_FAMILIES the model lives in the shared model
+        # server (batched across all workers) and is never loaded here.
+        self.remote = remote_model("summarization") if remote_model else None
 
     def _load_summarizer_pipeline(self):
         """
@@ -41,9 +53,12 @@ class SummarizationTool(BaseTool):
         """
         Summarizes text using an abstractive (LLM-based) approach.
         """
-        self._load_summarizer_pipeline() # LAZY LOADING: Ensure model is loaded before use
         if not text.strip():
             raise ValueError("No text provided for summarization.")
+        if self.remote is not None:
+            return self.remote.run_one("summarize", text=text, model=self.model_name, device=self.device,
+                                       max_length=max_length, min_length=min_length)["summary_text"]
+        self._load_summarizer_pipeline() # LAZY LOADING: Ensure model is loaded before use
         summary = self.summarizer_pipeline(text, max_length=max_length, min_length=min_length, do_sample=False)
         return summary[0]['summary_text']
 
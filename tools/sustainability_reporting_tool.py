@@ -13,6 +13,7 @@ class SustainabilityReportingTool(BaseTool):
     """
     A tool that generates sustainability reports based on input data.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SustainabilityReportingTool", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
@@ -14,6 +14,7 @@ class SyntheticDataGeneratorFromSchemaTool(BaseTool):
     """
     A tool that generates synthetic data based on a given schema.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "SyntheticDataGeneratorFromSchema", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
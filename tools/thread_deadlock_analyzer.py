@@ -14,6 +14,7 @@ class ThreadDeadlockAnalyzerTool(BaseTool):
     A tool that simulates thread deadlock analysis, allowing for analyzing
     thread dumps and generating reports on detected deadlocks.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
 
     def __init__(self, tool_name: str = "ThreadDeadlockAnalyzer", data_dir: str = ".", **kwargs):
         super().__init__(tool_name=tool_name, **kwargs)
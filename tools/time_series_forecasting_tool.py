@@ -2,15 +2,181 @@ import logging
 import json
 import pandas as pd
 import numpy as np
-from typing import Union, List, Dict, Any, Tuple
+from typing import Union, List, Dict, Any, Tuple, Optional
+from collections import deque
 from tools.base_tool import BaseTool
 from statsmodels.tsa.arima.model import ARIMA
 import joblib
 import os
+import threading
 import warnings
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_P_VALUES = range(3)
+DEFAULT_D_VALUES = range(2)
+DEFAULT_Q_VALUES = range(3)
+# At most this many candidates per differencing order survive the pre-screen, and only
+# those within EARLY_STOP_MARGIN (AIC units) of the best pre-screen score of their d.
+# The same margin skips candidates whose pre-screen score trails the best exact fit.
+PRESCREEN_TOP = 5
+EARLY_STOP_MARGIN = 10.0
+# Worker processes of the pool every order search and batch forecast in this process shares.
+FIT_POOL_WORKERS = int(os.getenv("ARIMA_FIT_POOL_WORKERS", os.cpu_count() or 1))
+# Below this many observations a fit takes milliseconds, less than shipping the series and the
+# fitted model between processes, so the order search runs in the calling thread.
+PARALLEL_FIT_MIN_OBSERVATIONS = int(os.getenv("ARIMA_PARALLEL_MIN_OBSERVATIONS", 1000))
+
+_fit_pool: Optional[ProcessPoolExecutor] = None
+_fit_pool_lock = threading.Lock()
+
+def fit_pool() -> ProcessPoolExecutor:
+    """The shared process pool for ARIMA fits, started on first use (and again if a worker died)."""
+    global _fit_pool
+    with _fit_pool_lock:
+        if _fit_pool is None or getattr(_fit_pool, "_broken", False):
+            _fit_pool = ProcessPoolExecutor(max_workers=FIT_POOL_WORKERS)
+        return _fit_pool
+
+def _lagged(values: np.ndarray, lags: int, start: int) -> np.ndarray:
+    """Columns values[t-1], ..., values[t-lags] for t >= start."""
+    return np.column_stack([values[start - lag:len(values) - lag] for lag in range(1, lags + 1)]) if lags else np.empty((len(values) - start, 0))
+
+def prescreen_orders(series: pd.Series, p_values: Any, d_values: Any, q_values: Any,
+                     top: int = PRESCREEN_TOP, margin: float = EARLY_STOP_MARGIN) -> List[Tuple[Tuple[int, int, int], float]]:
+    """
+    Ranks ARIMA orders by an approximate AIC from a Hannan-Rissanen regression.
+
+    Each differencing order is applied once. A long autoregression on the
+    differenced series gives innovation estimates, and every (p, q) candidate of
+    that d is then a least-squares fit on shared lag matrices, which is orders of
+    magnitude cheaper than a state-space likelihood fit. The likelihood is scaled
+    to the full differenced length so scores are on the scale of the exact AIC.
+    Returns the surviving ``(order, approximate_aic)`` pairs sorted by score.
+    """
+    values = np.asarray(series, dtype=np.float64)
+    max_p, max_q = max(p_values), max(q_values)
+    ranked = []
+    for d in d_values:
+        differenced = np.diff(values, n=d) if d else values
+        if d == 0:
+            differenced = differenced - differenced.mean()
+        long_ar = min(len(differenced) // 4, max(8, max_p + max_q + 2))
+        start = long_ar + max(max_p, max_q)
+        if long_ar < 1 or len(differenced) - start < max_p + max_q + 8:
+            # Too short to pre-screen; let the exact fits decide.
+            ranked.extend(((p, d, q), float("-inf")) for p in p_values for q in q_values)
+            continue
+        ar_design = _lagged(differenced, long_ar, long_ar)
+        ar_coefs = np.linalg.lstsq(ar_design, differenced[long_ar:], rcond=None)[0]
+        innovations = np.zeros_like(differenced)
+        innovations[long_ar:] = differenced[long_ar:] - ar_design @ ar_coefs
+        target = differenced[start:]
+        y_lags = _lagged(differenced, max_p, start)
+        e_lags = _lagged(innovations, max_q, start)
+        n = len(target)
+        scores = []
+        for p in p_values:
+            for q in q_values:
+                design = np.hstack([y_lags[:, :p], e_lags[:, :q]])
+                residuals = target - design @ np.linalg.lstsq(design, target, rcond=None)[0] if design.shape[1] else target
+                sigma2 = max(float(residuals @ residuals) / n, 1e-300)
+                k = p + q + 1 + (1 if d == 0 else 0)
+                scores.append(((p, d, q), len(differenced) * (np.log(2 * np.pi * sigma2) + 1) + 2 * k))
+        scores.sort(key=lambda item: item[1])
+        ranked.extend(item for item in scores[:top] if item[1] <= scores[0][1] + margin)
+    ranked.sort(key=lambda item: item[1])
+    return ranked
+
+def _fit_arima(series: pd.Series, order: Tuple[int, int, int]) -> Tuple[Tuple[int, int, int], Any]:
+    """Fits one candidate; runs in worker processes, so it must stay at module level."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # Convergence warnings are expected for poor candidates.
+        try:
+            return order, ARIMA(series, order=order).fit()
+        except Exception as e:
+            logger.debug(f"ARIMA with order={order} failed: {e}")
+            return order, None
+
+def select_arima_order(series: pd.Series, p_values: Any = DEFAULT_P_VALUES, d_values: Any = DEFAULT_D_VALUES,
+                       q_values: Any = DEFAULT_Q_VALUES, top: int = PRESCREEN_TOP, margin: float = EARLY_STOP_MARGIN,
+                       max_workers: int = 1, executor: Optional[ProcessPoolExecutor] = None) -> Dict[str, Any]:
+    """
+    Searches ARIMA orders and returns the lowest-AIC fitted model.
+
+    Candidates surviving ``prescreen_orders`` are fitted exactly, best pre-screen
+    score first, with up to ``max_workers`` fits in flight on a process pool.
+    A candidate is skipped once its pre-screen score is more than ``margin`` worse
+    than the best exact AIC found so far.
+    """
+    candidates = deque(prescreen_orders(series, p_values, d_values, q_values, top, margin))
+    total = len(p_values) * len(d_values) * len(q_values)
+    best_fit, best_aic, fitted, skipped = None, float("inf"), 0, 0
+
+    def consider(order: Tuple[int, int, int], model_fit: Any) -> None:
+        nonlocal best_fit, best_aic, fitted
+        fitted += 1
+        if model_fit is not None and np.isfinite(model_fit.aic) and model_fit.aic < best_aic:
+            best_fit, best_aic = model_fit, model_fit.aic
+
+    if max_workers <= 1 and executor is None:
+        while candidates:
+            order, approx_aic = candidates.popleft()
+            if approx_aic > best_aic + margin:
+                skipped += 1
+                continue
+            consider(*_fit_arima(series, order))
+    else:
+        pool = executor or ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            pending = set()
+            while candidates or pending:
+                while candidates and len(pending) < max_workers:
+                    order, approx_aic = candidates.popleft()
+                    if approx_aic > best_aic + margin:
+                        skipped += 1
+                        continue
+                    pending.add(pool.submit(_fit_arima, series, order))
+                if not pending:
+                    continue
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    consider(*future.result())
+        finally:
+            if executor is None:
+                pool.shutdown(wait=True)
+    return {
+        "model_fit": best_fit,
+        "order": tuple(best_fit.model.order) if best_fit is not None else None,
+        "aic": best_aic,
+        "candidates": total,
+        "fitted": fitted,
+        "pruned": total - fitted - skipped,
+        "skipped_early": skipped,
+    }
+
+def _forecast_series(task: Tuple[str, pd.Series, Dict[str, Any], int, float]) -> Tuple[str, Dict[str, Any]]:
+    """Order search, fit and forecast for one series of a batch; runs in worker processes."""
+    series_id, series, search, steps, alpha = task
+    try:
+        selection = select_arima_order(series, **search)
+        model_fit = selection["model_fit"]
+        if model_fit is None:
+            return series_id, {"error": "Could not find a suitable ARIMA order."}
+        forecast = model_fit.get_forecast(steps=steps)
+        return series_id, {
+            "order": selection["order"],
+            "aic": float(selection["aic"]),
+            "forecast": forecast.predicted_mean.tolist(),
+            "confidence_interval": forecast.conf_int(alpha=alpha).values.tolist(),
+        }
+    except Exception as e:
+        return series_id, {"error": str(e)}
+
+def _forecast_chunk(tasks: List[Tuple[str, pd.Series, Dict[str, Any], int, float]]) -> List[Tuple[str, Dict[str, Any]]]:
+    return [_forecast_series(task) for task in tasks]
+
 class TimeSeriesForecastingTool(BaseTool):
     """
     A tool for performing time series forecasting using ARIMA models.
@@ -32,7 +198,7 @@ class TimeSeriesForecastingTool(BaseTool):
             "properties": {
                 "action": {
                     "type": "string",
-                    "description": "The action to perform: 'train', 'forecast', 'evaluate', 'find_best_order', 'save_model', 'load_model'."
+                    "description": "The action to perform: 'train', 'forecast', 'evaluate', 'find_best_order', 'forecast_batch', 'save_model', 'load_model'."
                 },
                 "model_name": {"type": "string", "description": "A unique name for the model."},
                 "data": {
@@ -41,6 +207,11 @@ class TimeSeriesForecastingTool(BaseTool):
                 },
                 "steps": {"type": "integer", "description": "The number of future steps to forecast."},
                 "order": {"type": "array", "items": {"type": "integer"}, "description": "A tuple for the ARIMA order (p,d,q)."},
+                "series": {"type": "object", "description": "For 'forecast_batch': a mapping of series id to data (list of values)."},
+                "p_values": {"type": "array", "items": {"type": "integer"}, "description": "Candidate AR orders for 'find_best_order' and 'forecast_batch'."},
+                "d_values": {"type": "array", "items": {"type": "integer"}, "description": "Candidate differencing orders."},
+                "q_values": {"type": "array", "items": {"type": "integer"}, "description": "Candidate MA orders."},
+                "max_workers": {"type": "integer", "description": "Number of worker processes for order search (defaults to the CPU count; short series are searched serially)."},
                 "file_path": {"type": "string", "description": "File path for saving or loading a model."},
                 "output_format": {"type": "string", "description": "Output format ('json' or 'text').", "default": "json"}
             },
@@ -50,7 +221,7 @@ class TimeSeriesForecastingTool(BaseTool):
     def execute(self, action: str, **kwargs: Any) -> Union[str, Dict, List]:
         try:
             action = action.lower()
-            model_name = kwargs.get("model_name")
+            model_name = kwargs.pop("model_name", None)
             if not model_name:
                 return self._format_output({"error": "'model_name' is a required parameter."}, kwargs.get("output_format", "json"))
 
@@ -59,6 +230,7 @@ class TimeSeriesForecastingTool(BaseTool):
                 "forecast": self._make_forecast,
                 "evaluate": self._evaluate_model,
                 "find_best_order": self._find_best_order,
+                "forecast_batch": self._forecast_batch,
                 "save_model": self._save_model,
                 "load_model": self._load_model,
             }
@@ -128,31 +300,60 @@ class TimeSeriesForecastingTool(BaseTool):
         
         return {"mean_squared_error": mse, "mean_absolute_error": mae}
 
-    def _find_best_order(self, model_name: str, data: Any, p_values: range = range(3), d_values: range = range(2), q_values: range = range(3), **kwargs) -> Dict:
+    def _find_best_order(self, model_name: str, data: Any, p_values: Any = DEFAULT_P_VALUES, d_values: Any = DEFAULT_D_VALUES,
+                         q_values: Any = DEFAULT_Q_VALUES, max_workers: Optional[int] = None,
+                         prescreen_top: int = PRESCREEN_TOP, **kwargs) -> Dict:
         data_series = self._load_data_to_series(data)
-        best_aic, best_order = float("inf"), None
-        
-        warnings.filterwarnings("ignore") # Suppress convergence warnings
-        for p in p_values:
-            for d in d_values:
-                for q in q_values:
-                    try:
-                        model = ARIMA(data_series, order=(p,d,q))
-                        model_fit = model.fit()
-                        if model_fit.aic < best_aic:
-                            best_aic, best_order = model_fit.aic, (p,d,q)
-                    except Exception as e:
-                        logger.debug(f"ARIMA with order=({p},{d},{q}) failed: {e}")
-                        continue
-        warnings.resetwarnings()
+        if max_workers is None and len(data_series) < PARALLEL_FIT_MIN_OBSERVATIONS:
+            max_workers = 1
+        workers = max_workers or FIT_POOL_WORKERS
+        selection = select_arima_order(data_series, list(p_values), list(d_values), list(q_values), top=prescreen_top,
+                                       max_workers=workers, executor=fit_pool() if workers > 1 else None)
 
-        if best_order:
-            # Optionally train and store the best model
-            self._train_model(model_name, data_series, best_order)
-            return {"best_order": best_order, "best_aic": best_aic, "message": f"Model '{model_name}' has been trained with this order."}
+        if selection["model_fit"] is not None:
+            # The winning fit is kept as-is instead of being retrained.
+            self.models[model_name] = selection["model_fit"]
+            return {
+                "best_order": selection["order"], "best_aic": float(selection["aic"]),
+                "candidates": selection["candidates"], "fitted": selection["fitted"],
+                "pruned": selection["pruned"], "skipped_early": selection["skipped_early"],
+                "message": f"Model '{model_name}' has been trained with this order."
+            }
         else:
             return {"error": "Could not find a suitable ARIMA order. Try different p,d,q ranges or check data."}
 
+    def _forecast_batch(self, model_name: str, series: Dict[str, Any], steps: int, p_values: Any = DEFAULT_P_VALUES,
+                        d_values: Any = DEFAULT_D_VALUES, q_values: Any = DEFAULT_Q_VALUES, max_workers: Optional[int] = None,
+                        prescreen_top: int = PRESCREEN_TOP, alpha: float = 0.05, **kwargs) -> Dict:
+        """
+        Selects an order, fits and forecasts every series in ``series`` (id -> data).
+        Whole series are distributed over the shared fit pool, at most ``max_workers``
+        chunks at a time, since with many series that parallelizes better than fitting
+        one series' candidates concurrently.
+        """
+        if isinstance(series, str):
+            series = json.loads(series)
+        if not isinstance(series, dict) or not series:
+            raise ValueError("'series' must be a non-empty mapping of series id to data.")
+        search = {"p_values": list(p_values), "d_values": list(d_values), "q_values": list(q_values), "top": prescreen_top}
+        tasks = [(str(series_id), self._load_data_to_series(values), search, steps, alpha) for series_id, values in series.items()]
+        workers = min(max_workers or FIT_POOL_WORKERS, len(tasks))
+        if workers <= 1:
+            results = dict(map(_forecast_series, tasks))
+        else:
+            size = max(1, len(tasks) // (workers * 8))
+            chunks = deque(tasks[start:start + size] for start in range(0, len(tasks), size))
+            pool, pending, results = fit_pool(), set(), {}
+            while chunks or pending:
+                while chunks and len(pending) < workers:
+                    pending.add(pool.submit(_forecast_chunk, chunks.popleft()))
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results.update(future.result())
+            results = {task[0]: results[task[0]] for task in tasks}  # in the caller's order
+        failed = sum(1 for result in results.values() if "error" in result)
+        return {"series": results, "succeeded": len(results) - failed, "failed": failed}
+
     def _load_model(self, model_name: str, file_path: str, **kwargs) -> Dict:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Model file not found at {file_path}")
@@ -178,4 +379,33 @@ class TimeSeriesForecastingTool(BaseTool):
                 return "\n".join([f"{k}: {v}" for k, v in result.items()])
             elif isinstance(result, list):
                 return "\n".join([str(item) for item in result])
-            return str(result)
\ No newline at end of file
+            return str(result)
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    # Benchmark: batched order search + forecast for many short series (default 200;
+    # pass a count on the command line), e.g. one series per SKU.
+    num_series = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = np.random.default_rng(0)
+    series = {f"sku-{i}": (np.cumsum(rng.normal(size=156)) + 100).tolist() for i in range(num_series)}
+    tool = TimeSeriesForecastingTool()
+
+    sample = pd.Series(series["sku-0"])
+    started = time.perf_counter()
+    for p in DEFAULT_P_VALUES:
+        for d in DEFAULT_D_VALUES:
+            for q in DEFAULT_Q_VALUES:
+                _fit_arima(sample, (p, d, q))
+    exhaustive = time.perf_counter() - started
+    started = time.perf_counter()
+    selection = select_arima_order(sample)
+    print(f"One series: exhaustive search {exhaustive:.2f}s, pre-screened search {time.perf_counter() - started:.2f}s "
+          f"({selection['fitted']} of {selection['candidates']} candidates fitted, order={selection['order']})")
+
+    started = time.perf_counter()
+    result = tool.execute(action="forecast_batch", model_name="benchmark", series=series, steps=12)
+    elapsed = time.perf_counter() - started
+    print(f"Batch: {num_series} series in {elapsed:.2f}s ({num_series / elapsed:.1f} series/s on {os.cpu_count()} CPUs), "
+          f"{result['failed']} failed")
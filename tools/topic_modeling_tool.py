@@ -1,28 +1,274 @@
+import copy
+import hashlib
 import logging
-from typing import Dict, Any, List
-from tools.base_tool import BaseTool
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.decomposition import LatentDirichletAllocation
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Any, List, Optional
+
 import numpy as np
+import scipy.sparse as sp
+from joblib import Parallel, delayed
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.utils import murmurhash3_32
+
+from tools.base_tool import BaseTool
+from tools.model_registry import model_registry
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_HASH_FEATURES = 2 ** 18
+DEFAULT_BATCH_SIZE = 4096
+DEFAULT_EXPECTED_DOCUMENTS = 1_000_000
+CORPUS_CACHE_MAX_ENTRIES = 32
+PARALLEL_VECTORIZE_MIN_DOCUMENTS = 20_000
+VOCABULARY_SAMPLE_PER_BATCH = 2_000
+VOCABULARY_MAX_TERMS = 500_000
+REGISTRY_PREFIX = "topic_model_"
+
+
+class _CorpusCache:
+    """
+    LRU cache of hashed document-term matrices keyed by the content of the documents
+    and the hashing configuration, so a corpus is tokenized once however many
+    times it is fitted, updated or scored.
+    """
+    def __init__(self, max_entries: int = CORPUS_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, sp.csr_matrix]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(documents: List[str], n_features: int) -> str:
+        digest = hashlib.sha256(str(n_features).encode("utf-8"))
+        for document in documents:
+            encoded = document.encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "little"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[sp.csr_matrix]:
+        with self._lock:
+            matrix = self._entries.get(key)
+            if matrix is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return matrix
+
+    def put(self, key: str, matrix: sp.csr_matrix) -> None:
+        with self._lock:
+            self._entries[key] = matrix
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+corpus_cache = _CorpusCache()
+
+
+def _make_vectorizer(n_features: int) -> HashingVectorizer:
+    # Stateless: nothing is fitted, so new documents never require re-vectorizing the corpus.
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None, stop_words='english')
+
+
+def vectorize_documents(documents: List[str], n_features: int = DEFAULT_HASH_FEATURES, n_jobs: int = -1,
+                        use_cache: bool = True) -> sp.csr_matrix:
+    """
+    Returns the hashed term-count matrix for ``documents``. Large corpora are split
+    into chunks and hashed in parallel; results are memoised in ``corpus_cache``.
+    """
+    key = corpus_cache.key(documents, n_features) if use_cache else None
+    if key is not None:
+        cached = corpus_cache.get(key)
+        if cached is not None:
+            return cached
+    vectorizer = _make_vectorizer(n_features)
+    if n_jobs != 1 and len(documents) >= PARALLEL_VECTORIZE_MIN_DOCUMENTS:
+        chunk_size = PARALLEL_VECTORIZE_MIN_DOCUMENTS // 2
+        chunks = [documents[start:start + chunk_size] for start in range(0, len(documents), chunk_size)]
+        parts = Parallel(n_jobs=n_jobs)(delayed(vectorizer.transform)(chunk) for chunk in chunks)
+        matrix = sp.vstack(parts, format="csr")
+    else:
+        matrix = vectorizer.transform(documents)
+    matrix = matrix.astype(np.float32)
+    if key is not None:
+        corpus_cache.put(key, matrix)
+    return matrix
+
+
+class OnlineTopicModel:
+    """
+    An LDA model trained with online variational Bayes over hashed term counts.
+    Hashing has no vocabulary to fit, so the model can be updated with
+    ``partial_fit`` as documents arrive; a sampled term counter maps hashed
+    feature indices back to readable words for topic summaries. A model is
+    safe to share between threads: its state changes and reads take a lock.
+    """
+    def __init__(self, num_topics: int = 5, n_features: int = DEFAULT_HASH_FEATURES,
+                 batch_size: int = DEFAULT_BATCH_SIZE, expected_documents: int = DEFAULT_EXPECTED_DOCUMENTS,
+                 n_jobs: int = -1, random_state: int = 42):
+        self.num_topics = num_topics
+        self.n_features = n_features
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+        self.lda = LatentDirichletAllocation(
+            n_components=num_topics,
+            learning_method='online',
+            learning_offset=10.0,
+            batch_size=batch_size,
+            total_samples=expected_documents,
+            n_jobs=n_jobs,
+            random_state=random_state,
+        )
+        self.documents_seen = 0
+        self.updates = 0
+        self.term_counts: Counter = Counter()
+        self._index_terms: Optional[Dict[int, str]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_fitted(self) -> bool:
+        return hasattr(self.lda, "components_")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Copied under the lock, so a model saved while it is being updated is pickled consistently.
+        with self._lock:
+            state = self.__dict__.copy()
+            state["lda"] = copy.deepcopy(self.lda)
+            state["term_counts"] = self.term_counts.copy()
+        state["_index_terms"] = None
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _observe_terms(self, documents: List[str]) -> None:
+        analyzer = _make_vectorizer(self.n_features).build_analyzer()
+        step = max(1, len(documents) // VOCABULARY_SAMPLE_PER_BATCH)
+        for document in documents[::step]:
+            self.term_counts.update(analyzer(document))
+        if len(self.term_counts) > VOCABULARY_MAX_TERMS:
+            self.term_counts = Counter(dict(self.term_counts.most_common(VOCABULARY_MAX_TERMS // 2)))
+        self._index_terms = None
+
+    def _terms_by_index(self) -> Dict[int, str]:
+        if self._index_terms is None:
+            index_terms: Dict[int, str] = {}
+            # most_common order means a colliding index keeps its most frequent term.
+            for term, _ in self.term_counts.most_common():
+                index = abs(murmurhash3_32(term, positive=False)) % self.n_features
+                index_terms.setdefault(index, term)
+            self._index_terms = index_terms
+        return self._index_terms
+
+    def fit(self, documents: List[str], passes: int = 10) -> "OnlineTopicModel":
+        """Trains from scratch with ``passes`` online sweeps over ``documents``."""
+        dtm = vectorize_documents(documents, self.n_features, self.n_jobs)
+        with self._lock:
+            self.term_counts = Counter()
+            self._observe_terms(documents)
+            self.lda.set_params(max_iter=passes, total_samples=max(len(documents), 1))
+            self.lda.fit(dtm)
+            self.documents_seen = len(documents)
+            self.updates = 1
+        return self
+
+    def partial_fit(self, documents: List[str]) -> "OnlineTopicModel":
+        """Updates the model with one or more mini-batches of new documents."""
+        dtm = vectorize_documents(documents, self.n_features, self.n_jobs)
+        with self._lock:
+            self._observe_terms(documents)
+            for start in range(0, dtm.shape[0], self.batch_size):
+                self.lda.partial_fit(dtm[start:start + self.batch_size])
+            self.documents_seen += len(documents)
+            self.updates += 1
+        return self
+
+    def transform(self, documents: List[str]) -> np.ndarray:
+        """Infers per-document topic distributions with the current topics fixed."""
+        dtm = vectorize_documents(documents, self.n_features, self.n_jobs)
+        with self._lock:
+            if not self.is_fitted:
+                raise ValueError("The topic model has not been trained yet.")
+            return self.lda.transform(dtm)
+
+    def top_words(self, num_words: int = 10) -> Dict[str, List[str]]:
+        with self._lock:
+            if not self.is_fitted:
+                raise ValueError("The topic model has not been trained yet.")
+            index_terms = self._terms_by_index()
+            components = self.lda.components_.copy()
+        topics = {}
+        for topic_idx, topic in enumerate(components):
+            words: List[str] = []
+            # Indices never seen in the sampled vocabulary are skipped rather than shown as hashes.
+            for index in np.argsort(topic)[::-1]:
+                term = index_terms.get(int(index))
+                if term is not None:
+                    words.append(term)
+                    if len(words) == num_words:
+                        break
+            topics[f"Topic {topic_idx + 1}"] = words
+        return topics
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "num_topics": self.num_topics,
+                "n_features": self.n_features,
+                "batch_size": self.batch_size,
+                "documents_seen": self.documents_seen,
+                "updates": self.updates,
+                "vocabulary_sample_size": len(self.term_counts),
+            }
+
+
+topic_models: Dict[str, OnlineTopicModel] = {}
+_topic_models_lock = threading.Lock()
+
+
 class TopicModelingTool(BaseTool):
     """
     A tool for performing topic modeling on a collection of documents using Latent Dirichlet Allocation (LDA).
+    Models are kept by name so they can be updated incrementally and used for inference on new documents.
     """
+    thread_safe = True  # the model table and each model are locked
     def __init__(self, tool_name: str = "topic_modeling_tool"):
         super().__init__(tool_name)
 
     @property
     def description(self) -> str:
-        return "Identifies topics from a list of documents using Latent Dirichlet Allocation (LDA)."
+        return ("Identifies topics from a list of documents using Latent Dirichlet Allocation (LDA). Named models persist "
+                "between calls: they can be updated with new documents in mini-batches, used to infer topic "
+                "distributions for unseen documents without refitting, and saved to or loaded from the model registry.")
 
     @property
     def parameters(self) -> Dict[str, Any]:
         return {
             "type": "object",
             "properties": {
+                "operation": {
+                    "type": "string",
+                    "enum": ["fit", "update", "infer", "get_topics", "save", "load", "list", "delete"],
+                    "description": "'fit' trains a model from scratch, 'update' adds documents with online updates, "
+                                   "'infer' returns topic distributions for documents without refitting.",
+                    "default": "fit"
+                },
+                "model_name": {
+                    "type": "string",
+                    "description": "Name of the persistent topic model.",
+                    "default": "default"
+                },
                 "documents": {
                     "type": "array",
                     "items": {"type": "string"},
@@ -37,44 +283,149 @@ class TopicModelingTool(BaseTool):
                     "type": "integer",
                     "description": "The number of top words to display for each topic.",
                     "default": 10
+                },
+                "batch_size": {
+                    "type": "integer",
+                    "description": "Mini-batch size for online updates.",
+                    "default": DEFAULT_BATCH_SIZE
+                },
+                "expected_documents": {
+                    "type": "integer",
+                    "description": "Expected total corpus size when a model is created by 'update'; scales the online updates.",
+                    "default": DEFAULT_EXPECTED_DOCUMENTS
+                },
+                "n_jobs": {
+                    "type": "integer",
+                    "description": "Number of worker processes for vectorizing and fitting (-1 uses all cores).",
+                    "default": -1
+                },
+                "version": {
+                    "type": ["integer", "string"],
+                    "description": "Registry version or alias to load.",
+                    "default": "latest"
                 }
             },
-            "required": ["documents"]
+            "required": []
         }
 
-    def execute(self, documents: List[str], num_topics: int = 5, num_words_per_topic: int = 10, **kwargs) -> Dict[str, Any]:
-        """
-        Performs LDA topic modeling on a list of documents.
-        """
+    @staticmethod
+    def _validate_documents(documents: Any) -> Optional[Dict[str, Any]]:
         if not documents or not isinstance(documents, list) or not all(isinstance(doc, str) for doc in documents):
             return {"error": "'documents' must be a non-empty list of strings."}
-        
-        if len(documents) < num_topics:
-            return {"error": "The number of documents must be greater than or equal to the number of topics."}
+        return None
 
+    def execute(self, documents: Optional[List[str]] = None, num_topics: int = 5, num_words_per_topic: int = 10,
+                operation: str = "fit", model_name: str = "default", batch_size: int = DEFAULT_BATCH_SIZE,
+                expected_documents: int = DEFAULT_EXPECTED_DOCUMENTS, n_jobs: int = -1,
+                version: Any = "latest", **kwargs) -> Dict[str, Any]:
+        """
+        Performs LDA topic modeling on a list of documents.
+        """
         try:
-            # Vectorize the text data
-            vectorizer = CountVectorizer(max_df=0.95, min_df=2, stop_words='english')
-            dtm = vectorizer.fit_transform(documents)
-            
-            # Fit the LDA model
-            lda = LatentDirichletAllocation(n_components=num_topics, random_state=42)
-            lda.fit(dtm)
-            
-            # Get the topics and their top words
-            feature_names = vectorizer.get_feature_names_out()
-            topics = {}
-            for topic_idx, topic in enumerate(lda.components_):
-                top_words_indices = topic.argsort()[:-num_words_per_topic - 1:-1]
-                top_words = [feature_names[i] for i in top_words_indices]
-                topics[f"Topic {topic_idx + 1}"] = top_words
-            
-            return {"topics": topics}
+            if operation in ("fit", "update", "infer"):
+                invalid = self._validate_documents(documents)
+                if invalid:
+                    return invalid
+
+            if operation == "fit":
+                if len(documents) < num_topics:
+                    return {"error": "The number of documents must be greater than or equal to the number of topics."}
+                model = OnlineTopicModel(num_topics=num_topics, batch_size=batch_size, n_jobs=n_jobs)
+                model.fit(documents)
+                with _topic_models_lock:
+                    topic_models[model_name] = model
+                return {"model_name": model_name, "topics": model.top_words(num_words_per_topic), **model.summary()}
+
+            if operation == "update":
+                with _topic_models_lock:
+                    model = topic_models.get(model_name)
+                    if model is None:
+                        model = OnlineTopicModel(num_topics=num_topics, batch_size=batch_size,
+                                                 expected_documents=expected_documents, n_jobs=n_jobs)
+                        topic_models[model_name] = model
+                model.partial_fit(documents)
+                return {"model_name": model_name, "topics": model.top_words(num_words_per_topic), **model.summary()}
+
+            if operation == "list":
+                with _topic_models_lock:
+                    models = dict(topic_models)
+                return {"models": {name: model.summary() for name, model in models.items()}}
+
+            if operation == "load":
+                model = copy.deepcopy(model_registry.load(REGISTRY_PREFIX + model_name, version, mmap_mode=None))
+                with _topic_models_lock:
+                    topic_models[model_name] = model
+                return {"model_name": model_name, "loaded": True, **model.summary()}
+
+            with _topic_models_lock:
+                model = topic_models.get(model_name)
+            if model is None:
+                return {"error": f"Topic model '{model_name}' not found. Fit, update or load it first."}
+
+            if operation == "infer":
+                distributions = model.transform(documents)
+                return {
+                    "model_name": model_name,
+                    "documents": [
+                        {"dominant_topic": f"Topic {int(row.argmax()) + 1}",
+                         "topic_distribution": {f"Topic {i + 1}": round(float(p), 4) for i, p in enumerate(row)}}
+                        for row in distributions
+                    ],
+                }
+            if operation == "get_topics":
+                return {"model_name": model_name, "topics": model.top_words(num_words_per_topic), **model.summary()}
+            if operation == "save":
+                record = model_registry.register(REGISTRY_PREFIX + model_name, model, model.summary())
+                return {"model_name": model_name, "version": record["version"], "sha256": record["sha256"]}
+            if operation == "delete":
+                with _topic_models_lock:
+                    topic_models.pop(model_name, None)
+                return {"model_name": model_name, "deleted": True}
+            return {"error": f"Unknown operation: {operation}"}
 
         except ValueError as e:
-            # Catch errors from CountVectorizer (e.g., empty vocabulary)
+            # Catch errors from vectorizing or fitting (e.g., empty documents) and untrained models
             logger.error(f"A ValueError occurred during topic modeling: {e}")
             return {"error": f"Could not process documents. Ensure they contain enough meaningful content. Details: {e}"}
         except Exception as e:
             logger.error(f"An unexpected error occurred during topic modeling: {e}")
-            return {"error": f"An unexpected error occurred: {e}"}
\ No newline at end of file
+            return {"error": f"An unexpected error occurred: {e}"}
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    total_documents = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    mini_batch = 20_000
+    rng = np.random.default_rng(0)
+    themes = [
+        "market stock price trading investor shares profit revenue earnings dividend",
+        "football match goal player team league coach season score stadium",
+        "patient doctor hospital treatment disease health medicine clinic symptoms nurse",
+        "software code developer programming release bug compiler database server cloud",
+        "election vote government minister parliament policy campaign party senate law",
+    ]
+    theme_words = [theme.split() for theme in themes]
+
+    def synthetic_batch(size: int) -> List[str]:
+        labels = rng.integers(0, len(themes), size)
+        return [" ".join(rng.choice(theme_words[label], 12)) for label in labels]
+
+    model = OnlineTopicModel(num_topics=len(themes), expected_documents=total_documents)
+    started = time.perf_counter()
+    processed = 0
+    while processed < total_documents:
+        batch = synthetic_batch(min(mini_batch, total_documents - processed))
+        model.partial_fit(batch)
+        processed += len(batch)
+    elapsed = time.perf_counter() - started
+    print(f"online LDA: {processed:,} documents in {elapsed:.1f}s ({processed / elapsed:,.0f} docs/s)")
+    for topic, words in model.top_words(5).items():
+        print(f"  {topic}: {', '.join(words)}")
+
+    probe = synthetic_batch(10_000)
+    vectorize_documents(probe)
+    started = time.perf_counter()
+    model.transform(probe)
+    print(f"inference (cached corpus): 10,000 documents in {time.perf_counter() - started:.2f}s")
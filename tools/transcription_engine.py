@@ -0,0 +1,557 @@
+import json
+import logging
+import os
+import subprocess  # nosec B404
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from scipy.cluster.hierarchy import fcluster, linkage
+    from scipy.fft import dct
+    from scipy.signal import resample_poly
+    SCIPY_AVAILABLE = True
+except ImportError:
+    fcluster = linkage = dct = resample_poly = None
+    SCIPY_AVAILABLE = False
+
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    WhisperModel = None
+    FASTER_WHISPER_AVAILABLE = False
+
+try:
+    import vosk
+    VOSK_AVAILABLE = True
+except ImportError:
+    vosk = None
+    VOSK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+FFPROBE_BINARY = os.getenv("FFPROBE_BINARY", "ffprobe")
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "auto")
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH")
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", min(4, os.cpu_count() or 1)))
+DIARIZATION_THRESHOLD = float(os.getenv("DIARIZATION_THRESHOLD", 0.5))
+
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 400  # 25 ms
+HOP_LENGTH = 160  # 10 ms; all frame indices below are in hops
+FRAMES_PER_SECOND = SAMPLE_RATE // HOP_LENGTH
+N_FFT = 512
+N_MELS = 40
+N_MFCC = 20
+# Long recordings are analyzed in windows of this many seconds, in parallel.
+ANALYSIS_WINDOW_SECONDS = 300
+MAX_CHUNK_SECONDS = 30.0
+CHUNK_OVERLAP_SECONDS = 1.0
+VAD_MARGIN_DB = 12.0
+MIN_SPEECH_SECONDS = 0.25
+MIN_SILENCE_SECONDS = 0.3
+SPEECH_PAD_SECONDS = 0.1
+EMBEDDING_WINDOW_SECONDS = 1.5
+MIN_TURN_SECONDS = 0.5
+# Above this many embedding windows, cluster a subsample and assign the rest to the nearest centroid.
+MAX_CLUSTERED_WINDOWS = 2000
+
+def pcm_to_float32(raw: bytes, sample_width: int) -> np.ndarray:
+    """Little-endian PCM as WAV stores it (8-bit unsigned, 16/24/32-bit signed) to float32 in [-1, 1)."""
+    if sample_width == 1:
+        return (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    if sample_width == 2:
+        return np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    if sample_width == 3:
+        packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        return ((packed[:, 0] | (packed[:, 1] << 8) | (packed[:, 2] << 16)) << 8 >> 8).astype(np.float32) / 8388608.0
+    return np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+
+class AudioSource:
+    """
+    Random access to an audio file as 16 kHz mono float32. PCM WAV files are read
+    directly; anything else is decoded range by range through ffmpeg. Each read
+    opens the file itself, so concurrent reads from several threads are safe.
+    """
+    __slots__ = ("path", "duration", "_wav")
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Audio file not found at {path}")
+        self.path = path
+        try:
+            with wave.open(path, "rb") as f:
+                self._wav = (f.getnchannels(), f.getsampwidth(), f.getframerate())
+                self.duration = f.getnframes() / f.getframerate()
+        except (wave.Error, EOFError):
+            self._wav = None
+            self.duration = self._probe_duration()
+
+    def _probe_duration(self) -> float:
+        command = [FFPROBE_BINARY, "-v", "error", "-show_entries", "format=duration", "-of", "json", self.path]
+        try:
+            process = subprocess.run(command, capture_output=True, text=True, check=False)  # nosec B603
+        except FileNotFoundError:
+            raise RuntimeError(f"Only PCM WAV can be read without FFmpeg; '{FFPROBE_BINARY}' was not found.")
+        if process.returncode != 0:
+            raise RuntimeError(f"ffprobe failed for '{self.path}': {process.stderr.strip()}")
+        duration = json.loads(process.stdout or "{}").get("format", {}).get("duration")
+        if duration in (None, "N/A"):
+            raise ValueError(f"Could not determine the duration of '{self.path}'.")
+        return float(duration)
+
+    def read(self, start: float, end: float) -> np.ndarray:
+        """Samples between ``start`` and ``end`` seconds, clipped to the file."""
+        start, end = max(0.0, start), min(end, self.duration)
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+        if self._wav is None:
+            return self._read_ffmpeg(start, end)
+        channels, width, rate = self._wav
+        with wave.open(self.path, "rb") as f:
+            f.setpos(int(start * rate))
+            raw = f.readframes(int(round((end - start) * rate)))
+        samples = pcm_to_float32(raw, width)
+        samples = samples[:len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+        if rate != SAMPLE_RATE:
+            divisor = np.gcd(rate, SAMPLE_RATE)
+            samples = resample_poly(samples, SAMPLE_RATE // divisor, rate // divisor).astype(np.float32)
+        return samples
+
+    def _read_ffmpeg(self, start: float, end: float) -> np.ndarray:
+        command = [FFMPEG_BINARY, "-nostdin", "-v", "error", "-ss", f"{start:.3f}", "-t", f"{end - start:.3f}", "-i", self.path,
+                   "-vn", "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"]
+        try:
+            process = subprocess.run(command, capture_output=True, check=False)  # nosec B603
+        except FileNotFoundError:
+            raise RuntimeError(f"'{FFMPEG_BINARY}' was not found; install FFmpeg or convert the audio to WAV.")
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed for '{self.path}': {process.stderr.decode(errors='replace').strip()}")
+        return np.frombuffer(process.stdout, dtype="<f4").copy()
+
+def _mel_filterbank() -> np.ndarray:
+    def to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+    edges = 700.0 * (10 ** (np.linspace(to_mel(20.0), to_mel(SAMPLE_RATE / 2), N_MELS + 2) / 2595.0) - 1.0)
+    bins = np.fft.rfftfreq(N_FFT, 1.0 / SAMPLE_RATE)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32).T
+
+_MEL_FILTERBANK = _mel_filterbank()
+_WINDOW = np.hamming(FRAME_LENGTH).astype(np.float32)
+
+def frame_features(samples: np.ndarray, n_frames: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-frame log energy (dB) and MFCCs for ``n_frames`` hops of ``samples``;
+    ``samples`` must hold at least ``(n_frames - 1) * HOP_LENGTH + FRAME_LENGTH``
+    values and is zero-padded otherwise.
+    """
+    needed = (n_frames - 1) * HOP_LENGTH + FRAME_LENGTH
+    if len(samples) < needed:
+        samples = np.pad(samples, (0, needed - len(samples)))
+    frames = np.lib.stride_tricks.sliding_window_view(samples[:needed], FRAME_LENGTH)[::HOP_LENGTH]
+    energy = 10.0 * np.log10((frames * frames).mean(axis=1) + 1e-10)
+    spectrum = np.abs(np.fft.rfft(frames * _WINDOW, n=N_FFT)) ** 2
+    log_mel = np.log(spectrum.astype(np.float32) @ _MEL_FILTERBANK + 1e-6)
+    mfcc = dct(log_mel, type=2, norm="ortho", axis=1)[:, :N_MFCC]
+    return energy.astype(np.float32), mfcc.astype(np.float32)
+
+def analyze_audio(source: AudioSource, workers: int = TRANSCRIPTION_WORKERS,
+                  window_seconds: float = ANALYSIS_WINDOW_SECONDS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Frame energies and MFCCs of the whole recording. The file is read in windows
+    aligned to whole hops, each extended by one frame of overlap so the features
+    of adjacent windows stitch together exactly; windows are analyzed in parallel
+    and only one raw window per worker is ever in memory.
+    """
+    total_frames = int(source.duration * FRAMES_PER_SECOND)
+    window_frames = int(window_seconds * FRAMES_PER_SECOND)
+    starts = list(range(0, total_frames, window_frames))
+
+    def run(first: int) -> Tuple[np.ndarray, np.ndarray]:
+        count = min(window_frames, total_frames - first)
+        samples = source.read(first / FRAMES_PER_SECOND, (first + count) / FRAMES_PER_SECOND + FRAME_LENGTH / SAMPLE_RATE)
+        return frame_features(samples, count)
+
+    if not starts:
+        return np.zeros(0, dtype=np.float32), np.zeros((0, N_MFCC), dtype=np.float32)
+    if workers > 1 and len(starts) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(starts))) as pool:
+            parts = list(pool.map(run, starts))
+    else:
+        parts = [run(first) for first in starts]
+    return np.concatenate([part[0] for part in parts]), np.concatenate([part[1] for part in parts])
+
+def _runs(mask: np.ndarray) -> np.ndarray:
+    """(start, end) frame pairs of the True runs of ``mask``."""
+    edges = np.flatnonzero(np.diff(np.concatenate([[False], mask, [False]]).astype(np.int8)))
+    return edges.reshape(-1, 2)
+
+def speech_regions(energy: np.ndarray, margin_db: float = VAD_MARGIN_DB) -> List[Tuple[int, int]]:
+    """
+    Energy voice activity detection with a threshold relative to the recording's
+    own noise floor (10th percentile) and loudness (99th percentile). Pauses shorter
+    than MIN_SILENCE_SECONDS are bridged, blips shorter than MIN_SPEECH_SECONDS are
+    dropped and every region is padded by SPEECH_PAD_SECONDS.
+    """
+    if len(energy) == 0:
+        return []
+    noise, peak = np.percentile(energy, 10), np.percentile(energy, 99)
+    if peak - noise < 6.0:
+        # Nearly constant level: either all silence or uninterrupted speech.
+        return [(0, len(energy))] if peak > -50.0 else []
+    mask = energy > noise + min(margin_db, 0.4 * (peak - noise))
+    for start, end in _runs(~mask):
+        if start > 0 and end < len(mask) and end - start < MIN_SILENCE_SECONDS * FRAMES_PER_SECOND:
+            mask[start:end] = True
+    pad = int(SPEECH_PAD_SECONDS * FRAMES_PER_SECOND)
+    regions: List[Tuple[int, int]] = []
+    for start, end in _runs(mask):
+        if end - start < MIN_SPEECH_SECONDS * FRAMES_PER_SECOND:
+            continue
+        start, end = max(0, int(start) - pad), min(len(mask), int(end) + pad)
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return regions
+
+def speaker_embeddings(mfcc: np.ndarray, regions: List[Tuple[int, int]]) -> Tuple[np.ndarray, List[Tuple[int, int, int]]]:
+    """
+    One embedding per EMBEDDING_WINDOW_SECONDS window (half overlapping) of speech:
+    mean and standard deviation of the mean/variance-normalized MFCCs (without c0,
+    which only carries loudness), centered and L2-normalized. Returns the embeddings
+    and (region index, start frame, end frame) of each window.
+    """
+    if not regions:
+        return np.zeros((0, 2 * (N_MFCC - 1)), dtype=np.float32), []
+    speech = np.concatenate([mfcc[start:end, 1:] for start, end in regions])
+    mean, std = speech.mean(axis=0), speech.std(axis=0) + 1e-6
+    size = int(EMBEDDING_WINDOW_SECONDS * FRAMES_PER_SECOND)
+    windows, vectors = [], []
+    for number, (start, end) in enumerate(regions):
+        features = (mfcc[start:end, 1:] - mean) / std
+        length = end - start
+        offsets = [0] if length <= size else list(range(0, length - size + 1, size // 2))
+        if length > size and offsets[-1] + size < length:
+            offsets.append(length - size)
+        for offset in offsets:
+            chunk = features[offset:offset + size]
+            vectors.append(np.concatenate([chunk.mean(axis=0), chunk.std(axis=0)]))
+            windows.append((number, start + offset, start + min(offset + size, length)))
+    embeddings = np.asarray(vectors, dtype=np.float32)
+    embeddings -= embeddings.mean(axis=0)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-9
+    return embeddings, windows
+
+def cluster_speakers(embeddings: np.ndarray, num_speakers: Optional[int] = None, max_speakers: Optional[int] = None,
+                     threshold: float = DIARIZATION_THRESHOLD) -> np.ndarray:
+    """
+    Average-linkage agglomerative clustering on cosine distance, cut at ``threshold``
+    or at exactly ``num_speakers``/at most ``max_speakers`` clusters. Labels are
+    renumbered by first appearance.
+    """
+    n = len(embeddings)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if n == 1 or num_speakers == 1:
+        return np.zeros(n, dtype=np.int64)
+    sample = np.arange(n) if n <= MAX_CLUSTERED_WINDOWS else np.linspace(0, n - 1, MAX_CLUSTERED_WINDOWS).astype(np.int64)
+    tree = linkage(embeddings[sample], method="average", metric="cosine")
+    if num_speakers:
+        labels = fcluster(tree, num_speakers, criterion="maxclust")
+    else:
+        labels = fcluster(tree, threshold, criterion="distance")
+        if max_speakers and labels.max() > max_speakers:
+            labels = fcluster(tree, max_speakers, criterion="maxclust")
+    if len(sample) < n:
+        centroids = np.stack([embeddings[sample][labels == label].mean(axis=0) for label in range(1, labels.max() + 1)])
+        labels = np.argmax(embeddings @ centroids.T, axis=1) + 1
+    _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    order = np.argsort(np.argsort(first))
+    return order[inverse]
+
+def speaker_turns(regions: List[Tuple[int, int]], windows: List[Tuple[int, int, int]], labels: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Labels every speech frame with the speaker of the nearest embedding window and
+    returns contiguous single-speaker turns (in frames). Turns shorter than
+    MIN_TURN_SECONDS are absorbed by their neighbour, and turns of the same speaker
+    separated by a short pause are joined.
+    """
+    by_region: Dict[int, List[Tuple[float, int]]] = {}
+    for (number, start, end), label in zip(windows, labels):
+        by_region.setdefault(number, []).append(((start + end) / 2.0, int(label)))
+    minimum = MIN_TURN_SECONDS * FRAMES_PER_SECOND
+    turns: List[Dict[str, Any]] = []
+    for number, (start, end) in enumerate(regions):
+        centers = np.array([center for center, _ in by_region[number]])
+        speakers = np.array([label for _, label in by_region[number]])
+        frames = np.arange(start, end)
+        frame_speakers = speakers[np.searchsorted((centers[1:] + centers[:-1]) / 2.0, np.arange(start, end))]
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(frame_speakers)) + 1, [end - start]])
+        pieces: List[List[int]] = []
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            piece = [int(start + a), int(start + b), int(frame_speakers[a])]
+            if pieces and (piece[1] - piece[0] < minimum or pieces[-1][2] == piece[2]):
+                pieces[-1][1] = piece[1]
+            elif pieces and pieces[-1][1] - pieces[-1][0] < minimum:
+                pieces[-1][1:] = piece[1:]
+            else:
+                pieces.append(piece)
+        for first, last, speaker in pieces:
+            if turns and turns[-1]["speaker"] == speaker and first - turns[-1]["end"] < minimum:
+                turns[-1]["end"] = last
+            else:
+                turns.append({"start": first, "end": last, "speaker": speaker})
+    return turns
+
+def _plan_chunks(spans: List[Dict[str, Any]], energy: np.ndarray, max_seconds: float = MAX_CHUNK_SECONDS,
+                 overlap_seconds: float = CHUNK_OVERLAP_SECONDS) -> List[Dict[str, Any]]:
+    """
+    Splits spans (frames) longer than ``max_seconds`` at their quietest frame near
+    the limit. Forced splits fall inside speech, so the audio of both sides extends
+    ``overlap_seconds`` past the split and words are later kept only by the side
+    that owns their midpoint.
+    """
+    limit, overlap = int(max_seconds * FRAMES_PER_SECOND), int(overlap_seconds * FRAMES_PER_SECOND)
+    chunks = []
+    for span_index, span in enumerate(spans):
+        start, end = span["start"], span["end"]
+        pieces = []
+        while end - start > limit:
+            search_from = start + max(1, limit - 5 * FRAMES_PER_SECOND)
+            split = search_from + int(np.argmin(energy[search_from:start + limit]))
+            pieces.append((start, split))
+            start = split
+        pieces.append((start, end))
+        for number, (first, last) in enumerate(pieces):
+            chunks.append({
+                "span": span_index, "speaker": span.get("speaker"), "start": first, "end": last,
+                "audio_start": first - overlap if number > 0 else first,
+                "audio_end": last + overlap if number < len(pieces) - 1 else last,
+            })
+    for index, chunk in enumerate(chunks):
+        chunk["index"] = index
+    return chunks
+
+def _stitch_words(chunk: Dict[str, Any], words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Moves chunk-relative word times to the recording and drops words owned by the neighbouring chunk."""
+    offset = chunk["audio_start"] / FRAMES_PER_SECOND
+    low = chunk["start"] / FRAMES_PER_SECOND if chunk["audio_start"] < chunk["start"] else -np.inf
+    high = chunk["end"] / FRAMES_PER_SECOND if chunk["audio_end"] > chunk["end"] else np.inf
+    kept = []
+    for word in words:
+        start, end = word["start"] + offset, word["end"] + offset
+        if low <= (start + end) / 2.0 < high:
+            kept.append({**word, "start": round(start, 2), "end": round(end, 2)})
+    return kept
+
+class _FasterWhisperBackend:
+    """faster-whisper (CTranslate2) on CPU; ``num_workers`` lets that many chunks decode in parallel on one model."""
+    name = "faster_whisper"
+
+    def __init__(self, workers: int):
+        threads = max(1, (os.cpu_count() or 1) // max(1, workers))
+        self.model = WhisperModel(WHISPER_MODEL, device="cpu", compute_type=WHISPER_COMPUTE_TYPE,
+                                  cpu_threads=threads, num_workers=max(1, workers))
+
+    def transcribe(self, audio: np.ndarray, language: Optional[str]) -> List[Dict[str, Any]]:
+        segments, _ = self.model.transcribe(audio, language=language.split("-")[0].lower() if language else None,
+                                            beam_size=1, vad_filter=False, word_timestamps=True,
+                                            condition_on_previous_text=False)
+        return [{"word": word.word.strip(), "start": word.start, "end": word.end, "probability": round(word.probability, 3)}
+                for segment in segments for word in (segment.words or [])]
+
+class _VoskBackend:
+    """Vosk (Kaldi) recognizer; one lightweight recognizer per chunk over a shared model."""
+    name = "vosk"
+
+    def __init__(self, workers: int, language: Optional[str] = None):
+        self.model = vosk.Model(model_path=VOSK_MODEL_PATH) if VOSK_MODEL_PATH else vosk.Model(lang=(language or "en-us").lower())
+
+    def transcribe(self, audio: np.ndarray, language: Optional[str]) -> List[Dict[str, Any]]:
+        recognizer = vosk.KaldiRecognizer(self.model, SAMPLE_RATE)
+        recognizer.SetWords(True)
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+        results = []
+        for offset in range(0, len(pcm), SAMPLE_RATE * 2):
+            if recognizer.AcceptWaveform(pcm[offset:offset + SAMPLE_RATE * 2]):
+                results.append(json.loads(recognizer.Result()))
+        results.append(json.loads(recognizer.FinalResult()))
+        return [{"word": word["word"], "start": word["start"], "end": word["end"], "probability": round(word.get("conf", 1.0), 3)}
+                for result in results for word in result.get("result", [])]
+
+_BACKENDS: Dict[str, Any] = {}
+_BACKENDS_LOCK = threading.Lock()
+
+def available_backends() -> List[str]:
+    return [name for name, available in (("faster_whisper", FASTER_WHISPER_AVAILABLE), ("vosk", VOSK_AVAILABLE)) if available]
+
+def get_backend(name: str = TRANSCRIPTION_BACKEND, workers: int = TRANSCRIPTION_WORKERS, language: Optional[str] = None) -> Any:
+    """Loads an offline recognizer once per process ('auto' prefers faster-whisper over Vosk)."""
+    if name == "auto":
+        installed = available_backends()
+        if not installed:
+            raise RuntimeError("No offline speech recognition backend is installed. Install 'faster-whisper' or 'vosk'.")
+        name = installed[0]
+    if name not in ("faster_whisper", "vosk"):
+        raise ValueError(f"Unsupported transcription backend '{name}'.")
+    if name not in available_backends():
+        raise RuntimeError(f"Transcription backend '{name}' is not installed.")
+    with _BACKENDS_LOCK:
+        if name not in _BACKENDS:
+            logger.info(f"Loading offline speech recognition backend '{name}'.")
+            _BACKENDS[name] = _FasterWhisperBackend(workers) if name == "faster_whisper" else _VoskBackend(workers, language)
+        return _BACKENDS[name]
+
+class TranscriptionEngine:
+    """
+    Offline transcription with diarization.
+
+    A recording is analyzed once, in parallel windows, into frame energies and
+    MFCCs; energy VAD finds speech, MFCC-statistics speaker embeddings are clustered
+    into speakers, and the resulting single-speaker turns (at most MAX_CHUNK_SECONDS)
+    are the chunks handed to the recognizer. Only each chunk's own audio is decoded
+    and recognized, concurrently on one shared model, and results are yielded per
+    chunk as they complete.
+    """
+
+    def __init__(self, backend: Any = None, workers: int = TRANSCRIPTION_WORKERS):
+        self.backend = backend
+        self.workers = max(1, workers)
+
+    def _recognizer(self, language: Optional[str]) -> Any:
+        if self.backend is None or isinstance(self.backend, str):
+            return get_backend(self.backend or TRANSCRIPTION_BACKEND, self.workers, language)
+        return self.backend
+
+    def diarize(self, audio_file_path: str, num_speakers: Optional[int] = None,
+                max_speakers: Optional[int] = None) -> Dict[str, Any]:
+        """Speaker turns of the recording, without transcription."""
+        source = AudioSource(audio_file_path)
+        energy, mfcc = analyze_audio(source, self.workers)
+        regions = speech_regions(energy)
+        embeddings, windows = speaker_embeddings(mfcc, regions)
+        labels = cluster_speakers(embeddings, num_speakers, max_speakers)
+        turns = speaker_turns(regions, windows, labels)
+        return {"source": source, "energy": energy, "regions": regions, "turns": turns,
+                "num_speakers": int(labels.max()) + 1 if len(labels) else 0}
+
+    def stream(self, audio_file_path: str, language: Optional[str] = None, diarize: bool = True,
+               num_speakers: Optional[int] = None, max_speakers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yields one result per chunk, in completion order: index, speaker (or None),
+        start/end seconds, text and word timings.
+        """
+        recognizer = self._recognizer(language)
+        if diarize:
+            analysis = self.diarize(audio_file_path, num_speakers, max_speakers)
+            spans = analysis["turns"]
+        else:
+            source = AudioSource(audio_file_path)
+            energy, _ = analyze_audio(source, self.workers)
+            analysis = {"source": source, "energy": energy}
+            spans = [{"start": start, "end": end} for start, end in speech_regions(energy)]
+        chunks = _plan_chunks(spans, analysis["energy"])
+        source = analysis["source"]
+
+        def run(chunk: Dict[str, Any]) -> Dict[str, Any]:
+            audio = source.read(chunk["audio_start"] / FRAMES_PER_SECOND, chunk["audio_end"] / FRAMES_PER_SECOND)
+            words = _stitch_words(chunk, recognizer.transcribe(audio, language))
+            return {"index": chunk["index"], "span": chunk["span"],
+                    "speaker": None if chunk["speaker"] is None else f"Speaker_{chunk['speaker'] + 1}",
+                    "start": round(chunk["start"] / FRAMES_PER_SECOND, 2), "end": round(chunk["end"] / FRAMES_PER_SECOND, 2),
+                    "text": " ".join(word["word"] for word in words), "words": words}
+
+        if self.workers == 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                yield run(chunk)
+            return
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for future in as_completed([pool.submit(run, chunk) for chunk in chunks]):
+                yield future.result()
+
+    def transcribe(self, audio_file_path: str, language: Optional[str] = None, diarize: bool = True,
+                   num_speakers: Optional[int] = None, max_speakers: Optional[int] = None) -> Dict[str, Any]:
+        """Full transcript: chunks in order, joined back into one segment per speaker turn."""
+        start = time.perf_counter()
+        chunks = sorted(self.stream(audio_file_path, language, diarize, num_speakers, max_speakers), key=lambda chunk: chunk["index"])
+        segments: List[Dict[str, Any]] = []
+        for chunk in chunks:
+            if segments and segments[-1]["span"] == chunk["span"]:
+                segments[-1]["end"] = chunk["end"]
+                segments[-1]["words"].extend(chunk["words"])
+                segments[-1]["text"] = " ".join(part for part in (segments[-1]["text"], chunk["text"]) if part)
+            else:
+                segments.append(dict(chunk, words=list(chunk["words"])))
+        elapsed = time.perf_counter() - start
+        duration = AudioSource(audio_file_path).duration
+        return {
+            "duration_seconds": round(duration, 2),
+            "seconds": round(elapsed, 2),
+            "realtime_factor": round(duration / elapsed, 1) if elapsed > 0 else None,
+            "chunks": len(chunks),
+            "speakers": sorted({segment["speaker"] for segment in segments if segment["speaker"]}),
+            "text": " ".join(segment["text"] for segment in segments if segment["text"]),
+            "segments": [{key: value for key, value in segment.items() if key not in ("index", "span")} for segment in segments]
+        }
+
+def synthetic_speech(path: str, turns: List[Tuple[int, float, float]], duration: float, seed: int = 0) -> None:
+    """
+    Writes a 16 kHz WAV where each (speaker, start, end) turn is a voiced, formant-
+    filtered harmonic signal with a per-speaker pitch and vocal-tract shape. Used by
+    the tests and the benchmark.
+    """
+    rng = np.random.default_rng(seed)
+    audio = rng.normal(0.0, 0.002, int(duration * SAMPLE_RATE)).astype(np.float32)
+    voices = [(110.0, (700, 1200, 2600)), (210.0, (350, 2000, 2900)), (150.0, (500, 1500, 3400)), (260.0, (850, 1700, 2400))]
+    for speaker, start, end in turns:
+        pitch, formants = voices[speaker % len(voices)]
+        t = np.arange(int((end - start) * SAMPLE_RATE)) / SAMPLE_RATE
+        # Syllable-rate amplitude and pitch modulation so the signal is not stationary.
+        f0 = pitch * (1.0 + 0.05 * np.sin(2 * np.pi * 0.7 * t + speaker))
+        phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 30))
+        spectrum = np.fft.rfft(voiced)
+        frequencies = np.fft.rfftfreq(len(voiced), 1.0 / SAMPLE_RATE)
+        envelope = sum(1.0 / (1.0 + ((frequencies - formant) / 120.0) ** 2) for formant in formants)
+        signal = np.fft.irfft(spectrum * envelope, n=len(voiced))
+        signal *= 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 3.0 * t))
+        first = int(start * SAMPLE_RATE)
+        audio[first:first + len(signal)] += (0.3 * signal / (np.abs(signal).max() + 1e-9)).astype(np.float32)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+
+if __name__ == "__main__":
+    import tempfile
+
+    # Diarization front-end benchmark on a synthetic 30-minute, three-speaker recording.
+    minutes = float(os.getenv("TRANSCRIPTION_BENCHMARK_MINUTES", 30))
+    rng = np.random.default_rng(0)
+    turns, position = [], 0.5
+    while position < minutes * 60 - 10:
+        length = float(rng.uniform(2.0, 8.0))
+        turns.append((int(rng.integers(0, 3)), position, position + length))
+        position += length + float(rng.uniform(0.4, 1.5))
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "meeting.wav")
+        synthetic_speech(path, turns, minutes * 60)
+        for workers in sorted({1, TRANSCRIPTION_WORKERS}):
+            start = time.perf_counter()
+            result = TranscriptionEngine(workers=workers).diarize(path)
+            elapsed = time.perf_counter() - start
+            print(f"workers={workers}: {minutes:.0f} min diarized in {elapsed:.1f}s ({minutes * 60 / elapsed:.0f}x real time), "
+                  f"{result['num_speakers']} speakers, {len(result['turns'])} turns (reference: {len(turns)} turns)")
@@ -13,6 +13,7 @@ class UserFeedbackCollectionTool(BaseTool):
     """
     A tool to collect, manage, and analyze user feedback from a JSON file.
     """
+    thread_safe = False  # its JSON data files are rewritten without locking
     def __init__(self, tool_name: str = "user_feedback_collection_tool"):
         super().__init__(tool_name)
 
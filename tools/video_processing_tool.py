@@ -1,22 +1,277 @@
+import json
 import logging
-import random
-from typing import Dict, Any, List
-from tools.base_tool import BaseTool
-from moviepy.editor import VideoFileClip
 import os
+import subprocess  # nosec B404
+import tempfile
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from typing import Dict, Any, Iterator, List, Optional
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from tools.base_tool import BaseTool
 
 logger = logging.getLogger(__name__)
 
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+FFPROBE_BINARY = os.getenv("FFPROBE_BINARY", "ffprobe")
+SCENE_ANALYSIS_WIDTH = int(os.getenv("SCENE_ANALYSIS_WIDTH", "160"))
+SCENE_DETECTION_WORKERS = int(os.getenv("SCENE_DETECTION_WORKERS", min(4, os.cpu_count() or 1)))
+SCENE_BLOCK_FRAMES = 256
+HISTOGRAM_BINS = 16
+HISTOGRAM_WEIGHT = 0.5
+SSIM_WINDOW = 8
+_SSIM_C1 = (0.01 * 255) ** 2
+_SSIM_C2 = (0.03 * 255) ** 2
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+def probe_video(video_path: str) -> Dict[str, Any]:
+    """Returns width, height, fps and duration of the first video stream using ffprobe."""
+    command = [FFPROBE_BINARY, "-v", "error", "-select_streams", "v:0",
+               "-show_entries", "stream=width,height,avg_frame_rate,r_frame_rate:format=duration", "-of", "json", video_path]
+    try:
+        process = subprocess.run(command, capture_output=True, text=True, check=False)  # nosec B603
+    except FileNotFoundError:
+        raise RuntimeError(f"'{FFPROBE_BINARY}' was not found; install FFmpeg or set FFPROBE_BINARY.")
+    if process.returncode != 0:
+        raise RuntimeError(f"ffprobe failed for '{video_path}': {process.stderr.strip()}")
+    info = json.loads(process.stdout or "{}")
+    if not info.get("streams"):
+        raise ValueError(f"No video stream found in '{video_path}'.")
+    stream = info["streams"][0]
+    fps = 0.0
+    for key in ("avg_frame_rate", "r_frame_rate"):
+        try:
+            fps = float(Fraction(stream.get(key, "0/0")))
+        except (ValueError, ZeroDivisionError):
+            continue
+        if fps > 0:
+            break
+    duration = info.get("format", {}).get("duration")
+    return {"width": int(stream["width"]), "height": int(stream["height"]), "fps": fps or 25.0,
+            "duration": float(duration) if duration not in (None, "N/A") else None}
+
+def iter_frame_blocks(video_path: str, width: int, height: int, fps: Optional[float] = None,
+                      block_frames: int = SCENE_BLOCK_FRAMES) -> Iterator[np.ndarray]:
+    """
+    Streams the video as (n, height, width, 3) uint8 RGB blocks decoded and scaled
+    by an ffmpeg pipe. Blocks share one buffer, so each must be consumed before the
+    next is requested; memory stays constant regardless of the video's length.
+    """
+    filters = ([f"fps={fps}"] if fps else []) + [f"scale={width}:{height}:flags=area"]
+    command = [FFMPEG_BINARY, "-nostdin", "-v", "error", "-i", video_path, "-an", "-sn", "-dn",
+               "-vf", ",".join(filters), "-pix_fmt", "rgb24", "-f", "rawvideo", "-"]
+    frame_bytes = width * height * 3
+    buffer = bytearray(frame_bytes * block_frames)
+    view = memoryview(buffer)
+    with tempfile.TemporaryFile() as errors:
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=errors, bufsize=0)  # nosec B603
+        except FileNotFoundError:
+            raise RuntimeError(f"'{FFMPEG_BINARY}' was not found; install FFmpeg or set FFMPEG_BINARY.")
+        try:
+            while True:
+                filled = 0
+                while filled < len(buffer):
+                    count = process.stdout.readinto(view[filled:])
+                    if not count:
+                        break
+                    filled += count
+                frames = filled // frame_bytes
+                if frames:
+                    yield np.frombuffer(buffer, dtype=np.uint8, count=frames * frame_bytes).reshape(frames, height, width, 3)
+                if filled < len(buffer):
+                    break
+            if process.wait() != 0:
+                errors.seek(0)
+                raise RuntimeError(f"ffmpeg failed for '{video_path}': {errors.read().decode(errors='replace').strip()}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+def _histograms(frames: np.ndarray) -> np.ndarray:
+    """Per-frame normalized RGB histograms, shape (n, 3 * HISTOGRAM_BINS), from one bincount over every other pixel."""
+    frames = frames[:, ::2, ::2]
+    n = frames.shape[0]
+    shift = 8 - int(np.log2(HISTOGRAM_BINS))
+    offsets = (np.arange(n, dtype=np.int32)[:, None, None, None] * (3 * HISTOGRAM_BINS)
+               + np.arange(3, dtype=np.int32) * HISTOGRAM_BINS)
+    indices = (frames >> shift).astype(np.int32) + offsets
+    counts = np.bincount(indices.ravel(), minlength=n * 3 * HISTOGRAM_BINS).reshape(n, 3 * HISTOGRAM_BINS)
+    return counts.astype(np.float32) / (frames.shape[1] * frames.shape[2])
+
+def _window_means(values: np.ndarray, rows: int, columns: int) -> np.ndarray:
+    n = values.shape[0]
+    return values.reshape(n, rows, SSIM_WINDOW, columns, SSIM_WINDOW).mean(axis=(2, 4))
+
+class SceneDetector:
+    """
+    Incremental cut detector over decoded frame blocks.
+
+    Each frame is scored against its predecessor by combining the RGB histogram
+    distance (half the L1 distance, 0..1) with 1 - SSIM of the luma computed over
+    8x8 windows. A frame is a cut when its score exceeds both ``min_threshold`` and
+    an adaptive threshold of median + k * MAD over the preceding ``window_seconds``
+    of scores, so steady high-motion footage does not fire while a hard cut in a
+    static shot does. Cuts closer than ``min_scene_seconds`` to the previous one are
+    dropped. Only the last frame and the score window are kept between blocks.
+    """
+    __slots__ = ("fps", "min_threshold", "deviations", "window", "min_scene_frames",
+                 "frames_seen", "cuts", "_previous_histogram", "_previous_luma", "_history", "_last_cut")
+
+    def __init__(self, fps: float, sensitivity: float = 0.5, min_scene_seconds: float = 0.5, window_seconds: float = 2.0):
+        if not (0.0 <= sensitivity <= 1.0):
+            raise ValueError("Sensitivity must be between 0.0 and 1.0.")
+        self.fps = fps
+        # Higher sensitivity lowers both the absolute floor and the outlier factor.
+        self.min_threshold = 0.08 + 0.3 * (1.0 - sensitivity)
+        self.deviations = 3.0 + 9.0 * (1.0 - sensitivity)
+        self.window = max(2, int(round(window_seconds * fps)))
+        self.min_scene_frames = max(1, int(round(min_scene_seconds * fps)))
+        self.frames_seen = 0
+        self.cuts: List[Dict[str, Any]] = []
+        self._previous_histogram: Optional[np.ndarray] = None
+        self._previous_luma: Optional[np.ndarray] = None
+        self._history = np.zeros(0, dtype=np.float32)
+        self._last_cut = 0
+
+    def scores(self, frames: np.ndarray) -> np.ndarray:
+        """Scores each frame of the block against the frame before it (the first frame of the video scores 0)."""
+        height, width = frames.shape[1:3]
+        rows, columns = height // SSIM_WINDOW, width // SSIM_WINDOW
+        histograms = _histograms(frames)
+        luma = frames[:, :rows * SSIM_WINDOW, :columns * SSIM_WINDOW].astype(np.float32) @ _LUMA
+        if self._previous_histogram is None:
+            histograms_before = np.concatenate([histograms[:1], histograms[:-1]])
+            luma_before = np.concatenate([luma[:1], luma[:-1]])
+        else:
+            histograms_before = np.concatenate([self._previous_histogram, histograms[:-1]])
+            luma_before = np.concatenate([self._previous_luma, luma[:-1]])
+        histogram_delta = 0.5 * np.abs(histograms - histograms_before).sum(axis=1) / 3.0
+
+        if rows and columns:
+            mean_x, mean_y = _window_means(luma, rows, columns), _window_means(luma_before, rows, columns)
+            variance_x = _window_means(luma * luma, rows, columns) - mean_x * mean_x
+            variance_y = _window_means(luma_before * luma_before, rows, columns) - mean_y * mean_y
+            covariance = _window_means(luma * luma_before, rows, columns) - mean_x * mean_y
+            ssim = ((2 * mean_x * mean_y + _SSIM_C1) * (2 * covariance + _SSIM_C2)
+                    / ((mean_x * mean_x + mean_y * mean_y + _SSIM_C1) * (variance_x + variance_y + _SSIM_C2)))
+            structural_delta = np.clip(1.0 - ssim.mean(axis=(1, 2)), 0.0, 1.0)
+        else:
+            structural_delta = histogram_delta
+
+        self._previous_histogram = histograms[-1:].copy()
+        self._previous_luma = luma[-1:].copy()
+        return (HISTOGRAM_WEIGHT * histogram_delta + (1.0 - HISTOGRAM_WEIGHT) * structural_delta).astype(np.float32)
+
+    def update(self, frames: np.ndarray) -> List[Dict[str, Any]]:
+        """Consumes a (n, height, width, 3) uint8 block and returns the cuts found in it."""
+        if frames.shape[0] == 0:
+            return []
+        scores = self.scores(frames)
+        first_index = self.frames_seen
+        self.frames_seen += len(scores)
+
+        # Trailing window (excluding the current frame) for every frame of the block.
+        extended = np.concatenate([np.full(self.window, np.nan, dtype=np.float32), self._history, scores])
+        windows = sliding_window_view(extended, self.window)[-len(scores) - 1:-1]
+        with np.errstate(all="ignore"), warnings.catch_warnings():
+            # The first frames of a video have all-NaN (empty) windows.
+            warnings.simplefilter("ignore", RuntimeWarning)
+            median = np.nanmedian(windows, axis=1)
+            spread = 1.4826 * np.nanmedian(np.abs(windows - median[:, None]), axis=1)
+        threshold = np.maximum(self.min_threshold, np.nan_to_num(median + self.deviations * np.maximum(spread, 0.01), nan=0.0))
+        candidates = np.flatnonzero(scores > threshold)
+        self._history = np.concatenate([self._history, scores])[-self.window:]
+
+        found = []
+        for offset in candidates:
+            index = first_index + int(offset)
+            if index == 0 or index - self._last_cut < self.min_scene_frames:
+                continue
+            self._last_cut = index
+            found.append({"frame": index, "time_seconds": round(index / self.fps, 3), "score": round(float(scores[offset]), 4)})
+        self.cuts.extend(found)
+        return found
+
+    def scenes(self, duration: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Turns the cuts seen so far into contiguous scenes covering the whole video."""
+        end_frame = self.frames_seen
+        end_time = duration if duration else end_frame / self.fps
+        boundaries = [{"frame": 0, "time_seconds": 0.0, "score": None}] + self.cuts
+        scenes = []
+        for number, start in enumerate(boundaries):
+            following = boundaries[number + 1] if number + 1 < len(boundaries) else None
+            scenes.append({
+                "scene_number": number + 1,
+                "start_time_seconds": round(start["time_seconds"], 3),
+                "end_time_seconds": round(following["time_seconds"] if following else end_time, 3),
+                "start_frame": start["frame"],
+                "end_frame": following["frame"] if following else end_frame,
+                "cut_score": start["score"]
+            })
+        return scenes
+
+def detect_scenes(video_path: str, sensitivity: float = 0.5, analysis_width: int = SCENE_ANALYSIS_WIDTH,
+                  analysis_fps: Optional[float] = None, min_scene_seconds: float = 0.5) -> Dict[str, Any]:
+    """Detects the scene cuts of one video by streaming downscaled frames from ffmpeg."""
+    if not os.path.exists(video_path):
+        raise FileNotFoundError(f"Video file not found at '{video_path}'.")
+    start = time.perf_counter()
+    info = probe_video(video_path)
+    width = max(SSIM_WINDOW, min(analysis_width, info["width"]) // 2 * 2)
+    height = max(SSIM_WINDOW, int(round(info["height"] * width / info["width"] / 2)) * 2)
+    fps = analysis_fps or info["fps"]
+    detector = SceneDetector(fps, sensitivity=sensitivity, min_scene_seconds=min_scene_seconds)
+    for block in iter_frame_blocks(video_path, width, height, fps=analysis_fps):
+        detector.update(block)
+    elapsed = time.perf_counter() - start
+    duration = info["duration"] or detector.frames_seen / fps
+    scenes = detector.scenes(duration)
+    return {
+        "video_path": video_path,
+        "duration_seconds": round(duration, 3),
+        "frames_analyzed": detector.frames_seen,
+        "analysis_resolution": f"{width}x{height}",
+        "analysis_fps": round(fps, 3),
+        "seconds": round(elapsed, 3),
+        "realtime_factor": round(duration / elapsed, 1) if elapsed > 0 else None,
+        "scene_count": len(scenes),
+        "scenes": scenes
+    }
+
+def detect_scenes_many(video_paths: List[str], workers: int = SCENE_DETECTION_WORKERS, **options: Any) -> List[Dict[str, Any]]:
+    """
+    Runs detect_scenes over several videos concurrently. Decoding happens in the
+    ffmpeg child processes and the NumPy scoring releases the GIL for most of its
+    work, so threads keep the cores busy without pickling frames between processes.
+    """
+    def run(path: str) -> Dict[str, Any]:
+        try:
+            return detect_scenes(path, **options)
+        except (FileNotFoundError, ValueError, RuntimeError) as e:
+            logger.error(f"Scene detection failed for '{path}': {e}")
+            return {"video_path": path, "error": str(e)}
+
+    if workers <= 1 or len(video_paths) <= 1:
+        return [run(path) for path in video_paths]
+    with ThreadPoolExecutor(max_workers=min(workers, len(video_paths))) as pool:
+        return list(pool.map(run, video_paths))
+
 class VideoSceneDetectorTool(BaseTool):
     """
-    A tool to simulate detecting scene changes in a video file.
+    A tool to detect scene changes (cuts) in video files.
     """
     def __init__(self, tool_name: str = "video_scene_detector_tool"):
         super().__init__(tool_name)
 
     @property
     def description(self) -> str:
-        return "Simulates detecting scene changes in a video and returns a list of timestamps."
+        return ("Detects scene changes in one or more videos from frame-to-frame histogram and SSIM differences "
+                "and returns the scenes with their start and end timestamps.")
 
     @property
     def parameters(self) -> Dict[str, Any]:
@@ -24,57 +279,60 @@ class VideoSceneDetectorTool(BaseTool):
             "type": "object",
             "properties": {
                 "video_path": {"type": "string", "description": "The local file path to the video."},
+                "video_paths": {"type": "array", "items": {"type": "string"}, "description": "Several videos to analyze in parallel."},
                 "sensitivity": {
                     "type": "number",
                     "description": "A value from 0.0 to 1.0 to control detection sensitivity. Higher means more scenes.",
                     "default": 0.5
-                }
+                },
+                "min_scene_seconds": {"type": "number", "description": "Shortest scene to report.", "default": 0.5},
+                "analysis_width": {"type": "integer", "description": "Width frames are downscaled to before analysis.", "default": SCENE_ANALYSIS_WIDTH},
+                "analysis_fps": {"type": "number", "description": "Optional frame rate to sample at instead of every frame."},
+                "workers": {"type": "integer", "description": "Videos analyzed concurrently.", "default": SCENE_DETECTION_WORKERS}
             },
-            "required": ["video_path"]
+            "required": []
         }
 
-    def execute(self, video_path: str, sensitivity: float = 0.5, **kwargs: Any) -> Dict:
+    def execute(self, video_path: Optional[str] = None, sensitivity: float = 0.5, video_paths: Optional[List[str]] = None,
+                min_scene_seconds: float = 0.5, analysis_width: int = SCENE_ANALYSIS_WIDTH, analysis_fps: Optional[float] = None,
+                workers: int = SCENE_DETECTION_WORKERS, **kwargs: Any) -> Dict:
         """
-        Simulates finding scene change timestamps in a video.
+        Finds scene change timestamps in one video, or in several when 'video_paths' is given.
         """
+        options = {"sensitivity": sensitivity, "analysis_width": analysis_width, "analysis_fps": analysis_fps,
+                   "min_scene_seconds": min_scene_seconds}
         try:
-            if not os.path.exists(video_path):
-                raise FileNotFoundError(f"Video file not found at '{video_path}'.")
-            
             if not (0.0 <= sensitivity <= 1.0):
                 raise ValueError("Sensitivity must be between 0.0 and 1.0.")
-
-            logger.info(f"Simulating scene detection for '{video_path}' with sensitivity {sensitivity}.")
-
-            with VideoFileClip(video_path) as clip:
-                duration = clip.duration
-            
-            # Simulate scene detection
-            # More sensitivity = more scenes
-            num_scenes = int(duration / 10 * (1 + sensitivity * 2)) # Base number of scenes + sensitivity factor
-            num_scenes = max(1, num_scenes)
-
-            scene_changes = [0.0] # The video always starts with a scene
-            for _ in range(num_scenes - 1):
-                scene_changes.append(round(random.uniform(0, duration), 2))  # nosec B311
-            
-            scene_changes = sorted(list(set(scene_changes))) # Remove duplicates and sort
-
-            # Create scene list with start and end times
-            scenes = []
-            for i, start_time in enumerate(scene_changes):
-                end_time = scene_changes[i+1] if i + 1 < len(scene_changes) else duration
-                scenes.append({
-                    "scene_number": i + 1,
-                    "start_time_seconds": start_time,
-                    "end_time_seconds": round(end_time, 2)
-                })
-
-            return {
-                "message": f"Simulated scene detection complete. Found {len(scenes)} scenes.",
-                "scenes": scenes
-            }
-
+            if video_paths:
+                results = detect_scenes_many(video_paths, workers=workers, **options)
+                return {
+                    "message": f"Scene detection complete for {len(results)} videos.",
+                    "failed": sum("error" in result for result in results),
+                    "videos": results
+                }
+            if not video_path:
+                raise ValueError("Either 'video_path' or 'video_paths' is required.")
+            logger.info(f"Detecting scenes in '{video_path}' with sensitivity {sensitivity}.")
+            result = detect_scenes(video_path, **options)
+            result["message"] = f"Scene detection complete. Found {result['scene_count']} scenes."
+            return result
         except Exception as e:
             logger.error(f"An error occurred in VideoSceneDetectorTool: {e}")
             return {"error": str(e)}
+
+if __name__ == "__main__":
+    # Benchmark of the analysis stage on synthetic 160x90 frames: ten 6-second shots at 30 fps.
+    rng = np.random.default_rng(0)
+    fps, shot_frames, shots = 30.0, 180, 10
+    detector = SceneDetector(fps)
+    start = time.perf_counter()
+    for shot in range(shots):
+        base = rng.integers(0, 256, size=(9, 16, 3), dtype=np.uint8).repeat(10, axis=0).repeat(10, axis=1)
+        frames = np.stack([np.roll(base, 2 * i, axis=1) for i in range(shot_frames)])
+        for block_start in range(0, shot_frames, SCENE_BLOCK_FRAMES):
+            detector.update(frames[block_start:block_start + SCENE_BLOCK_FRAMES])
+    elapsed = time.perf_counter() - start
+    print(f"{detector.frames_seen} frames scored in {elapsed:.2f}s "
+          f"({detector.frames_seen / elapsed:.0f} frames/s, {detector.frames_seen / fps / elapsed:.0f}x real time at {fps:.0f} fps)")
+    print(f"cuts: {[cut['frame'] for cut in detector.cuts]}")
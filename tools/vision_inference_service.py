@@ -0,0 +1,530 @@
+import base64
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from mic.model_server import ModelTask, remote_model
+except ImportError:  # run from the repository root (python -m tools.vision_inference_service): no model server
+    ModelTask = remote_model = None
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    PIL_AVAILABLE = False
+    logging.warning("Pillow not found. Vision inference will be unavailable. Please install 'Pillow'.")
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    requests = None
+    REQUESTS_AVAILABLE = False
+
+# Deferring heavy imports
+try:
+    import torch
+    from transformers import (AutoImageProcessor, AutoModelForImageClassification, AutoModelForObjectDetection)
+    TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    torch = None
+    AutoImageProcessor = None
+    AutoModelForImageClassification = None
+    AutoModelForObjectDetection = None
+    TRANSFORMERS_AVAILABLE = False
+    logging.warning("transformers or torch not found. Vision inference models will not be available. Please install 'transformers', 'torch'.")
+
+try:
+    from optimum.onnxruntime import ORTModelForImageClassification
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ORTModelForImageClassification = None
+    ONNXRUNTIME_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DETECTION_MODEL = os.getenv("VISION_DETECTION_MODEL", "facebook/detr-resnet-50")
+CLASSIFICATION_MODEL = os.getenv("VISION_CLASSIFICATION_MODEL", "google/vit-base-patch16-224")
+# 'auto' uses ONNX Runtime where an exporter exists and eager PyTorch otherwise;
+# 'torch_compile' needs a working C++ toolchain for the inductor backend.
+VISION_BACKEND = os.getenv("VISION_BACKEND", "auto")
+VISION_MAX_BATCH = int(os.getenv("VISION_MAX_BATCH", 8))
+VISION_BATCH_WAIT_MS = float(os.getenv("VISION_BATCH_WAIT_MS", 10))
+VISION_RESULT_CACHE_SIZE = int(os.getenv("VISION_RESULT_CACHE_SIZE", 1024))
+VISION_DECODED_CACHE_SIZE = int(os.getenv("VISION_DECODED_CACHE_SIZE", 64))
+VISION_FETCH_WORKERS = int(os.getenv("VISION_FETCH_WORKERS", 8))
+URL_TIMEOUT_SECONDS = 10
+# DETR resizes to at most 1333 px on the long side and ViT to 224, so decoding
+# more pixels than this is wasted work for every model the service runs.
+MAX_DECODED_SIDE = 1333
+DEFAULT_DETECTION_THRESHOLD = 0.5
+
+
+# -- image loading ---------------------------------------------------------------
+
+def source_label(source: Dict[str, Any]) -> str:
+    return source.get("image_path") or source.get("image_url") or "base64_data"
+
+
+def read_image_bytes(image_path: str = None, image_url: str = None, image_base64: str = None,
+                     session: Any = None) -> bytes:
+    """Raw encoded bytes of an image given by path, URL or base64."""
+    if image_path:
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"Image file not found at {image_path}")
+        with open(image_path, "rb") as f:
+            return f.read()
+    elif image_url:
+        if session is not None:
+            response = session.get(image_url, timeout=URL_TIMEOUT_SECONDS)
+            response.raise_for_status() # Raise an exception for HTTP errors
+            return response.content
+        from urllib.request import urlopen
+        with urlopen(image_url, timeout=URL_TIMEOUT_SECONDS) as response:
+            return response.read()
+    elif image_base64:
+        return base64.b64decode(image_base64)
+    else:
+        raise ValueError("One of image_path, image_url, or image_base64 must be provided.")
+
+
+class DecodedImage:
+    """
+    An RGB image decoded once and shared by every model. ``size`` is the original
+    (width, height); ``image`` is capped at MAX_DECODED_SIDE, and JPEGs are
+    decoded directly at reduced scale.
+    """
+    __slots__ = ("digest", "image", "size")
+
+    def __init__(self, digest: str, image: "Image.Image", size: Tuple[int, int]):
+        self.digest = digest
+        self.image = image
+        self.size = size
+
+    @classmethod
+    def from_bytes(cls, data: bytes, digest: Optional[str] = None) -> "DecodedImage":
+        image = Image.open(BytesIO(data))
+        size = image.size
+        if max(size) > MAX_DECODED_SIDE:
+            image.draft("RGB", (MAX_DECODED_SIDE, MAX_DECODED_SIDE))
+        image = image.convert("RGB")
+        if max(image.size) > MAX_DECODED_SIDE:
+            image.thumbnail((MAX_DECODED_SIDE, MAX_DECODED_SIDE), Image.BILINEAR)
+        return cls(digest or hashlib.sha256(data).hexdigest(), image, size)
+
+
+class _LRUCache:
+    """A small thread-safe LRU map with hit/miss counters."""
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Any, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# -- micro-batching ----------------------------------------------------------------
+
+class MicroBatcher:
+    """
+    Collects items submitted from any thread and runs them through ``run_batch`` in
+    groups: a batch closes when it holds ``max_batch_size`` items or ``max_wait_ms``
+    after its first item arrived. ``run_batch`` gets a list of items and returns a
+    list of results in the same order.
+    """
+    def __init__(self, run_batch: Callable[[List[Any]], List[Any]], max_batch_size: int = VISION_MAX_BATCH,
+                 max_wait_ms: float = VISION_BATCH_WAIT_MS, name: str = "vision-batcher"):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.items = 0
+        self._queue: "queue.Queue[Optional[Tuple[Any, Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            pending = [first]
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                pending.append(entry)
+            self._run(pending)
+            if stop:
+                return
+
+    def _run(self, pending: List[Tuple[Any, Future]]) -> None:
+        pending = [(item, future) for item, future in pending if future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+        self.batches += 1
+        self.items += len(pending)
+        try:
+            results = self.run_batch([item for item, _ in pending])
+        except Exception as e:
+            logger.error(f"Batch of {len(pending)} failed: {e}")
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(pending, results):
+            future.set_result(result)
+
+
+# -- model runners -----------------------------------------------------------------
+
+def _resolve_backend(backend: str, onnx_supported: bool) -> str:
+    if backend == "auto":
+        return "onnx" if onnx_supported and ONNXRUNTIME_AVAILABLE else "torch"
+    if backend == "onnx" and not (onnx_supported and ONNXRUNTIME_AVAILABLE):
+        logger.warning("ONNX Runtime path unavailable for this model (install 'optimum[onnxruntime]'); using PyTorch.")
+        return "torch"
+    return backend
+
+
+def _compiled(model: Any) -> Any:
+    try:
+        return torch.compile(model, dynamic=True)
+    except Exception as e:
+        logger.warning(f"torch.compile unavailable ({e}); using eager PyTorch.")
+        return model
+
+
+class _TorchRunner:
+    """Shared plumbing: one processor call and one forward pass per batch."""
+    task = ""
+
+    def __init__(self, model_name: str, backend: str):
+        self.model_name = model_name
+        self.processor = AutoImageProcessor.from_pretrained(model_name)
+        self.backend = backend
+        self.model = self._load_model(backend)
+        self._eager_model = None
+
+    def _load_model(self, backend: str) -> Any:
+        raise NotImplementedError
+
+    def _forward(self, inputs: Dict[str, Any]) -> Any:
+        with torch.inference_mode():
+            try:
+                return self.model(**inputs)
+            except Exception as e:
+                if self.backend != "torch_compile" or self._eager_model is None:
+                    raise
+                # Compilation errors surface on the first call; keep serving with the eager model.
+                logger.warning(f"Compiled {self.task} model failed ({e}); falling back to eager PyTorch.")
+                self.model, self.backend = self._eager_model, "torch"
+                return self.model(**inputs)
+
+
+class DetectionRunner(_TorchRunner):
+    task = "detect"
+
+    def _load_model(self, backend: str) -> Any:
+        model = AutoModelForObjectDetection.from_pretrained(self.model_name).eval()
+        self._eager_model = model
+        return _compiled(model) if backend == "torch_compile" else model
+
+    def __call__(self, batch: List[Tuple[DecodedImage, Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+        inputs = self.processor(images=[decoded.image for decoded, _ in batch], return_tensors="pt")
+        outputs = self._forward(inputs)
+        thresholds = [params.get("threshold", DEFAULT_DETECTION_THRESHOLD) for _, params in batch]
+        # Boxes are predicted in relative coordinates, so they scale straight back to the original size.
+        target_sizes = torch.tensor([[decoded.size[1], decoded.size[0]] for decoded, _ in batch])
+        processed = self.processor.post_process_object_detection(outputs, threshold=min(thresholds), target_sizes=target_sizes)
+        id2label = self._eager_model.config.id2label
+        results = []
+        for detections, threshold in zip(processed, thresholds):
+            objects = []
+            for score, label, box in zip(detections["scores"].tolist(), detections["labels"].tolist(), detections["boxes"].tolist()):
+                if score >= threshold:
+                    xmin, ymin, xmax, ymax = (int(value) for value in box)
+                    objects.append({"score": score, "label": id2label[label],
+                                    "box": {"xmin": xmin, "ymin": ymin, "xmax": xmax, "ymax": ymax}})
+            results.append(objects)
+        return results
+
+
+class ClassificationRunner(_TorchRunner):
+    task = "classify"
+
+    def _load_model(self, backend: str) -> Any:
+        if backend == "onnx":
+            model = ORTModelForImageClassification.from_pretrained(self.model_name, export=True)
+            self._eager_model = model
+            return model
+        model = AutoModelForImageClassification.from_pretrained(self.model_name).eval()
+        self._eager_model = model
+        return _compiled(model) if backend == "torch_compile" else model
+
+    def __call__(self, batch: List[Tuple[DecodedImage, Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+        inputs = self.processor(images=[decoded.image for decoded, _ in batch], return_tensors="pt")
+        logits = torch.as_tensor(self._forward(inputs).logits)
+        probabilities = logits.softmax(dim=-1)
+        top_ks = [min(params.get("top_k", 5), probabilities.shape[-1]) for _, params in batch]
+        scores, labels = probabilities.topk(max(top_ks), dim=-1)
+        id2label = self._eager_model.config.id2label
+        return [[{"label": id2label[label], "score": score} for score, label in zip(row_scores[:k].tolist(), row_labels[:k].tolist())]
+                for row_scores, row_labels, k in zip(scores, labels, top_ks)]
+
+
+_BUILTIN_RUNNERS = {
+    "detect": lambda backend: DetectionRunner(DETECTION_MODEL, _resolve_backend(backend, onnx_supported=False)),
+    "classify": lambda backend: ClassificationRunner(CLASSIFICATION_MODEL, _resolve_backend(backend, onnx_supported=True)),
+}
+
+
+# -- service -----------------------------------------------------------------------
+
+class VisionInferenceService:
+    """
+    One process-wide entry point for image models. Requests from any tool are
+    fetched concurrently (URLs on a thread pool with a pooled HTTP session),
+    decoded once per distinct image content, batched per model across callers,
+    and their results cached by (task, parameters, image content hash).
+    """
+
+    def __init__(self, max_batch_size: int = VISION_MAX_BATCH, max_wait_ms: float = VISION_BATCH_WAIT_MS,
+                 backend: str = VISION_BACKEND, result_cache_size: int = VISION_RESULT_CACHE_SIZE,
+                 decoded_cache_size: int = VISION_DECODED_CACHE_SIZE):
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.backend = backend
+        self.results = _LRUCache(result_cache_size)
+        self.decoded = _LRUCache(decoded_cache_size)
+        self._factories: Dict[str, Callable[[], Callable[[List[Any]], List[Any]]]] = {}
+        self._batchers: Dict[str, MicroBatcher] = {}
+        self._runners: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._io_pool = ThreadPoolExecutor(max_workers=VISION_FETCH_WORKERS, thread_name_prefix="vision-io")
+        self._session = requests.Session() if REQUESTS_AVAILABLE else None
+        # With "vision" in MODEL_SERVER_FAMILIES the built-in models run in the shared model
+        # server; decoded pixels reach it through shared memory.
+        self.remote = remote_model("vision") if remote_model else None
+        for task, runner in _BUILTIN_RUNNERS.items():
+            self.register_task(task, lambda runner=runner: runner(self.backend))
+
+    def register_task(self, task: str, factory: Callable[[], Callable[[List[Any]], List[Any]]]) -> None:
+        """
+        Registers a batched model. ``factory`` is called once, on first use, and
+        returns a callable mapping [(DecodedImage, params), ...] to one result per item.
+        """
+        with self._lock:
+            self._factories[task] = factory
+            self._runners.pop(task, None)
+
+    def available(self, task: str) -> bool:
+        if task in ("detect", "classify"):
+            return PIL_AVAILABLE and (TRANSFORMERS_AVAILABLE or self.remote is not None)
+        return PIL_AVAILABLE and task in self._factories
+
+    def _batcher(self, task: str) -> MicroBatcher:
+        with self._lock:
+            if task not in self._batchers:
+                if task not in self._factories:
+                    raise ValueError(f"Unknown vision task '{task}'.")
+                self._batchers[task] = MicroBatcher(lambda batch, task=task: self._run_batch(task, batch),
+                                                    self.max_batch_size, self.max_wait_ms, name=f"vision-{task}")
+            return self._batchers[task]
+
+    def _run_batch(self, task: str, batch: List[Tuple[DecodedImage, Dict[str, Any]]]) -> List[Any]:
+        if self.remote is not None and task in _BUILTIN_RUNNERS:
+            return self.remote.run(task, [{"image": np.asarray(decoded.image), "size": list(decoded.size), "params": params}
+                                          for decoded, params in batch])
+        runner = self._runners.get(task)
+        if runner is None:
+            # Loaded on the batcher thread, so model loading never blocks callers' threads.
+            start = time.perf_counter()
+            runner = self._runners[task] = self._factories[task]()
+            logger.info(f"Loaded vision model for '{task}' ({getattr(runner, 'backend', 'custom')}) in {time.perf_counter() - start:.1f}s")
+        return runner(batch)
+
+    def _fetch(self, source: Dict[str, Any]) -> Tuple[str, bytes]:
+        data = read_image_bytes(source.get("image_path"), source.get("image_url"), source.get("image_base64"),
+                                session=self._session)
+        return hashlib.sha256(data).hexdigest(), data
+
+    def _decode(self, digest: str, data: bytes) -> DecodedImage:
+        decoded = self.decoded.get(digest)
+        if decoded is None:
+            decoded = DecodedImage.from_bytes(data, digest)
+            self.decoded.put(digest, decoded)
+        return decoded
+
+    def submit(self, task: str, source: Dict[str, Any], **params: Any) -> Future:
+        """Schedules ``task`` on one image source ({image_path|image_url|image_base64}); returns a Future of its result."""
+        if not PIL_AVAILABLE:
+            raise ImportError("Vision inference requires 'Pillow'. Please install it with 'pip install Pillow'.")
+        batcher = self._batcher(task)
+        result: Future = Future()
+        params_key = tuple(sorted(params.items()))
+
+        def finish(key: Tuple, batch_future: Future) -> None:
+            error = batch_future.exception()
+            if error is not None:
+                result.set_exception(error)
+                return
+            self.results.put(key, batch_future.result())
+            result.set_result(batch_future.result())
+
+        def fetched(fetch_future: Future) -> None:
+            # Runs on the I/O thread that fetched the bytes, so decoding stays off the caller's thread too.
+            try:
+                digest, data = fetch_future.result()
+                key = (task, params_key, digest)
+                cached = self.results.get(key)
+                if cached is not None:
+                    result.set_result(cached)
+                    return
+                decoded = self._decode(digest, data)
+            except Exception as e:
+                result.set_exception(e)
+                return
+            batcher.submit((decoded, params)).add_done_callback(lambda batch_future: finish(key, batch_future))
+
+        self._io_pool.submit(self._fetch, source).add_done_callback(fetched)
+        return result
+
+    def run(self, task: str, source: Dict[str, Any], **params: Any) -> Any:
+        return self.submit(task, source, **params).result()
+
+    def stream(self, task: str, sources: List[Dict[str, Any]], **params: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Runs ``task`` on many images and yields {"index", "image_source", "result"|"error"}
+        as each one finishes, fastest first; all of them share batches.
+        """
+        futures = {self.submit(task, source, **params): index for index, source in enumerate(sources)}
+        for future in as_completed(futures):
+            index = futures[future]
+            entry: Dict[str, Any] = {"index": index, "image_source": source_label(sources[index])}
+            try:
+                entry["result"] = future.result()
+            except Exception as e:
+                entry["error"] = str(e)
+            yield entry
+
+    def run_many(self, task: str, sources: List[Dict[str, Any]], **params: Any) -> List[Dict[str, Any]]:
+        return sorted(self.stream(task, sources, **params), key=lambda entry: entry["index"])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": {task: getattr(runner, "backend", "custom") for task, runner in self._runners.items()},
+            "batches": {task: {"batches": batcher.batches, "images": batcher.items} for task, batcher in self._batchers.items()},
+            "result_cache": {"entries": len(self.results), "hits": self.results.hits, "misses": self.results.misses},
+            "decoded_cache": {"entries": len(self.decoded), "hits": self.decoded.hits, "misses": self.decoded.misses},
+        }
+
+def model_server_tasks() -> Dict[str, ModelTask]:
+    """The "vision" model-server family: the built-in runners, fed straight from shared-memory pixel arrays."""
+    def serve(task: str) -> ModelTask:
+        runner = None
+
+        def run_batch(items: List[Dict[str, Any]]) -> List[Any]:
+            nonlocal runner
+            if runner is None:
+                runner = _BUILTIN_RUNNERS[task](VISION_BACKEND)
+            # Image processors take HxWx3 arrays as well as PIL images, so the mapped pixels are used as-is.
+            return runner([(DecodedImage("", item["image"], tuple(item["size"])), item["params"]) for item in items])
+
+        return ModelTask(run_batch=run_batch)
+
+    return {task: serve(task) for task in _BUILTIN_RUNNERS}
+
+
+vision_service = VisionInferenceService()
+
+
+if __name__ == "__main__":
+    import random
+    logging.basicConfig(level=logging.INFO)
+    rng = random.Random(0)
+    sources = []
+    for i in range(64):
+        image = Image.new("RGB", (1280, 960), (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        image.paste(Image.effect_noise((640, 480), 64).convert("RGB"), (rng.randrange(600), rng.randrange(400)))
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", quality=90)
+        sources.append({"image_base64": base64.b64encode(buffer.getvalue()).decode("ascii")})
+
+    start = time.perf_counter()
+    for source in sources:
+        DecodedImage.from_bytes(base64.b64decode(source["image_base64"]))
+    print(f"decode + downscale: {len(sources) / (time.perf_counter() - start):.1f} images/sec")
+
+    if not TRANSFORMERS_AVAILABLE:
+        print("transformers/torch not installed; skipping model benchmarks.")
+    else:
+        for backend in ("torch", "torch_compile", "onnx"):
+            for task in ("classify", "detect"):
+                images = sources if task == "classify" else sources[:16]
+                for batch_size in (1, VISION_MAX_BATCH):
+                    service = VisionInferenceService(max_batch_size=batch_size, backend=backend, result_cache_size=0)
+                    service.run(task, images[0])  # load (and compile) the model outside the timing
+                    start = time.perf_counter()
+                    results = service.run_many(task, images)
+                    elapsed = time.perf_counter() - start
+                    errors = sum("error" in entry for entry in results)
+                    print(f"{backend:14s} {task:9s} batch={batch_size:<3d} {len(images) / elapsed:7.1f} images/sec"
+                          f"{f' ({errors} errors)' if errors else ''} {service.stats()['backend']}")
+        cached = VisionInferenceService()
+        cached.run_many("classify", sources[:16])
+        start = time.perf_counter()
+        cached.run_many("classify", sources[:16])
+        print(f"result cache hits: {16 / (time.perf_counter() - start):.1f} images/sec")
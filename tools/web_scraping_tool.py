@@ -1,16 +1,21 @@
 import json
-import requests
+import httpx
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
 import logging
 from typing import Union, List, Dict, Any, Optional
 from tools.base_tool import BaseTool
 
 logger = logging.getLogger(__name__)
 
+# Loading the CA bundle dominates the cost of a new client, so the SSL context is built once and shared.
+_SSL_CONTEXT = httpx.create_ssl_context()
+
 class WebScrapingTool(BaseTool):
     """
     A tool for scraping content from web pages, supporting both static and dynamic sites.
+    Pages are fetched asynchronously (httpx / Playwright's async API), so many scrapes can
+    share one event loop; execute() is derived from aexecute().
     """
 
     def __init__(self, tool_name: str = "web_scraping_tool"):
@@ -33,14 +38,14 @@ class WebScrapingTool(BaseTool):
                 },
                 "dynamic": {
                     "type": "boolean", 
-                    "description": "If True, use Playwright for dynamic content. Otherwise, use requests/BeautifulSoup.",
+                    "description": "If True, use Playwright for dynamic content. Otherwise, use httpx/BeautifulSoup.",
                     "default": False
                 }
             },
             "required": ["url", "selector"]
         }
 
-    def execute(self, url: str, selector: str, attribute: Optional[str] = None, dynamic: bool = False, **kwargs) -> Dict:
+    async def aexecute(self, url: str, selector: str, attribute: Optional[str] = None, dynamic: bool = False, **kwargs) -> Dict:
         """
         Executes the web scraping action.
         """
@@ -49,9 +54,9 @@ class WebScrapingTool(BaseTool):
 
         try:
             if dynamic:
-                extracted_data = self._scrape_dynamic(url, selector, attribute)
+                extracted_data = await self._scrape_dynamic(url, selector, attribute)
             else:
-                extracted_data = self._scrape_static(url, selector, attribute)
+                extracted_data = await self._scrape_static(url, selector, attribute)
             
             if not extracted_data:
                 return {"message": f"No content found for selector '{selector}'.", "url": url, "selector": selector}
@@ -62,13 +67,11 @@ class WebScrapingTool(BaseTool):
             logger.error(f"An error occurred during web scraping: {e}")
             return {"error": str(e)}
 
-    def _scrape_static(self, url: str, selector: str, attribute: Optional[str] = None) -> List[str]:
+    def _extract(self, html: str, selector: str, attribute: Optional[str] = None) -> List[str]:
         """
-        Scrapes content from a static URL using requests and BeautifulSoup.
+        Extracts the text (or ``attribute``) of the elements matching ``selector``.
         """
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml') # Use lxml parser
+        soup = BeautifulSoup(html, 'lxml') # Use lxml parser
         elements = soup.select(selector)
         
         extracted_data = []
@@ -80,26 +83,26 @@ class WebScrapingTool(BaseTool):
         
         return extracted_data
 
-    def _scrape_dynamic(self, url: str, selector: str, attribute: Optional[str] = None) -> List[str]:
+    async def _scrape_static(self, url: str, selector: str, attribute: Optional[str] = None) -> List[str]:
+        """
+        Scrapes content from a static URL using httpx and BeautifulSoup.
+        """
+        async with httpx.AsyncClient(verify=_SSL_CONTEXT, follow_redirects=True) as client:
+            response = await client.get(url, timeout=10)
+        response.raise_for_status()
+        return self._extract(response.text, selector, attribute)
+
+    async def _scrape_dynamic(self, url: str, selector: str, attribute: Optional[str] = None) -> List[str]:
         """
         Scrapes content from a dynamic URL using Playwright.
         """
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page()
-            page.goto(url)
-            page.wait_for_selector(selector) # Wait for the selector to be present
-            
-            content = page.content()
-            soup = BeautifulSoup(content, 'lxml') # Use lxml parser
-            elements = soup.select(selector)
-            
-            extracted_data = []
-            for element in elements:
-                if attribute:
-                    extracted_data.append(element.get(attribute))
-                else:
-                    extracted_data.append(element.get_text(strip=True))
-            
-            browser.close()
-            return extracted_data
+        async with async_playwright() as p:
+            browser = await p.chromium.launch()
+            try:
+                page = await browser.new_page()
+                await page.goto(url)
+                await page.wait_for_selector(selector) # Wait for the selector to be present
+                content = await page.content()
+            finally:
+                await browser.close()
+        return self._extract(content, selector, attribute)
@@ -2,7 +2,6 @@ import logging
 from typing import Dict, Any
 from tools.base_tool import BaseTool
 from mic.google_search_api import google_web_search # Import the actual search function
-import asyncio # Import asyncio for running async function
 
 logger = logging.getLogger(__name__)
 
@@ -28,9 +27,10 @@ class WebSearchTool(BaseTool):
             "required": ["query"]
         }
 
-    def execute(self, query: str, num_results: int = 5, **kwargs: Any) -> Dict:
+    async def aexecute(self, query: str, num_results: int = 5, **kwargs: Any) -> Dict:
         """
         Performs a web search using the Google Web Search tool.
+        The search is awaited on the caller's event loop; execute() is derived from this.
         """
         if not query:
             error_msg = "'query' cannot be empty."
@@ -38,9 +38,7 @@ class WebSearchTool(BaseTool):
             return {"error": error_msg}
 
         try:
-            # Call the actual asynchronous google_web_search function
-            # Since execute is synchronous, we need to run the async function
-            search_result = asyncio.run(google_web_search(query=query, num_results=num_results))
+            search_result = await google_web_search(query=query, num_results=num_results)
             
             if "error" in search_result:
                 # The google_web_search function already logs its errors